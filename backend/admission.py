@@ -0,0 +1,214 @@
+import os
+import time
+import asyncio
+from collections import OrderedDict, deque
+
+
+# dasar penolakan admission control, retry_after dalam detik untuk header Retry-After
+class AdmissionRejected(Exception):
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# klien melewati batas token bucket
+class RateLimited(AdmissionRejected):
+    pass
+
+
+# slot upstream penuh dan antrean juga penuh atau terlalu lama
+class UpstreamBusy(AdmissionRejected):
+    pass
+
+
+# daftar dipisah koma dari variabel lingkungan
+def _split(value: str) -> tuple:
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+# rate limiting token bucket per klien (ip atau header kunci). bucket disimpan
+# di OrderedDict dengan batas jumlah klien; klien yang paling lama tidak
+# terlihat dibuang lebih dulu (bucket penuh sama dengan klien baru).
+# header kunci hanya dipakai jika nilainya ada di allowed_keys, kalau tidak
+# klien cukup mengganti header untuk mendapat bucket baru
+class RateLimiter:
+    def __init__(self, rate: float = 0.5, burst: int = 10, max_clients: int = 10000,
+                 key_header: str = None, allowed_keys: tuple = (), trusted_proxies: int = 0, exempt: tuple = ()):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.key_header = key_header
+        self.allowed_keys = frozenset(allowed_keys)
+        self.trusted_proxies = trusted_proxies
+        self.exempt = frozenset(exempt)
+        # kunci klien -> [token, waktu isi ulang terakhir]
+        self._buckets = OrderedDict()
+        self.allowed = 0
+        self.limited = 0
+
+    # membuat limiter dari variabel lingkungan, RATE_LIMIT_PER_MINUTE=0 mematikan.
+    # RATE_LIMIT_TRUST_PROXY berisi jumlah proxy tepercaya di depan aplikasi
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        return cls(
+            rate=float(os.getenv("RATE_LIMIT_PER_MINUTE", "30")) / 60,
+            burst=int(os.getenv("RATE_LIMIT_BURST", "10")),
+            max_clients=int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000")),
+            key_header=os.getenv("RATE_LIMIT_KEY_HEADER") or None,
+            allowed_keys=_split(os.getenv("RATE_LIMIT_KEYS", "")),
+            trusted_proxies=int(os.getenv("RATE_LIMIT_TRUST_PROXY", "0")),
+            exempt=_split(os.getenv("RATE_LIMIT_EXEMPT", "")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    # kunci klien dari request starlette: header kunci yang terdaftar, lalu
+    # X-Forwarded-For (hanya di belakang proxy tepercaya), lalu ip socket.
+    # setiap proxy menambahkan ip lawannya di akhir header, jadi dengan N
+    # proxy tepercaya ip klien adalah entri ke-N dari kanan; entri di kirinya
+    # ditulis klien sendiri dan tidak dipercaya
+    def client_key(self, request) -> str:
+        if request is None:
+            return None
+        if self.key_header:
+            key = request.headers.get(self.key_header)
+            if key and key in self.allowed_keys:
+                return f"key:{key}"
+        if self.trusted_proxies:
+            hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+            if len(hops) >= self.trusted_proxies:
+                return hops[-self.trusted_proxies]
+        return request.client.host if request.client else None
+
+    # ambil satu token untuk klien, lempar RateLimited jika bucket kosong.
+    # kunci None (panggilan internal seperti pre-warm) tidak dibatasi
+    def acquire(self, key: str, cost: float = 1.0, now: float = None):
+        if not self.enabled or key is None or key in self.exempt:
+            return
+        now = time.monotonic() if now is None else now
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_clients:
+                self._buckets.popitem(last=False)
+            bucket = self._buckets[key] = [float(self.burst), now]
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] < cost:
+            self.limited += 1
+            raise RateLimited(f"terlalu banyak pertanyaan dari {key}", retry_after=(cost - bucket[0]) / self.rate)
+        bucket[0] -= cost
+        self.allowed += 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "per_minute": round(self.rate * 60, 2),
+            "burst": self.burst,
+            "clients": len(self._buckets),
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+
+
+# batas panggilan upstream yang berjalan bersamaan di proses ini, dengan
+# antrean tunggu yang dibatasi panjang dan waktunya. slot diserahkan langsung
+# ke penunggu berikutnya saat dilepas. tidak memakai asyncio.Semaphore supaya
+# tidak terikat ke satu event loop (pre-warm di proses induk serve.py)
+class UpstreamGate:
+    def __init__(self, max_inflight: int = 8, max_queue: int = 32, queue_timeout: float = 10.0):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.inflight = 0
+        self._waiters = deque()
+        self.admitted = 0
+        self.queued_total = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    # membuat gate dari variabel lingkungan, UPSTREAM_MAX_INFLIGHT=0 berarti tanpa batas
+    @classmethod
+    def from_env(cls) -> "UpstreamGate":
+        return cls(
+            max_inflight=int(os.getenv("UPSTREAM_MAX_INFLIGHT", "8")),
+            max_queue=int(os.getenv("UPSTREAM_MAX_QUEUE", "32")),
+            queue_timeout=float(os.getenv("UPSTREAM_QUEUE_TIMEOUT", "10")),
+        )
+
+    async def acquire(self):
+        if not self.max_inflight:
+            self.admitted += 1
+            return
+        if self.inflight < self.max_inflight and not self._waiters:
+            self.inflight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise UpstreamBusy("antrean upstream penuh", retry_after=max(self.queue_timeout, 1.0))
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued_total += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout or None)
+        except asyncio.TimeoutError:
+            self.rejected_timeout += 1
+            raise UpstreamBusy(f"menunggu slot upstream lebih dari {self.queue_timeout} detik",
+                               retry_after=max(self.queue_timeout, 1.0))
+        except asyncio.CancelledError:
+            # slot yang sudah diserahkan tapi tidak jadi dipakai dikembalikan
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+        self.admitted += 1
+
+    def release(self):
+        if not self.max_inflight:
+            return
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # slot berpindah ke penunggu, inflight tidak berubah
+                waiter.set_result(None)
+                return
+        self.inflight -= 1
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
+        return False
+
+    async def run(self, func):
+        async with self:
+            return await func()
+
+    def stats(self) -> dict:
+        return {
+            "max_inflight": self.max_inflight,
+            "inflight": self.inflight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "queued_total": self.queued_total,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+        }
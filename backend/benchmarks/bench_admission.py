@@ -0,0 +1,137 @@
+# satu klien (bot) membanjiri /ask dengan pertanyaan unik sementara beberapa
+# pengunjung biasa bertanya seperti biasa. upstream tiruan hanya sanggup
+# sejumlah panggilan bersamaan dan membalas 429 di atas itu, seperti batas
+# rate openai. dibandingkan tanpa dan dengan admission control; perilaku
+# limiter dan gate diuji di tests/test_admission.py
+#
+#   python benchmarks/bench_admission.py --bot-requests 300 --users 10 --upstream-limit 8
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+os.environ["PREWARM_ON_STARTUP"] = "0"
+
+import main  # noqa: E402
+from admission import RateLimiter, UpstreamGate  # noqa: E402
+from circuit_breaker import CircuitBreaker  # noqa: E402
+
+UPSTREAM_ANSWER = "Jawaban dari upstream."
+
+
+class LimitedUpstream:
+    def __init__(self, latency_ms: float, limit: int):
+        self.latency_ms = latency_ms
+        self.limit = limit
+        self.inflight = 0
+        self.peak = 0
+        self.calls = 0
+        self.throttled = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.inflight >= self.limit:
+            self.throttled += 1
+            return httpx.Response(429, json={"error": {"message": "rate limit reached"}})
+        self.inflight += 1
+        self.peak = max(self.peak, self.inflight)
+        try:
+            await asyncio.sleep(self.latency_ms / 1000)
+        finally:
+            self.inflight -= 1
+        return httpx.Response(200, json={"choices": [{"message": {"content": UPSTREAM_ANSWER}}]})
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)] if values else 0.0
+
+
+def client_for(ip: str) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=main.app, client=(ip, 40000))
+    return httpx.AsyncClient(transport=transport, base_url="http://backend.test", timeout=None)
+
+
+async def run_bot(requests: int, concurrency: int, tag: str) -> dict:
+    statuses = {}
+    issued = 0
+
+    async def worker(client):
+        nonlocal issued
+        while issued < requests:
+            index = issued
+            issued += 1
+            response = await client.post("/ask", json={"question": f"Apa proyek terbaik kamu? bot {tag} {index}"})
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    async with client_for("203.0.113.66") as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return statuses
+
+
+# setiap pengunjung punya ip sendiri dan bertanya beberapa kali dengan jeda
+async def run_user(index: int, questions: int, tag: str) -> tuple:
+    timings, from_upstream = [], 0
+    async with client_for(f"198.51.100.{index + 1}") as client:
+        for i in range(questions):
+            await asyncio.sleep(0.02)
+            start = time.perf_counter()
+            response = await client.post("/ask", json={"question": f"Apa keahlian utama kamu? user {tag} {index} {i}"})
+            timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code == 200 and response.json()["response"] == UPSTREAM_ANSWER:
+                from_upstream += 1
+    return timings, from_upstream
+
+
+async def scenario(name: str, args, limiter: RateLimiter, gate: UpstreamGate, overflow: str):
+    upstream = LimitedUpstream(args.upstream_ms, args.upstream_limit)
+    main.openai_client._client = httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler), base_url="http://upstream.test")
+    main.openai_breaker = CircuitBreaker(min_calls=10 ** 9)
+    main.rate_limiter = limiter
+    main.upstream_gate = gate
+    main.admission_overflow = overflow
+    main.response_cache.clear()
+
+    start = time.perf_counter()
+    bot, *users = await asyncio.gather(
+        run_bot(args.bot_requests, args.bot_concurrency, name),
+        *(run_user(i, args.user_questions, name) for i in range(args.users)),
+    )
+    elapsed = time.perf_counter() - start
+
+    timings = [ms for user_timings, _ in users for ms in user_timings]
+    served = sum(count for _, count in users)
+    total = args.users * args.user_questions
+    print(f"{name}")
+    print(f"  bot            : status {dict(sorted(bot.items()))}")
+    print(f"  pengunjung     : {served}/{total} dijawab upstream, p50 {percentile(timings, 0.5):7.1f} ms  p95 {percentile(timings, 0.95):7.1f} ms")
+    print(f"  upstream       : {upstream.calls} panggilan, {upstream.throttled} kena 429, puncak bersamaan {upstream.peak}")
+    print(f"  durasi         : {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bot-requests", type=int, default=300)
+    parser.add_argument("--bot-concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--user-questions", type=int, default=5)
+    parser.add_argument("--upstream-ms", type=float, default=100.0)
+    parser.add_argument("--upstream-limit", type=int, default=8)
+    args = parser.parse_args()
+
+    # log per request dan error 429 upstream akan mendominasi keluaran
+    logging.disable(logging.ERROR)
+
+    asyncio.run(scenario("tanpa admission control", args, RateLimiter(rate=0), UpstreamGate(max_inflight=0), "mock"))
+    asyncio.run(scenario("dengan admission control (overflow mock)", args,
+                         RateLimiter(rate=0.5, burst=10), UpstreamGate(max_inflight=args.upstream_limit, max_queue=32, queue_timeout=5), "mock"))
+    asyncio.run(scenario("dengan admission control (overflow 429)", args,
+                         RateLimiter(rate=0.5, burst=10), UpstreamGate(max_inflight=args.upstream_limit, max_queue=32, queue_timeout=5), "reject"))
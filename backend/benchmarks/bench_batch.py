@@ -0,0 +1,88 @@
+# bandingkan menjawab pertanyaan golden satu per satu lewat /ask dengan satu
+# panggilan /ask/batch terhadap upstream tiruan, beserta jumlah panggilan
+# upstream. urutan hasil, dedupe, dan cache diuji di tests/test_batch.py
+#
+#   python benchmarks/bench_batch.py --questions 60 --concurrency 8
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+# semua request datang dari satu klien uji
+os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+# yang diukur jalur openai, jadi pertanyaan faktual juga harus ke upstream
+os.environ["FAST_PATH_ENABLED"] = "0"
+
+import main  # noqa: E402
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "classifier_golden.json")
+
+
+async def run(count: int, concurrency: int, upstream_ms: float) -> None:
+    upstream_calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(upstream_ms / 1000)
+        prompt = json.loads(request.content)["messages"][1]["content"]
+        question = prompt.rsplit("Pertanyaan pengguna: ", 1)[1].split("\n", 1)[0]
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"Jawaban untuk: {question}"}}]})
+
+    main.openai_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test")
+    main.batch_concurrency = concurrency
+    main.batch_max_questions = max(main.batch_max_questions, count * 2)
+
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        questions = list(dict.fromkeys(item["question"] for item in json.load(f)))[:count]
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test", timeout=None) as client:
+        # serial lewat /ask
+        main.response_cache.clear()
+        start = time.perf_counter()
+        for question in questions:
+            await client.post("/ask", json={"question": question})
+        serial_ms = (time.perf_counter() - start) * 1000
+
+        # satu batch, setiap pertanyaan dikirim dua kali untuk menguji dedupe
+        main.response_cache.clear()
+        upstream_calls = 0
+        batch = [question for question in questions for _ in range(2)]
+        start = time.perf_counter()
+        body = (await client.post("/ask/batch", json={"questions": batch})).json()
+        batch_ms = (time.perf_counter() - start) * 1000
+        batch_calls = upstream_calls
+
+        # batch kedua seluruhnya dari cache
+        start = time.perf_counter()
+        cached = (await client.post("/ask/batch", json={"questions": questions})).json()
+        cached_ms = (time.perf_counter() - start) * 1000
+
+    results = body["results"]
+    sources = {item["source"] for item in cached["results"]}
+    errors = sum(1 for item in results if item["error"])
+
+    print(f"{len(questions)} pertanyaan, upstream {upstream_ms} ms, concurrency batch {concurrency}")
+    print(f"  serial /ask      : {serial_ms:8.1f} ms")
+    print(f"  /ask/batch       : {batch_ms:8.1f} ms  ({len(batch)} item, {batch_calls} panggilan upstream, {errors} error)")
+    print(f"  /ask/batch cache : {cached_ms:8.1f} ms  (source {sorted(sources)})")
+    print(f"  speedup          : {serial_ms / batch_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--upstream-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.questions, args.concurrency, args.upstream_ms))
@@ -0,0 +1,109 @@
+# simulasi gangguan openai terhadap /ask: latensi per request saat upstream
+# error dengan dan tanpa circuit breaker, pemulihan lewat half-open, dan
+# mode hedge yang mengirim jawaban mock saat deadline terlewat. transisi state
+# breaker dan hedge diuji di tests/test_circuit_breaker.py
+#
+#   python benchmarks/bench_circuit_breaker.py --requests 50 --upstream-ms 300
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+# semua request datang dari satu klien uji
+os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+
+import main  # noqa: E402
+from circuit_breaker import CircuitBreaker, Hedge  # noqa: E402
+
+
+class FakeUpstream:
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+        self.healthy = True
+        self.calls = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(self.latency_ms / 1000)
+        if not self.healthy:
+            return httpx.Response(503, json={"error": "service unavailable"})
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Jawaban dari upstream."}}]})
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+# kirim pertanyaan berbeda satu per satu supaya tidak kena cache
+async def ask_sequential(client: httpx.AsyncClient, count: int, tag: str) -> list:
+    timings = []
+    for i in range(count):
+        start = time.perf_counter()
+        response = await client.post("/ask", json={"question": f"Apa keahlian utama kamu? {tag} {i}"})
+        response.raise_for_status()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def run(requests: int, upstream_ms: float, open_seconds: float):
+    upstream = FakeUpstream(upstream_ms)
+    main.openai_client._client = httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler), base_url="http://upstream.test")
+    transport = httpx.ASGITransport(app=main.app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+        # gangguan tanpa breaker: setiap request menunggu upstream dulu
+        upstream.healthy = False
+        main.openai_breaker = CircuitBreaker(min_calls=10 ** 9)
+        upstream.calls = 0
+        without = await ask_sequential(client, requests, "tanpa")
+        calls_without = upstream.calls
+
+        # gangguan dengan breaker
+        main.openai_breaker = CircuitBreaker(window=10, min_calls=5, open_seconds=open_seconds)
+        upstream.calls = 0
+        with_breaker = await ask_sequential(client, requests, "dengan")
+        calls_with = upstream.calls
+
+        print(f"upstream error, {requests} request, latensi upstream {upstream_ms} ms")
+        print(f"  tanpa breaker : p50 {percentile(without, 0.5):7.1f} ms  p95 {percentile(without, 0.95):7.1f} ms  panggilan upstream {calls_without}")
+        print(f"  dengan breaker: p50 {percentile(with_breaker, 0.5):7.1f} ms  p95 {percentile(with_breaker, 0.95):7.1f} ms  panggilan upstream {calls_with}")
+        print(f"  breaker: {main.openai_breaker.stats()}")
+
+        # upstream pulih, setelah open_seconds satu percobaan menutup breaker lagi
+        upstream.healthy = True
+        await asyncio.sleep(open_seconds)
+        await ask_sequential(client, 1, "pulih")
+        print(f"  setelah pulih: {main.openai_breaker.stats()['state']}")
+
+        # hedge: upstream lebih lambat dari deadline, jawaban mock dikirim duluan
+        # dan jawaban upstream yang terlambat masuk ke cache
+        upstream.latency_ms = upstream_ms * 4
+        main.openai_hedge = Hedge(deadline=upstream_ms / 1000)
+        question = {"question": "Ceritakan proyek yang paling menantang"}
+        start = time.perf_counter()
+        first = (await client.post("/ask", json=question)).json()["response"]
+        hedged_ms = (time.perf_counter() - start) * 1000
+        await asyncio.sleep(upstream.latency_ms / 1000)
+        second = (await client.post("/ask", json=question)).json()["response"]
+        print(f"hedge deadline {upstream_ms} ms, upstream {upstream.latency_ms} ms")
+        print(f"  request pertama {hedged_ms:.1f} ms (mock: {first != 'Jawaban dari upstream.'})")
+        print(f"  request kedua dari cache: {second == 'Jawaban dari upstream.'}")
+        print(f"  hedge: {main.openai_hedge.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--upstream-ms", type=float, default=300.0)
+    parser.add_argument("--open-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.requests, args.upstream_ms, args.open_seconds))
@@ -0,0 +1,116 @@
+# microbenchmark classifier kata kunci terkompilasi vs rantai elif lama.
+# paritas terhadap golden set dan input acak dicek di tests/test_classifier.py
+#
+#   python benchmarks/bench_classifier.py
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classifier import categorize_question  # noqa: E402
+
+
+# implementasi lama (rantai elif) sebagai pembanding
+def legacy_categorize_question(question: str) -> str:
+    question_lower = question.lower()
+    
+    # kategori pertanyaan personal yang perlu dialihkan
+    if any(word in question_lower for word in ["pacar", "jodoh", "pacaran", "pasangan", "gebetan", "nikah", "menikah", "single", "lajang", "status hubungan"]):
+        return "personal_relationship"
+    elif any(word in question_lower for word in ["gaji", "salary", "penghasilan", "bayaran", "uang", "kekayaan", "sebulan"]):
+        return "personal_financial"
+    elif any(word in question_lower for word in ["alamat rumah", "tinggal dimana", "alamat lengkap", "nomor", "kontak", "pribadi"]):
+        return "personal_contact"
+    elif any(word in question_lower for word in ["umur", "usia", "tanggal lahir", "kapan lahir", "kelahiran"]):
+        return "personal_age"
+    elif any(word in question_lower for word in ["agama", "kepercayaan", "tuhan", "beribadah"]):
+        return "personal_religion"
+        
+    # kategori umum
+    elif any(word in question_lower for word in ["keahlian", "skill", "kemampuan", "ahli", "bisa apa", "bisa apa saja", "jago"]):
+        return "keahlian"
+    elif any(word in question_lower for word in ["proyek", "project", "karya", "portfolio", "aplikasi", "buat apa", "telah dibuat", "terbaik", "unggulan"]):
+        return "proyek"
+    elif any(word in question_lower for word in ["tantangan", "challenge", "kesulitan", "masalah", "problem", "hambatan"]):
+        return "tantangan_proyek"
+    elif any(word in question_lower for word in ["hobi", "suka", "waktu luang", "kegiatan", "aktivitas", "senang"]):
+        return "hobi"
+    elif any(word in question_lower for word in ["pendidikan", "sekolah", "kuliah", "belajar", "kampus", "universitas", "itb", "masuk itb", "masuk kuliah", "jurusan"]):
+        return "pendidikan"
+    elif any(word in question_lower for word in ["pelajaran favorit", "mata kuliah favorit", "mata pelajaran"]):
+        return "mata_kuliah"
+    elif any(word in question_lower for word in ["lokasi", "tinggal", "domisili", "alamat", "kota", "daerah"]):
+        return "lokasi"
+    elif any(word in question_lower for word in ["prestasi", "pencapaian", "award", "penghargaan", "juara"]):
+        return "prestasi"
+    elif any(word in question_lower for word in ["lomba", "kompetisi", "contest", "hackathon", "datathon"]):
+        return "lomba"
+    elif any(word in question_lower for word in ["data", "data science", "analisis data", "big data", "statistik", "machine learning", "ml"]):
+        return "data_science"
+    elif any(word in question_lower for word in ["ai", "artificial intelligence", "kecerdasan buatan"]):
+        return "data_science"  # redirect AI questions to data science
+    elif any(word in question_lower for word in ["tool", "alat", "software", "library", "framework", "favorit", "suka pakai"]):
+        return "tools"
+    elif any(word in question_lower for word in ["karakter", "kepribadian", "sifat", "tipe", "mbti", "orangnya", "pemalu", "extrovert", "introvert"]):
+        return "karakter"
+    elif any(word in question_lower for word in ["portofolio ini", "website ini", "web ini", "dibuat pakai", "teknologi"]):
+        return "portofolio_tech"
+    elif any(word in question_lower for word in ["rencana", "masa depan", "target", "tujuan", "cita", "5 tahun"]):
+        return "rencana"
+    elif any(word in question_lower for word in ["pekerjaan", "kerja", "profesi", "karir", "jabatan"]):
+        return "pekerjaan"
+    elif any(word in question_lower for word in ["pengalaman", "experience", "lama kerja"]):
+        return "pengalaman"
+    elif any(word in question_lower for word in ["waktu", "manage", "manajemen", "atur waktu", "produktif"]):
+        return "manajemen_waktu"
+    elif any(word in question_lower for word in ["stres", "stress", "tekanan", "pressure", "beban", "handle"]):
+        return "manajemen_stres"
+    elif any(word in question_lower for word in ["cerita", "momen", "pengalaman kuliah", "culture shock", "berkesan"]):
+        return "cerita_kuliah"
+    elif any(word in question_lower for word in ["organisasi", "berorganisasi", "komunitas", "kepanitiaan"]):
+        return "organisasi"
+    elif any(word in question_lower for word in ["belajar mandiri", "autodidak", "self-taught", "tutorial"]):
+        return "belajar_mandiri"
+    elif any(word in question_lower for word in ["kegagalan", "gagal", "failure", "kesalahan", "mistake"]):
+        return "belajar_kegagalan"
+    elif any(word in question_lower for word in ["tim", "team", "kerja tim", "kolaborasi", "konflik"]):
+        return "kerja_tim"
+    elif any(word in question_lower for word in ["ngoding", "coding", "kode", "malam", "produktif"]):
+        return "kebiasaan_ngoding"
+    elif any(word in question_lower for word in ["lagu", "musik", "dengerin", "dengarkan", "playlist"]):
+        return "lagu_favorit"
+    elif any(word in question_lower for word in ["moto", "motto", "quotes", "quote", "kutipan", "kata-kata"]):
+        return "moto_hidup"
+    else:
+        return "general"
+
+
+# ukur rata-rata waktu per panggilan dalam mikrodetik
+def timeit(func, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    rng = random.Random(1)
+    filler = " ".join(rng.choice(["lorem", "ipsum", "xyz", "qwerty", "halo"]) for _ in range(2000))
+    cases = [
+        ("pendek, kena kategori awal", "Kamu sudah punya pacar?", 20000),
+        ("pendek, kena kategori akhir", "Apa moto hidupmu?", 20000),
+        ("pendek, tanpa kata kunci", "halo, siapa namamu?", 20000),
+        ("suggested question", "Ceritakan tentang pengalamanmu dengan data science", 20000),
+        ("panjang tanpa kata kunci (~12k char)", filler, 200),
+        ("panjang, kata kunci di akhir", filler + " moto", 200),
+        ("adversarial: 'a' x 10k", "a" * 10000, 200),
+        ("adversarial: prefiks kata kunci berulang", "kepercay " * 1500, 200),
+    ]
+
+    print(f"{'kasus':45} {'lama (us)':>12} {'baru (us)':>12} {'speedup':>8}")
+    for name, text, repeat in cases:
+        old = timeit(legacy_categorize_question, text, repeat)
+        new = timeit(categorize_question, text, repeat)
+        print(f"{name:45} {old:12.2f} {new:12.2f} {old / new:7.1f}x")
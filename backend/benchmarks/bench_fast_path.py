@@ -0,0 +1,122 @@
+# jalur cepat untuk pertanyaan faktual: latensi /ask untuk pertanyaan yang
+# dijawab langsung dari profil dibandingkan pertanyaan yang tetap ke openai
+# (upstream tiruan dengan latensi tetap) dan porsi jalur cepat pada campuran
+# trafik. pertanyaan mana yang dijawab dan mana yang dieskalasi diuji di
+# tests/test_fast_path.py
+#
+#   python benchmarks/bench_fast_path.py --requests 5000 --upstream-ms 800
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+os.environ["PREWARM_ON_STARTUP"] = "0"
+os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+os.environ["FAST_PATH_ENABLED"] = "1"
+
+import main  # noqa: E402
+from fast_path import FastPathCounts  # noqa: E402
+
+# pertanyaan faktual yang harus dijawab jalur cepat
+FACTUAL = [
+    "Kamu tinggal di mana?",
+    "Domisili kamu di kota apa?",
+    "Kamu kuliah di mana?",
+    "Jurusan kamu apa?",
+    "Lomba apa saja yang pernah kamu ikuti?",
+    "Pernah ikut hackathon apa?",
+    "Lagu apa yang sering kamu dengerin?",
+    "Apa moto hidup kamu?",
+    "Website ini dibuat dengan teknologi apa?",
+]
+
+# kategori faktual tapi meminta cerita atau pendapat, harus ke openai
+ESCALATED = [
+    "Bagaimana kehidupan di kota tempat kamu tinggal?",
+    "Kenapa kamu memilih kuliah di jurusan itu?",
+    "Ceritakan pengalaman lomba yang paling berkesan",
+    "Apa makna moto hidup kamu?",
+    "Kenapa pilih teknologi itu untuk portofolio ini?",
+]
+
+# kata kunci kategori faktual ada, tapi yang ditanyakan bukan fakta profil
+# (waktu, keinginan, topik lain), harus ke openai
+NOT_FACTUAL = [
+    "Sejak kapan kamu belajar coding?",
+    "kota mana yang pengen kamu kunjungi?",
+    "teknologi apa yang pengen kamu pelajari?",
+    "Kamu belajar data science dari mana?",
+    "Kota mana yang paling kamu suka?",
+    "Kapan kamu lulus kuliah?",
+    "Lomba apa yang mau kamu ikuti tahun depan?",
+    "Lagu apa yang cocok buat ngoding?",
+]
+
+# kategori lain, selalu ke openai
+OTHER = [
+    "Apa keahlian utama kamu?",
+    "Ceritakan tentang proyek terbaik kamu",
+    "Apa hobi yang kamu sukai?",
+    "Apa rencana karir kamu ke depan?",
+]
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)] if values else 0.0
+
+
+async def run(requests: int, upstream_ms: float):
+    upstream_calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(upstream_ms / 1000)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Jawaban dari upstream."}}]})
+
+    main.openai_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test")
+
+    # latensi per pertanyaan faktual, dipanggil langsung seperti handler fastapi
+    latencies = []
+    for i in range(requests):
+        question = FACTUAL[i % len(FACTUAL)]
+        start = time.perf_counter()
+        await main.ask_ai(main.QuestionRequest(question=question))
+        latencies.append(time.perf_counter() - start)
+    p50, p99 = percentile(latencies, 0.5) * 1000, percentile(latencies, 0.99) * 1000
+    print(f"faktual  : {requests} request, p50 {p50:.3f} ms, p99 {p99:.3f} ms, {upstream_calls} panggilan openai")
+
+    # pertanyaan yang dieskalasi dan kategori lain tetap ke openai
+    start = time.perf_counter()
+    slow = ESCALATED + NOT_FACTUAL + OTHER
+    await asyncio.gather(*(main.ask_ai(main.QuestionRequest(question=question)) for question in slow))
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"eskalasi : {len(slow)} request paralel, {elapsed:.0f} ms, {upstream_calls} panggilan openai")
+
+    # campuran trafik dihitung dari nol
+    mix = FACTUAL + ESCALATED + NOT_FACTUAL + OTHER
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+        main.fast_path.counts = FastPathCounts()
+        await asyncio.gather(*(client.post("/ask", json={"question": question}) for question in mix))
+        health = (await client.get("/")).json()["fast_path"]
+    print(f"campuran : {health}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--upstream-ms", type=float, default=800)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    asyncio.run(run(args.requests, args.upstream_ms))
@@ -0,0 +1,151 @@
+# overhead logging per request pada rps tinggi: /ask dari cache lewat seluruh
+# stack asgi (middleware id request ikut aktif) dengan logging mati, handler
+# sinkron lama (format teks langsung ke file di event loop), dan pipeline
+# antrean dengan format json, dengan dan tanpa sampling. --disk-ms
+# mensimulasikan disk lambat per baris yang ditulis. isi baris json, id
+# request, dan sampling diuji di tests/test_structured_logging.py
+#
+#   python benchmarks/bench_logging.py --requests 5000 --concurrency 50
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+os.environ["PREWARM_ON_STARTUP"] = "0"
+os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+os.environ["FAST_PATH_ENABLED"] = "0"
+
+import main  # noqa: E402
+
+QUESTION = "Apa keahlian utama kamu?"
+
+
+# file log yang bisa dibuat lambat untuk meniru disk atau stdout yang tersendat
+class SlowFile:
+    def __init__(self, path: str, delay: float):
+        self.file = open(path, "w", encoding="utf-8")
+        self.delay = delay
+
+    def write(self, text: str):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.file.write(text)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+async def drive(requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+        async def worker(count: int):
+            for _ in range(count):
+                response = await client.post("/ask", json={"question": QUESTION})
+                assert response.status_code == 200 and response.headers.get("x-request-id")
+
+        await worker(20)
+        start = time.perf_counter()
+        share, extra = divmod(requests, concurrency)
+        await asyncio.gather(*(worker(share + (i < extra)) for i in range(concurrency)))
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+def run_off(requests: int, concurrency: int) -> float:
+    main.log_pipeline.stop()
+    logging.disable(logging.CRITICAL)
+    try:
+        return asyncio.run(drive(requests, concurrency))
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+# konfigurasi sebelumnya: logging.basicConfig, format teks, tulis di thread request
+def run_sync(requests: int, concurrency: int, path: str, delay: float) -> float:
+    main.log_pipeline.stop()
+    output = SlowFile(path, delay)
+    handler = logging.StreamHandler(output)
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    try:
+        return asyncio.run(drive(requests, concurrency))
+    finally:
+        root.removeHandler(handler)
+        output.close()
+
+
+def run_queue(requests: int, concurrency: int, path: str, delay: float, sample_rate: float) -> tuple:
+    pipeline = main.log_pipeline
+    output = SlowFile(path, delay)
+    pipeline.stream, pipeline.sample_rate, pipeline.json_format = output, sample_rate, True
+    pipeline.handler.dropped = pipeline.filter.sampled_out = 0
+    pipeline.start()
+    try:
+        per_request = asyncio.run(drive(requests, concurrency))
+        stats = pipeline.stats()
+        pipeline.flush()
+    finally:
+        pipeline.stop()
+        output.close()
+    return per_request, stats
+
+
+def count_summaries(path: str) -> int:
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for line in f if json.loads(line).get("path") == "/ask")
+
+
+def median(values: list) -> float:
+    return sorted(values)[len(values) // 2]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--disk-ms", type=float, default=0.0)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    delay = args.disk_ms / 1000
+    # log klien httpx di sisi benchmark, bukan bagian dari backend
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    category = main.categorize_question(QUESTION)
+    main.response_cache.set(main.make_cache_key(QUESTION, category, main.profile_hash), "Jawaban dari cache.")
+    main.log_pipeline.handler.max_size = args.requests * 4
+    workdir = tempfile.mkdtemp(prefix="bench-logging-")
+    sync_path, queue_path, sampled_path = (os.path.join(workdir, name) for name in ("sync.log", "queue.jsonl", "sampled.jsonl"))
+
+    # konfigurasi dijalankan bergantian beberapa putaran, dilaporkan median
+    results = {"off": [], "sync": [], "queue": [], "sampled": []}
+    for _ in range(args.rounds):
+        results["off"].append(run_off(args.requests, args.concurrency))
+        results["sync"].append(run_sync(args.requests, args.concurrency, sync_path, delay))
+        per_request, queue_stats = run_queue(args.requests, args.concurrency, queue_path, delay, 1.0)
+        results["queue"].append(per_request)
+        per_request, sampled_stats = run_queue(args.requests, args.concurrency, sampled_path, delay, args.sample_rate)
+        results["sampled"].append(per_request)
+    off, sync, queued, sampled = (median(results[name]) for name in ("off", "sync", "queue", "sampled"))
+
+    print(f"{args.requests} request /ask dari cache, {args.concurrency} paralel, disk {args.disk_ms} ms/baris, median {args.rounds} putaran")
+    print(f"logging mati           : {off:7.1f} us/request")
+    print(f"sinkron teks           : {sync:7.1f} us/request (+{sync - off:.1f} us)")
+    print(f"antrean json           : {queued:7.1f} us/request (+{queued - off:.1f} us), {queue_stats}")
+    print(f"antrean json sampel {args.sample_rate:<3}: {sampled:7.1f} us/request (+{sampled - off:.1f} us), {sampled_stats}")
+
+    print(f"baris ringkasan json: {count_summaries(queue_path)} (sampel: {count_summaries(sampled_path)})")
@@ -0,0 +1,56 @@
+# overhead instrumentasi: biaya satu timer tahap saat aktif dan mati, dan
+# throughput handler /ask untuk jawaban dari cache (jalur paling sensitif)
+# dengan metrics aktif vs mati
+#
+#   python benchmarks/bench_metrics.py --iterations 20000
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+
+import main  # noqa: E402
+from metrics import Metrics  # noqa: E402
+
+
+def timer_cost(metrics: Metrics, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with metrics.stage("categorize"):
+            pass
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+async def cached_ask_rate(metrics: Metrics, iterations: int) -> float:
+    main.metrics = metrics
+    request = main.QuestionRequest(question="Apa keahlian utama kamu?")
+    category = main.categorize_question(request.question)
+    main.response_cache.set(main.make_cache_key(request.question, category, main.profile_hash), "Jawaban dari cache.")
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await main.ask_ai(request)
+    return iterations / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    # log per request akan mendominasi pengukuran
+    main.logger.disabled = True
+
+    enabled, disabled = Metrics(enabled=True), Metrics(enabled=False)
+    print(f"timer tahap aktif: {timer_cost(enabled, args.iterations * 10):6.0f} ns")
+    print(f"timer tahap mati : {timer_cost(disabled, args.iterations * 10):6.0f} ns")
+
+    rate_disabled = asyncio.run(cached_ask_rate(disabled, args.iterations))
+    rate_enabled = asyncio.run(cached_ask_rate(enabled, args.iterations))
+    print(f"/ask dari cache, metrics mati : {rate_disabled:9.0f} request/detik")
+    print(f"/ask dari cache, metrics aktif: {rate_enabled:9.0f} request/detik ({(1 - rate_enabled / rate_disabled) * 100:.1f}% lebih lambat)")
+    print(f"render /metrics: {len(enabled.render())} byte")
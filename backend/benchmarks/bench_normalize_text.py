@@ -0,0 +1,85 @@
+# benchmark normalize_text versi terkompilasi vs rantai replace/re.sub lama.
+# uji paritas pada input acak ada di tests/test_normalize_text.py
+#
+#   python benchmarks/bench_normalize_text.py
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_normalizer import normalize_text  # noqa: E402
+
+
+# implementasi lama sebagai pembanding
+def _legacy_normalize_spacing(text: str) -> str:
+    # gunakan regex untuk hapus spasi berlebih
+    cleaned = re.sub(r'\s+', ' ', text)
+    cleaned = re.sub(r'\s+\.', '.', cleaned)
+    cleaned = re.sub(r'\s+,', ',', cleaned)
+    cleaned = re.sub(r',\s+', ', ', cleaned)
+    cleaned = re.sub(r'\.\s+', '. ', cleaned)
+    cleaned = re.sub(r'\s+!', '!', cleaned)
+    cleaned = re.sub(r'!\s+', '! ', cleaned)
+    cleaned = re.sub(r'\s+\?', '?', cleaned)
+    cleaned = re.sub(r'\?\s+', '? ', cleaned)
+    return cleaned
+
+
+# fungsi untuk normalisasi teks respons
+def legacy_normalize_text(text: str) -> str:
+    # hapus spasi berlebih dan standardisasi tanda baca
+    cleaned = (text
+        .replace(r'\s+', ' ')        # ganti multiple spaces dengan single space
+        .replace(r'\s+\.', '.')      # hapus spasi sebelum tanda titik
+        .replace(r'\s+,', ',')       # hapus spasi sebelum koma
+        .replace(r',\s+', ', ')      # standarisasi spasi setelah koma
+        .replace(r'\.\s+', '. ')     # standarisasi spasi setelah titik
+        .replace(r'\s+!', '!')       # hapus spasi sebelum tanda seru
+        .replace(r'!\s+', '! ')      # standarisasi spasi setelah tanda seru
+        .replace(r'\s+\?', '?')      # hapus spasi sebelum tanda tanya
+        .replace(r'\?\s+', '? ')     # standarisasi spasi setelah tanda tanya
+        .replace(r'\s+:', ':')       # hapus spasi sebelum titik dua
+        .replace(r':\s+', ': ')      # standarisasi spasi setelah titik dua
+        .replace(r'\s+;', ';')       # hapus spasi sebelum titik koma
+        .replace(r';\s+', '; ')      # standarisasi spasi setelah titik koma
+    )
+
+    return _legacy_normalize_spacing(cleaned).strip()
+
+
+# teks mirip keluaran llm: kalimat, daftar, baris kosong, spasi ganda
+def make_llm_output(size: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    words = ["aku", "suka", "data", "science", "pandas", "proyek", "algoritma", "Rush", "Hour", "kamu"]
+    parts = []
+    while sum(len(p) for p in parts) < size:
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(4, 14)))
+        parts.append(sentence + rng.choice([". ", ", ", "! ", "? ", " .  ", "\n\n- ", "  "]))
+    return "".join(parts)[:size]
+
+
+def timeit(func, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    clean = "Aku paling jago di bidang Python, Data Science, dan Next.js. Terutama untuk data science, aku senang menggunakan pandas."
+    cases = [
+        ("respons mock (sudah rapi)", clean, 20000),
+        ("respons llm ~1 KB", make_llm_output(1_000), 5000),
+        ("respons llm ~32 KB", make_llm_output(32_000), 200),
+        ("respons llm ~1 MB", make_llm_output(1_000_000), 5),
+        ("whitespace 100k", " \t" * 50_000 + "x", 20),
+    ]
+
+    print(f"{'kasus':30} {'lama (us)':>12} {'baru (us)':>12} {'speedup':>8}")
+    for name, text, repeat in cases:
+        old = timeit(legacy_normalize_text, text, repeat)
+        new = timeit(normalize_text, text, repeat)
+        print(f"{name:30} {old:12.1f} {new:12.1f} {old / new:7.1f}x")
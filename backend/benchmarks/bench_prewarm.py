@@ -0,0 +1,105 @@
+# latensi pengunjung pertama untuk pertanyaan preset, tanpa dan dengan
+# pre-warm saat startup, terhadap upstream tiruan. log request dibuat dari
+# pertanyaan golden supaya top-n dari log ikut diuji
+#
+#   python benchmarks/bench_prewarm.py --upstream-ms 300 --top-n 10
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+# semua request datang dari satu klien uji
+os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+
+import main  # noqa: E402
+from prewarm import Prewarmer, load_suggested_questions  # noqa: E402
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "classifier_golden.json")
+
+
+# log palsu dengan distribusi zipf supaya ada pertanyaan yang jelas paling sering
+def write_request_log(path: str, questions: list, lines: int):
+    rng = random.Random(0)
+    weights = [1 / (rank + 1) for rank in range(len(questions))]
+    with open(path, "w", encoding="utf-8") as f:
+        for question in rng.choices(questions, weights=weights, k=lines):
+            f.write(f"INFO:main:pertanyaan diterima: {question}\n")
+
+
+async def first_visitors(client: httpx.AsyncClient, questions: list) -> list:
+    timings = []
+    for question in questions:
+        start = time.perf_counter()
+        await client.post("/ask", json={"question": question})
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def run(upstream_ms: float, top_n: int, concurrency: int) -> bool:
+    upstream_calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(upstream_ms / 1000)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Jawaban dari upstream."}}]})
+
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        golden = list(dict.fromkeys(item["question"] for item in json.load(f)))
+
+    log_file = tempfile.NamedTemporaryFile(suffix=".log", delete=False)
+    log_file.close()
+    write_request_log(log_file.name, golden[:100], 5000)
+
+    prewarmer = Prewarmer(log_path=log_file.name, top_n=top_n, concurrency=concurrency, enabled=True)
+    suggested = load_suggested_questions(prewarmer.suggested_path)
+    visitors = prewarmer.questions()
+    transport = httpx.ASGITransport(app=main.app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+        # tanpa pre-warm
+        main.openai_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test")
+        main.response_cache.clear()
+        cold = await first_visitors(client, visitors)
+
+        # pre-warm lewat lifespan, persis seperti saat startup
+        main.response_cache.clear()
+        main.openai_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test")
+        main.prewarmer = prewarmer
+        start = time.perf_counter()
+        async with main.app.router.lifespan_context(main.app):
+            startup_ms = (time.perf_counter() - start) * 1000
+            main.openai_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test")
+            upstream_calls = 0
+            warm = await first_visitors(client, visitors)
+            calls_after_warm = upstream_calls
+
+    os.unlink(log_file.name)
+    summary = prewarmer.last_run
+    print(f"{len(suggested)} pertanyaan preset + top {top_n} dari log = {len(visitors)} pertanyaan, upstream {upstream_ms} ms")
+    print(f"  pre-warm saat startup: {startup_ms:.1f} ms, {summary}")
+    print(f"  pengunjung pertama tanpa pre-warm: rata-rata {sum(cold) / len(cold):7.1f} ms")
+    print(f"  pengunjung pertama dengan pre-warm: rata-rata {sum(warm) / len(warm):7.1f} ms, panggilan upstream {calls_after_warm}")
+    return len(suggested) > 0 and summary["failed"] == 0 and calls_after_warm == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--upstream-ms", type=float, default=300.0)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    ok = asyncio.run(run(args.upstream_ms, args.top_n, args.concurrency))
+    print("OK" if ok else "GAGAL")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,85 @@
+# hot reload profil: biaya pengecekan file yang tidak berubah (jalur yang
+# berjalan setiap interval), biaya memasang versi baru (render ulang template
+# dan katalog mock), dan biaya menolak profil rusak. penggantian versi dan
+# cache diuji di tests/test_profile_store.py
+#
+#   python benchmarks/bench_profile_reload.py --iterations 20000
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profile_store import DEFAULT_PROFILE_PATH  # noqa: E402
+
+# profil disalin ke direktori sementara supaya file aslinya tidak diubah
+workdir = tempfile.mkdtemp()
+PROFILE_PATH = os.path.join(workdir, "profile.json")
+shutil.copyfile(DEFAULT_PROFILE_PATH, PROFILE_PATH)
+
+os.environ["PROFILE_PATH"] = PROFILE_PATH
+os.environ["PROFILE_RELOAD_INTERVAL"] = "0"
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+
+import main  # noqa: E402
+
+
+def write_profile(profile: dict):
+    # tulis ke file sementara lalu ganti secara atomik, seperti saat deploy konten
+    tmp_path = PROFILE_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, PROFILE_PATH)
+
+
+def run(iterations: int) -> None:
+    store = main.profile_store
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        store.check()
+    unchanged_us = (time.perf_counter() - start) / iterations * 1e6
+
+    old_version = main.profile_hash
+    profile = json.loads(json.dumps(store.profile))
+    profile["nama"] = "Nama Baru Untuk Uji Reload"
+    write_profile(profile)
+    start = time.perf_counter()
+    reloaded = store.check()
+    reload_ms = (time.perf_counter() - start) * 1000
+
+    mock = asyncio.run(main.ask_ai_mock(main.QuestionRequest(question="Apa hobi kamu?"))).response
+
+    # profil yang gagal dirender ditolak, versi yang terpasang tetap dipakai
+    version = main.profile_hash
+    del profile["proyek"]
+    write_profile(profile)
+    start = time.perf_counter()
+    store.check()
+    rejected_ms = (time.perf_counter() - start) * 1000
+
+    print(f"cek file tanpa perubahan : {unchanged_us:8.2f} us")
+    print(f"pasang versi baru        : {reload_ms:8.2f} ms ({len(main.prompt_templates.categories)} template + katalog mock, dimuat {reloaded})")
+    print(f"tolak profil tidak valid : {rejected_ms:8.2f} ms")
+    print(f"versi {old_version[:12]} -> {version[:12]}, contoh mock: {mock[:60]}...")
+    print(f"store: {store.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    # log per request dan peringatan profil rusak yang disengaja
+    logging.disable(logging.ERROR)
+
+    try:
+        run(args.iterations)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
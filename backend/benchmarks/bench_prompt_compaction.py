@@ -0,0 +1,89 @@
+# laporan token yang dihemat per kategori oleh kompaksi prompt, dan efeknya ke
+# latensi end-to-end /ask dengan upstream tiruan yang latensinya sebanding
+# dengan jumlah token input
+#
+#   python benchmarks/bench_prompt_compaction.py
+#   python benchmarks/bench_prompt_compaction.py --ms-per-token 0.2 --requests 100
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# matikan cache supaya setiap request benar-benar ke upstream
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ["RESPONSE_CACHE_MAX_ENTRIES"] = "0"
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+# semua request datang dari satu klien uji
+os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+
+import main  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from prompt_templates import PromptTemplates  # noqa: E402
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "classifier_golden.json")
+
+
+# upstream tiruan: latensi = dasar + (token input x ms per token)
+def make_transport(tokenizer, base_ms: float, ms_per_token: float):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        prompt_tokens = sum(tokenizer.count(message["content"]) for message in payload["messages"])
+        await asyncio.sleep((base_ms + prompt_tokens * ms_per_token) / 1000)
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": "Jawaban tiruan."}}],
+            "usage": {"prompt_tokens": prompt_tokens},
+        })
+    return httpx.MockTransport(handler)
+
+
+def run_requests(client: TestClient, questions: list) -> list:
+    timings = []
+    for question in questions:
+        start = time.perf_counter()
+        client.post("/ask", json={"question": question})
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-ms", type=float, default=20.0)
+    parser.add_argument("--ms-per-token", type=float, default=0.1)
+    parser.add_argument("--requests", type=int, default=60)
+    args = parser.parse_args()
+
+    compactor = main.prompt_compactor or main.PromptCompactor.from_env()
+    tokenizer = compactor.tokenizer
+    compacted = PromptTemplates(main.user_profile, compactor=compactor)
+    original = PromptTemplates(main.user_profile)
+
+    print(f"tokenizer: {tokenizer.name}, budget {compactor.budget} token")
+    print(f"{'kategori':24} {'asli':>6} {'kompak':>7} {'hemat':>6}")
+    report = compacted.token_report(tokenizer)
+    for category, row in report.items():
+        print(f"{category:24} {row['original']:6} {row['compacted']:7} {row['saved']:6}")
+    total_original = sum(row["original"] for row in report.values())
+    total_saved = sum(row["saved"] for row in report.values())
+    print(f"{'total':24} {total_original:6} {total_original - total_saved:7} {total_saved:6} ({total_saved / total_original:.1%})")
+
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        questions = [item["question"] for item in json.load(f)][:args.requests]
+
+    print(f"\nlatensi /ask, upstream tiruan {args.base_ms} ms + {args.ms_per_token} ms/token:")
+    with TestClient(main.app) as client:
+        main.openai_client._client = httpx.AsyncClient(
+            transport=make_transport(tokenizer, args.base_ms, args.ms_per_token),
+            base_url="http://upstream.test",
+        )
+        for name, templates in (("tanpa kompaksi", original), ("dengan kompaksi", compacted)):
+            main.prompt_templates = main.default_tenant.templates = templates
+            timings = run_requests(client, questions)
+            p50 = timings[len(timings) // 2]
+            p95 = timings[int(len(timings) * 0.95)]
+            print(f"  {name:16} p50 {p50:7.2f} ms, p95 {p95:7.2f} ms")
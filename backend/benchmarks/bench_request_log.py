@@ -0,0 +1,156 @@
+# log pertanyaan/jawaban: biaya record() di jalur request, throughput tulis
+# batch lewat mmap, ukuran per record, lalu cli summary (proses terpisah)
+# membaca jutaan record secara streaming; hasilnya dicetak berdampingan
+# dengan hitungan eksak dan memori puncak cli dilaporkan. terakhir overhead
+# log di /ask. isi record, summary, dan jalur per endpoint diuji di
+# tests/test_request_log.py
+#
+#   python benchmarks/bench_request_log.py --records 1000000
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tracemalloc
+import tempfile
+import subprocess
+
+import httpx
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+WORKDIR = tempfile.mkdtemp(prefix="bench-request-log-")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+os.environ["PREWARM_ON_STARTUP"] = "0"
+os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+os.environ["FAST_PATH_ENABLED"] = "1"
+os.environ["REQUEST_LOG_DIR"] = os.path.join(WORKDIR, "app")
+
+import main  # noqa: E402
+from fake_openai import FakeOpenAIConfig, create_app  # noqa: E402
+from request_log import PATHS, RequestLog, question_hash, summarize  # noqa: E402
+
+CATEGORIES = ("keahlian", "proyek", "hobi", "pendidikan", "lokasi", "prestasi", "rencana", "general")
+# latensi khas per jalur (median ms, sebaran lognormal)
+PATH_LATENCY = {"openai": (900.0, 0.5), "cache": (0.4, 0.3), "mock": (0.3, 0.3), "fast_path": (0.1, 0.3)}
+
+
+# trafik sintetis: pertanyaan berdistribusi zipf dari beberapa ribu pertanyaan berbeda
+def synthetic(records: int, distinct: int, seed: int = 7):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    questions = [f"Pertanyaan nomor {rank} tentang {CATEGORIES[rank % len(CATEGORIES)]}?" for rank in range(distinct)]
+    picks = rng.choices(range(distinct), weights=weights, k=records)
+    for rank in picks:
+        path = PATHS[rank % len(PATHS)] if rank % 3 else "cache"
+        median, sigma = PATH_LATENCY[path]
+        yield questions[rank], CATEGORIES[rank % len(CATEGORIES)], path, median * math.exp(rng.gauss(0, sigma)) / 1000
+
+
+def exact_percentile(values: list, q: float) -> float:
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def write_phase(records: int, distinct: int) -> tuple:
+    # flush dipanggil manual per 1024 record supaya biaya record() dan flush terpisah
+    log = RequestLog(os.path.join(WORKDIR, "synthetic"), batch_size=records + 1, chunk_size=16 * 1024 * 1024)
+    exact_questions, exact_categories, latencies = {}, {}, []
+    prompt = "Prompt contoh dengan profil dan pertanyaan. " * 20
+    answer = "Jawaban contoh yang cukup panjang untuk dihitung tokennya. " * 5
+
+    record_time = 0.0
+    flush_time = 0.0
+    start = time.perf_counter()
+    for question, category, path, seconds in synthetic(records, distinct):
+        before = time.perf_counter()
+        if path == "openai":
+            log.record(question, category, path, seconds, prompt, answer)
+        else:
+            log.record(question, category, path, seconds)
+        record_time += time.perf_counter() - before
+        if len(log._pending) >= 1024:
+            before = time.perf_counter()
+            log.flush()
+            flush_time += time.perf_counter() - before
+        hashed = question_hash(question)
+        exact_questions[hashed] = exact_questions.get(hashed, 0) + 1
+        exact_categories[category] = exact_categories.get(category, 0) + 1
+        latencies.append(seconds * 1000)
+    before = time.perf_counter()
+    log.close()
+    flush_time += time.perf_counter() - before
+    elapsed = time.perf_counter() - start
+
+    size = os.path.getsize(log.path)
+    print(f"tulis    : {records} record, {size / records:.1f} byte/record, file {size / 1e6:.1f} MB")
+    print(f"           append {record_time / records * 1e9:.0f} ns/record, flush batch {flush_time / records * 1e6:.2f} us/record"
+          f" ({records / flush_time:.0f} record/detik), total {elapsed:.1f} s")
+    return log.path, exact_questions, exact_categories, sorted(latencies)
+
+
+# cli dijalankan seperti di produksi, lalu agregasi yang sama diulang di proses
+# ini dengan tracemalloc untuk memori puncak (rss proses anak ikut mewarisi
+# memori benchmark saat fork, jadi tidak bisa dipakai)
+def summary_phase(path: str, records: int) -> tuple:
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, os.path.join(BACKEND, "request_log.py"), "summary", os.path.dirname(path), "--json", "--top", "10",
+         "--capacity", "2000"],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    summarize([path], capacity=2000).report(10)
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    file_mb = os.path.getsize(path) / 1e6
+    print(f"summary  : {elapsed:.1f} s ({records / elapsed:.0f} record/detik), heap puncak {peak_mb:.1f} MB untuk file {file_mb:.0f} MB")
+    return json.loads(output), peak_mb
+
+
+def print_summary(report: dict, exact_questions: dict, exact_categories: dict, latencies: list):
+    exact_top = sorted(exact_questions.values(), reverse=True)[:10]
+    counts = [item["count"] for item in report["top_questions"]]
+    print(f"top-10   : {counts} (eksak {exact_top})")
+    for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        print(f"{name}      : {report['latency_ms'][name]:.3f} ms (eksak {exact_percentile(latencies, q):.3f} ms)")
+    print(f"kategori : {report['categories']}")
+
+
+# overhead per request di /ask dari cache dengan log aktif dan mati
+async def overhead_phase(iterations: int):
+    upstream = create_app(FakeOpenAIConfig(latency_ms=5, jitter_ms=0, chunk_ms=0))
+    main.openai_client._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=upstream), base_url="http://upstream.test/v1")
+    request = main.QuestionRequest(question="Apa keahlian utama kamu?")
+    log = main.request_log
+    rates = {}
+    for name, value in (("mati", None), ("aktif", log)):
+        main.request_log = value
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await main.ask_ai(request)
+        rates[name] = (time.perf_counter() - start) / iterations * 1e6
+    log.close()
+    main.request_log = log
+    print(f"/ask dari cache: log mati {rates['mati']:.1f} us, log aktif {rates['aktif']:.1f} us per request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=1000000)
+    parser.add_argument("--distinct", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    path, exact_questions, exact_categories, latencies = write_phase(args.records, args.distinct)
+    report, _ = summary_phase(path, args.records)
+    print_summary(report, exact_questions, exact_categories, latencies)
+    asyncio.run(overhead_phase(args.iterations))
@@ -0,0 +1,99 @@
+# fakta tambahan dari indeks bm25 di atas blok per kategori: ukuran prompt
+# (token), latensi menyusun prompt per request, waktu membangun indeks, dan
+# apakah fakta yang ditanyakan benar-benar ada di prompt. isi prompt dan
+# budget token diuji di tests/test_retrieval.py
+#
+#   python benchmarks/bench_retrieval.py --rounds 20
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classifier import categorize_question  # noqa: E402
+from profile_store import ProfileStore  # noqa: E402
+from prompt_compaction import PromptCompactor  # noqa: E402
+from prompt_templates import PromptTemplates  # noqa: E402
+from retrieval import ProfileRetriever  # noqa: E402
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "classifier_golden.json")
+
+# pertanyaan dan potongan fakta profil yang seharusnya ada di prompt
+FACT_CHECKS = [
+    ("Buku apa yang kamu suka baca?", "Ted Chiang"),
+    ("Bagaimana cara kamu mengatasi stres?", "drama Korea"),
+    ("Sudah berapa provinsi yang kamu kunjungi?", "8 provinsi"),
+    ("Editor apa yang kamu pakai buat ngoding?", "VS Code"),
+    ("Mata kuliah favorit kamu apa?", "Matematika"),
+    ("Kamu ikut kepanitiaan apa di kampus?", "Arkavidia"),
+    ("Dulu SMA di mana?", "SMA Negeri 5 Bekasi"),
+    ("Apa tantangan di proyek Rush Hour?", "Rush Hour"),
+    ("Kapan pertama kali belajar coding?", "SMA"),
+    ("Kamu kontributor open source?", "open source"),
+    ("Quote favorit kamu apa?", "Simplicity"),
+    ("Pernah juara lomba apa?", "juara 2"),
+    ("Deploy backend portofolio ini di mana?", "Railway"),
+    ("Bagaimana kamu bekerja dalam tim?", "menginisiasi"),
+]
+
+
+def timeit(func, items: list, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for item in items:
+            func(item)
+    return (time.perf_counter() - start) / (rounds * len(items)) * 1e6
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    profile = ProfileStore().profile
+    compactor = PromptCompactor.from_env()
+    tokenizer = compactor.tokenizer
+    retriever = ProfileRetriever.from_env(tokenizer=tokenizer)
+
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        questions = list(dict.fromkeys(item["question"] for item in json.load(f)))
+    questions += [question for question, _ in FACT_CHECKS]
+    categorized = [(categorize_question(question), question) for question in questions]
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        index = retriever.build(profile)
+    build_ms = (time.perf_counter() - start) / args.rounds * 1000
+    print(f"indeks: {len(index)} passage dari {len(profile)} field, dibangun dalam {build_ms:.2f} ms "
+          f"(tokenizer {tokenizer.name})")
+
+    builders = (
+        ("blok kategori", PromptTemplates(profile)),
+        ("blok kategori + kompaksi", PromptTemplates(profile, compactor=compactor)),
+        ("bm25 + kompaksi", PromptTemplates(profile, compactor=compactor, retriever=retriever)),
+    )
+    print(f"\n{len(categorized)} pertanyaan")
+    print(f"{'penyusun':26} {'token rata2':>11} {'p95':>6} {'maks':>6} {'us/prompt':>10} {'fakta ada':>10}")
+    for name, templates in builders:
+        tokens = [tokenizer.count(templates.render(category, question)) for category, question in categorized]
+        render_us = timeit(lambda item: templates.render(*item), categorized, args.rounds)
+        found = sum(
+            fact.lower() in templates.render(categorize_question(question), question).lower()
+            for question, fact in FACT_CHECKS
+        )
+        print(f"{name:26} {sum(tokens) / len(tokens):11.1f} {percentile(tokens, 0.95):6} {max(tokens):6} "
+              f"{render_us:10.1f} {found:>5}/{len(FACT_CHECKS)}")
+
+    # contoh blok fakta untuk satu pertanyaan
+    question, _ = FACT_CHECKS[1]
+    print(f"\ncontoh, {question!r} (kategori {categorize_question(question)}):"
+          f"{retriever.context(index, question, categorize_question(question))}")
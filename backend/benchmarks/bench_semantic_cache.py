@@ -0,0 +1,86 @@
+# benchmark cache semantik: hit rate pada korpus uji dan latensi lookup
+# pada indeks berisi 10k sampai 1M entri
+#
+#   python benchmarks/bench_semantic_cache.py
+#   python benchmarks/bench_semantic_cache.py --sizes 10000 100000
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classifier import categorize_question  # noqa: E402
+from semantic_cache import SemanticCache, VectorIndex  # noqa: E402
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "semantic_corpus.json")
+
+
+# hit rate, presisi, dan recall pada pasangan pertanyaan di korpus
+def evaluate_corpus(threshold: float):
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    true_pos = false_pos = false_neg = true_neg = 0
+    for pair in corpus:
+        cache = SemanticCache(threshold=threshold)
+        cache.set(pair["cached"], categorize_question(pair["cached"]), "jawaban")
+        hit = cache.get(pair["query"], categorize_question(pair["query"])) is not None
+
+        if hit and pair["same"]:
+            true_pos += 1
+        elif hit:
+            false_pos += 1
+        elif pair["same"]:
+            false_neg += 1
+        else:
+            true_neg += 1
+
+    positives = true_pos + false_neg
+    print(f"korpus: {len(corpus)} pasangan, threshold {threshold}")
+    print(f"  hit rate (paraphrase): {true_pos}/{positives} = {true_pos / positives:.1%}")
+    print(f"  false hit (beda maksud): {false_pos}/{false_pos + true_neg}")
+    print(f"  presisi: {true_pos / max(true_pos + false_pos, 1):.1%}")
+
+
+# latensi lookup (vectorize + search) pada indeks berukuran tertentu
+def benchmark_lookup(size: int, dim: int, queries: int = 200):
+    cache = SemanticCache(dim=dim, max_entries=size)
+    rng = np.random.default_rng(0)
+
+    # isi indeks dengan vektor acak ternormalisasi, jauh lebih cepat
+    # daripada memvectorize jutaan pertanyaan sintetis satu per satu
+    index = VectorIndex(dim, size, initial_capacity=size)
+    batch = rng.standard_normal((size, dim)).astype(np.float32)
+    batch /= np.linalg.norm(batch, axis=1, keepdims=True)
+    index._vectors[:] = batch
+    index._values = [(frozenset(), "jawaban")] * size
+    cache._indexes["keahlian"] = index
+
+    timings = []
+    for i in range(queries):
+        start = time.perf_counter()
+        cache.get(f"apa keahlian kamu nomor {i}?", "keahlian")
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    p50 = timings[len(timings) // 2] * 1000
+    p99 = timings[int(len(timings) * 0.99)] * 1000
+    memory_mb = index._vectors.nbytes / (1024 * 1024)
+    print(f"  {size:>9,} entri: p50 {p50:.3f} ms, p99 {p99:.3f} ms, matriks {memory_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    evaluate_corpus(args.threshold)
+    print(f"latensi lookup (dim {args.dim}):")
+    for size in args.sizes:
+        benchmark_lookup(size, args.dim)
@@ -0,0 +1,113 @@
+# sesi percakapan: memori per sesi saat ribuan sesi aktif bersamaan, memori
+# setelah batas SESSION_MAX tercapai, ukuran riwayat di prompt, dan waktu
+# menyusun riwayat per pertanyaan. batas sesi, ttl, budget token, dan konteks
+# pertanyaan lanjutan lewat /ask diuji di tests/test_sessions.py
+#
+#   python benchmarks/bench_sessions.py --sessions 20000 --max-sessions 5000
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tracemalloc
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+os.environ["PREWARM_ON_STARTUP"] = "0"
+os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+
+import main  # noqa: E402
+from sessions import SessionStore  # noqa: E402
+
+QUESTIONS = [
+    "Apa proyek terbaik kamu?",
+    "Teknologi apa yang kamu kuasai?",
+    "Ceritakan pengalaman kerja kamu.",
+    "Apa hobi kamu?",
+]
+ANSWER = ("Proyek terbaik saya adalah platform e-commerce dengan React dan Node.js yang melayani ribuan "
+          "pengguna setiap hari. Selain itu saya juga membangun dashboard analitik dan aplikasi mobile.")
+
+
+def fill(store: SessionStore, sessions: int, turns: int, now: float):
+    for i in range(sessions):
+        key = f"default:sesi-{i:06d}"
+        for t in range(turns):
+            store.record(key, f"{QUESTIONS[(i + t) % len(QUESTIONS)]} ({i}/{t})", ANSWER, now=now)
+
+
+def measure_memory(store: SessionStore, sessions: int, turns: int, now: float) -> int:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    fill(store, sessions, turns, now=now)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return after - before
+
+
+def run_store(sessions: int, max_sessions: int, tokenizer):
+    turns = 6
+    now = time.time()
+
+    # memori per sesi saat semua sesi muat, lalu saat jumlah sesi dua kali batas
+    half = SessionStore(max_sessions=max_sessions, tokenizer=tokenizer)
+    half_bytes = measure_memory(half, max_sessions, turns, now)
+    full = SessionStore(max_sessions=max_sessions, tokenizer=tokenizer)
+    full_bytes = measure_memory(full, sessions, turns, now)
+    per_session = half_bytes / max_sessions
+    print(f"{max_sessions} sesi x {turns} giliran (ring {half.turns}): {half_bytes / 1024:8.0f} KiB, "
+          f"{per_session:6.0f} B per sesi")
+    print(f"{sessions} sesi, batas {max_sessions}: {full_bytes / 1024:8.0f} KiB, {full.stats()}")
+
+    # sesi kedaluwarsa dibuang sambil lalu saat store diakses berikutnya
+    expiring = SessionStore(max_sessions=max_sessions, ttl=60, tokenizer=tokenizer)
+    now = time.time()
+    fill(expiring, max_sessions, 2, now=now - 90)
+    start = time.perf_counter()
+    expiring.history("default:baru", "itu apa?", now=now)
+    print(f"ttl 60 detik: {expiring.expired} sesi kedaluwarsa dibuang dalam {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    budget = half.history_tokens
+    keys = [f"default:sesi-{i:06d}" for i in range(max_sessions)]
+    start = time.perf_counter()
+    histories = [half.history(key, "Jelaskan lebih detail yang pertama", now=now) for key in keys]
+    history_us = (time.perf_counter() - start) / max_sessions * 1e6
+    worst = max(half._count(history) for history in histories)
+    print(f"riwayat: maksimum {worst} token (budget {budget}), {history_us:.1f} us per pertanyaan")
+
+
+# latensi /ask dengan dan tanpa riwayat sesi terhadap upstream tiruan
+async def run_api(requests: int):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"choices": [{"message": {"content": ANSWER}}]})
+
+    main.openai_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test")
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+        for label, session_id in (("tanpa sesi", None), ("dengan sesi", "tamu-1")):
+            start = time.perf_counter()
+            for i in range(requests):
+                body = {"question": f"Teknologi apa yang dipakai di proyek itu? ({i})"}
+                if session_id:
+                    body["session_id"] = session_id
+                await client.post("/ask", json=body)
+            print(f"/ask {label:12}: {(time.perf_counter() - start) / requests * 1000:6.2f} ms per request")
+    print(f"sessions: {main.session_store.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=20000)
+    parser.add_argument("--max-sessions", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    tokenizer = main.prompt_compactor.tokenizer if main.prompt_compactor is not None else None
+    run_store(args.sessions, args.max_sessions, tokenizer)
+    asyncio.run(run_api(args.requests))
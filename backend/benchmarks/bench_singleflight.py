@@ -0,0 +1,63 @@
+# kirim N pertanyaan identik secara bersamaan ke /ask dengan upstream tiruan
+# dan ukur latensinya. penggabungan menjadi satu panggilan upstream diuji di
+# tests/test_singleflight.py
+#
+#   python benchmarks/bench_singleflight.py --concurrency 200
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# matikan cache supaya yang diuji hanya penggabungan request
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ["RESPONSE_CACHE_MAX_ENTRIES"] = "0"
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+# semua request datang dari satu klien uji
+os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+
+import main  # noqa: E402
+
+
+async def run(concurrency: int, upstream_ms: float):
+    upstream_calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(upstream_ms / 1000)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Jawaban bersama."}}]})
+
+    main.openai_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test")
+    transport = httpx.ASGITransport(app=main.app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+        async def ask():
+            start = time.perf_counter()
+            response = await client.post("/ask", json={"question": "Apa keahlian utama kamu?"})
+            return response.json()["response"], (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(ask() for _ in range(concurrency)))
+        elapsed = (time.perf_counter() - start) * 1000
+
+    answers = {answer for answer, _ in results}
+    timings = sorted(timing for _, timing in results)
+    print(f"{concurrency} request bersamaan, upstream {upstream_ms} ms")
+    print(f"  panggilan upstream: {upstream_calls}")
+    print(f"  jawaban unik: {len(answers)}")
+    print(f"  total {elapsed:.1f} ms, p50 {timings[len(timings) // 2]:.1f} ms, p99 {timings[int(len(timings) * 0.99)]:.1f} ms")
+    print(f"  singleflight: {main.openai_singleflight.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--upstream-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.concurrency, args.upstream_ms))
@@ -0,0 +1,134 @@
+# ratusan tenant dalam satu proses: waktu muat dan memori per tenant
+# (classifier, bagian statis katalog mock, dan string profil dibagi; template
+# dirender saat dipakai) dibandingkan dengan memuat setiap tenant sendiri-sendiri,
+# lalu throughput /ask-mock lewat /t/<id>/ dan header host. routing dan
+# pemisahan namespace cache diuji di tests/test_tenants.py
+#
+#   python benchmarks/bench_tenants.py --tenants 300 --requests 2000
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import logging
+import argparse
+import tempfile
+import tracemalloc
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classifier import CATEGORY_RULES, KeywordClassifier  # noqa: E402
+from mock_catalog import DEFAULT_CATALOG_PATH, MockCatalog  # noqa: E402
+from profile_store import DEFAULT_PROFILE_PATH  # noqa: E402
+from prompt_templates import PromptTemplates  # noqa: E402
+from tenants import TenantRegistry  # noqa: E402
+
+CITIES = ["Bandung", "Surabaya", "Yogyakarta", "Medan", "Makassar", "Denpasar", "Semarang", "Malang"]
+
+
+# tenant turunan profil utama: nama dan kota berbeda, sebagian punya hobi,
+# aturan kategori, atau katalog mock sendiri
+def write_tenants(directory: str, count: int):
+    with open(DEFAULT_PROFILE_PATH, encoding="utf-8") as f:
+        base = json.load(f)
+    custom_rules = [[category, list(keywords)] for category, keywords in CATEGORY_RULES]
+    custom_rules.insert(5, ["keahlian", ["stack", "tech stack"]])
+
+    for i in range(count):
+        path = os.path.join(directory, f"tenant{i:04d}")
+        os.makedirs(path)
+        profile = dict(base, nama=f"Pemilik Portofolio {i}", lokasi=f"{CITIES[i % len(CITIES)]}, Indonesia")
+        if i % 5 == 0:
+            profile["hobi"] = ["Bersepeda", "Memasak", f"Koleksi {i}"]
+        with open(os.path.join(path, "profile.json"), "w", encoding="utf-8") as f:
+            json.dump(profile, f, ensure_ascii=False)
+        with open(os.path.join(path, "tenant.json"), "w", encoding="utf-8") as f:
+            json.dump({"hosts": [f"tenant{i:04d}.portfolio.test"]}, f)
+        if i % 10 == 0:
+            with open(os.path.join(path, "rules.json"), "w", encoding="utf-8") as f:
+                json.dump(custom_rules, f)
+        if i % 50 == 0:
+            shutil.copyfile(DEFAULT_CATALOG_PATH, os.path.join(path, "mock_catalog.json"))
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current
+
+
+# setiap tenant dimuat tanpa berbagi apa pun, semua template dirender di depan
+def load_naive(directory: str, compactor) -> list:
+    tenants = []
+    for tenant_id in sorted(os.listdir(directory)):
+        path = os.path.join(directory, tenant_id)
+        with open(os.path.join(path, "profile.json"), encoding="utf-8") as f:
+            profile = json.load(f)
+        rules = CATEGORY_RULES
+        if os.path.exists(os.path.join(path, "rules.json")):
+            with open(os.path.join(path, "rules.json"), encoding="utf-8") as f:
+                rules = tuple((category, tuple(keywords)) for category, keywords in json.load(f))
+        classifier = KeywordClassifier(rules)
+        catalog_path = os.path.join(path, "mock_catalog.json")
+        catalog = MockCatalog.from_file(catalog_path if os.path.exists(catalog_path) else DEFAULT_CATALOG_PATH, profile)
+        templates = PromptTemplates(profile, categories=classifier.categories + (classifier.default,), compactor=compactor)
+        tenants.append((profile, classifier, catalog, templates))
+    return tenants
+
+
+async def exercise(main, count: int, requests: int):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+        for label, path_for, headers_for in (
+            ("/ask-mock tanpa tenant", lambda i: "/ask-mock", lambda i: None),
+            ("/t/<id>/ask-mock", lambda i: f"/t/tenant{i % count:04d}/ask-mock", lambda i: None),
+            ("host -> /ask-mock", lambda i: "/ask-mock", lambda i: {"host": f"tenant{i % count:04d}.portfolio.test"}),
+        ):
+            start = time.perf_counter()
+            errors = 0
+            for i in range(requests):
+                response = await client.post(path_for(i), json={"question": "Apa hobi kamu?"}, headers=headers_for(i))
+                errors += response.status_code != 200
+            print(f"  {label:24}: {requests / (time.perf_counter() - start):8.0f} request/detik, {errors} error")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tenants", type=int, default=300)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    directory = tempfile.mkdtemp()
+    try:
+        write_tenants(directory, args.tenants)
+
+        os.environ.setdefault("OPENAI_API_KEY", "bench")
+        os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+        os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+        os.environ["TENANTS_DIR"] = directory
+        import main  # noqa: E402
+
+        def load_shared():
+            registry = TenantRegistry(directory, compactor=main.prompt_compactor, catalog_data=main.mock_catalog.data)
+            registry.load()
+            return registry
+
+        registry, shared_s, shared_bytes = measure(load_shared)
+        _, naive_s, naive_bytes = measure(lambda: load_naive(directory, None))
+
+        print(f"{args.tenants} tenant, {registry.stats()}")
+        print(f"  dibagi  : muat {shared_s * 1000:7.0f} ms, {shared_bytes / args.tenants / 1024:6.1f} KiB per tenant")
+        print(f"  terpisah: muat {naive_s * 1000:7.0f} ms, {naive_bytes / args.tenants / 1024:6.1f} KiB per tenant "
+              f"(tanpa kompaksi, {naive_bytes / shared_bytes:.1f}x lebih besar)")
+
+        asyncio.run(exercise(main, args.tenants, args.requests))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,190 @@
+# capture trafik: overhead middleware di /ask dari cache (capture aktif dan
+# mati, median beberapa putaran), lalu trafik sintetis dengan kedatangan
+# poisson direkam dan diputar ulang 20x lebih cepat terhadap upstream tiruan
+# yang memutar ulang latensi rekaman. putaran ulang ikut direkam, lalu
+# distribusi latensi upstream dan kegagalannya dicetak berdampingan (gate
+# upstream tanpa batas, supaya yang diukur hanya upstream tiruannya).
+# terakhir putar ulang dengan gate sempit. sanitasi, isi rekaman, dan
+# pemisahan antrean gate dari latensi upstream diuji di
+# tests/test_traffic_capture.py
+#
+#   python benchmarks/bench_traffic_capture.py --requests 300 --rps 10 --speedup 20
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+WORKDIR = tempfile.mkdtemp(prefix="bench-traffic-capture-")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+os.environ["PREWARM_ON_STARTUP"] = "0"
+os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+os.environ["TRAFFIC_CAPTURE_DIR"] = os.path.join(WORKDIR, "recorded")
+
+import main  # noqa: E402
+from admission import UpstreamGate  # noqa: E402
+from fake_openai import FakeOpenAIConfig, RecordedLatencies, create_app  # noqa: E402
+from loadtest import percentile  # noqa: E402
+from replay import replay  # noqa: E402
+from traffic_capture import load_capture, sanitize_question  # noqa: E402
+
+PRIVATE = [
+    ("Email aku budi.santoso+kerja@contoh.co.id, bisa kontak?", "budi.santoso"),
+    ("Nomor WA aku +62 812-3456-7890 ya", "3456"),
+    ("Cek portofolio di https://contoh.dev/budi?ref=abc dong", "contoh.dev"),
+    ("NIK 3174012345678901 dipakai buat apa?", "3174"),
+]
+
+
+def sanitize_phase():
+    for question, _ in PRIVATE:
+        print(f"sanitasi : {sanitize_question(question)}")
+
+
+async def drive(client: httpx.AsyncClient, requests: int, concurrency: int):
+    async def worker(count: int):
+        for _ in range(count):
+            response = await client.post("/ask", json={"question": "Apa keahlian utama kamu?"})
+            assert response.status_code == 200
+
+    share, extra = divmod(requests, concurrency)
+    await asyncio.gather(*(worker(share + (i < extra)) for i in range(concurrency)))
+
+
+# overhead per request lewat seluruh stack asgi; capture mati berarti
+# middleware tetap terpasang tapi tidak ada endpoint yang cocok
+async def overhead_phase(requests: int, concurrency: int, rounds: int):
+    capture = main.traffic_capture
+    endpoints = capture.endpoints
+    capture.directory = os.path.join(WORKDIR, "overhead")
+    question = "Apa keahlian utama kamu?"
+    category = main.categorize_question(question)
+    main.response_cache.set(main.make_cache_key(question, category, main.profile_hash), "Jawaban dari cache.")
+
+    results = {"mati": [], "aktif": []}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+        await drive(client, 50, 10)
+        for _ in range(rounds):
+            for name in results:
+                capture.endpoints = endpoints if name == "aktif" else ()
+                start = time.perf_counter()
+                await drive(client, requests, concurrency)
+                results[name].append((time.perf_counter() - start) / requests * 1e6)
+    capture.endpoints = endpoints
+    capture.close()
+    rates = {name: sorted(values)[len(values) // 2] for name, values in results.items()}
+    print(f"/ask dari cache: capture mati {rates['mati']:.1f} us, aktif {rates['aktif']:.1f} us per request"
+          f" (+{rates['aktif'] - rates['mati']:.1f} us), {capture.captured} baris")
+
+
+# trafik sintetis: pertanyaan dari data golden classifier (sebagian dengan
+# data pribadi), sebagian besar dalam sesi, kedatangan poisson
+async def record_phase(requests: int, rps: float, error_rate: float) -> list:
+    capture = main.traffic_capture
+    capture.directory = os.environ["TRAFFIC_CAPTURE_DIR"]
+    capture.path = None
+    main.response_cache.clear()
+    with open(os.path.join(BENCH_DIR, "classifier_golden.json"), encoding="utf-8") as f:
+        questions = list(dict.fromkeys(item["question"] for item in json.load(f)))
+    questions += [question for question, _ in PRIVATE]
+
+    upstream = create_app(FakeOpenAIConfig(latency_ms=60, jitter_ms=50, error_rate=error_rate, chunk_ms=0, seed=3))
+    main.openai_client._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=upstream), base_url="http://upstream.test/v1")
+    rng = random.Random(11)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test", timeout=30) as client:
+        async def send(body: dict, path: str):
+            await client.post(path, json=body)
+
+        tasks = []
+        for i in range(requests):
+            await asyncio.sleep(rng.expovariate(rps))
+            body = {"question": rng.choice(questions)}
+            if rng.random() < 0.7:
+                body["session_id"] = f"sesi-{rng.randrange(requests // 8)}"
+            draw = rng.random()
+            path = "/ask-mock" if draw < 0.2 else "/ask/stream" if draw < 0.35 else "/ask"
+            tasks.append(asyncio.create_task(send(body, path)))
+        await asyncio.gather(*tasks)
+    capture.close()
+    return load_capture([capture.directory])
+
+
+def upstream_summary(entries: list) -> tuple:
+    upstream = sorted(entry["upstream_ms"] for entry in entries if entry["upstream_ms"] is not None)
+    failed = sum(1 for entry in entries if entry["upstream_failed"])
+    return [round(percentile(upstream, q), 1) for q in (0.5, 0.9, 0.99, 1.0)], len(upstream), failed
+
+
+async def replay_phase(entries: list, speedup: float, concurrency: int, name: str) -> tuple:
+    capture = main.traffic_capture
+    capture.directory = os.path.join(WORKDIR, name)
+    capture.path = None
+    main.response_cache.clear()
+    latencies = RecordedLatencies(entries, seed=0)
+    upstream = create_app(FakeOpenAIConfig(chunk_ms=0, latencies=latencies))
+    main.openai_client._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=upstream), base_url="http://upstream.test/v1")
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test", timeout=30) as client:
+        result = await replay(client, entries, speedup, concurrency)
+    capture.close()
+    return result, load_capture([capture.directory]), latencies.stats()
+
+
+def print_capture(entries: list):
+    endpoints = {entry["endpoint"] for entry in entries}
+    print(f"rekaman  : {len(entries)} request, endpoint {sorted(endpoints)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--rps", type=float, default=10.0)
+    parser.add_argument("--speedup", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--overhead-requests", type=int, default=3000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    sanitize_phase()
+    asyncio.run(overhead_phase(args.overhead_requests, 50, args.rounds))
+
+    recorded = asyncio.run(record_phase(args.requests, args.rps, args.error_rate))
+    print_capture(recorded)
+    default_gate = main.upstream_gate
+    main.upstream_gate = UpstreamGate(max_inflight=0)
+    result, replayed, upstream_stats = asyncio.run(replay_phase(recorded, args.speedup, args.concurrency, "replayed"))
+    main.upstream_gate = default_gate
+    span = recorded[-1]["ts"] - recorded[0]["ts"]
+    report = result.report(span, args.speedup)
+
+    recorded_pct, recorded_calls, recorded_failed = upstream_summary(recorded)
+    replayed_pct, replayed_calls, replayed_failed = upstream_summary(replayed)
+    print(f"putar ulang {args.speedup:g}x: {report['requests']} request dalam {report['elapsed_s']} s "
+          f"(rekaman {span:.1f} s), rps target {report['target_rps']}, tercapai {report['achieved_rps']}, "
+          f"keterlambatan jadwal p99 {report['schedule_lag']['p99_ms']} ms")
+    for endpoint, row in report["endpoints"].items():
+        print(f"  {endpoint:9}: status {row['outcomes']}, latensi {row['latency']} (rekaman {row['recorded']})")
+    print(f"upstream rekaman    : {recorded_calls} panggilan, {recorded_failed} gagal, p50/p90/p99 {recorded_pct} ms")
+    print(f"upstream putar ulang: {replayed_calls} panggilan, {replayed_failed} gagal, p50/p90/p99 {replayed_pct} ms, {upstream_stats}")
+
+    main.upstream_gate = UpstreamGate(max_inflight=4, max_queue=8)
+    gated_result, gated, _ = asyncio.run(replay_phase(recorded, args.speedup, args.concurrency, "gated"))
+    gated_pct, gated_calls, gated_failed = upstream_summary(gated)
+    gate_stats = main.upstream_gate.stats()
+    main.upstream_gate = default_gate
+    print(f"gate 4 inflight/8 antrean: {gated_calls} panggilan http, {gated_failed} gagal, max {gated_pct[3]} ms, "
+          f"fallback {gated_result.fallbacks}, antre {gate_stats['queued_total']}, ditolak {gate_stats['rejected_queue_full']}")
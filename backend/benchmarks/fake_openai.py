@@ -0,0 +1,209 @@
+# pengganti lokal untuk endpoint chat completions openai, dengan latensi,
+# jitter, rasio error, dan streaming yang bisa diatur. bisa dipakai di dalam
+# proses lewat httpx.ASGITransport atau dijalankan sebagai server terpisah.
+# dengan --replay-capture latensi dan kegagalan upstream diambil dari capture
+# trafik (traffic_capture.py) untuk diputar ulang dengan benchmarks/replay.py
+#
+#   python benchmarks/fake_openai.py --port 9100 --latency-ms 300 --jitter-ms 100 --error-rate 0.02
+#   python benchmarks/fake_openai.py --port 9100 --replay-capture captures/
+#   OPENAI_BASE_URL=http://127.0.0.1:9100/v1 OPENAI_API_KEY=fake uvicorn main:app
+import os
+import re
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import collections
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_cache import canonicalize_question  # noqa: E402
+from traffic_capture import load_capture, sanitize_question  # noqa: E402
+
+DEFAULT_ANSWER = (
+    "Aku paling suka mengerjakan proyek algoritma seperti Rush Hour Puzzle Solver, karena di situ aku bisa "
+    "mencoba UCS, Greedy Best-First Search, A*, dan Dijkstra sekaligus. Selain itu aku juga senang mengolah "
+    "data dengan pandas dan scikit-learn, lalu memvisualisasikannya supaya polanya gampang dipahami."
+)
+
+# pertanyaan asli di dalam prompt (lihat QUESTION_HEADER di prompt_templates.py)
+_QUESTION = re.compile(r"Pertanyaan pengguna: (.*)")
+
+
+# latensi upstream dari capture trafik. pertanyaan yang pernah direkam
+# mendapat latensi dan kegagalan rekamannya secara bergiliran, pertanyaan
+# lain (misalnya prompt yang isinya tidak terbaca) mendapat sampel acak dari
+# semua rekaman
+class RecordedLatencies:
+    def __init__(self, entries: list, seed: int = None):
+        self.by_question = {}
+        self.samples = []
+        for entry in entries:
+            if entry.get("upstream_ms") is None:
+                continue
+            sample = (entry["upstream_ms"] / 1000, bool(entry.get("upstream_failed")))
+            self.by_question.setdefault(self.key(entry["question"]), collections.deque()).append(sample)
+            self.samples.append(sample)
+        self.rng = random.Random(seed)
+        self.matched = 0
+        self.unmatched = 0
+
+    @classmethod
+    def from_files(cls, paths: list, seed: int = None) -> "RecordedLatencies":
+        return cls(load_capture(paths), seed)
+
+    # capture menyimpan pertanyaan yang sudah disanitasi, jadi pertanyaan dari
+    # prompt disanitasi dulu sebelum dicocokkan
+    @staticmethod
+    def key(question: str) -> str:
+        return canonicalize_question(sanitize_question(question))
+
+    # (detik, gagal) untuk satu panggilan
+    def next(self, prompt: str) -> tuple:
+        match = _QUESTION.search(prompt)
+        queue = self.by_question.get(self.key(match.group(1))) if match else None
+        if queue:
+            self.matched += 1
+            sample = queue[0]
+            queue.rotate(-1)
+            return sample
+        self.unmatched += 1
+        return self.rng.choice(self.samples) if self.samples else (0.0, False)
+
+    def stats(self) -> dict:
+        return {"questions": len(self.by_question), "samples": len(self.samples),
+                "matched": self.matched, "unmatched": self.unmatched}
+
+
+# konfigurasi perilaku upstream tiruan
+class FakeOpenAIConfig:
+    def __init__(self, latency_ms: float = 200.0, jitter_ms: float = 50.0, error_rate: float = 0.0,
+                 error_status: int = 500, chunk_ms: float = 5.0, answer: str = DEFAULT_ANSWER, seed: int = None,
+                 latencies: RecordedLatencies = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.chunk_ms = chunk_ms
+        self.answer = answer
+        self.rng = random.Random(seed)
+        self.latencies = latencies
+
+    # membuat konfigurasi dari variabel lingkungan
+    @classmethod
+    def from_env(cls) -> "FakeOpenAIConfig":
+        seed = os.getenv("FAKE_OPENAI_SEED")
+        return cls(
+            latency_ms=float(os.getenv("FAKE_OPENAI_LATENCY_MS", "200")),
+            jitter_ms=float(os.getenv("FAKE_OPENAI_JITTER_MS", "50")),
+            error_rate=float(os.getenv("FAKE_OPENAI_ERROR_RATE", "0")),
+            error_status=int(os.getenv("FAKE_OPENAI_ERROR_STATUS", "500")),
+            chunk_ms=float(os.getenv("FAKE_OPENAI_CHUNK_MS", "5")),
+            seed=int(seed) if seed else None,
+        )
+
+    # latensi satu request: dasar +- jitter, tidak pernah negatif
+    def delay(self) -> float:
+        jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(self.latency_ms + jitter, 0.0) / 1000
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and self.rng.random() < self.error_rate
+
+    # (detik, gagal) untuk satu panggilan, dari capture jika ada
+    def next_call(self, prompt: str) -> tuple:
+        if self.latencies is not None:
+            return self.latencies.next(prompt)
+        return self.delay(), self.should_fail()
+
+
+def _usage(payload: dict, answer: str) -> dict:
+    prompt_chars = sum(len(message.get("content", "")) for message in payload.get("messages", []))
+    prompt_tokens = max(prompt_chars // 4, 1)
+    completion_tokens = max(len(answer) // 4, 1)
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+
+
+def create_app(config: FakeOpenAIConfig = None) -> FastAPI:
+    config = config or FakeOpenAIConfig()
+    app = FastAPI(title="Fake OpenAI")
+    app.state.config = config
+    app.state.requests = 0
+    app.state.errors = 0
+
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        app.state.requests += 1
+        messages = payload.get("messages") or [{}]
+        delay, failed = config.next_call(messages[-1].get("content", ""))
+        await asyncio.sleep(delay)
+
+        if failed:
+            app.state.errors += 1
+            return JSONResponse({"error": {"message": "fake upstream error"}}, status_code=config.error_status)
+
+        model = payload.get("model", "gpt-3.5-turbo")
+        created = int(time.time())
+        if not payload.get("stream"):
+            return JSONResponse({
+                "id": f"chatcmpl-fake-{app.state.requests}",
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": config.answer}, "finish_reason": "stop"}],
+                "usage": _usage(payload, config.answer),
+            })
+
+        async def events():
+            words = config.answer.split(" ")
+            for i, word in enumerate(words):
+                content = word if i == 0 else " " + word
+                chunk = {"object": "chat.completion.chunk", "created": created, "model": model,
+                         "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                if config.chunk_ms:
+                    await asyncio.sleep(config.chunk_ms / 1000)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    # path dengan dan tanpa /v1 supaya cocok dengan base_url mana pun
+    app.add_api_route("/chat/completions", chat_completions, methods=["POST"])
+    app.add_api_route("/v1/chat/completions", chat_completions, methods=["POST"])
+
+    @app.get("/stats")
+    async def stats():
+        result = {"requests": app.state.requests, "errors": app.state.errors}
+        if config.latencies is not None:
+            result["replay"] = config.latencies.stats()
+        return result
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=None)
+    parser.add_argument("--jitter-ms", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=None)
+    parser.add_argument("--chunk-ms", type=float, default=None)
+    parser.add_argument("--replay-capture", nargs="+", default=None, help="file atau direktori capture trafik")
+    args = parser.parse_args()
+
+    config = FakeOpenAIConfig.from_env()
+    for name in ("latency_ms", "jitter_ms", "error_rate", "chunk_ms"):
+        if getattr(args, name) is not None:
+            setattr(config, name, getattr(args, name))
+    if args.replay_capture:
+        config.latencies = RecordedLatencies.from_files(args.replay_capture)
+
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
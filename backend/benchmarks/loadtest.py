@@ -0,0 +1,231 @@
+# load test /ask, /ask/stream, /ask-mock, dan / terhadap upstream tiruan
+# (benchmarks/fake_openai.py). melaporkan rps, p50/p95/p99, error, dan memori,
+# lalu membandingkan dengan baseline tersimpan; regresi membuat exit code 1
+#
+#   python benchmarks/loadtest.py --save-baseline benchmarks/baseline.json
+#   python benchmarks/loadtest.py --compare benchmarks/baseline.json --tolerance 0.25
+#   python benchmarks/loadtest.py --url http://127.0.0.1:8000 --worker-pids 1234,1235
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import resource
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_PATH = os.path.join(BENCH_DIR, "classifier_golden.json")
+
+# skenario: method, path, jumlah pertanyaan berbeda yang dipakai bergantian
+# (0 berarti tanpa body, None berarti semua), dan apakah cache aktif
+SCENARIOS = {
+    "ask": {"method": "POST", "path": "/ask", "questions": None, "cache": False},
+    "ask_cached": {"method": "POST", "path": "/ask", "questions": 20, "cache": True},
+    "ask_stream": {"method": "POST", "path": "/ask/stream", "questions": None, "cache": False},
+    "ask_mock": {"method": "POST", "path": "/ask-mock", "questions": None, "cache": True},
+    "health": {"method": "GET", "path": "/", "questions": 0, "cache": True},
+}
+
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+# rss proses dalam MiB dari /proc, atau puncak rss jika /proc tidak ada
+def rss_mib(pid: int = None) -> float:
+    path = f"/proc/{pid or 'self'}/status"
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if pid is None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return 0.0
+
+
+async def run_scenario(client: httpx.AsyncClient, name: str, questions: list, requests: int,
+                       concurrency: int, warmup: int) -> dict:
+    scenario = SCENARIOS[name]
+    method, path = scenario["method"], scenario["path"]
+    if scenario["questions"] is not None:
+        questions = questions[:scenario["questions"]]
+    timings = []
+    errors = 0
+    issued = 0
+
+    async def worker():
+        nonlocal issued, errors
+        while issued < requests:
+            index = issued
+            issued += 1
+            body = {"question": questions[index % len(questions)]} if questions else None
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                if path == "/ask/stream":
+                    await response.aread()
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            timings.append((time.perf_counter() - start) * 1000)
+
+    # request pemanasan tidak ikut dihitung
+    for i in range(warmup):
+        body = {"question": questions[i % len(questions)]} if questions else None
+        response = await client.request(method, path, json=body)
+        await response.aread()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    timings.sort()
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "rps": round(len(timings) / elapsed, 1),
+        "p50_ms": round(percentile(timings, 0.50), 2),
+        "p95_ms": round(percentile(timings, 0.95), 2),
+        "p99_ms": round(percentile(timings, 0.99), 2),
+    }
+
+
+# jalankan aplikasi di proses ini dengan upstream tiruan di proses yang sama
+async def run_in_process(args, questions: list) -> dict:
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+    os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+    os.environ["PREWARM_ON_STARTUP"] = "0"
+    # pertanyaan faktual juga harus ke upstream supaya sebanding dengan baseline
+    os.environ["FAST_PATH_ENABLED"] = "0"
+
+    import main
+    from fake_openai import FakeOpenAIConfig, create_app
+    from response_cache import ResponseCache
+
+    fake = create_app(FakeOpenAIConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                       error_rate=args.error_rate, chunk_ms=args.chunk_ms, seed=0))
+    main.openai_client._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake), base_url="http://fake-openai")
+    enabled_cache = main.response_cache
+    disabled_cache = ResponseCache(max_entries=0)
+
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test", timeout=None) as client:
+        for name in args.scenarios:
+            # cache dimatikan supaya skenario ask benar-benar mengukur jalur upstream
+            main.response_cache = enabled_cache if SCENARIOS[name]["cache"] else disabled_cache
+            main.response_cache.clear()
+            result = await run_scenario(client, name, questions, args.requests, args.concurrency, args.warmup)
+            result["rss_mib"] = round(rss_mib(), 1)
+            results[name] = result
+    main.response_cache = enabled_cache
+    return results
+
+
+# jalankan terhadap server yang sedang berjalan (misalnya beberapa worker uvicorn)
+async def run_remote(args, questions: list) -> dict:
+    pids = [int(pid) for pid in args.worker_pids.split(",")] if args.worker_pids else []
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url.rstrip("/"), timeout=None, limits=limits) as client:
+        for name in args.scenarios:
+            result = await run_scenario(client, name, questions, args.requests, args.concurrency, args.warmup)
+            if pids:
+                result["rss_mib"] = round(max(rss_mib(pid) for pid in pids), 1)
+            results[name] = result
+    return results
+
+
+# bandingkan dengan baseline: rps turun atau p95 naik lebih dari toleransi.
+# selisih p95 di bawah min_delta_ms diabaikan karena hanya noise
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list:
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {current['rps']} < baseline {previous['rps']}")
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance) and current["p95_ms"] - previous["p95_ms"] > min_delta_ms:
+            regressions.append(f"{name}: p95 {current['p95_ms']} ms > baseline {previous['p95_ms']} ms")
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: error {current['errors']} > baseline {previous['errors']}")
+    return regressions
+
+
+def print_table(results: dict, baseline: dict = None):
+    print(f"{'skenario':12} {'req':>6} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rss MiB':>8}")
+    for name, row in results.items():
+        print(f"{name:12} {row['requests']:6} {row['errors']:5} {row['rps']:9} {row['p50_ms']:9} "
+              f"{row['p95_ms']:9} {row['p99_ms']:9} {row.get('rss_mib', '-'):>8}")
+        previous = (baseline or {}).get(name)
+        if previous:
+            print(f"{'  baseline':12} {previous['requests']:6} {previous['errors']:5} {previous['rps']:9} "
+                  f"{previous['p50_ms']:9} {previous['p95_ms']:9} {previous['p99_ms']:9} {previous.get('rss_mib', '-'):>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--chunk-ms", type=float, default=0.0)
+    parser.add_argument("--url", default=None, help="uji server yang sudah berjalan, upstream dan cache mengikuti konfigurasi server itu")
+    parser.add_argument("--worker-pids", default=None, help="pid worker untuk laporan memori mode --url")
+    parser.add_argument("--save-baseline", default=None)
+    parser.add_argument("--compare", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    args.scenarios = [name for name in args.scenarios.split(",") if name]
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"skenario tidak dikenal: {', '.join(unknown)}")
+
+    # log per request dari aplikasi akan mendominasi pengukuran
+    logging.disable(logging.INFO)
+
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        questions = list(dict.fromkeys(item["question"] for item in json.load(f)))
+
+    runner = run_remote if args.url else run_in_process
+    results = asyncio.run(runner(args, questions))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    print_table(results, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"config": {k: v for k, v in vars(args).items() if k not in ("save_baseline", "compare")},
+                       "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"baseline disimpan ke {args.save_baseline}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("\nREGRESI PERFORMA:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\ntidak ada regresi (toleransi {args.tolerance:.0%})")
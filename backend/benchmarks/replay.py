@@ -0,0 +1,245 @@
+# putar ulang capture trafik (traffic_capture.py) terhadap backend: setiap
+# request dikirim pada jarak waktu aslinya dibagi --speedup (1x sampai 100x),
+# dibatasi --concurrency, dengan session yang sama seperti saat direkam.
+# upstream diganti benchmarks/fake_openai.py yang memutar ulang latensi dan
+# kegagalan openai yang direkam. laporan per endpoint: distribusi status dan
+# error, latensi putar ulang dibanding rekaman, keterlambatan jadwal, rps, dan
+# jawaban mock karena upstream gagal (dari /metrics, status tetap 200)
+#
+#   python benchmarks/replay.py captures/ --speedup 10 --concurrency 100
+#   python benchmarks/fake_openai.py --port 9100 --replay-capture captures/ &
+#   OPENAI_BASE_URL=http://127.0.0.1:9100/v1 python serve.py --workers 4
+#   python benchmarks/replay.py captures/ --url http://127.0.0.1:8000 --speedup 20
+#   python benchmarks/replay.py captures/ --url http://127.0.0.1:8000 --upstream-port 9100
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import subprocess
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from loadtest import percentile  # noqa: E402
+from traffic_capture import load_capture  # noqa: E402
+
+_FALLBACK = re.compile(r'^ask_fallback_total\{reason="([^"]*)"\} (\S+)$', re.MULTILINE)
+
+
+def latency_summary(values: list) -> dict:
+    values = sorted(values)
+    return {
+        "p50_ms": round(percentile(values, 0.50), 2),
+        "p90_ms": round(percentile(values, 0.90), 2),
+        "p99_ms": round(percentile(values, 0.99), 2),
+        "max_ms": round(values[-1], 2) if values else 0.0,
+    }
+
+
+# hasil satu putaran: per request (endpoint, status atau nama error, latensi
+# putar ulang, latensi rekaman) dan keterlambatan jadwal
+class ReplayResult:
+    def __init__(self):
+        self.rows = []
+        self.lags = []
+        self.elapsed = 0.0
+        self.fallbacks = {}
+
+    def report(self, span: float, speedup: float) -> dict:
+        endpoints = {}
+        for endpoint, outcome, seconds, recorded_ms in self.rows:
+            row = endpoints.setdefault(endpoint, {"outcomes": {}, "latency": [], "recorded": []})
+            row["outcomes"][outcome] = row["outcomes"].get(outcome, 0) + 1
+            row["latency"].append(seconds * 1000)
+            row["recorded"].append(recorded_ms)
+
+        result = {}
+        for endpoint, row in sorted(endpoints.items()):
+            outcomes = dict(sorted(row["outcomes"].items(), key=lambda item: -item[1]))
+            result[endpoint] = {
+                "requests": len(row["latency"]),
+                "errors": sum(count for outcome, count in outcomes.items() if outcome != "200"),
+                "outcomes": outcomes,
+                "latency": latency_summary(row["latency"]),
+                "recorded": latency_summary(row["recorded"]),
+            }
+        requests = len(self.rows)
+        return {
+            "requests": requests,
+            "target_rps": round(requests / (span / speedup), 1) if span else None,
+            "achieved_rps": round(requests / self.elapsed, 1) if self.elapsed else None,
+            "elapsed_s": round(self.elapsed, 2),
+            "schedule_lag": latency_summary([lag * 1000 for lag in self.lags]),
+            "fallbacks": self.fallbacks,
+            "endpoints": result,
+        }
+
+
+# jumlah fallback per penyebab; dengan beberapa worker hanya worker yang
+# melayani /metrics ini yang terhitung
+async def fallbacks(client: httpx.AsyncClient) -> dict:
+    try:
+        response = await client.get("/metrics")
+    except httpx.HTTPError:
+        return {}
+    return {reason: float(value) for reason, value in _FALLBACK.findall(response.text)}
+
+
+# kirim setiap request pada jadwalnya. concurrency penuh menahan jadwal
+# (seperti klien sungguhan yang kehabisan koneksi), keterlambatannya dicatat
+async def replay(client: httpx.AsyncClient, entries: list, speedup: float, concurrency: int) -> ReplayResult:
+    result = ReplayResult()
+    before = await fallbacks(client)
+    slots = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    first = entries[0]["ts"]
+    start = loop.time()
+
+    async def send(entry: dict):
+        body = {"question": entry["question"]}
+        if entry.get("session"):
+            body["session_id"] = entry["session"]
+        began = time.perf_counter()
+        try:
+            response = await client.post(entry["endpoint"], json=body)
+            outcome = str(response.status_code)
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        finally:
+            slots.release()
+        result.rows.append((entry["endpoint"], outcome, time.perf_counter() - began, entry["latency_ms"]))
+
+    tasks = []
+    for entry in entries:
+        target = start + (entry["ts"] - first) / speedup
+        delay = target - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await slots.acquire()
+        result.lags.append(max(loop.time() - target, 0.0))
+        tasks.append(asyncio.create_task(send(entry)))
+    await asyncio.gather(*tasks)
+    result.elapsed = loop.time() - start
+    after = await fallbacks(client)
+    result.fallbacks = {reason: int(count - before.get(reason, 0)) for reason, count in after.items()
+                        if count > before.get(reason, 0)}
+    return result
+
+
+# backend dan upstream tiruan di proses ini lewat ASGITransport
+async def run_in_process(args, entries: list) -> tuple:
+    os.environ.setdefault("OPENAI_API_KEY", "replay")
+    os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+    os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+    os.environ["PREWARM_ON_STARTUP"] = "0"
+    # putar ulang tidak ikut direkam
+    os.environ.pop("TRAFFIC_CAPTURE_DIR", None)
+
+    import main
+    from fake_openai import FakeOpenAIConfig, RecordedLatencies, create_app
+
+    fake = create_app(FakeOpenAIConfig(chunk_ms=0, latencies=RecordedLatencies(entries, seed=0)))
+    main.openai_client._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake), base_url="http://fake-openai")
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test", timeout=args.timeout) as client:
+        result = await replay(client, entries, args.speedup, args.concurrency)
+    return result, fake.state.config.latencies.stats()
+
+
+# server yang sudah berjalan; upstreamnya diatur lewat OPENAI_BASE_URL server
+# itu, misalnya ke fake_openai.py yang dijalankan dengan --upstream-port
+async def run_remote(args, entries: list) -> tuple:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url.rstrip("/"), timeout=args.timeout, limits=limits) as client:
+        result = await replay(client, entries, args.speedup, args.concurrency)
+    upstream = None
+    if args.upstream_port:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.upstream_port}") as client:
+            upstream = (await client.get("/stats")).json().get("replay")
+    return result, upstream
+
+
+# upstream tiruan yang memutar ulang capture, di proses terpisah
+def start_upstream(args) -> subprocess.Popen:
+    process = subprocess.Popen([sys.executable, os.path.join(BENCH_DIR, "fake_openai.py"), "--port", str(args.upstream_port),
+                                "--chunk-ms", "0", "--replay-capture", *args.capture])
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{args.upstream_port}/stats", timeout=0.5)
+            return process
+        except httpx.HTTPError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"upstream tiruan tidak bisa dijalankan di port {args.upstream_port}")
+
+
+def print_report(report: dict, upstream: dict):
+    print(f"{report['requests']} request dalam {report['elapsed_s']} s, rps target {report['target_rps']}, "
+          f"tercapai {report['achieved_rps']}")
+    lag = report["schedule_lag"]
+    print(f"keterlambatan jadwal: p50 {lag['p50_ms']} ms, p99 {lag['p99_ms']} ms, max {lag['max_ms']} ms")
+    print(f"{'endpoint':16} {'req':>6} {'err':>5} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for endpoint, row in report["endpoints"].items():
+        for label, latency in ((endpoint, row["latency"]), ("  rekaman", row["recorded"])):
+            requests, errors = (row["requests"], row["errors"]) if label == endpoint else ("", "")
+            print(f"{label:16} {requests:>6} {errors:>5} {latency['p50_ms']:9} {latency['p90_ms']:9} "
+                  f"{latency['p99_ms']:9} {latency['max_ms']:9}")
+        print(f"{'  status':16} {row['outcomes']}")
+    print(f"fallback ke mock: {report['fallbacks']}")
+    if upstream:
+        print(f"upstream: {upstream}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("capture", nargs="+", help="file atau direktori capture trafik")
+    parser.add_argument("--speedup", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=None, help="hanya request pertama sebanyak ini")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--url", default=None, help="putar ulang ke server yang sudah berjalan")
+    parser.add_argument("--upstream-port", type=int, default=None,
+                        help="jalankan upstream tiruan dari capture di port ini (server di --url harus memakainya)")
+    parser.add_argument("--json-out", default=None)
+    args = parser.parse_args()
+
+    if not 1 <= args.speedup <= 100:
+        parser.error("--speedup harus antara 1 dan 100")
+    if args.upstream_port and not args.url:
+        parser.error("--upstream-port hanya untuk mode --url")
+
+    entries = load_capture(args.capture)[:args.limit]
+    if not entries:
+        print("tidak ada request di capture", file=sys.stderr)
+        sys.exit(1)
+    span = entries[-1]["ts"] - entries[0]["ts"]
+
+    # log per request dari aplikasi akan mendominasi pengukuran
+    logging.disable(logging.INFO)
+
+    upstream_process = start_upstream(args) if args.upstream_port else None
+    try:
+        runner = run_remote if args.url else run_in_process
+        result, upstream = asyncio.run(runner(args, entries))
+    finally:
+        if upstream_process is not None:
+            upstream_process.terminate()
+            upstream_process.wait()
+
+    report = result.report(span, args.speedup)
+    report["upstream"] = upstream
+    print_report(report, upstream)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "report": report}, f, indent=2)
+            f.write("\n")
+        print(f"laporan disimpan ke {args.json_out}")
@@ -0,0 +1,216 @@
+import os
+import time
+import asyncio
+import inspect
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+# dilempar saat breaker terbuka, pemanggil langsung pakai fallback
+class CircuitOpenError(Exception):
+    pass
+
+
+# dilempar saat upstream belum menjawab sampai deadline hedge
+class DeadlineExceeded(Exception):
+    pass
+
+
+# circuit breaker untuk panggilan upstream. hasil beberapa panggilan terakhir
+# disimpan di jendela geser; breaker terbuka jika rasio gagal atau rasio
+# panggilan lambat melewati ambang. setelah open_seconds breaker setengah
+# terbuka dan hanya meloloskan beberapa panggilan percobaan
+class CircuitBreaker:
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate: float = 0.5,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+    ):
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        # setiap entri (gagal, lambat)
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self.opened = 0
+        self.rejected = 0
+
+    # membuat breaker dari variabel lingkungan
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        return cls(
+            window=int(os.getenv("CIRCUIT_WINDOW", "20")),
+            min_calls=int(os.getenv("CIRCUIT_MIN_CALLS", "5")),
+            failure_rate=float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5")),
+            slow_call_seconds=float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "10")),
+            slow_call_rate=float(os.getenv("CIRCUIT_SLOW_CALL_RATE", "0.5")),
+            open_seconds=float(os.getenv("CIRCUIT_OPEN_SECONDS", "30")),
+            half_open_probes=int(os.getenv("CIRCUIT_HALF_OPEN_PROBES", "1")),
+        )
+
+    # apakah satu panggilan boleh diteruskan ke upstream
+    def allow(self) -> bool:
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+            self._probes = 0
+            self._probe_successes = 0
+            logger.info("circuit breaker setengah terbuka, mencoba upstream")
+
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_probes:
+                self.rejected += 1
+                return False
+            self._probes += 1
+        return True
+
+    # catat hasil satu panggilan yang sudah diizinkan allow()
+    def record(self, failed: bool, duration: float):
+        slow = duration >= self.slow_call_seconds
+
+        if self.state == HALF_OPEN:
+            if failed or slow:
+                self._trip("percobaan gagal" if failed else "percobaan lambat")
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                self.state = CLOSED
+                self._outcomes.clear()
+                logger.info("circuit breaker tertutup kembali")
+            return
+        if self.state == OPEN:
+            # panggilan yang mulai sebelum breaker terbuka, abaikan
+            return
+
+        self._outcomes.append((failed, slow))
+        calls = len(self._outcomes)
+        if calls < self.min_calls:
+            return
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow_calls = sum(1 for _, slow in self._outcomes if slow)
+        if failures / calls >= self.failure_rate:
+            self._trip(f"{failures}/{calls} panggilan gagal")
+        elif slow_calls / calls >= self.slow_call_rate:
+            self._trip(f"{slow_calls}/{calls} panggilan lebih lambat dari {self.slow_call_seconds} detik")
+
+    # panggilan yang dibatalkan tidak dihitung, tapi slot percobaan dikembalikan
+    def release(self):
+        if self.state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def _trip(self, reason: str):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.opened += 1
+        logger.warning("circuit breaker terbuka: %s", reason)
+
+    # jalankan func() lewat breaker dan catat hasil serta durasinya
+    async def call(self, func):
+        if not self.allow():
+            raise CircuitOpenError("circuit breaker terbuka, upstream dilewati")
+
+        start = time.monotonic()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            self.release()
+            raise
+        except Exception:
+            self.record(True, time.monotonic() - start)
+            raise
+        self.record(False, time.monotonic() - start)
+        return result
+
+    # ringkasan state untuk health check
+    def stats(self) -> dict:
+        calls = len(self._outcomes)
+        retry_in = 0.0
+        if self.state == OPEN:
+            retry_in = max(self.open_seconds - (time.monotonic() - self._opened_at), 0.0)
+        return {
+            "state": self.state,
+            "calls": calls,
+            "failure_rate": round(sum(1 for failed, _ in self._outcomes if failed) / calls, 4) if calls else 0.0,
+            "slow_call_rate": round(sum(1 for _, slow in self._outcomes if slow) / calls, 4) if calls else 0.0,
+            "retry_in": round(retry_in, 2),
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+# hedge: tunggu upstream paling lama deadline detik. jika terlewat, pemanggil
+# langsung memakai fallback sementara panggilan upstream tetap berjalan dan
+# hasilnya diteruskan ke on_late (misalnya untuk disimpan ke cache). on_late
+# boleh mengembalikan coroutine, yang dijalankan sebagai task tersendiri
+class Hedge:
+    def __init__(self, deadline: float = 0.0):
+        self.deadline = deadline
+        self.missed = 0
+        self.late_results = 0
+        self._late_tasks = set()
+
+    # membuat hedge dari variabel lingkungan, 0 berarti tanpa deadline
+    @classmethod
+    def from_env(cls) -> "Hedge":
+        return cls(deadline=float(os.getenv("OPENAI_HEDGE_DEADLINE", "0")))
+
+    async def run(self, func, on_late=None):
+        if not self.deadline:
+            return await func()
+
+        task = asyncio.ensure_future(func())
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), self.deadline)
+        except asyncio.TimeoutError:
+            self.missed += 1
+            task.add_done_callback(lambda done: self._finish_late(done, on_late))
+            raise DeadlineExceeded(f"openai tidak menjawab dalam {self.deadline} detik")
+        except asyncio.CancelledError:
+            task.add_done_callback(lambda done: self._finish_late(done, None))
+            raise
+
+    def _finish_late(self, task: asyncio.Future, on_late):
+        if task.cancelled() or task.exception() is not None or on_late is None:
+            return
+        self.late_results += 1
+        try:
+            result = on_late(task.result())
+        except Exception as e:
+            logger.error("gagal memproses jawaban openai yang terlambat: %s", e)
+            return
+        if inspect.isawaitable(result):
+            late = asyncio.ensure_future(result)
+            self._late_tasks.add(late)
+            late.add_done_callback(self._finish_on_late)
+
+    def _finish_on_late(self, late: asyncio.Future):
+        self._late_tasks.discard(late)
+        if not late.cancelled() and late.exception() is not None:
+            logger.error("gagal memproses jawaban openai yang terlambat: %s", late.exception())
+
+    def stats(self) -> dict:
+        return {
+            "deadline": self.deadline,
+            "missed": self.missed,
+            "late_results": self.late_results,
+        }
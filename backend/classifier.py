@@ -0,0 +1,152 @@
+import re
+from typing import NamedTuple
+
+# aturan kategori berurutan sesuai prioritas, kategori yang lebih atas menang
+# jika pertanyaan mengandung kata kunci dari beberapa kategori sekaligus
+CATEGORY_RULES = (
+    # kategori pertanyaan personal yang perlu dialihkan
+    ("personal_relationship", ("pacar", "jodoh", "pacaran", "pasangan", "gebetan", "nikah", "menikah", "single", "lajang", "status hubungan")),
+    ("personal_financial", ("gaji", "salary", "penghasilan", "bayaran", "uang", "kekayaan", "sebulan")),
+    ("personal_contact", ("alamat rumah", "tinggal dimana", "alamat lengkap", "nomor", "kontak", "pribadi")),
+    ("personal_age", ("umur", "usia", "tanggal lahir", "kapan lahir", "kelahiran")),
+    ("personal_religion", ("agama", "kepercayaan", "tuhan", "beribadah")),
+
+    # kategori umum
+    ("keahlian", ("keahlian", "skill", "kemampuan", "ahli", "bisa apa", "bisa apa saja", "jago")),
+    ("proyek", ("proyek", "project", "karya", "portfolio", "aplikasi", "buat apa", "telah dibuat", "terbaik", "unggulan")),
+    ("tantangan_proyek", ("tantangan", "challenge", "kesulitan", "masalah", "problem", "hambatan")),
+    ("hobi", ("hobi", "suka", "waktu luang", "kegiatan", "aktivitas", "senang")),
+    ("pendidikan", ("pendidikan", "sekolah", "kuliah", "belajar", "kampus", "universitas", "itb", "masuk itb", "masuk kuliah", "jurusan")),
+    ("mata_kuliah", ("pelajaran favorit", "mata kuliah favorit", "mata pelajaran")),
+    ("lokasi", ("lokasi", "tinggal", "domisili", "alamat", "kota", "daerah")),
+    ("prestasi", ("prestasi", "pencapaian", "award", "penghargaan", "juara")),
+    ("lomba", ("lomba", "kompetisi", "contest", "hackathon", "datathon")),
+    ("data_science", ("data", "data science", "analisis data", "big data", "statistik", "machine learning", "ml")),
+    ("data_science", ("ai", "artificial intelligence", "kecerdasan buatan")),  # redirect AI questions to data science
+    ("tools", ("tool", "alat", "software", "library", "framework", "favorit", "suka pakai")),
+    ("karakter", ("karakter", "kepribadian", "sifat", "tipe", "mbti", "orangnya", "pemalu", "extrovert", "introvert")),
+    ("portofolio_tech", ("portofolio ini", "website ini", "web ini", "dibuat pakai", "teknologi")),
+    ("rencana", ("rencana", "masa depan", "target", "tujuan", "cita", "5 tahun")),
+    ("pekerjaan", ("pekerjaan", "kerja", "profesi", "karir", "jabatan")),
+    ("pengalaman", ("pengalaman", "experience", "lama kerja")),
+    ("manajemen_waktu", ("waktu", "manage", "manajemen", "atur waktu", "produktif")),
+    ("manajemen_stres", ("stres", "stress", "tekanan", "pressure", "beban", "handle")),
+    ("cerita_kuliah", ("cerita", "momen", "pengalaman kuliah", "culture shock", "berkesan")),
+    ("organisasi", ("organisasi", "berorganisasi", "komunitas", "kepanitiaan")),
+    ("belajar_mandiri", ("belajar mandiri", "autodidak", "self-taught", "tutorial")),
+    ("belajar_kegagalan", ("kegagalan", "gagal", "failure", "kesalahan", "mistake")),
+    ("kerja_tim", ("tim", "team", "kerja tim", "kolaborasi", "konflik")),
+    ("kebiasaan_ngoding", ("ngoding", "coding", "kode", "malam", "produktif")),
+    ("lagu_favorit", ("lagu", "musik", "dengerin", "dengarkan", "playlist")),
+    ("moto_hidup", ("moto", "motto", "quotes", "quote", "kutipan", "kata-kata")),
+)
+
+DEFAULT_CATEGORY = "general"
+
+
+# hasil klasifikasi beserta kata kunci yang cocok untuk debugging
+class Classification(NamedTuple):
+    category: str
+    keywords: tuple
+
+
+# klasifikasi kata kunci dalam satu kali scan teks.
+# semua kata kunci disusun menjadi trie lalu dikompilasi menjadi satu regex,
+# setiap ujung kata kunci diberi grup kosong "()" sehingga m.lastindex
+# menunjukkan kata kunci terpanjang yang cocok di posisi itu. kata kunci lain
+# yang cocok di posisi yang sama pasti prefiksnya, jadi prioritas terbaik per
+# posisi bisa dihitung sekali saat kompilasi
+class KeywordClassifier:
+    def __init__(self, rules=CATEGORY_RULES, default: str = DEFAULT_CATEGORY):
+        self.default = default
+        self.categories = tuple(category for category, _ in rules)
+
+        # prioritas tiap kata kunci = urutan aturan pertama yang memuatnya
+        priorities = {}
+        for priority, (_, keywords) in enumerate(rules):
+            for keyword in keywords:
+                priorities.setdefault(keyword, priority)
+
+        trie = {}
+        for keyword in priorities:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = keyword
+
+        # kategori tiap kata kunci, untuk melihat topik lain yang ikut disebut
+        self.keyword_categories = {keyword: self.categories[priority] for keyword, priority in priorities.items()}
+
+        self._group_keywords = [()]
+        self._group_priority = [None]
+        self._pattern = re.compile(self._render(trie, priorities, ()))
+
+    # ubah trie menjadi regex, grup dinomori sesuai urutan kemunculan
+    def _render(self, node: dict, priorities: dict, chain: tuple) -> str:
+        pattern = ""
+        if "" in node:
+            chain = chain + (node[""],)
+            self._group_keywords.append(chain)
+            self._group_priority.append(min(priorities[keyword] for keyword in chain))
+            pattern = "()"
+
+        branches = [
+            re.escape(char) + self._render(child, priorities, chain)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return pattern
+        if pattern:
+            return pattern + "(?:" + "|".join(branches) + ")?"
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    # cari prioritas terbaik; berhenti lebih awal jika tidak perlu kata kunci
+    def _scan(self, text: str, collect: bool):
+        search = self._pattern.search
+        group_priority = self._group_priority
+        best = None
+        keywords = []
+        pos = 0
+
+        while True:
+            match = search(text, pos)
+            if match is None:
+                break
+            priority = group_priority[match.lastindex]
+            if best is None or priority < best:
+                best = priority
+            if collect:
+                keywords.extend(self._group_keywords[match.lastindex])
+            elif best == 0:
+                break
+            # geser satu karakter supaya kata kunci yang tumpang tindih tetap terlihat
+            pos = match.start() + 1
+
+        return best, keywords
+
+    # kategori saja, jalur cepat yang dipakai di setiap request
+    def categorize(self, question: str) -> str:
+        best, _ = self._scan(question.lower(), collect=False)
+        return self.categories[best] if best is not None else self.default
+
+    # kategori beserta semua kata kunci yang cocok
+    def classify(self, question: str) -> Classification:
+        best, keywords = self._scan(question.lower(), collect=True)
+        category = self.categories[best] if best is not None else self.default
+        return Classification(category, tuple(dict.fromkeys(keywords)))
+
+
+# classifier bawaan, dikompilasi sekali saat modul diimpor
+default_classifier = KeywordClassifier()
+
+
+# fungsi untuk mengkategorikan pertanyaan
+def categorize_question(question: str) -> str:
+    return default_classifier.categorize(question)
+
+
+# kategori dan kata kunci yang cocok, untuk debugging
+def classify_question(question: str) -> Classification:
+    return default_classifier.classify(question)
@@ -0,0 +1,242 @@
+import os
+import re
+import logging
+from typing import NamedTuple
+
+from text_normalizer import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# pertanyaan yang meminta cerita, alasan, atau pendapat butuh jawaban llm
+OPEN_ENDED_MARKERS = re.compile(
+    r"\b(kenapa|mengapa|bagaimana|gimana|jelaskan|ceritakan|cerita|menurut|pendapat|alasan|"
+    r"bandingkan|bedanya|pengalaman|makna|arti|maksud|pelajaran|seperti apa|kayak apa)\b"
+)
+
+# waktu, keinginan, atau rencana: fakta profil tidak menjawab "sejak kapan"
+# atau "kota mana yang pengen dikunjungi"
+TEMPORAL_DESIRE_MARKERS = re.compile(
+    r"\b(sejak|kapan|dulu|nanti|pengen|pingin|ingin|mau|berencana|rencana|cita|impian|harap|"
+    r"suka|favorit|terbaik|paling)\b"
+)
+
+
+def _intent(*patterns: str):
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+# kebijakan jalur cepat per kategori. pertanyaan hanya dijawab jika cocok
+# dengan pola niat fakta kategori itu (misalnya "tinggal di mana"), satu kata
+# kunci kategori saja tidak cukup. sisanya dieskalasi ke llm jika confidence
+# di bawah min_confidence
+class FastPathPolicy(NamedTuple):
+    intent: re.Pattern
+    min_confidence: float = 0.7
+    # pertanyaan yang lebih panjang biasanya meminta lebih dari sekadar fakta
+    max_words: int = 10
+    # kata yang selalu berarti pertanyaan di luar fakta profil untuk kategori ini
+    escalate: tuple = ()
+    # kata waktu/keinginan yang tetap boleh muncul di pertanyaan fakta kategori ini
+    allow: tuple = ()
+
+
+# gabungkan daftar dengan koma dan "dan" sebelum item terakhir
+def _join(items: list) -> str:
+    items = [str(item) for item in items if item]
+    if len(items) <= 1:
+        return "".join(items)
+    return ", ".join(items[:-1]) + " dan " + items[-1]
+
+
+def _lokasi(profile: dict) -> str:
+    return f"Aku tinggal di {profile['lokasi']}."
+
+
+def _pendidikan(profile: dict) -> str:
+    text = f"Sekarang aku kuliah di {profile['pendidikan']}."
+    previous = profile.get("pendidikan_sebelumnya")
+    if previous:
+        text += f" Sebelumnya aku sekolah di {_join(list(previous.values()))}."
+    return text
+
+
+def _lomba(profile: dict) -> str:
+    lines = [f"{name}: {detail}" if detail else name for name, detail in profile["lomba"].items()]
+    return f"Lomba yang pernah aku ikuti: {'; '.join(lines)}."
+
+
+def _lagu_favorit(profile: dict) -> str:
+    songs = [f"{title} dari {artist}" if artist else title for title, artist in profile["lagu_favorit"].items()]
+    return f"Lagu favoritku antara lain {_join(songs)}."
+
+
+def _moto_hidup(profile: dict) -> str:
+    return f"Moto hidupku: \"{profile['moto']}\"."
+
+
+def _portofolio_tech(profile: dict) -> str:
+    parts = [f"{part.capitalize()}: {stack}" for part, stack in profile["portfolio_tech"].items()]
+    return f"Portofolio ini dibangun dengan stack berikut. {'; '.join(parts)}."
+
+
+# kategori yang jawabannya murni fakta dari profil: kebijakan dan template jawaban
+FAST_PATH_RULES = {
+    "lokasi": (FastPathPolicy(
+        _intent(r"\b(tinggal|domisili|berdomisili|menetap)\b.*\b(di ?mana|kota apa|daerah mana)",
+                r"\b(di ?mana|kota apa)\b.*\b(tinggal|domisili|berdomisili|menetap)\b"),
+        escalate=("kehidupan", "suka tinggal", "betah", "nyaman", "enak")), _lokasi),
+    "pendidikan": (FastPathPolicy(
+        _intent(r"\b(kuliah|kampus|sekolah|universitas)\b.*\b(di ?mana|mana|apa)\b",
+                r"\b(jurusan|prodi|program studi)\b.*\b(apa|mana)\b",
+                r"\b(di ?mana|apa)\b.*\b(kuliah|kampus|jurusan|prodi|universitas)\b",
+                r"\briwayat pendidikan\b"),
+        escalate=("mata kuliah", "pengaruh", "karir", "susah", "sulit")), _pendidikan),
+    "lomba": (FastPathPolicy(
+        _intent(r"\b(lomba|kompetisi|hackathon|olimpiade)\b.*\b(apa|mana|pernah|diikuti|ikuti)\b",
+                r"\b(apa|pernah)\b.*\b(lomba|kompetisi|hackathon|olimpiade)\b"),
+        escalate=("proses", "tantangan", "belajar", "strategi", "tips")), _lomba),
+    "lagu_favorit": (FastPathPolicy(
+        _intent(r"\blagu\b.*\b(apa|favorit|sering|suka)\b", r"\b(apa|favorit)\b.*\blagu\b"),
+        escalate=("rekomendasi", "genre", "ngoding"), allow=("suka", "favorit", "paling")), _lagu_favorit),
+    "moto_hidup": (FastPathPolicy(
+        _intent(r"\b(moto|motto|semboyan|prinsip) hidup\b", r"\bapa (moto|motto|semboyan)\b"),
+        max_words=8, escalate=("filosofi", "pengaruh", "terapkan")), _moto_hidup),
+    "portofolio_tech": (FastPathPolicy(
+        _intent(r"\b(website|web|situs|portofolio|portfolio) ini\b.*\b(dibuat|dibangun|pakai|memakai|menggunakan|"
+                r"stack|teknologi|tech)\b",
+                r"\b(teknologi|stack|tech)\b.*\b(website|web|situs|portofolio|portfolio) ini\b"),
+        escalate=("fitur", "pilih", "deploy", "cara")), _portofolio_tech),
+}
+
+
+# penilaian satu pertanyaan: confidence dan alasan eskalasi ("" jika dijawab)
+class FastPathScore(NamedTuple):
+    confidence: float
+    reason: str
+
+
+# hitungan bersama untuk semua salinan per tenant
+class FastPathCounts:
+    def __init__(self):
+        self.requests = 0
+        self.served = 0
+        self.escalated = {}
+
+
+# jawaban deterministik untuk pertanyaan faktual tanpa memanggil llm. jawaban
+# dirender dan dinormalisasi sekali per versi profil; per request hanya ada
+# klasifikasi kata kunci dan beberapa pengecekan regex
+class FastPath:
+    def __init__(self, profile: dict, rules: dict = FAST_PATH_RULES, enabled: bool = True,
+                 min_confidence: float = None, counts: FastPathCounts = None):
+        self.rules = rules
+        self.enabled = enabled
+        self.min_confidence = min_confidence
+        self.counts = counts or FastPathCounts()
+        self._answers = {}
+        self.rebuild(profile)
+
+    # membuat jalur cepat dari variabel lingkungan. mati kecuali
+    # FAST_PATH_ENABLED=1, FAST_PATH_CATEGORIES
+    # membatasi kategori, FAST_PATH_MIN_CONFIDENCE mengganti batas semua kategori
+    @classmethod
+    def from_env(cls, profile: dict) -> "FastPath":
+        rules = FAST_PATH_RULES
+        categories = os.getenv("FAST_PATH_CATEGORIES")
+        if categories:
+            selected = {category.strip() for category in categories.split(",")}
+            rules = {category: rule for category, rule in rules.items() if category in selected}
+        min_confidence = os.getenv("FAST_PATH_MIN_CONFIDENCE")
+        return cls(
+            profile,
+            rules=rules,
+            enabled=os.getenv("FAST_PATH_ENABLED", "0") == "1",
+            min_confidence=float(min_confidence) if min_confidence else None,
+        )
+
+    # salinan untuk profil lain (tenant) dengan konfigurasi dan hitungan yang sama
+    def with_profile(self, profile: dict) -> "FastPath":
+        return FastPath(profile, rules=self.rules, enabled=self.enabled,
+                        min_confidence=self.min_confidence, counts=self.counts)
+
+    # render ulang jawaban, dipanggil saat startup dan saat profil berubah.
+    # kategori yang datanya tidak ada di profil tidak dijawab lewat jalur cepat
+    def rebuild(self, profile: dict):
+        answers = {}
+        for category, (_, render) in self.rules.items():
+            try:
+                answers[category] = normalize_text(render(profile))
+            except (KeyError, TypeError, AttributeError) as e:
+                logger.warning("jalur cepat %s dimatikan, data profil tidak lengkap: %s", category, e)
+        self._answers = answers
+
+    # pertanyaan tanpa pola niat fakta, dengan topik lain, atau dengan kata
+    # waktu/keinginan selalu ke llm. sisanya confidence 1.0 dikurangi untuk
+    # setiap tanda bahwa pertanyaan butuh lebih dari satu fakta: meminta
+    # penjelasan, kata eskalasi kategori, pertanyaan panjang, atau lanjutan
+    # dari riwayat sesi
+    def score(self, question: str, category: str, classifier, followup: bool = False) -> FastPathScore:
+        policy = self.rules[category][0]
+        text = question.lower()
+        if not policy.intent.search(text):
+            return FastPathScore(0.0, "no_intent")
+        _, keywords = classifier.classify(text)
+        if any(classifier.keyword_categories[keyword] != category for keyword in keywords):
+            return FastPathScore(0.0, "mixed_topics")
+        if any(match not in policy.allow for match in TEMPORAL_DESIRE_MARKERS.findall(text)):
+            return FastPathScore(0.0, "temporal_desire")
+
+        confidence = 1.0
+        reasons = []
+        if followup:
+            confidence -= 1.0
+            reasons.append("followup")
+        if OPEN_ENDED_MARKERS.search(text):
+            confidence -= 0.6
+            reasons.append("open_ended")
+        if any(term in text for term in policy.escalate):
+            confidence -= 0.6
+            reasons.append("policy")
+        if len(text.split()) > policy.max_words:
+            confidence -= 0.4
+            reasons.append("long_question")
+
+        confidence = max(confidence, 0.0)
+        threshold = self.min_confidence if self.min_confidence is not None else policy.min_confidence
+        if confidence >= threshold:
+            return FastPathScore(confidence, "")
+        return FastPathScore(confidence, reasons[0] if reasons else "low_confidence")
+
+    # jawaban jalur cepat, atau None jika pertanyaan harus ke llm/cache.
+    # dipanggil untuk setiap pertanyaan supaya porsi jalur cepat bisa dihitung
+    def answer(self, question: str, category: str, classifier, followup: bool = False):
+        counts = self.counts
+        counts.requests += 1
+        if not self.enabled:
+            return None
+        answer = self._answers.get(category)
+        if answer is None:
+            return None
+
+        reason = self.score(question, category, classifier, followup).reason
+        if reason:
+            counts.escalated[reason] = counts.escalated.get(reason, 0) + 1
+            return None
+        counts.served += 1
+        return answer
+
+    @property
+    def share(self) -> float:
+        counts = self.counts
+        return counts.served / counts.requests if counts.requests else 0.0
+
+    def stats(self) -> dict:
+        counts = self.counts
+        return {
+            "enabled": self.enabled,
+            "categories": sorted(self._answers),
+            "requests": counts.requests,
+            "served": counts.served,
+            "share": round(self.share, 4),
+            "escalated": dict(counts.escalated),
+        }
@@ -1,23 +1,134 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import os
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
+from typing import List, Optional
+import os
+import math
+import asyncio
+import time
 import logging
 import json
-import requests
-import random
-import re
 
-# setup logging 
-logging.basicConfig(level=logging.INFO)
+from admission import AdmissionRejected, RateLimiter, UpstreamGate
+from circuit_breaker import CircuitBreaker, CircuitOpenError, Hedge
+from classifier import categorize_question, default_classifier
+from fast_path import FastPath
+from metrics import Metrics
+from mock_catalog import MockCatalog
+from openai_client import OpenAIClient
+from prewarm import Prewarmer
+from profile_store import ProfileStore
+from prompt_compaction import PromptCompactor
+from prompt_templates import PromptTemplates
+from request_log import RequestLog
+from response_cache import ResponseCache, make_cache_key
+from retrieval import ProfileRetriever
+from semantic_cache import SemanticCache
+from sessions import SessionStore
+from singleflight import SingleFlight
+from structured_logging import RequestLogMiddleware, setup_logging
+from tenants import DEFAULT_TENANT, Tenant, TenantMiddleware, TenantRegistry
+from text_normalizer import StreamingNormalizer, normalize_text
+from traffic_capture import TrafficCapture, TrafficCaptureMiddleware
+
+# log lewat antrean: request hanya memasukkan record, penulisan dan format
+# json dikerjakan thread terpisah (LOG_FORMAT, LOG_SAMPLE_RATE, LOG_LEVEL)
+log_pipeline = setup_logging()
 logger = logging.getLogger(__name__)
 
 # memuat variabel lingkungan
 load_dotenv()
 
+# metrik latensi per tahap untuk /metrics, METRICS_ENABLED=0 mematikan semua pencatatan
+metrics = Metrics.from_env()
+
+# klien openai bersama dengan pool koneksi keep-alive
+openai_client = OpenAIClient.from_env()
+openai_client.observer = metrics.observe_upstream
+
+# cache respons openai, opsional dengan penyimpanan sqlite
+response_cache = ResponseCache.from_env()
+
+# cache semantik untuk pertanyaan yang mirip (parafrase) di kategori yang sama,
+# opsional (SEMANTIC_CACHE_ENABLED=1) karena jawaban yang tertukar lebih buruk
+# daripada satu panggilan openai tambahan
+semantic_cache = SemanticCache.from_env() if os.getenv("SEMANTIC_CACHE_ENABLED", "0") == "1" else None
+
+# permintaan identik yang sedang berjalan berbagi satu panggilan openai
+openai_singleflight = SingleFlight()
+
+# circuit breaker supaya saat openai down pengunjung langsung dapat jawaban mock
+openai_breaker = CircuitBreaker.from_env()
+
+# batas waktu tunggu openai sebelum jawaban mock dikirim (0 berarti tanpa batas)
+openai_hedge = Hedge.from_env()
+
+# token bucket per klien untuk pertanyaan yang harus ke openai
+rate_limiter = RateLimiter.from_env()
+
+# batas panggilan openai bersamaan dengan antrean tunggu terbatas
+upstream_gate = UpstreamGate.from_env()
+
+# request yang ditolak dijawab mock (default) atau langsung 429 (ADMISSION_OVERFLOW=reject)
+admission_overflow = os.getenv("ADMISSION_OVERFLOW", "mock")
+
+# state cache dan breaker ikut ditampilkan di /metrics. stats() cache memicu
+# flush dan query sqlite, jadi dibaca sekali per scrape
+cache_stats = metrics.snapshot(response_cache.stats)
+metrics.add_gauge("response_cache_entries", "Jumlah entri di cache respons.", lambda: cache_stats.value["entries"])
+metrics.add_gauge("response_cache_hit_rate", "Rasio hit cache respons exact-match.", lambda: cache_stats.value["hit_rate"])
+metrics.add_gauge("response_cache_shared_hit_rate", "Rasio hit cache respons dari semua worker yang berbagi cache sqlite.",
+                  lambda: cache_stats.value.get("shared", cache_stats.value)["hit_rate"])
+metrics.add_gauge("circuit_breaker_open", "1 jika circuit breaker openai sedang terbuka.", lambda: int(openai_breaker.state == "open"))
+metrics.add_gauge("upstream_inflight", "Panggilan openai yang sedang berjalan.", lambda: upstream_gate.inflight)
+metrics.add_gauge("upstream_queued", "Panggilan openai yang menunggu slot.", lambda: upstream_gate.queued)
+metrics.add_counter("upstream_rejected_total", "Panggilan openai yang ditolak karena antrean penuh atau terlalu lama.",
+                    lambda: upstream_gate.rejected_queue_full + upstream_gate.rejected_timeout)
+metrics.add_counter("rate_limited_total", "Pertanyaan yang ditolak rate limiter per klien.", lambda: rate_limiter.limited)
+metrics.add_gauge("log_queue_size", "Record log yang menunggu ditulis.", lambda: len(log_pipeline.handler.records))
+metrics.add_counter("log_dropped_total", "Record log yang dibuang karena antrean penuh.", lambda: log_pipeline.handler.dropped)
+
+# batas ukuran batch dan jumlah panggilan openai paralel per batch
+batch_max_questions = int(os.getenv("BATCH_MAX_QUESTIONS", "100"))
+batch_concurrency = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+# pre-warm cache untuk pertanyaan preset dan pertanyaan populer (PREWARM_ON_STARTUP=1)
+prewarmer = Prewarmer.from_env()
+
+# buka pool koneksi saat startup dan tutup saat shutdown. pre-warm selesai
+# sebelum aplikasi mulai menerima request, lalu file profil dipantau
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await openai_client.start()
+    if prewarmer.enabled:
+        await prewarmer.run(prewarm_question)
+    watchers = []
+    if profile_store.reload_interval > 0:
+        watchers.append(asyncio.create_task(profile_store.watch()))
+        if len(tenant_registry):
+            watchers.append(asyncio.create_task(tenant_registry.watch()))
+    if request_log is not None:
+        watchers.append(asyncio.create_task(request_log.run()))
+    if traffic_capture is not None:
+        watchers.append(asyncio.create_task(traffic_capture.run()))
+    try:
+        yield
+    finally:
+        for watcher in watchers:
+            watcher.cancel()
+        await openai_client.close()
+        response_cache.close()
+        if request_log is not None:
+            request_log.close()
+        if traffic_capture is not None:
+            traffic_capture.close()
+        log_pipeline.flush()
+
 # inisialisasi aplikasi
-app = FastAPI(title="AI Portfolio Backend")
+app = FastAPI(title="AI Portfolio Backend", lifespan=lifespan)
 
 # konfigurasi cors
 app.add_middleware(
@@ -28,909 +139,519 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# model untuk request
+# model untuk request, session_id opsional untuk pertanyaan lanjutan
 class QuestionRequest(BaseModel):
     question: str
+    session_id: Optional[str] = Field(None, max_length=64, pattern=r"^[A-Za-z0-9_-]+$")
 
 # model untuk response
 class AIResponse(BaseModel):
     response: str
 
-# data profil pengguna
-user_profile = {
-    "nama": "Danendra Shafi Athallah",
-    "lokasi": "Jakarta, Indonesia",
-    "pendidikan": "Institut Teknologi Bandung, Teknik Informatika (Semester 4)",
-    "pendidikan_sebelumnya": {
-        "sd": "SD Islam Al Azhar 23 Jatikramat",
-        "smp": "SMP Islam Al Azhar 9 Kemang Pratama",
-        "sma": "SMA Negeri 5 Bekasi",
-    },
-    "pekerjaan": "Mahasiswa",
-    "pengalaman": "2 tahun pengalaman di pengembangan web dan 1 tahun di data science",
-    "keahlian": ["Next.js", "React", "Python", "Data Science", "Java", "Tailwind CSS"],
-    "keahlian_detail": {
-        "Next.js": "Framework utama yang digunakan untuk berbagai proyek web selama 2 tahun terakhir",
-        "React": "Library JavaScript favorit untuk membangun UI yang interaktif",
-        "Python": "Bahasa pemrograman utama untuk analisis data dan pengembangan algoritma",
-        "Data Science": "Analisis data menggunakan pandas, matplotlib, dan scikit-learn",
-        "Java": "Bahasa pemrograman untuk pengembangan algoritma dan aplikasi desktop"
-    },
-    "tools_favorit": {
-        "Python": "Bahasa utama untuk analisis data dan machine learning",
-        "VS Code": "Editor favorit dengan banyak extension untuk produktivitas",
-        "Jupyter Notebook": "Untuk eksplorasi dan visualisasi data",
-        "Git": "Version control untuk kolaborasi dan tracking proyek",
-        "Figma": "Untuk wireframing dan design",
-    },
-    "hobi": ["Membaca buku sci-fi", "Traveling ke destinasi lokal", "Makan", "Hiking di akhir pekan"],
-    "hobi_detail": {
-        "Membaca": "Buku favorit termasuk 'Dune' dan karya-karya Ted Chiang",
-        "Traveling": "Sudah mengunjungi 8 provinsi di Indonesia dan berencana menambah lagi",
-        "Fotografi": "Memiliki akun Instagram khusus untuk hasil foto urban landscape",
-        "Hiking": "Mendaki Gunung Rinjani pada 2022 dan Gunung Semeru pada 2023"
-    },
-    "proyek": [
-        "Algoritma Pencarian Little Alchemy 2 - Implementasi BFS, DFS, dan Bidirectional Search",
-        "Rush Hour Puzzle Solver - Program penyelesaian puzzle dengan algoritma pathfinding",
-        "Personal Finance Tracker - Aplikasi tracking keuangan pribadi",
-        "IQ Puzzler Pro Solver - Solusi permainan papan menggunakan algoritma brute force"
-    ],
-    "proyek_detail": {
-        "Algoritma Pencarian Little Alchemy 2": "Implementasi BFS, DFS, dan Bidirectional Search untuk mencari kombinasi recipe dalam permainan. Seru banget menyelesaikan tantangan algoritma ini!",
-        "Rush Hour Puzzle Solver": "Program yang menyelesaikan puzzle Rush Hour menggunakan algoritma pathfinding seperti UCS, Greedy Best-First Search, A*, dan Dijkstra. Dilengkapi dengan CLI dan GUI untuk visualisasi solusi. Salah satu proyek yang paling menantang dari segi algoritma.",
-        "Personal Finance Tracker": "Aplikasi web yang membantu pengguna melacak pengeluaran, mengatur anggaran, dan memvisualisasikan kebiasaan finansial. Menggunakan React, Firebase, dan D3.js untuk visualisasi data yang interaktif.",
-        "IQ Puzzler Pro Solver": "Solusi untuk permainan papan IQ Puzzler Pro menggunakan algoritma brute force dengan visualisasi interaktif. Butuh optimasi yang cukup rumit biar performanya bagus."
-    },
-    "tantangan_proyek": {
-        "Algoritma Pencarian Little Alchemy 2": "Tantangan terbesar adalah memaksimalkan efisiensi algoritma untuk pencarian kombinasi recipe yang banyak. Bidirectional search dibuat untuk mengatasi bottleneck pada graf hubungan recipe yang kompleks.",
-        "Rush Hour Puzzle Solver": "Optimalisasi algoritma A* dengan heuristik custom agar performa lebih baik. Tantangan lain adalah visualisasi state puzzle yang interaktif dengan library grafis yang terbatas.",
-        "IQ Puzzler Pro Solver": "Tantangan utama adalah state space yang sangat besar, karena banyaknya kombinasi yang mungkin. Perlu implementasi backtracking dengan pruning yang efisien untuk mencegah stack overflow."
-    },
-    "karakter": "Kreatif, analitis, detail-oriented, dan suka belajar hal baru",
-    "sifat_detail": {
-        "keberanian": "Mudah beradaptasi di lingkungan baru dan berani mengambil tantangan",
-        "kerjasama": "Bisa menyesuaikan peran sebagai pemimpin atau anggota tim sesuai kebutuhan",
-        "komunikasi": "Terbuka dalam komunikasi, senang berdiskusi tentang ide dan konsep baru"
-    },
-    "prestasi": [
-        "Juara 2 Hackathon Nasional 2022",
-        "Asisten praktikum Algoritma dan Struktur Data",
-        "Kontributor open source di beberapa proyek React"
-    ],
-    "lomba": {
-        "Datavidia UI": "Pengalaman lomba data science yang paling berkesan karena kompleksitasnya yang menantang",
-        "Hackathon Nasional 2022": "Berhasil meraih juara 2 dengan implementasi solusi data-driven untuk masalah transportasi"
-    },
-    "quotes_favorit": [
-        "Code is like humor. When you have to explain it, it's bad.",
-        "The best way to predict the future is to create it.",
-        "Simplicity is the ultimate sophistication."
-    ],
-    "moto": "Menuju tak terbatas dan melampauinya",
-    "lagu_favorit": {
-        "Without You": "Air Supply",
-        "Sekali Ini Saja": "Glenn Fredly",
-        "Lagu Oldies": "Bee Gees, Westlife, Backstreet Boys"
-    },
-    "kuliah": {
-        "mata_kuliah_favorit": "Matematika",
-        "pengalaman_culture_shock": "Kuliah di ITB memberikan culture shock karena banyak mahasiswa sudah fasih dengan dunia IT sejak kecil, berbeda dengan saya yang baru memulai. Pace pembelajaran yang sangat cepat juga membuat saya harus beradaptasi dengan baik.",
-        "organisasi": "Kepanitiaan Arkavidia divisi academy untuk bootcamp path data science"
-    },
-    "belajar_coding": {
-        "pertama_kali": "SMA",
-        "data_science": "Mulai belajar data science dari Excel dan visualisasi data sederhana"
-    },
-    "manajemen": {
-        "waktu": "Membagi waktu antara mengerjakan projek, tugas besar, dan belajar untuk ujian dengan sangat ketat",
-        "stres": "Menonton film horror/romance atau drama Korea untuk relaksasi",
-        "bekerja_tim": "Melihat dulu apakah ada yang mau menginisiasi menjadi leader, kalau tidak ada baru saya ambil peran tersebut"
-    },
-    "personality": {
-        "tipe": "Mudah berkenalan dengan orang baru",
-        "kebiasaan_ngoding": "Terkadang lebih produktif saat ngoding malam hari"
-    },
-    "rencana_masa_depan": "Fokus memperdalam keahlian di bidang data science dan algoritma, lulus dengan prestasi terbaik, dan berkarir di perusahaan teknologi terkemuka.",
-    "portfolio_tech": {
-        "frontend": "Next.js, TypeScript, Tailwind CSS, Shadcn UI, Framer Motion",
-        "backend": "Python FastAPI, OpenAI API",
-        "deployment": "Vercel untuk frontend, Railway untuk backend Python",
-        "design": "Menggunakan prinsip mobile-first design dengan animasi smooth dan interaksi intuitif"
-    }
-}
-
-# fungsi untuk mengkategorikan pertanyaan
-def categorize_question(question: str) -> str:
-    question_lower = question.lower()
-    
-    # kategori pertanyaan personal yang perlu dialihkan
-    if any(word in question_lower for word in ["pacar", "jodoh", "pacaran", "pasangan", "gebetan", "nikah", "menikah", "single", "lajang", "status hubungan"]):
-        return "personal_relationship"
-    elif any(word in question_lower for word in ["gaji", "salary", "penghasilan", "bayaran", "uang", "kekayaan", "sebulan"]):
-        return "personal_financial"
-    elif any(word in question_lower for word in ["alamat rumah", "tinggal dimana", "alamat lengkap", "nomor", "kontak", "pribadi"]):
-        return "personal_contact"
-    elif any(word in question_lower for word in ["umur", "usia", "tanggal lahir", "kapan lahir", "kelahiran"]):
-        return "personal_age"
-    elif any(word in question_lower for word in ["agama", "kepercayaan", "tuhan", "beribadah"]):
-        return "personal_religion"
-        
-    # kategori umum
-    elif any(word in question_lower for word in ["keahlian", "skill", "kemampuan", "ahli", "bisa apa", "bisa apa saja", "jago"]):
-        return "keahlian"
-    elif any(word in question_lower for word in ["proyek", "project", "karya", "portfolio", "aplikasi", "buat apa", "telah dibuat", "terbaik", "unggulan"]):
-        return "proyek"
-    elif any(word in question_lower for word in ["tantangan", "challenge", "kesulitan", "masalah", "problem", "hambatan"]):
-        return "tantangan_proyek"
-    elif any(word in question_lower for word in ["hobi", "suka", "waktu luang", "kegiatan", "aktivitas", "senang"]):
-        return "hobi"
-    elif any(word in question_lower for word in ["pendidikan", "sekolah", "kuliah", "belajar", "kampus", "universitas", "itb", "masuk itb", "masuk kuliah", "jurusan"]):
-        return "pendidikan"
-    elif any(word in question_lower for word in ["pelajaran favorit", "mata kuliah favorit", "mata pelajaran"]):
-        return "mata_kuliah"
-    elif any(word in question_lower for word in ["lokasi", "tinggal", "domisili", "alamat", "kota", "daerah"]):
-        return "lokasi"
-    elif any(word in question_lower for word in ["prestasi", "pencapaian", "award", "penghargaan", "juara"]):
-        return "prestasi"
-    elif any(word in question_lower for word in ["lomba", "kompetisi", "contest", "hackathon", "datathon"]):
-        return "lomba"
-    elif any(word in question_lower for word in ["data", "data science", "analisis data", "big data", "statistik", "machine learning", "ml"]):
-        return "data_science"
-    elif any(word in question_lower for word in ["ai", "artificial intelligence", "kecerdasan buatan"]):
-        return "data_science"  # redirect AI questions to data science
-    elif any(word in question_lower for word in ["tool", "alat", "software", "library", "framework", "favorit", "suka pakai"]):
-        return "tools"
-    elif any(word in question_lower for word in ["karakter", "kepribadian", "sifat", "tipe", "mbti", "orangnya", "pemalu", "extrovert", "introvert"]):
-        return "karakter"
-    elif any(word in question_lower for word in ["portofolio ini", "website ini", "web ini", "dibuat pakai", "teknologi"]):
-        return "portofolio_tech"
-    elif any(word in question_lower for word in ["rencana", "masa depan", "target", "tujuan", "cita", "5 tahun"]):
-        return "rencana"
-    elif any(word in question_lower for word in ["pekerjaan", "kerja", "profesi", "karir", "jabatan"]):
-        return "pekerjaan"
-    elif any(word in question_lower for word in ["pengalaman", "experience", "lama kerja"]):
-        return "pengalaman"
-    elif any(word in question_lower for word in ["waktu", "manage", "manajemen", "atur waktu", "produktif"]):
-        return "manajemen_waktu"
-    elif any(word in question_lower for word in ["stres", "stress", "tekanan", "pressure", "beban", "handle"]):
-        return "manajemen_stres"
-    elif any(word in question_lower for word in ["cerita", "momen", "pengalaman kuliah", "culture shock", "berkesan"]):
-        return "cerita_kuliah"
-    elif any(word in question_lower for word in ["organisasi", "berorganisasi", "komunitas", "kepanitiaan"]):
-        return "organisasi"
-    elif any(word in question_lower for word in ["belajar mandiri", "autodidak", "self-taught", "tutorial"]):
-        return "belajar_mandiri"
-    elif any(word in question_lower for word in ["kegagalan", "gagal", "failure", "kesalahan", "mistake"]):
-        return "belajar_kegagalan"
-    elif any(word in question_lower for word in ["tim", "team", "kerja tim", "kolaborasi", "konflik"]):
-        return "kerja_tim"
-    elif any(word in question_lower for word in ["ngoding", "coding", "kode", "malam", "produktif"]):
-        return "kebiasaan_ngoding"
-    elif any(word in question_lower for word in ["lagu", "musik", "dengerin", "dengarkan", "playlist"]):
-        return "lagu_favorit"
-    elif any(word in question_lower for word in ["moto", "motto", "quotes", "quote", "kutipan", "kata-kata"]):
-        return "moto_hidup"
-    else:
-        return "general"
-
-# menyusun prompt yang kontekstual
-def create_context_aware_prompt(question: str) -> str:
-    category = categorize_question(question)
-    
-    # base prompt yang selalu ada
-    base_prompt = f"""
-    Kamu adalah asisten pribadi dari {user_profile['nama']} yang cerdas, informatif, dan memiliki kepribadian yang santai. 
-    Jawab dengan bahasa Indonesia yang natural dan santai, tapi tetap informatif.
-    
-    Profil dasar:
-    - Nama: {user_profile['nama']}
-    - Lokasi: {user_profile['lokasi']}
-    - Pendidikan: {user_profile['pendidikan']}
-    - Pekerjaan saat ini: {user_profile['pekerjaan']}
-    - Karakter: {user_profile['karakter']}
-    """
-    
-    # penanganan pertanyaan personal
-    if category.startswith("personal_"):
-        base_prompt += f"""
-        Kamu mendapat pertanyaan yang bersifat personal dan sebaiknya dialihkan. Berikan jawaban dengan format:
-        
-        1. Mulai dengan pernyataan halus bahwa kamu tidak bisa menjawab pertanyaan personal itu (misalnya "Waduh, aku kurang nyaman membahas hal-hal personal seperti itu" atau "Hmm, aku nggak bisa jawab pertanyaan pribadi itu ya")
-        2. Lalu alihkan pembicaraan ke topik profesional, seperti keahlian atau proyek (misalnya "Tapi yang jelas, aku bisa cerita kalau...")
-        3. Jangan menyebutkan hal-hal personal yang ditanyakan sama sekali dalam jawabanmu
-        
-        PENTING: Jangan jawab pertanyaan personal apapun, tetapi juga jangan terlalu frontal dalam penolakan.
-        """
-        
-        # tambahkan beberapa topik pengalihan berdasarkan jenis pertanyaan personal
-        if category == "personal_relationship":
-            base_prompt += f"""
-            Alihkan dengan membicarakan fokus pada karir dan proyek. Misalnya: "Yang pasti, saat ini aku lebih fokus mengembangkan karir di bidang data science dan mengerjakan beberapa proyek menarik seperti {user_profile['proyek'][0].split(' - ')[0]} atau {user_profile['proyek'][3].split(' - ')[0]}."
-            
-            SANGAT PENTING: Jangan mengonfirmasi atau menyangkal status hubungan dalam bentuk apapun.
-            """
-    
-    # tambahkan informasi tambahan berdasarkan kategori pertanyaan
-    elif category == "keahlian":
-        base_prompt += f"""
-        Keahlian: {', '.join(user_profile['keahlian'])}
-        Detail keahlian:
-        {json.dumps(user_profile['keahlian_detail'], indent=2, ensure_ascii=False)}
-        
-        Pertanyaan pengguna adalah tentang keahlian. Jawab dengan detail tentang keahlian utama, seberapa mahir, dan bagaimana keahlian tersebut digunakan dalam pekerjaan atau proyek. Berikan contoh konkret.
-        
-        PENTING: Tekankan keahlian di bidang Data Science, bukan AI. Jika menyebutkan AI, sampaikan bahwa itu adalah bagian dari ekosistem Data Science.
-        """
-    elif category == "proyek":
-        base_prompt += f"""
-        Proyek unggulan:
-        1. {user_profile['proyek'][0]}
-        2. {user_profile['proyek'][1]}
-        3. {user_profile['proyek'][3]}
-        
-        Detail proyek:
-        1. {user_profile['proyek_detail']['Algoritma Pencarian Little Alchemy 2']}
-        2. {user_profile['proyek_detail']['Rush Hour Puzzle Solver']}
-        3. {user_profile['proyek_detail']['IQ Puzzler Pro Solver']}
-        
-        Pertanyaan pengguna adalah tentang proyek. Jawab dengan mendeskripsikan salah satu dari proyek algoritma di atas (Algoritma Pencarian Little Alchemy 2, Rush Hour Puzzle Solver, atau IQ Puzzler Pro Solver). Jelaskan tantangan teknis, algoritma yang dipakai, dan hasil yang dicapai.
-        
-        PENTING: Fokuskan pada proyek-proyek algoritma dan puzzle di atas, bukan proyek lainnya.
-        """
-    elif category == "tantangan_proyek":
-        base_prompt += f"""
-        Tantangan proyek:
-        {json.dumps(user_profile['tantangan_proyek'], indent=2, ensure_ascii=False)}
-        
-        Pertanyaan pengguna adalah tentang tantangan dalam proyek. Jelaskan dengan detail tantangan teknis yang dihadapi dalam pengembangan proyek unggulan, terutama proyek algoritma. Ceritakan bagaimana tantangan tersebut diatasi dengan kreativitas dan problem-solving.
-        """
-    elif category == "hobi":
-        base_prompt += f"""
-        Hobi: {', '.join(user_profile['hobi'])}
-        Detail hobi:
-        {json.dumps(user_profile['hobi_detail'], indent=2, ensure_ascii=False)}
-        
-        Pertanyaan pengguna adalah tentang hobi. Jawab dengan menjelaskan hobi yang disukai, mengapa menyukainya, dan bagaimana meluangkan waktu untuk hobi tersebut. Berikan beberapa cerita menarik terkait hobi.
-        """
-    elif category == "pendidikan":
-        base_prompt += f"""
-        Pendidikan: {user_profile['pendidikan']}
-        Pendidikan sebelumnya:
-        {json.dumps(user_profile['pendidikan_sebelumnya'], indent=2, ensure_ascii=False)}
-        
-        Pertanyaan pengguna adalah tentang pendidikan. Jawab dengan informasi tentang latar belakang pendidikan, jurusan, mata kuliah favorit, atau pengalaman belajar yang berkesan. Jelaskan juga bagaimana pendidikan mempengaruhi karir.
-        """
-    elif category == "mata_kuliah":
-        base_prompt += f"""
-        Mata kuliah favorit: {user_profile['kuliah']['mata_kuliah_favorit']}
-        
-        Pertanyaan pengguna adalah tentang mata kuliah atau pelajaran favorit. Jelaskan mengapa menyukai mata kuliah tersebut, apa yang menarik, dan bagaimana pengaruhnya terhadap minat di bidang data science dan algoritma.
-        """
-    elif category == "data_science":
-        base_prompt += f"""
-        Pengalaman Data Science: 
-        - 2 tahun pengalaman di bidang data science
-        - Keahlian: analisis data menggunakan pandas, matplotlib, dan scikit-learn
-        - Fokus pada pengolahan data, visualisasi, dan pembuatan model prediktif
-        - Awal mula belajar: {user_profile['belajar_coding']['data_science']}
-        
-        Pertanyaan pengguna adalah tentang data science atau AI. Jawab dengan menjelaskan pengalaman dan ketertarikan di bidang data science, bagaimana menggunakan tools seperti Python, pandas, dan scikit-learn dalam proyek. Tekankan bahwa fokus utama adalah data science, bukan AI secara spesifik.
-        
-        PENTING: Fokuskan pada data science, visualisasi data, dan analisis statistik. Jika pertanyaan tentang AI, jelaskan dalam konteks data science (sebagai bagian dari toolset data science).
-        """
-    elif category == "tools":
-        base_prompt += f"""
-        Tools favorit:
-        {json.dumps(user_profile['tools_favorit'], indent=2, ensure_ascii=False)}
-        
-        Pertanyaan pengguna adalah tentang tools yang sering digunakan. Jelaskan tools favorit untuk pengembangan, data science, dan alasan mengapa tools tersebut disukai. Berikan contoh penggunaan tools dalam proyek nyata.
-        """
-    elif category == "prestasi":
-        base_prompt += f"""
-        Prestasi: {', '.join(user_profile['prestasi'])}
-        
-        Pertanyaan pengguna adalah tentang prestasi. Jawab dengan menjelaskan pencapaian penting, penghargaan, atau pengakuan yang pernah diraih. Ceritakan tantangan dan pelajaran yang didapat dari prestasi tersebut.
-        """
-    elif category == "lomba":
-        base_prompt += f"""
-        Pengalaman lomba:
-        {json.dumps(user_profile['lomba'], indent=2, ensure_ascii=False)}
-        
-        Pertanyaan pengguna adalah tentang lomba yang pernah diikuti. Ceritakan pengalaman mengikuti lomba, terutama Datavidia UI yang berkesan karena kompleksitasnya. Jelaskan proses, tantangan, dan pembelajaran dari lomba tersebut.
-        """
-    elif category == "karakter":
-        base_prompt += f"""
-        Karakter: {user_profile['karakter']}
-        Detail kepribadian:
-        {json.dumps(user_profile['sifat_detail'], indent=2, ensure_ascii=False)}
-        Tipe: {user_profile['personality']['tipe']}
-        
-        Pertanyaan pengguna adalah tentang kepribadian atau karakter. Jawab dengan menjelaskan sifat-sifat utama, pendekatan dalam bekerja, dan bagaimana karakter tersebut mempengaruhi interaksi profesional dan personal.
-        """
-    elif category == "portofolio_tech":
-        base_prompt += f"""
-        Teknologi portofolio:
-        {json.dumps(user_profile['portfolio_tech'], indent=2, ensure_ascii=False)}
-        
-        Pertanyaan pengguna adalah tentang teknologi yang digunakan untuk membangun portofolio ini. Jelaskan stack teknologi yang dipakai (frontend dan backend), alasan pemilihan teknologi tersebut, dan fitur utama dari portofolio.
-        """
-    elif category == "rencana":
-        base_prompt += f"""
-        Rencana masa depan: {user_profile['rencana_masa_depan']}
-        
-        Pertanyaan pengguna adalah tentang rencana atau tujuan masa depan. Jawab dengan menjelaskan visi jangka panjang, rencana karir, proyek impian, atau keahlian yang ingin dikembangkan.
-        
-        PENTING: Fokuskan pada rencana terkait data science, bukan AI. Jika menyebutkan AI, sampaikan dalam konteks aplikasi data science.
-        """
-    elif category == "lokasi":
-        base_prompt += f"""
-        Lokasi: {user_profile['lokasi']}
-        
-        Pertanyaan pengguna adalah tentang lokasi. Jawab dengan informasi tentang kota tempat tinggal, bagaimana kehidupan di kota tersebut, dan apakah menikmati tinggal di sana.
-        """
-    elif category == "pekerjaan":
-        base_prompt += f"""
-        Pekerjaan: {user_profile['pekerjaan']}
-        
-        Pertanyaan pengguna adalah tentang pekerjaan. Jawab dengan informasi tentang posisi saat ini, tanggung jawab, perusahaan, dan bagaimana perjalanan karir sampai ke posisi sekarang.
-        
-        PENTING: Tekankan aspek data science dalam pekerjaan, bukan AI.
-        """
-    elif category == "pengalaman":
-        base_prompt += f"""
-        Pengalaman: {user_profile['pengalaman']}
-        
-        Pertanyaan pengguna adalah tentang pengalaman kerja. Jawab dengan informasi tentang lama bekerja di bidang tertentu, proyek yang pernah dikerjakan, dan keterampilan yang didapat dari pengalaman tersebut.
-        
-        PENTING: Tekankan pengalaman di bidang data science, bukan AI.
-        """
-    elif category == "manajemen_waktu":
-        base_prompt += f"""
-        Manajemen waktu: {user_profile['manajemen']['waktu']}
-        
-        Pertanyaan pengguna adalah tentang manajemen waktu. Jelaskan bagaimana mengelola waktu antara kuliah, proyek, dan kegiatan lain. Berikan tips praktis untuk produktivitas dan efisiensi.
-        """
-    elif category == "manajemen_stres":
-        base_prompt += f"""
-        Manajemen stres: {user_profile['manajemen']['stres']}
-        
-        Pertanyaan pengguna adalah tentang cara mengatasi stres. Jelaskan aktivitas yang dilakukan untuk relaksasi, seperti menonton film horror/romance atau drama Korea. Ceritakan bagaimana pengalaman di ITB melatih ketahanan menghadapi tekanan.
-        """
-    elif category == "cerita_kuliah":
-        base_prompt += f"""
-        Pengalaman kuliah: {user_profile['kuliah']['pengalaman_culture_shock']}
-        
-        Pertanyaan pengguna adalah tentang cerita atau pengalaman di kuliah. Ceritakan tentang culture shock saat masuk ITB, tantangan beradaptasi dengan pace pembelajaran yang cepat, dan bagaimana mengatasi tantangan tersebut.
-        """
-    elif category == "organisasi":
-        base_prompt += f"""
-        Pengalaman organisasi: {user_profile['kuliah']['organisasi']}
-        
-        Pertanyaan pengguna adalah tentang pengalaman organisasi. Ceritakan tentang kepanitiaan Arkavidia di divisi academy yang fokus pada bootcamp data science. Jelaskan peran, tanggung jawab, dan pembelajaran dari pengalaman tersebut.
-        """
-    elif category == "belajar_mandiri":
-        base_prompt += f"""
-        Pertanyaan pengguna adalah tentang belajar mandiri. Jelaskan pendekatan dalam belajar secara autodidak, sumber belajar yang digunakan (online courses, tutorial, dokumentasi), dan cara tetap konsisten dalam belajar mandiri.
-        """
-    elif category == "belajar_kegagalan":
-        base_prompt += f"""
-        Belajar dari kegagalan: {user_profile.get('manajemen', {}).get('coping_mechanism', 'jangan selalu menuruti coping mechanism diri sendiri')}
-        
-        Pertanyaan pengguna adalah tentang pelajaran dari kegagalan. Jelaskan pengalaman dari kegagalan akademik, insight yang didapat, dan bagaimana mengatasi coping mechanism yang tidak produktif.
-        """
-    elif category == "kerja_tim":
-        base_prompt += f"""
-        Kerja tim: {user_profile['manajemen']['bekerja_tim']}
-        
-        Pertanyaan pengguna adalah tentang kerja tim atau mengatasi konflik. Jelaskan pendekatan dalam bekerja dengan tim, bagaimana menangani perbedaan pendapat, dan peran yang biasa diambil dalam tim (observer dulu sebelum mengambil inisiatif sebagai leader jika dibutuhkan).
-        """
-    elif category == "kebiasaan_ngoding":
-        base_prompt += f"""
-        Kebiasaan ngoding: {user_profile['personality']['kebiasaan_ngoding']}
-        
-        Pertanyaan pengguna adalah tentang kebiasaan ngoding. Ceritakan preferensi waktu ngoding (terutama malam hari saat pikiran lebih jernih), rutinitas, dan lingkungan yang membuat produktif dalam coding.
-        """
-    elif category == "lagu_favorit":
-        base_prompt += f"""
-        Lagu favorit:
-        {json.dumps(user_profile['lagu_favorit'], indent=2, ensure_ascii=False)}
-        
-        Pertanyaan pengguna adalah tentang lagu favorit. Ceritakan lagu yang disukai seperti "Without You" dari Air Supply dan "Sekali Ini Saja" dari Glenn Fredly. Jelaskan juga preferensi untuk lagu oldies dari Bee Gees, Westlife, atau Backstreet Boys saat ngoding.
-        """
-    elif category == "moto_hidup":
-        base_prompt += f"""
-        Moto hidup: {user_profile['moto']}
-        
-        Pertanyaan pengguna adalah tentang moto hidup. Jelaskan moto "Menuju tak terbatas dan melampauinya", makna filosofis di baliknya, dan bagaimana moto tersebut mempengaruhi keputusan dan tindakan sehari-hari.
-        """
-    else:
-        base_prompt += f"""
-        Keahlian: {', '.join(user_profile['keahlian'])}
-        Hobi: {', '.join(user_profile['hobi'])}
-        Proyek unggulan:
-        1. {user_profile['proyek'][0]}
-        2. {user_profile['proyek'][3]}
-        Prestasi: {', '.join(user_profile['prestasi'])}
-        Rencana masa depan: {user_profile['rencana_masa_depan']}
-        
-        Coba tebak apa konteks dari pertanyaan pengguna dan berikan jawaban yang relevan. Hindari jawaban yang terlalu generik. Jika pertanyaan tidak jelas, berikan informasi tentang profil utama dengan singkat dan tawarkan untuk memberikan informasi lebih lanjut tentang topik tertentu.
-        
-        PENTING: Fokuskan pada data science, bukan AI. Jika membahas keahlian atau proyek, tekankan Algoritma Pencarian Little Alchemy 2.
-        """
-    
-    base_prompt += f"""
-    Pertanyaan pengguna: {question}
-    
-    Jawab dengan bahasa Indonesia yang santai dan alami (tidak kaku), tapi tetap informatif. Gunakan sapaan "aku" saat merujuk diri sendiri dan "kamu" saat merujuk pengguna. Variasikan struktur kalimat untuk terdengar natural. Berikan contoh spesifik dan detail untuk mengilustrasikan poin yang disampaikan. Gunakan sedikit humor yang relevan jika sesuai. Respons max 4-5 kalimat.
-    
-    PENTING: Pastikan respons kamu tidak mengandung spasi berlebih, pastikan transisi antar kalimat alami dan jelas.
-    """
-    
-    return base_prompt
-
-# fungsi untuk normalisasi teks respons
-def normalize_text(text: str) -> str:
-    # hapus spasi berlebih dan standardisasi tanda baca
-    cleaned = (text
-        .replace(r'\s+', ' ')        # ganti multiple spaces dengan single space
-        .replace(r'\s+\.', '.')      # hapus spasi sebelum tanda titik
-        .replace(r'\s+,', ',')       # hapus spasi sebelum koma
-        .replace(r',\s+', ', ')      # standarisasi spasi setelah koma
-        .replace(r'\.\s+', '. ')     # standarisasi spasi setelah titik
-        .replace(r'\s+!', '!')       # hapus spasi sebelum tanda seru
-        .replace(r'!\s+', '! ')      # standarisasi spasi setelah tanda seru
-        .replace(r'\s+\?', '?')      # hapus spasi sebelum tanda tanya
-        .replace(r'\?\s+', '? ')     # standarisasi spasi setelah tanda tanya
-        .replace(r'\s+:', ':')       # hapus spasi sebelum titik dua
-        .replace(r':\s+', ': ')      # standarisasi spasi setelah titik dua
-        .replace(r'\s+;', ';')       # hapus spasi sebelum titik koma
-        .replace(r';\s+', '; ')      # standarisasi spasi setelah titik koma
-    )
-    
-    # gunakan regex untuk hapus spasi berlebih
-    cleaned = re.sub(r'\s+', ' ', cleaned)
-    cleaned = re.sub(r'\s+\.', '.', cleaned)
-    cleaned = re.sub(r'\s+,', ',', cleaned)
-    cleaned = re.sub(r',\s+', ', ', cleaned)
-    cleaned = re.sub(r'\.\s+', '. ', cleaned)
-    cleaned = re.sub(r'\s+!', '!', cleaned)
-    cleaned = re.sub(r'!\s+', '! ', cleaned)
-    cleaned = re.sub(r'\s+\?', '?', cleaned)
-    cleaned = re.sub(r'\?\s+', '? ', cleaned)
-    
-    return cleaned.strip()
+# model untuk request batch
+class BatchQuestionRequest(BaseModel):
+    questions: List[str]
+
+# hasil satu pertanyaan dalam batch, source berisi "fast_path", "cache", atau "openai"
+class BatchItemResponse(BaseModel):
+    question: str
+    response: Optional[str] = None
+    source: Optional[str] = None
+    error: Optional[str] = None
+    duration_ms: float
+
+# model untuk response batch, urutan hasil sama dengan urutan pertanyaan
+class BatchResponse(BaseModel):
+    results: List[BatchItemResponse]
+    duration_ms: float
+
+# profil pengguna dari profile.json, dicek ulang setiap PROFILE_RELOAD_INTERVAL detik
+profile_store = ProfileStore.from_env()
+user_profile = profile_store.profile
+
+# kompaksi prompt (buang indentasi, instruksi ganda, jaga budget token)
+prompt_compactor = PromptCompactor.from_env() if os.getenv("PROMPT_COMPACTION", "1") != "0" else None
+
+# fakta profil tambahan yang relevan dipilih lewat indeks bm25 di atas blok per
+# kategori (PROMPT_RETRIEVAL=0 hanya memakai blok per kategori)
+prompt_retriever = (
+    ProfileRetriever.from_env(tokenizer=prompt_compactor.tokenizer if prompt_compactor is not None else None)
+    if os.getenv("PROMPT_RETRIEVAL", "1") != "0" else None
+)
+
+# template prompt per kategori, dirender sekali dari profil
+prompt_templates = PromptTemplates(user_profile, compactor=prompt_compactor, retriever=prompt_retriever)
+
+# katalog jawaban mock untuk fallback, dibaca dari mock_catalog.json sekali saat startup
+mock_catalog = MockCatalog.from_env(user_profile)
+
+# jawaban deterministik dari profil untuk pertanyaan faktual, tanpa openai
+fast_path = FastPath.from_env(user_profile)
+metrics.add_gauge("fast_path_share", "Porsi pertanyaan yang dijawab lewat jalur cepat.", lambda: fast_path.share)
+
+# versi profil (hash isi) untuk kunci cache, jawaban lama otomatis tidak terpakai saat profil berubah
+profile_hash = profile_store.version
+
+# riwayat percakapan per session_id, disertakan di prompt pertanyaan lanjutan
+session_store = SessionStore.from_env(tokenizer=prompt_compactor.tokenizer if prompt_compactor is not None else None)
+
+# log biner pertanyaan/jawaban untuk analitik offline (python request_log.py
+# summary <REQUEST_LOG_DIR>), aktif jika REQUEST_LOG_DIR diisi
+request_log = (
+    RequestLog.from_env(tokenizer=prompt_compactor.tokenizer if prompt_compactor is not None else None)
+    if os.getenv("REQUEST_LOG_DIR") else None
+)
+
+# rekaman trafik /ask, /ask/stream, dan /ask-mock yang sudah disanitasi untuk diputar ulang
+# dengan benchmarks/replay.py, aktif jika TRAFFIC_CAPTURE_DIR diisi
+traffic_capture = TrafficCapture.from_env() if os.getenv("TRAFFIC_CAPTURE_DIR") else None
+metrics.add_gauge("sessions_active", "Sesi percakapan yang sedang disimpan.", lambda: len(session_store))
+
+# tenant bawaan, dipakai untuk request tanpa tenant dan deployment satu portofolio
+default_tenant = Tenant(DEFAULT_TENANT, user_profile, profile_hash, default_classifier, prompt_templates, mock_catalog,
+                        fast_path=fast_path)
+
+# pasang versi profil baru: template dan katalog dirender ulang sekali, lalu
+# versi di kunci cache diganti. jika render gagal semuanya tetap di versi lama
+def apply_profile(profile: dict, version: str):
+    global user_profile, profile_hash
+    old_namespace = default_tenant.cache_namespace
+    default_tenant.apply(profile, version)
+    user_profile, profile_hash = profile, version
+    clear_stale_caches(old_namespace)
+
+# entri versi profil lama satu tenant di memori tidak akan pernah cocok lagi,
+# jadi hanya namespace itu yang dibuang; cache tenant lain tetap dipakai
+def clear_stale_caches(namespace: str):
+    response_cache.clear_memory(namespace)
+    if semantic_cache is not None:
+        semantic_cache.clear(semantic_namespace(namespace, ""))
+
+profile_store.on_change(apply_profile)
+
+# portofolio lain dari TENANTS_DIR, dipilih lewat /t/<id>/... atau header host.
+# cache respons dipakai bersama, kunci dipisah per tenant dan versi profil
+tenant_registry = TenantRegistry.from_env(compactor=prompt_compactor, catalog_data=mock_catalog.data, fast_path=fast_path,
+                                         retriever=prompt_retriever)
+tenant_registry.on_change(lambda tenant, old_namespace: clear_stale_caches(old_namespace))
+tenant_registry.load()
+if len(tenant_registry):
+    app.add_middleware(TenantMiddleware, registry=tenant_registry)
+
+if traffic_capture is not None:
+    app.add_middleware(TrafficCaptureMiddleware, capture=traffic_capture)
+
+# id request dan satu baris log per request; dipasang terakhir supaya menjadi
+# middleware terluar dan ikut mencatat request yang ditolak middleware lain
+app.add_middleware(RequestLogMiddleware, pipeline=log_pipeline)
+
+# tenant dari middleware, tenant bawaan untuk request biasa dan panggilan langsung
+def request_tenant(http_request: Request = None) -> Tenant:
+    if http_request is None:
+        return default_tenant
+    return http_request.scope.get("tenant", default_tenant)
+
+# kunci sesi dipisah per tenant supaya riwayat tidak tercampur
+def session_key(request: QuestionRequest, tenant: Tenant):
+    return f"{tenant.id}:{request.session_id}" if request.session_id else None
+
+# menyusun prompt yang kontekstual, riwayat sesi disisipkan sebelum pertanyaan
+def create_context_aware_prompt(question: str, tenant: Tenant = None, history: str = "") -> str:
+    tenant = tenant or default_tenant
+    category = tenant.categorize(question)
+    return tenant.templates.render(category, question, history)
+
+# indeks cache semantik per tenant, versi profil, dan kategori. namespace
+# tenant di depan supaya satu tenant bisa dibuang lewat prefix
+def semantic_namespace(namespace: str, category: str) -> str:
+    return f"{namespace}/{category}"
+
+# cari jawaban di cache exact-match, lalu di cache semantik
+async def get_cached_response(question: str, category: str, cache_key: str, tenant: Tenant = None):
+    namespace = (tenant or default_tenant).cache_namespace
+    cached_response = await response_cache.aget(cache_key, namespace)
+    if cached_response is None and semantic_cache is not None:
+        cached_response = semantic_cache.get(question, semantic_namespace(namespace, category))
+    return cached_response
+
+# simpan jawaban openai ke semua tingkat cache
+async def store_cached_response(question: str, category: str, cache_key: str, response_text: str, tenant: Tenant = None):
+    namespace = (tenant or default_tenant).cache_namespace
+    await response_cache.aset(cache_key, response_text, namespace)
+    if semantic_cache is not None:
+        semantic_cache.set(question, semantic_namespace(namespace, category), response_text)
+
+# satu record di log pertanyaan/jawaban; prompt dan jawaban hanya untuk
+# jawaban dari openai, untuk menghitung token
+def log_request(question: str, category: str, path: str, start: float, prompt: str = None, answer: str = None):
+    if request_log is not None:
+        request_log.record(question, category, path, time.perf_counter() - start, prompt, answer)
+
+# jawaban mock dari katalog untuk fallback, kategori sudah diketahui
+def mock_response_for(category: str, tenant: Tenant) -> AIResponse:
+    return AIResponse(response=tenant.catalog.answer(category))
 
 # fungsi untuk memanggil OpenAI API
-def call_openai_api(prompt):
+async def fetch_openai_response(prompt):
     logger.info("mengirim permintaan ke openai")
-    api_key = os.getenv("OPENAI_API_KEY")
-    
-    if not api_key:
-        logger.error("api key tidak ditemukan")
-        raise ValueError("OpenAI API key tidak ditemukan")
-    
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
-    }
-    
-    payload = {
-        "model": "gpt-3.5-turbo",
-        "messages": [
-            {"role": "system", "content": "Kamu adalah asisten virtual yang membantu menjawab pertanyaan tentang pemilik portfolio dengan cara yang personal, informatif, dan santai."},
-            {"role": "user", "content": prompt}
-        ],
-        "max_tokens": 800,
-        "temperature": 0.7
-    }
-    
-    try:
-        response = requests.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        
-        if response.status_code != 200:
-            logger.error(f"openai error: {response.status_code} - {response.text}")
-            raise ValueError(f"OpenAI API error: {response.status_code}")
-        
-        result = response.json()
-        if "choices" not in result or len(result["choices"]) == 0:
-            logger.error("tidak ada hasil dari openai")
-            raise ValueError("Tidak ada hasil dari OpenAI")
-        
-        # normalisasi respons sebelum mengembalikan
-        raw_response = result["choices"][0]["message"]["content"]
+    raw_response = await openai_client.chat(prompt)
+
+    # normalisasi respons sebelum mengembalikan
+    with metrics.stage("normalize"):
         normalized_response = normalize_text(raw_response)
-        return normalized_response
-    
-    except requests.exceptions.RequestException as e:
-        logger.error(f"request error: {str(e)}")
-        raise ValueError(f"Error saat berkomunikasi dengan OpenAI: {str(e)}")
+    return normalized_response
+
+# prompt yang sama dan sedang ditunggu tidak dikirim dua kali ke openai,
+# jumlah panggilan bersamaan dibatasi gate, dan panggilan dilewati selama
+# circuit breaker terbuka. gate di luar breaker supaya antrean tidak
+# dihitung sebagai panggilan lambat
+async def call_openai_api(prompt):
+    return await openai_singleflight.do(
+        prompt, lambda: upstream_gate.run(lambda: openai_breaker.call(lambda: fetch_openai_response(prompt)))
+    )
+
+# 429 dengan Retry-After untuk request yang ditolak admission control
+def admission_rejected_error(rejected: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=f"Terlalu banyak permintaan: {str(rejected)}",
+        headers={"Retry-After": str(max(math.ceil(rejected.retry_after), 1))},
+    )
 
 # endpoint untuk pertanyaan
 @app.post("/ask", response_model=AIResponse)
-async def ask_ai(request: QuestionRequest):
+async def ask_ai(request: QuestionRequest, http_request: Request = None):
     try:
+        start = time.perf_counter()
+
         # log pertanyaan
-        logger.info(f"pertanyaan diterima: {request.question}")
+        logger.info("pertanyaan diterima: %s", request.question)
+        tenant = request_tenant(http_request)
+        session = session_key(request, tenant)
+        
+        # pertanyaan faktual dijawab langsung dari profil, sisanya cek cache
+        # sebelum memanggil openai. jawaban yang bergantung pada riwayat sesi
+        # tidak dibaca dari atau disimpan ke cache
+        with metrics.stage("categorize"):
+            category = tenant.categorize(request.question)
+        metrics.category(category)
+        with metrics.stage("fast_path"):
+            history = session_store.history(session, request.question)
+            fast_answer = tenant.fast_path.answer(request.question, category, tenant.classifier, followup=bool(history))
+        if fast_answer is not None:
+            session_store.record(session, request.question, fast_answer)
+            metrics.observe_request("fast_path", time.perf_counter() - start)
+            log_request(request.question, category, "fast_path", start)
+            return AIResponse(response=fast_answer)
+        with metrics.stage("cache_lookup"):
+            cache_key = make_cache_key(request.question, category, tenant.cache_namespace) if not history else None
+            cached_response = await get_cached_response(request.question, category, cache_key, tenant) if cache_key else None
+        if cached_response is not None:
+            logger.info("respons diambil dari cache")
+            session_store.record(session, request.question, cached_response)
+            metrics.observe_request("cache", time.perf_counter() - start)
+            log_request(request.question, category, "cache", start)
+            return AIResponse(response=cached_response)
         
         # membuat prompt yang lebih kontekstual
-        prompt = create_context_aware_prompt(request.question)
+        with metrics.stage("prompt"):
+            prompt = create_context_aware_prompt(request.question, tenant, history)
         
         try:
-            # coba panggil openai
-            response_text = call_openai_api(prompt)
+            # coba panggil openai, jawaban yang terlambat tetap disimpan ke cache
+            rate_limiter.acquire(rate_limiter.client_key(http_request))
+            with metrics.stage("upstream"):
+                response_text = await openai_hedge.run(
+                    lambda: call_openai_api(prompt),
+                    on_late=lambda text: store_cached_response(request.question, category, cache_key, text, tenant) if cache_key else None,
+                )
             logger.info("respons diterima dari openai")
+            if cache_key:
+                await store_cached_response(request.question, category, cache_key, response_text, tenant)
+            session_store.record(session, request.question, response_text)
+            metrics.observe_request("openai", time.perf_counter() - start)
+            log_request(request.question, category, "openai", start, prompt, response_text)
             return AIResponse(response=response_text)
+        except AdmissionRejected as rejected:
+            logger.warning("request ditolak admission control: %s", rejected)
+            if admission_overflow == "reject":
+                raise admission_rejected_error(rejected)
+            metrics.fallback(type(rejected).__name__)
+            with metrics.stage("fallback"):
+                mock_response = mock_response_for(category, tenant)
+            session_store.record(session, request.question, mock_response.response)
+            metrics.observe_request("mock", time.perf_counter() - start)
+            log_request(request.question, category, "mock", start)
+            return mock_response
         except Exception as openai_error:
             # jika gagal, gunakan fallback
-            logger.warning(f"fallback ke mock response: {str(openai_error)}")
-            return await ask_ai_mock(request)
-        
+            logger.warning("fallback ke mock response: %s", openai_error)
+            metrics.fallback(type(openai_error).__name__)
+            with metrics.stage("fallback"):
+                mock_response = mock_response_for(category, tenant)
+            session_store.record(session, request.question, mock_response.response)
+            metrics.observe_request("mock", time.perf_counter() - start)
+            log_request(request.question, category, "mock", start)
+            return mock_response
+        
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"error saat memproses permintaan: {str(e)}")
+        logger.error("error saat memproses permintaan: %s", e)
         raise HTTPException(status_code=500, detail=f"Terjadi kesalahan: {str(e)}")
 
+# jawaban batch dari jalur cepat atau cache, None jika harus ke openai
+async def local_batch_answer(question: str, category: str, cache_key: str, tenant: Tenant, start: float):
+    fast_answer = tenant.fast_path.answer(question, category, tenant.classifier)
+    if fast_answer is not None:
+        return {"response": fast_answer, "source": "fast_path", "duration_ms": (time.perf_counter() - start) * 1000}
+    cached_response = await get_cached_response(question, category, cache_key, tenant)
+    if cached_response is not None:
+        return {"response": cached_response, "source": "cache", "duration_ms": (time.perf_counter() - start) * 1000}
+    return None
+
+# jawaban batch dari openai, antre lewat semaphore batch. tidak ada fallback
+# mock supaya error upstream terlihat per pertanyaan
+async def upstream_batch_answer(question: str, category: str, cache_key: str, semaphore: asyncio.Semaphore,
+                                tenant: Tenant, start: float) -> dict:
+    try:
+        prompt = create_context_aware_prompt(question, tenant)
+        async with semaphore:
+            response_text = await call_openai_api(prompt)
+        await store_cached_response(question, category, cache_key, response_text, tenant)
+        return {"response": response_text, "source": "openai", "duration_ms": (time.perf_counter() - start) * 1000}
+    except Exception as e:
+        logger.warning("pertanyaan batch gagal: %s", e)
+        return {"error": str(e), "duration_ms": (time.perf_counter() - start) * 1000}
+
+# jawab satu pertanyaan batch: jalur cepat dan cache langsung dijawab, sisanya antre ke openai
+async def answer_batch_item(question: str, category: str, cache_key: str, semaphore: asyncio.Semaphore,
+                            tenant: Tenant = None) -> dict:
+    start = time.perf_counter()
+    tenant = tenant or default_tenant
+    local = await local_batch_answer(question, category, cache_key, tenant, start)
+    if local is not None:
+        return local
+    return await upstream_batch_answer(question, category, cache_key, semaphore, tenant, start)
+
+# satu pertanyaan pre-warm, lewat jalur yang sama dengan /ask/batch
+async def prewarm_question(question: str, semaphore: asyncio.Semaphore) -> dict:
+    category = categorize_question(question)
+    cache_key = make_cache_key(question, category, profile_hash)
+    return await answer_batch_item(question, category, cache_key, semaphore)
+
+# endpoint batch untuk pre-warm dan uji regresi jawaban
+@app.post("/ask/batch", response_model=BatchResponse)
+async def ask_ai_batch(request: BatchQuestionRequest, http_request: Request = None):
+    if len(request.questions) > batch_max_questions:
+        raise HTTPException(status_code=400, detail=f"Maksimal {batch_max_questions} pertanyaan per batch")
+
+    start = time.perf_counter()
+    logger.info("batch diterima: %s pertanyaan", len(request.questions))
+
+    # pertanyaan dengan kunci cache yang sama hanya dijawab sekali
+    tenant = request_tenant(http_request)
+    keys = []
+    unique = {}
+    for question in request.questions:
+        category = tenant.categorize(question)
+        cache_key = make_cache_key(question, category, tenant.cache_namespace)
+        keys.append(cache_key)
+        if cache_key not in unique:
+            unique[cache_key] = (question, category)
+
+    answers = {}
+    pending = {}
+    for cache_key, (question, category) in unique.items():
+        local = await local_batch_answer(question, category, cache_key, tenant, time.perf_counter())
+        if local is not None:
+            answers[cache_key] = local
+        else:
+            pending[cache_key] = (question, category)
+
+    # satu batch dihitung satu pertanyaan di rate limiter, berapa pun isinya:
+    # ukuran batch sudah dibatasi batch_max_questions dan panggilan openai
+    # paralelnya oleh batch_concurrency. batch yang ditolak langsung 429
+    # karena batch tidak punya fallback mock
+    if pending:
+        try:
+            rate_limiter.acquire(rate_limiter.client_key(http_request))
+        except AdmissionRejected as rejected:
+            raise admission_rejected_error(rejected)
+
+    semaphore = asyncio.Semaphore(batch_concurrency)
+    start_upstream = time.perf_counter()
+    upstream_answers = await asyncio.gather(*(
+        upstream_batch_answer(question, category, cache_key, semaphore, tenant, start_upstream)
+        for cache_key, (question, category) in pending.items()
+    ))
+    answers.update(zip(pending, upstream_answers))
+
+    results = [BatchItemResponse(question=question, **answers[cache_key]) for question, cache_key in zip(request.questions, keys)]
+    return BatchResponse(results=results, duration_ms=(time.perf_counter() - start) * 1000)
+
+# format satu event server-sent events
+def sse_event(data: dict, event: str = None) -> str:
+    message = f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+    if event:
+        message = f"event: {event}\n" + message
+    return message
+
+# meneruskan token dari openai sebagai sse, dengan fallback ke mock
+# jika upstream gagal sebelum ada token yang terkirim
+async def stream_ai_answer(request: QuestionRequest, prompt: str, category: str, cache_key: str,
+                           http_request: Request = None, session: str = None, start: float = None):
+    start = start if start is not None else time.perf_counter()
+    normalizer = StreamingNormalizer()
+    parts = []
+
+    try:
+        # antrean penuh di sini selalu dijawab mock karena header 200 sudah terkirim
+        async with upstream_gate:
+            if not openai_breaker.allow():
+                raise CircuitOpenError("circuit breaker terbuka, upstream dilewati")
+            upstream_start = time.monotonic()
+            try:
+                async for delta in openai_client.stream_chat(prompt):
+                    text = normalizer.feed(delta)
+                    if text:
+                        parts.append(text)
+                        yield sse_event({"delta": text})
+                if not parts:
+                    raise ValueError("Tidak ada hasil dari OpenAI")
+            except Exception:
+                openai_breaker.record(True, time.monotonic() - upstream_start)
+                raise
+            except BaseException:
+                openai_breaker.release()
+                raise
+            openai_breaker.record(False, time.monotonic() - upstream_start)
+        logger.info("stream respons dari openai selesai")
+        answer = "".join(parts)
+        if cache_key:
+            await store_cached_response(request.question, category, cache_key, answer, request_tenant(http_request))
+        session_store.record(session, request.question, answer)
+        metrics.observe_request("openai", time.perf_counter() - start)
+        log_request(request.question, category, "openai", start, prompt, answer)
+    except Exception as openai_error:
+        if parts:
+            logger.error("stream openai terputus: %s", openai_error)
+            yield sse_event({"detail": "Stream terputus"}, event="error")
+        else:
+            logger.warning("fallback ke mock response: %s", openai_error)
+            metrics.fallback(type(openai_error).__name__)
+            mock_response = mock_response_for(category, request_tenant(http_request))
+            session_store.record(session, request.question, mock_response.response)
+            metrics.observe_request("mock", time.perf_counter() - start)
+            log_request(request.question, category, "mock", start)
+            yield sse_event({"delta": mock_response.response})
+
+    yield sse_event({"done": True}, event="done")
+
+# endpoint streaming, token dikirim begitu diterima dari openai
+@app.post("/ask/stream")
+async def ask_ai_stream(request: QuestionRequest, http_request: Request = None):
+    start = time.perf_counter()
+    logger.info("pertanyaan stream diterima: %s", request.question)
+
+    # jawaban jalur cepat atau yang sudah ada di cache dikirim sebagai satu event
+    tenant = request_tenant(http_request)
+    session = session_key(request, tenant)
+    with metrics.stage("categorize"):
+        category = tenant.categorize(request.question)
+    metrics.category(category)
+    with metrics.stage("fast_path"):
+        history = session_store.history(session, request.question)
+        cached_response = tenant.fast_path.answer(request.question, category, tenant.classifier, followup=bool(history))
+    source = "fast_path"
+    cache_key = None
+    if cached_response is None:
+        source = "cache"
+        with metrics.stage("cache_lookup"):
+            cache_key = make_cache_key(request.question, category, tenant.cache_namespace) if not history else None
+            cached_response = await get_cached_response(request.question, category, cache_key, tenant) if cache_key else None
+    if cached_response is not None:
+        session_store.record(session, request.question, cached_response)
+        metrics.observe_request(source, time.perf_counter() - start)
+        log_request(request.question, category, source, start)
+        events = [sse_event({"delta": cached_response}), sse_event({"done": True}, event="done")]
+        return StreamingResponse(iter(events), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    # rate limit dicek sebelum stream dimulai supaya 429 masih bisa dikirim
+    try:
+        rate_limiter.acquire(rate_limiter.client_key(http_request))
+    except AdmissionRejected as rejected:
+        logger.warning("request ditolak admission control: %s", rejected)
+        if admission_overflow == "reject":
+            raise admission_rejected_error(rejected)
+        metrics.fallback(type(rejected).__name__)
+        mock_response = mock_response_for(category, tenant)
+        session_store.record(session, request.question, mock_response.response)
+        metrics.observe_request("mock", time.perf_counter() - start)
+        log_request(request.question, category, "mock", start)
+        events = [sse_event({"delta": mock_response.response}), sse_event({"done": True}, event="done")]
+        return StreamingResponse(iter(events), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    with metrics.stage("prompt"):
+        prompt = create_context_aware_prompt(request.question, tenant, history)
+
+    return StreamingResponse(
+        stream_ai_answer(request, prompt, category, cache_key, http_request, session, start),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # endpoint mock dengan respons yang lebih kontekstual dan format yang lebih baik
 @app.post("/ask-mock", response_model=AIResponse)
-async def ask_ai_mock(request: QuestionRequest):
+async def ask_ai_mock(request: QuestionRequest, http_request: Request = None):
     try:
-        question = request.question.lower()
-        category = categorize_question(question)
-        
-        # variasi pembuka yang lebih natural
-        pembuka = [
-            "Hai! ",
-            "Oke, ",
-            "Hmm, soal itu... ",
-            "Menarik pertanyaannya! ",
-            "Kalau ditanya soal itu, ",
-            "Ah, ",
-            "Well, "
-        ]
-        
-        # respons untuk pertanyaan personal
-        if category.startswith("personal_"):
-            redirects = {
-                "personal_relationship": [
-                    "Waduh, aku nggak bisa jawab soal kehidupan pribadi kayak gitu hehe. Yang jelas, saat ini aku lagi fokus banget sama karir di data science. Lagi seru ngulik beberapa proyek algoritma seperti Rush Hour Puzzle Solver yang pakai algoritma UCS, Greedy, A*, dan Dijkstra.",
-                    "Hmm, aku kurang nyaman bahas hal-hal personal seperti itu. Aku lebih suka cerita tentang proyek Rush Hour Puzzle Solver yang sedang kukerjakan. Ini proyek yang menantang karena perlu implementasi algoritma pathfinding dengan visualisasi interaktif.",
-                    "Hehe, aku nggak bisa jawab pertanyaan pribadi begitu. Aku lebih suka fokus ke pengembangan skill di bidang data science. Belakangan ini lagi mendalami pandas dan scikit-learn untuk analisis data."
-                ],
-                "personal_financial": [
-                    "Wah, maaf aku nggak bisa share info finansial seperti itu. Yang bisa aku ceritakan, aku sekarang fokus di data science dan pengembangan algoritma. Proyek terbaru yang kukerjakan adalah Rush Hour Puzzle Solver dengan implementasi berbagai algoritma pathfinding.",
-                    "Hmm, soal finansial aku kurang nyaman untuk bahas. Aku lebih senang cerita tentang proyek data science dan pengembangan algoritma seperti Rush Hour Puzzle Solver yang mengimplementasikan UCS, Greedy Best-First Search, A*, dan Dijkstra."
-                ],
-                "personal_contact": [
-                    "Maaf, aku nggak bisa share info kontak personal. Kalau mau tau lebih banyak tentang proyekku, aku lagi fokus di algoritma pencarian untuk game puzzle seperti Little Alchemy 2 Solver yang mengimplementasikan BFS dan DFS.",
-                    "Hmm, untuk informasi kontak pribadi aku nggak bisa share ya. Aku senang kalau kamu tertarik dengan kerjaan dan proyekku di bidang data science."
-                ],
-                "personal_age": [
-                    "Hehe, soal umur dan tanggal lahir itu agak personal ya. Yang jelas, aku udah cukup lama berkecimpung di dunia data science dan coding, sekitar 2 tahun pengalaman di pengembangan web dan 1 tahun di data science.",
-                    "Daripada bahas umur yang agak personal, mending aku cerita kalau aku punya pengalaman sekitar 2 tahun pengalaman di pengembangan web dan 1 tahun di data science dan lagi fokus mengembangkan skill di data science."
-                ],
-                "personal_religion": [
-                    "Untuk hal-hal pribadi seperti itu, aku kurang nyaman membahasnya. Kalau soal profesional, aku bisa cerita kalau aku fokus di data science dan lagi mengerjakan beberapa proyek menarik tentang algoritma pencarian."
-                ]
-            }
-            
-            # pilih respons sesuai kategori personal, atau gunakan default jika kategori tidak spesifik
-            if category in redirects:
-                responses = redirects[category]
-            else:
-                responses = [
-                    "Hmm, itu pertanyaan yang agak personal, jadi aku nggak bisa jawab dengan spesifik. Yang bisa aku share, aku fokus di bidang data science dan lagi seru mengerjakan beberapa proyek algoritma menarik seperti Rush Hour Puzzle Solver dan Algoritma Pencarian Little Alchemy 2.",
-                    "Maaf, untuk hal-hal personal seperti itu aku kurang nyaman membahasnya. Tapi aku senang sharing tentang proyek-proyek data science dan algoritma yang sedang kukerjakan seperti Rush Hour Puzzle Solver yang menggunakan berbagai algoritma pathfinding."
-                ]
-                
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-        
-        # respons berdasarkan kategori yang lebih spesifik
-        elif category == "keahlian":
-            responses = [
-                "Aku paling jago di bidang Python, Data Science, dan Next.js. Terutama untuk data science, aku senang menggunakan pandas dan scikit-learn untuk analisis data. Selain itu, aku juga cukup mahir dengan Python yang kugunakan hampir setiap hari.",
-                "Skill utamaku ada di data science dan frontend development. Untuk data science, aku sering pakai Python dengan pandas dan matplotlib untuk visualisasi. Di sisi frontend, Next.js jadi tool favorit untuk bikin aplikasi web interaktif.",
-                "Kalau skill teknis, aku cukup percaya diri dengan data science yang sudah kudalami selama 1 tahun. Framework yang sering kupakai adalah pandas, scikit-learn, dan matplotlib untuk visualisasi data."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "proyek":
-            responses = [
-                "Proyek yang paling kubanggakan adalah Rush Hour Puzzle Solver. Program ini menyelesaikan puzzle Rush Hour menggunakan algoritma pathfinding seperti UCS, Greedy Best-First Search, A*, dan Dijkstra. Dilengkapi dengan CLI dan GUI untuk visualisasi solusi. Proyek ini mengajarkan banyak hal tentang kompleksitas algoritma pencarian dan struktur data yang efisien.",
-                "Salah satu proyek favoritku adalah Algoritma Pencarian Little Alchemy 2. Ini proyek implementasi BFS, DFS, dan Bidirectional Search untuk mencari kombinasi recipe dalam permainan. Rasanya puas banget pas algoritma berhasil menemukan kombinasi resep yang optimal.",
-                "Aku pernah bikin Rush Hour Puzzle Solver yang cukup menantang. Program ini menyelesaikan puzzle Rush Hour menggunakan algoritma pathfinding seperti UCS, Greedy Best-First Search, A*, dan Dijkstra. Proyek ini jadi salah satu portofolio utama yang sering kutunjukkan ke potential employer karena kompleksitas algoritmanya."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "tantangan_proyek":
-            responses = [
-                "Tantangan terbesar dalam proyek Rush Hour Puzzle Solver adalah mengoptimalkan algoritma A* dengan heuristik custom agar performa lebih baik. Tadinya algoritma lambat banget untuk puzzle kompleks, tapi setelah optimasi, waktu komputasi berkurang hingga 80%. Tantangan lainnya adalah visualisasi state puzzle yang interaktif dengan library grafis yang terbatas.",
-                "Saat mengerjakan Algoritma Pencarian Little Alchemy 2, tantangan utamanya ada di memaksimalkan efisiensi algoritma untuk pencarian kombinasi recipe yang jumlahnya ratusan. Aku harus implementasi Bidirectional search untuk mengatasi bottleneck pada graf hubungan recipe yang super kompleks. Hasilnya, pencarian jadi jauh lebih cepat dibanding BFS standar.",
-                "Di proyek IQ Puzzler Pro Solver, tantangan terberatnya adalah state space yang sangat besar karena banyaknya kombinasi yang mungkin. Awalnya, algoritma brute force standard selalu crash karena stack overflow. Akhirnya, berhasil mengatasinya dengan implementasi backtracking dengan pruning yang super efisien."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-
-        elif category == "hobi":
-            hobby = random.choice(user_profile['hobi'])
-            responses = [
-                f"Di luar coding, aku suka banget {hobby.lower()}. Menurutku ini bagus untuk refresh otak setelah lama menatap layar dan coding. Kadang juga traveling ke destinasi lokal kalau weekend dan cuacanya bagus.",
-                f"Kalau lagi senggang, biasanya aku {hobby.lower()}. Ini jadi semacam 'me time' yang penting untuk balance kerja-hidup. Hobi ini juga sering memberi inspirasi baru untuk proyek-proyek data science.",
-                f"Hobi utamaku adalah {hobby.lower()} dan kadang hiking di akhir pekan. Hobi ini benar-benar membantu menyegarkan pikiran dari pekerjaan teknis sehari-hari di data science."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "pendidikan":
-            responses = [
-                "Aku masih kuliah di ITB jurusan Teknik Informatika, sekarang lagi semester 4 nih. Sebelumnya, aku sekolah di SD Islam Al Azhar 23 Jatikramat, SMP Islam Al Azhar 9 Kemang Pratama, dan SMA Negeri 5 Bekasi. Masuk ITB karena memang tertarik banget sama teknologi dan ilmu komputer.",
-                "Saat ini aku masih mahasiswa semester 4 di Teknik Informatika ITB. Dulu aku berjuang keras belajar untuk bisa lolos seleksi SBMPTN. Sebelumnya bersekolah di SD Islam Al Azhar 23, SMP Islam Al Azhar 9, dan SMAN 5 Bekasi. Alhamdulillah keterima di Teknik Informatika yang memang jadi cita-citaku.",
-                "Aku masih kuliah semester 4 di ITB jurusan Teknik Informatika. Jenjang pendidikan sebelumnya di SD Islam Al Azhar 23 Jatikramat, dilanjutkan ke SMP Islam Al Azhar 9 Kemang Pratama, lalu SMAN 5 Bekasi. Meskipun tugasnya banyak dan berat, tapi justru di ITB aku belajar banyak tentang problem-solving dan algoritma yang seru."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "mata_kuliah":
-            responses = [
-                "Pelajaran favoritku sejak dulu adalah Matematika. Di kuliah sekarang juga aku suka banget mata kuliah yang berhubungan dengan matematika dan algoritma. Ada kepuasan tersendiri saat bisa memecahkan problem matematika yang kompleks, dan ilmunya sangat berguna untuk data science yang membutuhkan analisis kuantitatif.",
-                "Aku paling suka mata kuliah Matematika, baik waktu sekolah maupun sekarang kuliah. Di ITB, mata kuliah matematika seperti Kalkulus, Aljabar Linear, dan Matematika Diskrit jadi fondasi penting untuk algoritma dan data science. Suka banget momen 'eureka' saat berhasil memecahkan soal matematika yang challenging.",
-                "Dari dulu aku memang suka Matematika. Di jurusan Teknik Informatika, kemampuan matematika sangat penting terutama untuk mata kuliah algoritma dan struktur data. Matematika ini juga sangat membantu dalam pemodelan dan analisis data di bidang data science yang sedang kufokuskan."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "data_science":
-            responses = [
-                "Data science adalah salah satu passion utamaku. Aku mulai belajar dari hal-hal sederhana seperti Excel dan visualisasi data dasar, lalu berkembang ke Python dengan pandas dan scikit-learn. Visualisasi data pakai matplotlib juga jadi bagian yang menyenangkan karena bisa mengubah angka menjadi insight yang mudah dipahami.",
-                "Di bidang data science, aku fokus pada pengolahan data dan visualisasi. Awalnya mulai dari Excel dan visualisasi sederhana, sekarang sudah pakai tools yang lebih advanced. Salah satu proyek menarik yang pernah kukerjakan adalah analisis data menggunakan pandas untuk menemukan pola dan tren pada dataset kompleks.",
-                "Sebagai data scientist, aku banyak menggunakan Python dengan library seperti pandas, numpy, dan scikit-learn. Perjalananku di data science dimulai dari Excel dan visualisasi data sederhana, yang kemudian berkembang ke analisis yang lebih kompleks. Aku tertarik dengan bagaimana kita bisa mengekstrak informasi berharga dari data mentah."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "tools":
-            tools = list(user_profile['tools_favorit'].keys())
-            favorite_tool = random.choice(tools)
-            tool_desc = user_profile['tools_favorit'][favorite_tool]
-            
-            responses = [
-                f"Tool favoritku untuk coding adalah {favorite_tool} ({tool_desc}). Untuk data science, aku sering pakai Python dengan pandas dan matplotlib. VS Code jadi editor favorit dengan banyak extension yang mempercepat workflow. Jupyter Notebook juga essential untuk eksplorasi data dan eksperimen algoritma.",
-                f"Aku paling sering pakai {favorite_tool} untuk development. Selain itu, untuk data science aku selalu pakai pandas dan scikit-learn di Python. Git juga jadi tool wajib untuk version control, terutama saat kolaborasi dengan tim. Figma kadang kupakai untuk wireframing sederhana sebelum coding.",
-                f"Kalau soal tools, {favorite_tool} jadi andalanku. Untuk IDE, VS Code dengan berbagai extension-nya bikin produktivitas meningkat. Jupyter Notebook juga sangat membantu untuk eksplorasi data interaktif. Library seperti pandas, matplotlib, dan numpy jadi daily toolkit untuk pekerjaan data science."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "prestasi":
-            achievement = random.choice(user_profile['prestasi'])
-            
-            responses = [
-                f"Salah satu pencapaian yang cukup kubanggakan adalah {achievement}. Ini jadi bukti bahwa kerja keras dan passion di bidang data science dan algoritma akan membuahkan hasil. Pengalaman jadi asisten praktikum juga mengajarkan banyak tentang cara menjelaskan konsep teknis dengan lebih mudah dipahami.",
-                f"Aku pernah meraih {achievement} yang jadi motivasi untuk terus berkarya. Pencapaian ini mengajarkanku tentang pentingnya kolaborasi dan inovasi dalam teknologi data. Kontribusi ke proyek open source juga membuka jaringan dengan developer lain yang punya minat sama.",
-                f"Yang cukup memorable adalah waktu {achievement}. Rasanya jadi validasi atas upaya yang selama ini kulakukan dan membuatku semakin percaya diri dengan arah karir di data science. Kompetisi tersebut menguji kemampuan problem-solving dan implementasi algoritma dalam deadline yang ketat."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "lomba":
-            responses = [
-                "Aku pernah ikut beberapa lomba, tapi yang paling berkesan adalah Datavidia UI. Lomba ini berkesan karena tingkat kesulitannya yang kompleks dalam analisis data dan machine learning. Kami harus mengolah dataset besar dengan noise, membuat feature engineering kreatif, dan mengoptimalkan model dalam waktu terbatas.",
-                "Datavidia UI adalah lomba yang paling berkesan buatku. Lombanya menantang banget karena harus menghasilkan prediksi akurat dari data yang super berantakan. Tim kami harus lembur 2 hari untuk preprocessing data dan fine-tuning model. Meskipun nggak juara, pengalaman dan skillset baru yang kudapat sangat berharga.",
-                "Pernah ikut Datavidia UI yang menurutku jadi lomba paling menantang. Challenge-nya soal kompleksitas data yang harus dianalisis dan keterbatasan waktu. Saat itu kami menghadapi dataset dengan banyak missing values dan outliers yang bikin pusing. Tapi justru dari lomba ini aku belajar banyak teknik cleaning dan preprocessing data."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "karakter":
-            responses = [
-                "Teman-teman biasanya menggambarkan aku sebagai orang yang kreatif, analitis, detail-oriented, dan suka belajar hal baru. Aku juga termasuk orang yang mudah berkenalan dengan orang baru, tidak terlalu pemalu atau introvert. Dalam tim, aku suka membantu mencari solusi dari masalah-masalah teknis.",
-                "Aku cenderung mudah bergaul dan berkenalan dengan orang baru, jadi bukan tipe yang pemalu. Karakterku kreatif, analitis, detail-oriented, dan selalu ingin belajar hal baru. Temen-temen bilang aku orangnya problem solver yang suka memecah masalah kompleks jadi bagian-bagian yang lebih mudah ditangani.",
-                "Aku bukan orang yang pemalu, malah cenderung extrovert dan mudah berkenalan dengan orang baru. Karakterku adalah kreatif, analitis, detail-oriented, dan selalu penasaran untuk belajar teknologi baru. Dalam diskusi kelompok, aku biasanya aktif menyumbang ide dan mencoba memahami perspektif semua orang."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "portofolio_tech":
-            responses = [
-                "Portofolio ini dibangun pakai teknologi modern dengan Next.js, TypeScript, dan Tailwind CSS di frontend, serta Python FastAPI di backend. Komponen UI-nya menggunakan Shadcn UI dan ada efek animasi smooth dari Framer Motion. Fitur utamanya adalah asisten AI yang menjawab pertanyaan tentang profilku, ditenagai oleh OpenAI API di backend.",
-                "Website portfolio ini dibuat dengan stack Next.js dan TypeScript untuk frontend, dengan styling Tailwind CSS dan komponen Shadcn UI yang rapi. Backend-nya pakai Python FastAPI yang ngehubungin ke OpenAI API. Aku suka kombinasi ini karena Next.js sangat powerful untuk frontend dan Python gampang untuk integrasi AI.",
-                "Tech stack buat portofolio ini cukup modern: Next.js + TypeScript + Tailwind CSS untuk frontend, dengan tambahan komponen Shadcn UI yang elegan. Backend-nya pakai Python FastAPI yang terhubung ke OpenAI API. Deploment frontend di Vercel dan backend di Railway. Desainnya mengikuti prinsip mobile-first dengan UI/UX yang clean dan responsif."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "rencana":
-            responses = [
-                "Ke depannya, setelah lulus aku ingin fokus memperdalam keahlian di bidang data science dan algoritma, lulus dengan prestasi terbaik, dan berkarir di perusahaan teknologi terkemuka. Dalam 5 tahun ke depan, targetku jadi data science specialist yang bisa memimpin proyek-proyek analisis data skala besar.",
-                "Rencanaku setelah lulus nanti adalah fokus memperdalam keahlian di bidang data science dan algoritma, lulus dengan prestasi terbaik, dan berkarir di perusahaan teknologi terkemuka. Dalam 5 tahun, aku pengen jadi expert di bidang data engineering dan analytics yang bisa memberikan impact nyata bagi bisnis.",
-                "Dalam 5 tahun ke depan, aku berencana untuk menjadi professional di bidang data science dengan spesialisasi di data visualization dan predictive analytics. Fokus utamaku sekarang adalah memperdalam keahlian di bidang data science dan algoritma, lulus dengan prestasi terbaik, dan mendapatkan posisi bagus di perusahaan teknologi terkemuka."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "lokasi":
-            responses = [
-                "Aku tinggal di Jakarta, Indonesia. Kota ini punya komunitas developer dan data scientist yang aktif dengan banyak meetup dan diskusi menarik. Meskipun kemacetannya kadang bikin stres, tapi Jakarta punya akses bagus ke banyak perusahaan teknologi dan startup.",
-                "Saat ini base-ku di Jakarta, Indonesia. Cukup strategis untuk kerja remote maupun onsite dengan berbagai perusahaan teknologi dan data. Banyak acara tech dan data science meetup yang sering kuhadiri buat networking dan update knowledge terbaru di industri.",
-                "Domisili di Jakarta, Indonesia. Suka dengan dinamika kota ini meskipun kadang macetnya bikin frustrasi. Tapi dekat dengan banyak tech hub dan komunitas IT yang aktif. Jakarta juga punya banyak coworking space keren yang jadi tempat alternatif saat bosan kerja di rumah."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "pekerjaan":
-            responses = [
-                "Saat ini aku masih mahasiswa semester 4 di ITB jurusan Teknik Informatika. Belum bekerja full-time, tapi aku aktif sebagai asisten praktikum untuk mata kuliah Berpikir komputasional. Sambil kuliah juga sering bikin proyek-proyek coding untuk portfolio.",
-                "Aku masih fokus kuliah di semester 4 Teknik Informatika ITB. Untuk menambah pengalaman, aku jadi asisten praktikum dan kadang ngambil project kecil-kecilan. Masih panjang perjalanannya, tapi aku enjoy banget belajar dan bikin proyek yang menantang.",
-                "Belum kerja secara formal karena masih kuliah semester 4 di ITB. Aku aktif di beberapa kegiatan kampus, jadi panitia Arkavidia, dan pernah ikut beberapa lomba terkait hackathon. Fokus utama sekarang masih kuliah sambil mengembangkan skill teknis."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "pengalaman":
-            responses = [
-                "Meskipun masih kuliah semester 4, aku punya 2 tahun pengalaman di pengembangan web dan 1 tahun di data science. Pengalamanku di data science didapat dari proyek kuliah dan lomba-lomba yang kuikuti. Seru banget bisa belajar langsung dengan praktek.",
-                "Pengalaman coding dan data science-ku udah sekitar 2 tahun pengembangan web dan 1 tahun di data science. Meskipun masih kuliah semester 4, aku aktif ikut lomba, bikin proyek, dan jadi asisten praktikum yang nambah banyak jam terbang.",
-                "Aku punya pengalaman sekitar 2 tahun pengembangan web dan 1 tahun di data science. Sebagai mahasiswa semester 4, aku dapat banyak pengalaman dari tugas kuliah, lomba-lomba seperti hackathon, dan proyek-proyek kecil yang kukerjakan di luar kuliah."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "manajemen_waktu":
-            responses = [
-                "Manajemen waktuku di kuliah cukup ketat karena pace di ITB yang super cepat. Aku membagi waktu antara mengerjakan proyek, tugas besar, dan belajar untuk ujian dengan sangat disiplin. Biasanya aku pakai teknik Pomodoro dan time blocking untuk fokus, dan selalu reservasi waktu untuk istirahat dan hobi biar nggak burnout.",
-                "Di ITB, manajemen waktu jadi skill krusial buat survive. Aku punya sistem pembagian waktu antara kuliah, tugas, proyek, dan aktivitas lain dengan prioritas yang jelas. Kalender digital dan reminder jadi sahabatku. Kadang aku bikin 'time audit' untuk lihat apakah aktivitasku sesuai dengan prioritas dan goals.",
-                "Kunci manajemen waktuku adalah disiplin dan konsistensi. Aku membagi waktu dengan cermat antara mengerjakan proyek, tugas besar, dan persiapan ujian. Hal yang membantu adalah menyiapkan todo list di malam hari untuk esok, dan selalu reservasi 'deep work time' tanpa gangguan untuk tugas yang butuh konsentrasi penuh."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "manajemen_stres":
-            responses = [
-                "Kuliah di ITB memang udah sering melatih ketahanan menghadapi tekanan, jadi handling stres jadi skill wajib. Cara favoritku mengatasi stres adalah dengan menonton film horror/romance atau drama Korea untuk sejenak escape dari dunia coding. Kadang juga sempatkan olahraga ringan atau jalan-jalan singkat untuk me-refresh pikiran.",
-                "Buat handle stres, aku punya jurus jitu: nonton film horror atau romance, atau drama Korea yang seru. Kuliah di ITB dengan tekanannya yang tinggi bikin aku terbiasa dengan deadline dan ekspektasi tinggi. Aku juga percaya pentingnya deep breathing dan short breaks saat coding marathon untuk menjaga kejernihan pikiran.",
-                "Dengan tekanan akademik yang tinggi di ITB, aku belajar mengelola stres dengan baik. Biasanya aku menyempatkan menonton film horror/romance atau drama Korea sebagai escape. Kadang juga melakukan hobby lain seperti hiking di akhir pekan. Menurut pengalamanku, penting untuk punya 'mental shutdown time' di antara sesi coding intensif."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "cerita_kuliah":
-            responses = [
-                "Cerita menarik pas kuliah adalah waktu aku mengalami culture shock karena banyak yang sudah menggeluti dunia IT dari kecil sedangkan aku baru bergabung. Ini bikin aku merasa harus bekerja berkali-kali lipat dari yang lainnya. Tak hanya itu, aku juga kaget ternyata pace pembelajaran materi di ITB sangat amat cepat sehingga harus membagi waktu dengan sangat baik.",
-                "Salah satu cerita yang bikin aku kaget pas awal kuliah adalah melihat teman-teman yang sudah jago coding sejak SMP, sementara aku baru mulai serius di SMA. Ini jadi motivation shock yang bikin aku belajar lebih keras. Pace pembelajaran di ITB juga gila-gilaan cepat, dalam seminggu bisa numpuk beberapa tucil (tugas kecil) dan tubes (tugas besar) yang harus dikerjakan paralel.",
-                "Pengalaman culture shock terbesar di ITB adalah melihat gap kemampuan yang lebar antar mahasiswa. Banyak yang sudah expert di bidang IT sejak kecil, sementara aku baru mulai. Pace kuliah juga bikin aku kaget, dosen bisa ngejelasin materi super kompleks dalam waktu singkat dan langsung kasih tugas yang bikin melongo. Tapi justru tekanan ini yang bikin aku tumbuh lebih cepat secara teknis."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "organisasi":
-            responses = [
-                "Aku mengikuti beberapa kepanitiaan, salah satu kepanitiaan yang besar itu Arkavidia dan aku mengisi di divisi academy-nya yang mengelola bootcamp path data science. Pengalaman ini mengajarkan banyak tentang manajemen event, koordinasi tim, dan sharing knowledge tentang data science ke peserta dengan berbagai level pengalaman.",
-                "Pengalaman berorganisasi yang berkesan adalah jadi panitia Arkavidia di divisi academy untuk path data science. Tanggung jawabku termasuk menyusun kurikulum bootcamp, koordinasi dengan pemateri, dan memastikan peserta mendapat pengalaman belajar yang optimal. Seru banget bisa sharing knowledge sambil networking dengan profesional di industri.",
-                "Salah satu pengalaman berorganisasi yang signifikan adalah terlibat di kepanitiaan Arkavidia, event IT tahunan ITB. Aku di divisi academy yang mengurusi bootcamp data science. Peran ini mengajarkan soft skill berharga seperti leadership, komunikasi, dan project management yang ternyata sangat berguna melengkapi technical skill di dunia IT."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "belajar_mandiri":
-            responses = [
-                "Untuk belajar mandiri, aku punya strategi mix and match: online courses (Coursera, edX) untuk struktur materi, dokumentasi resmi untuk referensi teknis, dan proyek-proyek kecil untuk praktek. Yang penting adalah konsistensi daily practice, bahkan kalau cuma 20-30 menit sehari. Aku juga suka join forum diskusi dan komunitas untuk dapet insight dari sesama learner.",
-                "Belajar mandiri adalah skill vital buat developer. Strategiku adalah kombinasi structured learning via online courses dan exploratory learning dengan bereksperimen pada proyek pribadi. Aku mencatat konsep-konsep penting di Notion yang selalu kureview secara berkala. Selalu set small achievable goals biar ada momentum dan rasa progress.",
-                "Kunci belajar mandiri menurut pengalamanku adalah active learning: jangan cuma nonton tutorial, tapi langsung praktek dengan coding. Aku suka bikin proyek kecil untuk mengaplikasikan konsep baru yang kupelajari. Tetap update dengan trends via newsletter dan podcast teknis. Paling penting adalah growth mindset dan sabar dengan diri sendiri saat proses belajar."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "belajar_kegagalan":
-            responses = [
-                "Pelajaran paling berharga dari kegagalan akademikku adalah jangan selalu menuruti coping mechanism diri sendiri. Dulu aku sering procrastinate dan burnout karena mengerjakan tugas last minute. Sekarang aku lebih aware akan pola self-sabotage dan berusaha membangun habits yang lebih sehat. Setiap kegagalan adalah data points untuk improve strategy belajar.",
-                "Kegagalan akademik mengajarkan aku tentang bahaya menuruti coping mechanism yang tidak sehat. Dulu, saat stres dengan deadline, aku sering masuk ke cycle procrastination-panic-rush yang buruk. Sekarang aku belajar menghadapi ketidaknyamanan di awal dan start early pada tugas besar. Kegagalan juga mengajarkan pentingnya seek help dan kolaborasi.",
-                "Hal terpenting yang kupelajari dari kegagalan akademik adalah jangan terjebak pada coping mechanism yang destruktif. Aku dulu terjebak dalam pola menunda pekerjaan, lalu kerja marathon yang berujung burnout. Sekarang kupecah tugas besar jadi task-task kecil yang manageable, dan selalu refleksi apa yang worked dan tidak worked dari approach sebelumnya."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "kerja_tim":
-            responses = [
-                "Dalam kerja tim, aku biasanya liat dulu situasinya: apakah ada yang mau menginisiasi jadi leader, kalau benar-benar gaada baru aku ambil peran itu. Kalau ada konflik, aku cenderung jadi mediator yang fokus ke akar masalah, bukan ke personality. Aku percaya clear communication dan explicit expectations adalah kunci untuk meminimalisir kebanyakan konflik tim.",
-                "Gaya kerja tim aku cukup adaptif. Aku lebih suka observe dulu dinamika kelompok, baru ambil peran leader kalau memang dibutuhkan. Untuk konflik, pendekatanku adalah focus on facts, not fault. Aku mencoba mencari common ground dan memastikan semua pihak merasa didengar. Task tracking dan dokumentasi yang rapi juga sangat membantu mengurangi miscommunication.",
-                "Aku mengatasi konflik dalam tim dengan pendekatan problem-solving: identifikasi masalah real-nya, cari potential solutions, dan diskusikan trade-offs. Gaya kerjaku adalah observe dulu, baru ambil inisiatif jadi leader kalau memang tidak ada yang mengambil peran tersebut. Aku juga percaya pentingnya clear role dan responsibility distribution dari awal untuk menghindari overlaps dan gaps."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "kebiasaan_ngoding":
-            responses = [
-                "Terkadang aku memang lebih produktif ngoding malam-malam. Entah kenapa pikiran lebih jernih dan fokus saat dunia lebih sepi. Tapi tetap kuatur supaya tidak mengganggu siklus tidur. Aku biasanya setup IDE dengan dark mode, punya playlist instrumental khusus, dan pastikan punya snack sehat di dekat meja untuk coding marathon.",
-                "Iya, aku kadang lebih suka ngoding malam hari karena merasa lebih encer buat mikir dan lebih tenang tanpa distraksi. Tapi nggak selalu sih, biasanya tergantung complexity task-nya. Untuk project yang butuh kreativitas dan problem-solving, malam memang jadi waktu favorit. Setup coding space yang nyaman dan music lofi jadi pendukung penting productive night coding.",
-                "Kalau ditanya soal ngoding malam, kadang memang iya. Ada sweet spot dimana otak serasa lebih clear dan creative di jam-jam tertentu di malam hari. Tapi aku juga nggak mau jadi night owl terus karena impacts ke kesehatan. Jadi sekarang lebih ke arah flexible: simple tasks di siang, complex problems di malam, dan tetap prioritasin cukup istirahat."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "lagu_favorit":
-            responses = [
-                "Untuk saat ini, aku seneng dengerin Without You dari Air Supply, liriknya dalem dan relate banget sama aku. Kalau lagu Indonesia, aku suka denger Glenn Fredly kayak 'Sekali Ini Saja'. Pas lagi ngoding, aku condong ke lagu oldies atau 'old but gold' dengan artis kayak Bee Gees, Westlife, dan Backstreet Boys yang nggak terlalu ganggu fokus.",
-                "Lagu favoritku saat ini adalah Without You dari Air Supply, liriknya bener-bener mengena. Juga suka lagu-lagu Glenn Fredly seperti 'Sekali Ini Saja'. Ketika ngoding, playlist-ku biasanya berisi lagu-lagu klasik dari era 90an dan 2000an seperti hits dari Bee Gees, Westlife, atau Backstreet Boys yang bikin mood coding jadi lebih enak.",
-                "Aku pecinta musik oldies! Saat ngoding suka dengerin Bee Gees, Westlife, atau Backstreet Boys yang bikin nostalgia. Lagu favorit saat ini Without You dari Air Supply karena liriknya yang dalam dan relate dengan pengalaman pribadi. Untuk lagu Indonesia, aku suka karya-karya Glenn Fredly terutama 'Sekali Ini Saja' yang melodinya bikin nyaman."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        elif category == "moto_hidup":
-            responses = [
-                "Moto hidupku adalah 'Menuju tak terbatas dan melampauinya'. Bagiku ini adalah filosofi tentang selalu berusaha melampaui batasan yang ada, baik dalam pengembangan teknologi maupun pengembangan diri. Moto ini mengingatkanku untuk tidak cepat puas dengan pencapaian dan selalu mencari cara untuk mengembangkan skill dan knowledge lebih jauh lagi.",
-                "Aku punya moto 'Menuju tak terbatas dan melampauinya'. Ini mengingatkanku untuk selalu push boundaries dan jangan terjebak dalam comfort zone. Dalam konteks data science dan programming, moto ini jadi pengingat untuk terus belajar teknologi baru dan mencari solusi yang lebih efisien untuk masalah yang kuhadapi.",
-                "'Menuju tak terbatas dan melampauinya' adalah moto yang kupegang. Yap, memang terinspirasi Buzz Lightyear, tapi maknanya dalam bagiku. Ini tentang mindset bahwa selalu ada ruang untuk improvement dan inovasi. Dalam karir tech yang super fast-paced, moto ini jadi reminder untuk stay hungry for knowledge dan berani mengambil challenge baru."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-            
-        else:
-            # fallback untuk pertanyaan umum
-            responses = [
-                "Aku seorang mahasiswa dengan fokus di data science. Aku suka mengeksplorasi teknologi baru dan menerapkannya dalam proyek-proyek nyata. Oh iya, salah satu quote favoritku: 'Code is like humor. When you have to explain it, it's bad.'",
-                "Secara singkat, aku kreatif, analitis, detail-oriented, dan suka belajar hal baru yang bekerja sebagai mahasiswa. Fokus utamaku ada di data science dan frontend development. Saat ini sedang mengerjakan beberapa proyek algoritma yang menarik.",
-                "Aku adalah developer dan data scientist yang berbasis di Jakarta, Indonesia dengan spesialisasi di analisis data dan visualisasi. Selalu berusaha mengembangkan diri dan mencari tantangan baru di dunia teknologi."
-            ]
-            
-            response = random.choice(responses)
-            full_response = random.choice(pembuka) + response
-        
-        # Tambahkan penutup hanya dalam 30% kasus (untuk menghindari kalimat akhir yang terdengar tidak natural)
-        if random.random() > 0.7:
-            penutup = [
-                " Ada lagi yang mau kamu tanyakan?",
-                " Gimana menurutmu?",
-                " Moga membantu ya!",
-                " Ada yang masih kurang jelas?"
-            ]
-            full_response += random.choice(penutup)
-        
-        # normalisasi teks respons untuk menghindari spasi berlebih
-        normalized_response = normalize_text(full_response)
-        
-        return AIResponse(response=normalized_response)
+        start = time.perf_counter()
+        tenant = request_tenant(http_request)
+        category = tenant.categorize(request.question.lower())
+
+        # jawaban dipilih dari katalog yang sudah dirender saat startup
+        response = mock_response_for(category, tenant)
+        log_request(request.question, category, "mock", start)
+        return response
     except Exception as e:
-        logger.error(f"error saat memproses permintaan mock: {str(e)}")
+        logger.error("error saat memproses permintaan mock: %s", e)
         raise HTTPException(status_code=500, detail=f"Terjadi kesalahan: {str(e)}")
 
 # rute health check
 @app.get("/")
 async def root():
-    return {"message": "AI Portfolio Backend berjalan. Gunakan endpoint /ask untuk bertanya."}
+    # stats() cache menulis dan membaca sqlite jika cache disk aktif
+    cache = await asyncio.to_thread(response_cache.stats)
+    return {
+        "message": "AI Portfolio Backend berjalan. Gunakan endpoint /ask untuk bertanya.",
+        "worker": os.getpid(),
+        "cache": cache,
+        "semantic_cache": semantic_cache.stats() if semantic_cache is not None else None,
+        "singleflight": openai_singleflight.stats(),
+        "circuit_breaker": openai_breaker.stats(),
+        "hedge": openai_hedge.stats(),
+        "prewarm": prewarmer.last_run,
+        "profile": profile_store.stats(),
+        "tenants": tenant_registry.stats(),
+        "sessions": session_store.stats(),
+        "fast_path": fast_path.stats(),
+        "request_log": request_log.stats() if request_log is not None else None,
+        "traffic_capture": traffic_capture.stats() if traffic_capture is not None else None,
+        "rate_limit": rate_limiter.stats(),
+        "upstream_gate": upstream_gate.stats(),
+        "logging": log_pipeline.stats(),
+    }
+
+# metrik dalam format teks prometheus. dengan serve.py --workers N setiap
+# worker punya metrik sendiri dan scrape dilayani worker mana pun, jadi angka
+# di sini milik satu worker (lihat "worker" di /). hanya
+# response_cache_shared_hit_rate yang menjumlahkan semua worker
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics tidak aktif")
+    # render menyegarkan snapshot stats cache yang bisa memanggil sqlite
+    return PlainTextResponse(await asyncio.to_thread(metrics.render), media_type="text/plain; version=0.0.4")
 
 # menjalankan aplikasi
 if __name__ == "__main__":
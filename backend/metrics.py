@@ -0,0 +1,200 @@
+import os
+import time
+from bisect import bisect_left
+
+from structured_logging import record_stage
+
+# batas bucket histogram latensi dalam detik
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# counter dengan label, nilai disimpan per tuple label
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        # counter tanpa label langsung tampil dengan nilai 0
+        self._values = {} if labelnames else {(): 0}
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+# histogram dengan label. bucket disimpan non-kumulatif supaya observe cukup
+# satu bisect dan satu increment, dijumlahkan saat dirender
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}
+
+    def observe(self, value: float, labels: tuple = ()):
+        series = self._series.get(labels)
+        if series is None:
+            # [count per bucket (+Inf di akhir), sum, count]
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self):
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {count}"
+
+
+# gauge yang nilainya dibaca dari fungsi saat /metrics dipanggil. kind
+# "counter" untuk penghitung yang disimpan komponen lain
+class CallbackGauge:
+    def __init__(self, name: str, help_text: str, func, kind: str = "gauge"):
+        self.name = name
+        self.help_text = help_text
+        self.func = func
+        self.kind = kind
+
+    def samples(self):
+        yield f"{self.name} {_number(self.func())}"
+
+
+# hasil satu fungsi yang dibaca ulang sekali per render, untuk beberapa gauge
+# yang berasal dari stats() yang mahal (misalnya query ke sqlite)
+class Snapshot:
+    def __init__(self, func):
+        self.func = func
+        self.value = None
+
+    def refresh(self):
+        self.value = self.func()
+
+
+# pengukur waktu satu tahap, dipakai dengan with. tanpa histogram (metrics
+# dimatikan) durasi hanya dicatat untuk baris log per request
+class _StageTimer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    # durasi juga dicatat ke konteks request untuk baris log per request
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        if self.histogram is not None:
+            self.histogram.observe(elapsed, self.labels)
+        record_stage(self.labels[0], elapsed)
+        return False
+
+
+# metrik aplikasi dalam format teks prometheus. saat dimatikan semua method
+# langsung kembali tanpa mencatat apa pun, kecuali durasi tahap yang tetap
+# diukur untuk log per request
+class Metrics:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stage_seconds = Histogram("ask_stage_seconds", "Durasi per tahap pemrosesan pertanyaan.", ("stage",))
+        self.request_seconds = Histogram("ask_request_seconds", "Durasi total /ask dan /ask/stream per sumber jawaban.", ("source",))
+        self.upstream_responses = Counter("openai_responses_total", "Respons upstream openai per status code.", ("status",))
+        self.fallbacks = Counter("ask_fallback_total", "Jawaban mock karena openai gagal, per penyebab.", ("reason",))
+        self.categories = Counter("ask_category_total", "Pertanyaan per kategori classifier.", ("category",))
+        self.prompt_tokens = Counter("openai_prompt_tokens_total", "Token prompt yang dilaporkan openai.")
+        self.completion_tokens = Counter("openai_completion_tokens_total", "Token jawaban yang dilaporkan openai.")
+        self._stage_labels = {}
+        self._snapshots = []
+        self._collectors = [
+            self.stage_seconds, self.request_seconds, self.upstream_responses,
+            self.fallbacks, self.categories, self.prompt_tokens, self.completion_tokens,
+        ]
+
+    # membuat metrics dari variabel lingkungan
+    @classmethod
+    def from_env(cls) -> "Metrics":
+        return cls(enabled=os.getenv("METRICS_ENABLED", "1") != "0")
+
+    # tambahkan gauge yang dibaca dari state komponen lain (cache, breaker, dll)
+    def add_gauge(self, name: str, help_text: str, func):
+        self._collectors.append(CallbackGauge(name, help_text, func))
+
+    # counter yang nilainya sudah dihitung komponen lain (rate limiter, dll)
+    def add_counter(self, name: str, help_text: str, func):
+        self._collectors.append(CallbackGauge(name, help_text, func, kind="counter"))
+
+    # snapshot yang diperbarui di awal setiap render, gauge membaca .value
+    def snapshot(self, func) -> Snapshot:
+        snapshot = Snapshot(func)
+        self._snapshots.append(snapshot)
+        return snapshot
+
+    def stage(self, name: str):
+        labels = self._stage_labels.get(name)
+        if labels is None:
+            labels = self._stage_labels[name] = (name,)
+        return _StageTimer(self.stage_seconds if self.enabled else None, labels)
+
+    def observe_request(self, source: str, seconds: float):
+        if self.enabled:
+            self.request_seconds.observe(seconds, (source,))
+
+    # dipanggil oleh OpenAIClient untuk setiap respons (status None jika koneksi gagal)
+    def observe_upstream(self, status, usage: dict = None):
+        if not self.enabled:
+            return
+        self.upstream_responses.inc((str(status) if status is not None else "error",))
+        if usage:
+            self.prompt_tokens.inc(amount=usage.get("prompt_tokens", 0))
+            self.completion_tokens.inc(amount=usage.get("completion_tokens", 0))
+
+    def fallback(self, reason: str):
+        if self.enabled:
+            self.fallbacks.inc((reason,))
+
+    def category(self, category: str):
+        if self.enabled:
+            self.categories.inc((category,))
+
+    # seluruh metrik dalam format teks exposition prometheus
+    def render(self) -> str:
+        for snapshot in self._snapshots:
+            snapshot.refresh()
+        lines = []
+        for collector in self._collectors:
+            lines.append(f"# HELP {collector.name} {collector.help_text}")
+            lines.append(f"# TYPE {collector.name} {collector.kind}")
+            lines.extend(collector.samples())
+        return "\n".join(lines) + "\n"
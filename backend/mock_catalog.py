@@ -0,0 +1,109 @@
+import os
+import json
+import random
+
+from text_normalizer import normalize_text
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_catalog.json")
+
+# bagian katalog yang tidak bergantung pada profil, per objek data katalog.
+# objek data ikut disimpan supaya id-nya tidak dipakai ulang objek lain
+_static_parts = {}
+
+
+# ambil daftar pilihan dari profil untuk kategori yang menyebut data profil
+# (misalnya hobi atau tools), dict dipilih per pasangan kunci-nilai
+def _pick_options(profile: dict, key: str):
+    value = profile[key]
+    if isinstance(value, dict):
+        return tuple(value.items())
+    return tuple((item, "") for item in value)
+
+
+# katalog jawaban mock. file dibaca dan semua jawaban dirender serta
+# dinormalisasi sekali per versi profil, saat request hanya ada beberapa
+# pemilihan acak dari tuple yang sudah jadi
+class MockCatalog:
+    def __init__(self, data: dict, profile: dict, seed: int = None):
+        self.data = data
+        # seed tetap membuat urutan jawaban bisa diulang untuk pengujian
+        self.rng = random.Random(seed)
+        self.rebuild(profile)
+
+    # membuat katalog dari file json
+    @classmethod
+    def from_file(cls, path: str, profile: dict, seed: int = None) -> "MockCatalog":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), profile, seed=seed)
+
+    # membuat katalog dari variabel lingkungan
+    @classmethod
+    def from_env(cls, profile: dict) -> "MockCatalog":
+        seed = os.getenv("MOCK_SEED")
+        return cls.from_file(
+            os.getenv("MOCK_CATALOG_PATH", DEFAULT_CATALOG_PATH),
+            profile,
+            seed=int(seed) if seed else None,
+        )
+
+    # render ulang semua jawaban, dipanggil saat startup dan saat profil berubah.
+    # hanya kategori yang memakai data profil yang dirender per profil, sisanya
+    # dibagi oleh semua katalog (tenant) dengan data yang sama
+    def rebuild(self, profile: dict):
+        data = self.data
+        cached = _static_parts.get(id(data))
+        if cached is None:
+            cached = _static_parts[id(data)] = (data, self._build_static(data))
+        self._openers, self._closers, self._closer_threshold, self._static_entries, self._personal_default, self._default = cached[1]
+
+        # jawaban lama tetap dipakai jika profil baru gagal dirender. dict
+        # gabungan per katalog supaya answer cukup satu lookup, isinya dibagi
+        entries = dict(self._static_entries)
+        for category, spec in data["categories"].items():
+            if spec.get("pick") is not None:
+                entries[category] = self._build_entry(spec, profile)
+        self._entries = entries
+
+    def _build_static(self, data: dict) -> tuple:
+        # pembuka selalu diikuti jawaban, jadi spasi di ujungnya dipertahankan
+        openers = tuple(
+            normalize_text(opener) + (" " if opener[-1:].isspace() else "") for opener in data["openers"]
+        )
+        closers = tuple(
+            (" " if closer[:1].isspace() else "") + normalize_text(closer) for closer in data["closers"]
+        )
+        entries = {
+            category: self._build_entry(spec, None)
+            for category, spec in data["categories"].items() if spec.get("pick") is None
+        }
+        personal_default = self._build_entry({"responses": data["personal_default"]}, None)
+        default = self._build_entry({"responses": data["default"]}, None)
+        return openers, closers, 1 - data["closer_rate"], entries, personal_default, default
+
+    # (pakai data profil?, baris jawaban per pilihan profil)
+    def _build_entry(self, spec: dict, profile: dict):
+        pick = spec.get("pick")
+        if pick is None:
+            return False, (tuple(normalize_text(response) for response in spec["responses"]),)
+        rows = []
+        for item, detail in _pick_options(profile, pick):
+            fields = {"item": item, "item_lower": item.lower(), "detail": detail}
+            rows.append(tuple(normalize_text(response.format(**fields)) for response in spec["responses"]))
+        return True, tuple(rows)
+
+    # satu jawaban mock acak untuk kategori hasil classifier
+    def answer(self, category: str) -> str:
+        entry = self._entries.get(category)
+        if entry is None:
+            entry = self._personal_default if category.startswith("personal_") else self._default
+        picked, rows = entry
+
+        rng = self.rng
+        row = rng.choice(rows) if picked else rows[0]
+        response = rng.choice(row)
+        text = rng.choice(self._openers) + response
+
+        # penutup hanya ditambahkan pada sebagian jawaban supaya tidak terdengar kaku
+        if rng.random() > self._closer_threshold:
+            text += rng.choice(self._closers)
+        return text
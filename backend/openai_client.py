@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import logging
+
+import httpx
+
+from structured_logging import record_upstream_call
+
+logger = logging.getLogger(__name__)
+
+# system prompt yang dikirim bersama setiap permintaan
+SYSTEM_PROMPT = "Kamu adalah asisten virtual yang membantu menjawab pertanyaan tentang pemilik portfolio dengan cara yang personal, informatif, dan santai."
+
+# konfigurasi default, bisa di-override lewat variabel lingkungan
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_MODEL = "gpt-3.5-turbo"
+
+
+# cek apakah paket h2 tersedia untuk http/2
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# klien async untuk chat completions dengan koneksi keep-alive yang dipakai bersama
+class OpenAIClient:
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        model: str = DEFAULT_MODEL,
+        pool_size: int = 20,
+        keepalive: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        write_timeout: float = 10.0,
+        pool_timeout: float = 5.0,
+        http2: bool = True,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.limits = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=keepalive,
+        )
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=write_timeout,
+            pool=pool_timeout,
+        )
+        self.http2 = http2 and _http2_available()
+        self._client = None
+        # callback opsional observer(status_code, usage) untuk metrik, status
+        # None berarti request gagal sebelum ada respons
+        self.observer = None
+
+    # membuat klien dari variabel lingkungan
+    @classmethod
+    def from_env(cls) -> "OpenAIClient":
+        return cls(
+            base_url=os.getenv("OPENAI_BASE_URL", DEFAULT_BASE_URL),
+            model=os.getenv("OPENAI_MODEL", DEFAULT_MODEL),
+            pool_size=int(os.getenv("OPENAI_POOL_SIZE", "20")),
+            keepalive=int(os.getenv("OPENAI_POOL_KEEPALIVE", "10")),
+            connect_timeout=float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5")),
+            read_timeout=float(os.getenv("OPENAI_READ_TIMEOUT", "30")),
+            write_timeout=float(os.getenv("OPENAI_WRITE_TIMEOUT", "10")),
+            pool_timeout=float(os.getenv("OPENAI_POOL_TIMEOUT", "5")),
+            http2=os.getenv("OPENAI_HTTP2", "1") != "0",
+        )
+
+    # membuka pool koneksi, dipanggil saat aplikasi startup
+    async def start(self):
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=self.limits,
+            timeout=self.timeout,
+            http2=self.http2,
+        )
+        logger.info("pool koneksi openai dibuka (http2=%s)", self.http2)
+
+    # menutup pool koneksi, dipanggil saat aplikasi shutdown
+    async def close(self):
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+        logger.info("pool koneksi openai ditutup")
+
+    # menyusun header dan payload untuk satu prompt
+    def _build_request(self, prompt: str, **overrides):
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            logger.error("api key tidak ditemukan")
+            raise ValueError("OpenAI API key tidak ditemukan")
+
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        }
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": 800,
+            "temperature": 0.7
+        }
+        payload.update(overrides)
+        return headers, payload
+
+    def _observe(self, status_code, usage: dict = None):
+        if self.observer is not None:
+            self.observer(status_code, usage)
+
+    # mengirim prompt dan mengembalikan isi jawaban mentah
+    async def chat(self, prompt: str) -> str:
+        if self._client is None:
+            await self.start()
+
+        headers, payload = self._build_request(prompt)
+
+        start = time.perf_counter()
+        try:
+            response = await self._client.post("/chat/completions", headers=headers, json=payload)
+        except httpx.HTTPError as e:
+            record_upstream_call(time.perf_counter() - start, True)
+            logger.error("request error: %s", e)
+            self._observe(None)
+            raise ValueError(f"Error saat berkomunikasi dengan OpenAI: {str(e)}")
+        record_upstream_call(time.perf_counter() - start, response.status_code != 200)
+
+        if response.status_code != 200:
+            logger.error("openai error: %s - %s", response.status_code, response.text)
+            self._observe(response.status_code)
+            raise ValueError(f"OpenAI API error: {response.status_code}")
+
+        result = response.json()
+        self._observe(response.status_code, result.get("usage"))
+        if "choices" not in result or len(result["choices"]) == 0:
+            logger.error("tidak ada hasil dari openai")
+            raise ValueError("Tidak ada hasil dari OpenAI")
+
+        return result["choices"][0]["message"]["content"]
+
+    # mengirim prompt dengan stream=true dan menghasilkan potongan jawaban
+    # satu per satu begitu diterima dari upstream
+    async def stream_chat(self, prompt: str):
+        if self._client is None:
+            await self.start()
+
+        headers, payload = self._build_request(prompt, stream=True)
+
+        # durasi sampai token terakhir; stream yang tidak selesai dihitung gagal
+        start = time.perf_counter()
+        failed = True
+        try:
+            async with self._client.stream("POST", "/chat/completions", headers=headers, json=payload) as response:
+                self._observe(response.status_code)
+                if response.status_code != 200:
+                    body = await response.aread()
+                    logger.error("openai error: %s - %s", response.status_code, body.decode(errors="replace"))
+                    raise ValueError(f"OpenAI API error: {response.status_code}")
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+
+                    chunk = json.loads(data)
+                    choices = chunk.get("choices") or []
+                    if not choices:
+                        continue
+                    content = choices[0].get("delta", {}).get("content")
+                    if content:
+                        yield content
+            failed = False
+        except httpx.HTTPError as e:
+            logger.error("request error: %s", e)
+            self._observe(None)
+            raise ValueError(f"Error saat berkomunikasi dengan OpenAI: {str(e)}")
+        finally:
+            record_upstream_call(time.perf_counter() - start, failed)
@@ -0,0 +1,206 @@
+# pre-warm cache jawaban untuk pertanyaan yang disarankan di frontend dan
+# pertanyaan yang paling sering muncul di log request
+#
+#   python prewarm.py --log-path app.log --top-n 20
+#   python prewarm.py --url http://localhost:8000
+import os
+import re
+import json
+import time
+import asyncio
+import logging
+import argparse
+from collections import Counter
+
+from response_cache import canonicalize_question
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUGGESTED_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend", "components", "AISection.tsx"
+)
+
+# array presetQuestions di AISection.tsx dan string literal di dalamnya
+_PRESET_BLOCK = re.compile(r"presetQuestions\s*=\s*\[(.*?)\]", re.S)
+_STRING_LITERAL = re.compile(r'"((?:[^"\\]|\\.)*)"|\'((?:[^\'\\]|\\.)*)\'')
+
+# baris log dari ask_ai dan ask_ai_stream
+_LOGGED_QUESTION = re.compile(r"pertanyaan (?:stream )?diterima: (.+)$")
+
+
+# baca pertanyaan preset dari komponen frontend
+def load_suggested_questions(path: str) -> list:
+    try:
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+    except OSError as e:
+        logger.warning("pertanyaan preset tidak bisa dibaca: %s", e)
+        return []
+
+    block = _PRESET_BLOCK.search(source)
+    if block is None:
+        logger.warning("presetQuestions tidak ditemukan di %s", path)
+        return []
+
+    questions = []
+    for double, single in _STRING_LITERAL.findall(block.group(1)):
+        questions.append(json.loads(f'"{double}"') if double else single.replace("\\'", "'"))
+    return questions
+
+
+# pertanyaan yang paling sering muncul di log, dihitung per bentuk kanonik
+def load_top_questions(path: str, top_n: int) -> list:
+    counts = Counter()
+    originals = {}
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                # log json (LOG_FORMAT=json): pesan ada di field message
+                if line.startswith("{"):
+                    try:
+                        line = json.loads(line).get("message", "")
+                    except ValueError:
+                        continue
+                match = _LOGGED_QUESTION.search(line)
+                if match is None:
+                    continue
+                question = match.group(1).strip()
+                canonical = canonicalize_question(question)
+                if not canonical:
+                    continue
+                counts[canonical] += 1
+                originals.setdefault(canonical, question)
+    except OSError as e:
+        logger.warning("log request tidak bisa dibaca: %s", e)
+        return []
+    return [originals[canonical] for canonical, _ in counts.most_common(top_n)]
+
+
+# tambahkan satu hasil item /ask/batch ke ringkasan. jawaban jalur cepat tidak
+# lewat cache, jadi dihitung terpisah dari yang benar-benar di-warm dari openai
+def count_result(summary: dict, item: dict):
+    if item.get("error"):
+        summary["failed"] += 1
+    elif item.get("source") == "cache":
+        summary["cached"] += 1
+    elif item.get("source") == "fast_path":
+        summary["fast_path"] += 1
+    else:
+        summary["warmed"] += 1
+
+
+# pre-warm dijalankan saat startup sebelum aplikasi menerima request,
+# atau lewat cli setelah deploy
+class Prewarmer:
+    def __init__(self, suggested_path: str = DEFAULT_SUGGESTED_PATH, log_path: str = None,
+                 top_n: int = 20, concurrency: int = 4, timeout: float = 60.0, enabled: bool = False):
+        self.suggested_path = suggested_path
+        self.log_path = log_path
+        self.top_n = top_n
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.enabled = enabled
+        self.last_run = None
+
+    # membuat prewarmer dari variabel lingkungan
+    @classmethod
+    def from_env(cls) -> "Prewarmer":
+        return cls(
+            suggested_path=os.getenv("PREWARM_SUGGESTED_PATH", DEFAULT_SUGGESTED_PATH),
+            log_path=os.getenv("PREWARM_LOG_PATH") or None,
+            top_n=int(os.getenv("PREWARM_TOP_N", "20")),
+            concurrency=int(os.getenv("PREWARM_CONCURRENCY", "4")),
+            timeout=float(os.getenv("PREWARM_TIMEOUT", "60")),
+            enabled=os.getenv("PREWARM_ON_STARTUP", "0") != "0",
+        )
+
+    # pertanyaan preset dulu, lalu top-n dari log, tanpa duplikat kanonik
+    def questions(self) -> list:
+        candidates = load_suggested_questions(self.suggested_path) if self.suggested_path else []
+        if self.log_path:
+            candidates += load_top_questions(self.log_path, self.top_n)
+
+        seen = set()
+        questions = []
+        for question in candidates:
+            canonical = canonicalize_question(question)
+            if canonical and canonical not in seen:
+                seen.add(canonical)
+                questions.append(question)
+        return questions
+
+    # jawab semua pertanyaan lewat answer_item(question, semaphore), yang
+    # mengembalikan dict dengan "source" atau "error" seperti item /ask/batch
+    async def run(self, answer_item) -> dict:
+        questions = self.questions()
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        summary = {"questions": len(questions), "cached": 0, "fast_path": 0, "warmed": 0, "failed": 0, "timed_out": False}
+
+        async def warm(question):
+            count_result(summary, await answer_item(question, semaphore))
+
+        try:
+            await asyncio.wait_for(asyncio.gather(*(warm(question) for question in questions)), self.timeout or None)
+        except asyncio.TimeoutError:
+            summary["timed_out"] = True
+            logger.warning("pre-warm dihentikan setelah %s detik", self.timeout)
+
+        summary["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        self.last_run = summary
+        logger.info("pre-warm selesai: %s", summary)
+        return summary
+
+
+# kirim daftar pertanyaan ke server yang sedang berjalan lewat /ask/batch
+async def prewarm_remote(prewarmer: Prewarmer, url: str, batch_size: int) -> dict:
+    import httpx
+
+    questions = prewarmer.questions()
+    summary = {"questions": len(questions), "cached": 0, "fast_path": 0, "warmed": 0, "failed": 0}
+    async with httpx.AsyncClient(base_url=url.rstrip("/"), timeout=prewarmer.timeout or None) as client:
+        for i in range(0, len(questions), batch_size):
+            response = await client.post("/ask/batch", json={"questions": questions[i:i + batch_size]})
+            response.raise_for_status()
+            for item in response.json()["results"]:
+                count_result(summary, item)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="isi cache jawaban untuk pertanyaan preset dan pertanyaan populer")
+    parser.add_argument("--suggested-path", default=None)
+    parser.add_argument("--log-path", default=None)
+    parser.add_argument("--top-n", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=None)
+    parser.add_argument("--url", default=None, help="pre-warm server yang sedang berjalan lewat /ask/batch")
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    prewarmer = Prewarmer.from_env()
+    for name in ("suggested_path", "log_path", "top_n", "concurrency", "timeout"):
+        if getattr(args, name) is not None:
+            setattr(prewarmer, name, getattr(args, name))
+
+    if args.url:
+        result = asyncio.run(prewarm_remote(prewarmer, args.url, args.batch_size))
+    else:
+        # cache di proses ini hanya berguna jika disimpan ke sqlite yang juga dibaca server
+        if not os.getenv("RESPONSE_CACHE_PATH"):
+            logger.warning("RESPONSE_CACHE_PATH kosong, hasil pre-warm hilang saat proses selesai")
+        import main
+
+        # klien http openai ditutup di event loop yang sama dengan pre-warm
+        async def prewarm_local():
+            try:
+                return await prewarmer.run(main.prewarm_question)
+            finally:
+                await main.openai_client.close()
+
+        try:
+            result = asyncio.run(prewarm_local())
+        finally:
+            main.response_cache.close()
+    print(json.dumps(result, ensure_ascii=False))
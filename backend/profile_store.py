@@ -0,0 +1,108 @@
+import os
+import json
+import time
+import asyncio
+import logging
+
+from response_cache import hash_profile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profile.json")
+
+
+# dilempar saat file profil tidak bisa dibaca atau isinya bukan objek json
+class ProfileError(Exception):
+    pass
+
+
+# profil pengguna dari file json. file dicek berkala lewat mtime dan ukuran;
+# jika isinya berubah, versi baru (hash isi) diberikan ke semua listener yang
+# menghitung ulang turunan profil (template prompt, katalog mock). jika file
+# baru tidak valid atau listener gagal, versi lama tetap dipakai
+class ProfileStore:
+    def __init__(self, path: str = DEFAULT_PROFILE_PATH, reload_interval: float = 2.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._listeners = []
+        self.reloads = 0
+        self.failed_reloads = 0
+        # gagal saat startup lebih baik daripada berjalan tanpa profil
+        self.profile, self._signature = self._read()
+        self.version = hash_profile(self.profile)
+        self.loaded_at = time.time()
+
+    # membuat store dari variabel lingkungan, PROFILE_RELOAD_INTERVAL=0 mematikan hot reload
+    @classmethod
+    def from_env(cls) -> "ProfileStore":
+        return cls(
+            path=os.getenv("PROFILE_PATH", DEFAULT_PROFILE_PATH),
+            reload_interval=float(os.getenv("PROFILE_RELOAD_INTERVAL", "2")),
+        )
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read(self):
+        try:
+            signature = self._stat()
+            with open(self.path, encoding="utf-8") as f:
+                profile = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ProfileError(f"gagal membaca profil {self.path}: {e}") from e
+        if not isinstance(profile, dict):
+            raise ProfileError(f"profil {self.path} harus berupa objek json")
+        return profile, signature
+
+    # callback(profile, version) dipanggil setiap ada versi baru
+    def on_change(self, callback):
+        self._listeners.append(callback)
+
+    # cek file sekali, True jika versi baru berhasil dipasang
+    def check(self) -> bool:
+        try:
+            if self._stat() == self._signature:
+                return False
+            profile, signature = self._read()
+        except (OSError, ProfileError) as e:
+            # file bisa hilang sesaat saat diganti secara atomik
+            logger.warning("profil tidak bisa dibaca, tetap memakai versi %s: %s", self.version[:12], e)
+            return False
+
+        version = hash_profile(profile)
+        if version == self.version:
+            # hanya mtime yang berubah, turunan profil tidak perlu dihitung ulang
+            self._signature = signature
+            return False
+
+        try:
+            for callback in self._listeners:
+                callback(profile, version)
+        except Exception as e:
+            self.failed_reloads += 1
+            # signature disimpan supaya file yang sama tidak dicoba terus
+            self._signature = signature
+            logger.error("profil baru tidak valid, tetap memakai versi %s: %s", self.version[:12], e)
+            return False
+
+        self.profile, self._signature, self.version = profile, signature, version
+        self.loaded_at = time.time()
+        self.reloads += 1
+        logger.info("profil dimuat ulang: versi %s", version[:12])
+        return True
+
+    # loop pengecekan untuk dijalankan sebagai task di lifespan
+    async def watch(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            self.check()
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "version": self.version[:12],
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "failed_reloads": self.failed_reloads,
+        }
@@ -0,0 +1,193 @@
+import os
+import re
+import base64
+import hashlib
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# perkiraan token tanpa file vocab: pre-tokenisasi meniru pola cl100k
+# (kata beserta satu karakter di depannya, angka per 3 digit, tanda baca,
+# newline, dan run spasi), lalu potongan panjang dihitung per 4 karakter
+_PRETOKEN = re.compile(r"[^\r\n\w]?[^\W\d_]+|\d{1,3}| ?[^\s\w]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+")
+_APPROX_PIECE_CHARS = 4
+
+# penanda daftar di awal baris, diabaikan saat mencari instruksi duplikat
+_LIST_MARKER = re.compile(r"^(?:[-*]|\d+\.)\s+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# baris json.dumps(indent=2) berisi "kunci": "nilai", ditulis ulang jadi daftar biasa
+_JSON_ENTRY = re.compile(r'^"((?:[^"\\]|\\.)*)": "((?:[^"\\]|\\.)*)",?$')
+_JSON_BRACES = frozenset(["{", "}", "{}"])
+
+# baris yang tidak boleh dibuang saat memangkas ke budget token
+PROTECTED_PREFIXES = ("Kamu adalah", "Jawab", "PENTING", "SANGAT PENTING", "Pertanyaan pengguna")
+
+
+# encoding tiktoken yang bisa dimuat tanpa jaringan: url resmi (dipakai
+# tiktoken sebagai kunci cache), hash sha256 file, pola pre-tokenisasi, dan
+# token khusus, sama dengan definisi di tiktoken_ext.openai_public
+_TIKTOKEN_ENCODINGS = {
+    "cl100k_base": (
+        "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken",
+        "223921b76ee99bde995b7ff738513eef100fb51d18c93597a113bcffe865b2a7",
+        r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}++|\p{N}{1,3}+| ?[^\s\p{L}\p{N}]++[\r\n]*+|\s++$|\s*[\r\n]|\s+(?!\S)|\s""",
+        {"<|endoftext|>": 100257, "<|fim_prefix|>": 100258, "<|fim_middle|>": 100259, "<|fim_suffix|>": 100260,
+         "<|endofprompt|>": 100276},
+    ),
+}
+
+
+# file encoding lokal: TIKTOKEN_ENCODING_FILE, atau file cache tiktoken di
+# TIKTOKEN_CACHE_DIR (DATA_GYM_CACHE_DIR, default <tmp>/data-gym-cache)
+def _encoding_file(url: str):
+    path = os.getenv("TIKTOKEN_ENCODING_FILE")
+    if not path:
+        cache_dir = (os.getenv("TIKTOKEN_CACHE_DIR") or os.getenv("DATA_GYM_CACHE_DIR")
+                     or os.path.join(tempfile.gettempdir(), "data-gym-cache"))
+        path = os.path.join(cache_dir, hashlib.sha1(url.encode()).hexdigest())
+    return path if os.path.isfile(path) else None
+
+
+# muat tiktoken hanya dari file lokal. tiktoken.get_encoding mengunduh file
+# encoding jika belum ada di cache, dan itu tidak boleh terjadi saat startup,
+# jadi file dibaca dan dicek sendiri; tanpa file dipakai perkiraan
+def _load_tiktoken(encoding_name: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    spec = _TIKTOKEN_ENCODINGS.get(encoding_name)
+    if spec is None:
+        logger.warning("encoding tiktoken %s tidak didukung, pakai perkiraan", encoding_name)
+        return None
+    url, expected_hash, pattern, special_tokens = spec
+    path = _encoding_file(url)
+    if path is None:
+        logger.info("file encoding tiktoken %s tidak ada di TIKTOKEN_CACHE_DIR, pakai perkiraan", encoding_name)
+        return None
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        if hashlib.sha256(data).hexdigest() != expected_hash:
+            raise ValueError(f"hash file {path} tidak cocok")
+        ranks = {base64.b64decode(token): int(rank) for token, rank in (line.split() for line in data.splitlines() if line)}
+        return tiktoken.Encoding(encoding_name, pat_str=pattern, mergeable_ranks=ranks, special_tokens=special_tokens)
+    except Exception as e:
+        logger.warning("encoding tiktoken %s tidak bisa dimuat, pakai perkiraan: %s", encoding_name, e)
+        return None
+
+
+# tokenizer offline: tiktoken jika paket dan file encodingnya tersedia
+# secara lokal, selain itu perkiraan berbasis regex
+class Tokenizer:
+    def __init__(self, encoding_name: str = "cl100k_base", use_tiktoken: bool = True):
+        self._encoding = _load_tiktoken(encoding_name) if use_tiktoken else None
+        self.name = encoding_name if self._encoding is not None else "approx"
+
+    def encode(self, text: str) -> list:
+        if self._encoding is not None:
+            return self._encoding.encode(text)
+        pieces = []
+        for chunk in _PRETOKEN.findall(text):
+            if len(chunk) <= _APPROX_PIECE_CHARS or chunk.isspace():
+                pieces.append(chunk)
+            else:
+                pieces.extend(chunk[i:i + _APPROX_PIECE_CHARS] for i in range(0, len(chunk), _APPROX_PIECE_CHARS))
+        return pieces
+
+    def decode(self, tokens: list) -> str:
+        if self._encoding is not None:
+            return self._encoding.decode(tokens)
+        return "".join(tokens)
+
+    def count(self, text: str) -> int:
+        return len(self.encode(text))
+
+    # potong teks supaya tidak lebih dari max_tokens
+    def truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return self.decode(tokens[:max(max_tokens, 0)])
+
+
+# kompaksi prompt: buang indentasi dan baris kosong dari f-string bertingkat,
+# tulis ulang blok json jadi daftar, buang kalimat instruksi yang diulang,
+# dan jaga total token di bawah budget
+class PromptCompactor:
+    def __init__(self, tokenizer: Tokenizer = None, budget: int = 1000, question_reserve: int = 200):
+        self.tokenizer = tokenizer or Tokenizer()
+        self.budget = budget
+        self.question_reserve = question_reserve
+
+    # membuat compactor dari variabel lingkungan
+    @classmethod
+    def from_env(cls) -> "PromptCompactor":
+        return cls(
+            tokenizer=Tokenizer(
+                encoding_name=os.getenv("PROMPT_TOKENIZER", "cl100k_base"),
+                use_tiktoken=os.getenv("PROMPT_TIKTOKEN", "1") != "0",
+            ),
+            budget=int(os.getenv("PROMPT_TOKEN_BUDGET", "1000")),
+            question_reserve=int(os.getenv("PROMPT_QUESTION_RESERVE", "200")),
+        )
+
+    # rapikan baris dan buang kalimat yang sudah muncul sebelumnya
+    def _compact_lines(self, text: str, seen: set) -> list:
+        lines = []
+        for raw_line in text.split("\n"):
+            line = raw_line.strip()
+            if not line or line in _JSON_BRACES:
+                continue
+            entry = _JSON_ENTRY.match(line)
+            if entry:
+                line = f"- {entry.group(1)}: {entry.group(2)}"
+            marker = _LIST_MARKER.match(line)
+            prefix = marker.group(0) if marker else ""
+            sentences = []
+            for sentence in _SENTENCE_END.split(line[len(prefix):]):
+                key = sentence.casefold()
+                if key in seen:
+                    continue
+                seen.add(key)
+                sentences.append(sentence)
+            if sentences:
+                lines.append(prefix + " ".join(sentences))
+        return lines
+
+    # buang baris konteks dari bawah (selain instruksi) sampai muat di budget
+    def _fit(self, lines: list, limit: int) -> list:
+        counts = [self.tokenizer.count(line) + 1 for line in lines]
+        total = sum(counts)
+        index = len(lines) - 1
+        while total > limit and index >= 0:
+            if not lines[index].startswith(PROTECTED_PREFIXES):
+                total -= counts[index]
+                lines = lines[:index] + lines[index + 1:]
+                counts = counts[:index] + counts[index + 1:]
+            index -= 1
+        return lines
+
+    # kompaksi satu template: prefix (profil + konteks) dan instruksi penutup
+    def compact_template(self, prefix: str, instructions: str):
+        seen = set()
+        prefix_lines = self._compact_lines(prefix, seen)
+        instruction_lines = self._compact_lines(instructions, seen)
+
+        instruction_text = "\n" + "\n".join(instruction_lines)
+        limit = self.budget - self.question_reserve - self.tokenizer.count(instruction_text)
+        prefix_lines = self._fit(prefix_lines, limit)
+
+        return "\n".join(prefix_lines), instruction_text
+
+    # sisa budget yang boleh dipakai pertanyaan untuk satu template
+    def question_budget(self, prefix: str, instructions: str) -> int:
+        return max(self.budget - self.tokenizer.count(prefix) - self.tokenizer.count(instructions), 0)
+
+    def fit_question(self, question: str, max_tokens: int) -> str:
+        # setiap token minimal satu byte, jadi pertanyaan pendek tidak perlu ditokenisasi
+        if len(question.encode("utf-8")) <= max_tokens:
+            return question
+        return self.tokenizer.truncate(question, max_tokens)
@@ -0,0 +1,439 @@
+# log pertanyaan/jawaban biner yang hanya ditambah (append-only) dan cli
+# analitik yang membacanya secara streaming
+#
+#   python request_log.py summary logs/ --top 20
+#   python request_log.py dump logs/requests-1234.qalog --limit 10
+import os
+import sys
+import glob
+import math
+import mmap
+import time
+import struct
+import asyncio
+import hashlib
+import logging
+import argparse
+from typing import NamedTuple
+
+from response_cache import canonicalize_question
+
+logger = logging.getLogger(__name__)
+
+# header file: magic dan panjang data yang sudah lengkap ditulis. ruang di
+# belakangnya dialokasikan per potongan (chunk) dan masih berisi nol
+MAGIC = b"QALOG\x00\x01\x00"
+_HEADER = struct.Struct("<8sQ")
+
+# record: waktu, hash pertanyaan, latensi (ms), token prompt, token jawaban,
+# jalur, panjang kategori, panjang pertanyaan; lalu teks kategori dan pertanyaan
+_RECORD = struct.Struct("<dQfIIBBH")
+
+# jalur yang menjawab request, disimpan sebagai satu byte
+PATHS = ("openai", "cache", "mock", "fast_path")
+_PATH_CODES = {path: code for code, path in enumerate(PATHS)}
+
+
+class RequestRecord(NamedTuple):
+    timestamp: float
+    question_hash: int
+    question: str
+    category: str
+    path: str
+    latency_ms: float
+    prompt_tokens: int
+    answer_tokens: int
+
+
+# hash 64-bit dari pertanyaan kanonik, parafrase ejaan/tanda baca jatuh ke hash yang sama
+def question_hash(question: str) -> int:
+    digest = hashlib.blake2b(canonicalize_question(question).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _truncate(text: str, limit: int) -> bytes:
+    encoded = text.encode("utf-8")
+    if len(encoded) <= limit:
+        return encoded
+    return encoded[:limit].decode("utf-8", "ignore").encode("utf-8")
+
+
+# penulis log per proses (requests-<pid>.qalog, jadi worker serve.py tidak
+# berebut file). record() hanya menyimpan tuple; pengemasan, hitung token,
+# dan penyalinan ke file lewat mmap dilakukan per batch oleh flush()
+class RequestLog:
+    def __init__(self, directory: str, batch_size: int = 256, flush_interval: float = 1.0,
+                 chunk_size: int = 4 * 1024 * 1024, max_question_bytes: int = 512, tokenizer=None):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.chunk_size = chunk_size
+        self.max_question_bytes = max_question_bytes
+        self.tokenizer = tokenizer
+        self.records = 0
+        self.flushes = 0
+        self.path = None
+        self._pending = []
+        self._hashes = {}
+        self._fd = None
+        self._map = None
+        self._offset = 0
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    # membuat log dari variabel lingkungan
+    @classmethod
+    def from_env(cls, tokenizer=None) -> "RequestLog":
+        return cls(
+            directory=os.getenv("REQUEST_LOG_DIR", "logs"),
+            batch_size=int(os.getenv("REQUEST_LOG_BATCH", "256")),
+            flush_interval=float(os.getenv("REQUEST_LOG_FLUSH_INTERVAL", "1.0")),
+            chunk_size=int(os.getenv("REQUEST_LOG_CHUNK_MB", "4")) * 1024 * 1024,
+            tokenizer=tokenizer,
+        )
+
+    # proses anak menulis ke filenya sendiri; mapping dan record induk yang
+    # belum ditulis tetap milik induk
+    def _after_fork(self):
+        self._pending = []
+        if self._map is not None:
+            self._map.close()
+            os.close(self._fd)
+        self._fd = self._map = self.path = None
+        self._offset = 0
+
+    def _count(self, text: str) -> int:
+        if self.tokenizer is not None:
+            return self.tokenizer.count(text)
+        return len(text) // 4 + 1
+
+    # prompt dan jawaban hanya untuk request yang memanggil openai; token
+    # dihitung saat flush, jalur lain dicatat dengan 0 token
+    def record(self, question: str, category: str, path: str, seconds: float, prompt: str = None, answer: str = None):
+        self._pending.append((time.time(), question, category, path, seconds, prompt, answer))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"requests-{os.getpid()}.qalog")
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(self._fd).st_size
+        if size < _HEADER.size:
+            os.ftruncate(self._fd, self.chunk_size)
+            self._map = mmap.mmap(self._fd, self.chunk_size)
+            _HEADER.pack_into(self._map, 0, MAGIC, _HEADER.size)
+            self._offset = _HEADER.size
+            return
+        self._map = mmap.mmap(self._fd, size)
+        magic, length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            os.close(self._fd)
+            self._fd = self._map = None
+            raise ValueError(f"bukan file log request: {self.path}")
+        self._offset = length
+
+    # perbesar file per chunk lalu petakan ulang. jika gagal setelah map lama
+    # ditutup, file ikut ditutup dan dibuka ulang oleh flush berikutnya
+    # (panjang data di header tetap benar), jadi log tidak tertinggal dengan
+    # map yang sudah ditutup
+    def _reserve(self, size: int):
+        if self._offset + size <= len(self._map):
+            return
+        new_size = len(self._map) + max(self.chunk_size, size)
+        self._map.close()
+        try:
+            os.ftruncate(self._fd, new_size)
+            self._map = mmap.mmap(self._fd, new_size)
+        except (OSError, ValueError):
+            os.close(self._fd)
+            self._fd = self._map = None
+            raise
+
+    # hash dan bytes pertanyaan di-cache per teks, trafik didominasi pertanyaan yang sama
+    def _encode(self, question: str) -> tuple:
+        encoded = self._hashes.get(question)
+        if encoded is None:
+            if len(self._hashes) >= 4096:
+                self._hashes.clear()
+            encoded = self._hashes[question] = (question_hash(question), _truncate(question, self.max_question_bytes))
+        return encoded
+
+    def _pack(self, entry: tuple) -> bytes:
+        timestamp, question, category, path, seconds, prompt, answer = entry
+        hashed, question_bytes = self._encode(question)
+        category_bytes = _truncate(category, 255)
+        prompt_tokens = self._count(prompt) if prompt else 0
+        answer_tokens = self._count(answer) if prompt and answer else 0
+        return _RECORD.pack(
+            timestamp, hashed, seconds * 1000, prompt_tokens, answer_tokens,
+            _PATH_CODES[path], len(category_bytes), len(question_bytes),
+        ) + category_bytes + question_bytes
+
+    # salin batch ke file. panjang di header diperbarui setelah data tersalin,
+    # jadi pembaca tidak pernah melihat record setengah jadi
+    def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        try:
+            if self._map is None:
+                self._open()
+            data = b"".join(self._pack(entry) for entry in pending)
+            self._reserve(len(data))
+            self._map[self._offset:self._offset + len(data)] = data
+            self._offset += len(data)
+            _HEADER.pack_into(self._map, 0, MAGIC, self._offset)
+        except (OSError, ValueError) as e:
+            logger.warning("log request tidak bisa ditulis, %s record dibuang: %s", len(pending), e)
+            return
+        self.records += len(pending)
+        self.flushes += 1
+
+    # flush berkala supaya record di jam sepi tidak tertahan di memori
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    # ruang cadangan di akhir file dipotong supaya file tidak menyimpan nol
+    def close(self):
+        self.flush()
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map.close()
+        os.ftruncate(self._fd, self._offset)
+        os.close(self._fd)
+        self._fd = self._map = None
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "records": self.records,
+            "pending": len(self._pending),
+            "bytes": self._offset,
+            "flushes": self.flushes,
+        }
+
+
+# baca record satu per satu dari file lewat mmap; halaman file dimuat oleh os
+# sesuai kebutuhan, jadi memori tidak bergantung pada ukuran file
+def iter_records(path: str):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            magic, length = _HEADER.unpack_from(view, 0)
+            if magic != MAGIC:
+                raise ValueError(f"bukan file log request: {path}")
+            offset = _HEADER.size
+            unpack, fixed = _RECORD.unpack_from, _RECORD.size
+            while offset < length:
+                timestamp, hashed, latency, prompt_tokens, answer_tokens, path_code, category_length, question_length = unpack(view, offset)
+                offset += fixed
+                category = view[offset:offset + category_length].decode("utf-8")
+                offset += category_length
+                question = view[offset:offset + question_length].decode("utf-8")
+                offset += question_length
+                yield RequestRecord(timestamp, hashed, question, category, PATHS[path_code], latency,
+                                    prompt_tokens, answer_tokens)
+
+
+# file .qalog dari daftar file dan direktori
+def log_files(paths: list) -> list:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.qalog"))))
+        elif os.path.isfile(path):
+            files.append(path)
+    return files
+
+
+# histogram latensi dengan bucket logaritmik (lebar 2%), persentil
+# diperkirakan dari bucket dengan memori tetap berapa pun jumlah record
+class LatencyHistogram:
+    MIN_MS = 0.001
+    GROWTH = 1.02
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.max = 0.0
+        self._log_growth = math.log(self.GROWTH)
+
+    def add(self, latency_ms: float):
+        bucket = int(math.log(max(latency_ms, self.MIN_MS) / self.MIN_MS) / self._log_growth)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+        if latency_ms > self.max:
+            self.max = latency_ms
+
+    # titik tengah (geometris) bucket yang memuat persentil q
+    def percentile(self, q: float) -> float:
+        if not self.total:
+            return 0.0
+        rank = q * self.total
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self.MIN_MS * self.GROWTH ** (bucket + 0.5), self.max)
+        return self.max
+
+
+# top-k pertanyaan dengan memori terbatas (varian space-saving): saat tabel
+# melebihi 2x capacity, separuh hash dengan hitungan terkecil dibuang. hash
+# yang muncul lagi setelahnya mulai dari hitungan terbesar yang pernah
+# dibuang, jadi hitungan bisa lebih tinggi dari aslinya paling banyak
+# sebesar error masing-masing, dan pertanyaan yang benar-benar sering tidak
+# pernah terlewat
+class TopQuestions:
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.texts = {}
+        self.floor = 0
+
+    def add(self, hashed: int, question: str):
+        counts = self.counts
+        if hashed in counts:
+            counts[hashed] += 1
+            return
+        counts[hashed] = self.floor + 1
+        self.errors[hashed] = self.floor
+        self.texts[hashed] = question
+        if len(counts) > 2 * self.capacity:
+            self._prune()
+
+    def _prune(self):
+        ranked = sorted(self.counts, key=self.counts.get, reverse=True)
+        for hashed in ranked[self.capacity:]:
+            self.floor = max(self.floor, self.counts.pop(hashed))
+            del self.errors[hashed], self.texts[hashed]
+
+    def top(self, n: int) -> list:
+        ranked = sorted(self.counts.items(), key=lambda item: -item[1])[:n]
+        return [(self.texts[hashed], count, self.errors[hashed]) for hashed, count in ranked]
+
+
+# agregasi streaming: satu record diproses lalu dibuang
+class Summary:
+    def __init__(self, capacity: int = 10000):
+        self.records = 0
+        self.first = None
+        self.last = None
+        self.categories = {}
+        self.paths = {}
+        self.tokens = {}
+        self.latency = LatencyHistogram()
+        self.path_latency = {}
+        self.questions = TopQuestions(capacity)
+
+    def add(self, record: RequestRecord):
+        self.records += 1
+        if self.first is None or record.timestamp < self.first:
+            self.first = record.timestamp
+        if self.last is None or record.timestamp > self.last:
+            self.last = record.timestamp
+        self.categories[record.category] = self.categories.get(record.category, 0) + 1
+        self.paths[record.path] = self.paths.get(record.path, 0) + 1
+        prompt, answer = self.tokens.get(record.path, (0, 0))
+        self.tokens[record.path] = (prompt + record.prompt_tokens, answer + record.answer_tokens)
+        self.latency.add(record.latency_ms)
+        histogram = self.path_latency.get(record.path)
+        if histogram is None:
+            histogram = self.path_latency[record.path] = LatencyHistogram()
+        histogram.add(record.latency_ms)
+        self.questions.add(record.question_hash, record.question)
+
+    def report(self, top: int = 20) -> dict:
+        def percentiles(histogram: LatencyHistogram) -> dict:
+            return {f"p{int(q * 100)}": round(histogram.percentile(q), 3) for q in (0.5, 0.9, 0.95, 0.99)}
+
+        return {
+            "records": self.records,
+            "from": self.first,
+            "to": self.last,
+            "paths": dict(sorted(self.paths.items(), key=lambda item: -item[1])),
+            "categories": dict(sorted(self.categories.items(), key=lambda item: -item[1])),
+            "latency_ms": percentiles(self.latency),
+            "latency_ms_per_path": {path: percentiles(histogram) for path, histogram in self.path_latency.items()},
+            "tokens": {path: {"prompt": prompt, "answer": answer} for path, (prompt, answer) in self.tokens.items()},
+            "top_questions": [
+                {"question": question, "count": count, "max_overcount": error}
+                for question, count, error in self.questions.top(top)
+            ],
+        }
+
+
+def summarize(files: list, capacity: int = 10000) -> Summary:
+    summary = Summary(capacity)
+    for path in files:
+        for record in iter_records(path):
+            summary.add(record)
+    return summary
+
+
+def _print_report(report: dict):
+    def when(timestamp):
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp)) if timestamp else "-"
+
+    total = report["records"] or 1
+    print(f"{report['records']} record, {when(report['from'])} s/d {when(report['to'])}")
+    print("\njalur:")
+    for path, count in report["paths"].items():
+        latency = report["latency_ms_per_path"][path]
+        tokens = report["tokens"][path]
+        print(f"  {path:<10} {count:>10} {count / total:6.1%}  p50 {latency['p50']:9.2f} ms  p99 {latency['p99']:9.2f} ms"
+              f"  token prompt {tokens['prompt']}, jawaban {tokens['answer']}")
+    latency = report["latency_ms"]
+    print("\nlatensi semua: " + ", ".join(f"{name} {value:.2f} ms" for name, value in latency.items()))
+    print("\nkategori:")
+    width = max(report["categories"].values(), default=1)
+    for category, count in report["categories"].items():
+        print(f"  {category:<20} {count:>10} {count / total:6.1%}  {'#' * max(1, round(count / width * 40))}")
+    print("\npertanyaan teratas:")
+    for item in report["top_questions"]:
+        overcount = f" (+/-{item['max_overcount']})" if item["max_overcount"] else ""
+        print(f"  {item['count']:>10}{overcount}  {item['question']}")
+
+
+if __name__ == "__main__":
+    import json
+
+    parser = argparse.ArgumentParser(description="analitik log pertanyaan/jawaban (.qalog)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    summary_parser = commands.add_parser("summary", help="pertanyaan teratas, histogram kategori, persentil latensi")
+    summary_parser.add_argument("paths", nargs="+", help="file .qalog atau direktori REQUEST_LOG_DIR")
+    summary_parser.add_argument("--top", type=int, default=20)
+    summary_parser.add_argument("--capacity", type=int, default=10000, help="jumlah pertanyaan berbeda yang dipantau")
+    summary_parser.add_argument("--json", action="store_true")
+    dump_parser = commands.add_parser("dump", help="cetak record sebagai json per baris")
+    dump_parser.add_argument("paths", nargs="+")
+    dump_parser.add_argument("--limit", type=int, default=0)
+    args = parser.parse_args()
+
+    files = log_files(args.paths)
+    if not files:
+        print("tidak ada file .qalog", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "dump":
+        printed = 0
+        for path in files:
+            for record in iter_records(path):
+                print(json.dumps(record._asdict(), ensure_ascii=False))
+                printed += 1
+                if printed == args.limit:
+                    sys.exit(0)
+        sys.exit(0)
+
+    report = summarize(files, args.capacity).report(args.top)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        _print_report(report)
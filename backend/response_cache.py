@@ -0,0 +1,394 @@
+import os
+import re
+import time
+import json
+import uuid
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+# bentuk kanonik pertanyaan: huruf kecil, tanpa tanda baca, spasi tunggal
+def canonicalize_question(question: str) -> str:
+    text = unicodedata.normalize("NFKC", question).lower()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+# hash stabil dari profil, berubah setiap kali isi profil berubah
+def hash_profile(profile: dict) -> str:
+    encoded = json.dumps(profile, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+# kunci cache dari pertanyaan kanonik, kategori, dan hash profil
+def make_cache_key(question: str, category: str, profile_hash: str) -> str:
+    raw = f"{canonicalize_question(question)}\x00{category}\x00{profile_hash}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# penyimpanan sqlite opsional agar cache bertahan setelah restart dan bisa
+# dibaca bersama oleh semua worker di satu host. mode wal membuat pembaca
+# tidak menunggu penulis, dan koneksi dibuka ulang di setiap proses hasil fork.
+# penghitung worker disimpan per run: worker hasil fork mewarisi run_id induk
+# dan baris run lain tidak ikut dijumlahkan. file yang sama bisa dipakai
+# beberapa instance sekaligus, jadi store hanya menghapus baris run miliknya
+# sendiri: proses yang membuat run_id (run_id tidak diberikan) menghapusnya
+# saat ditutup, run_id dari luar dihapus oleh pembuatnya. entri kedaluwarsa yang tidak pernah
+# dibaca lagi dibuang saat menulis, paling sering sekali per purge_interval
+class SQLiteStore:
+    def __init__(self, path: str, timeout: float = 5.0, run_id: str = None, purge_interval: float = 60.0):
+        self.path = path
+        self.timeout = timeout
+        self.run_id = run_id or uuid.uuid4().hex
+        self.owns_run = run_id is None
+        self._owner_pid = os.getpid()
+        self.purge_interval = purge_interval
+        self.purged = 0
+        self._purged_at = 0.0
+        self._lock = threading.Lock()
+        self._conn = None
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+        self._connection()
+
+    # koneksi sqlite tidak boleh dipakai bersama setelah fork
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._conn = None
+
+    # harus dipanggil dengan lock terkunci, kecuali saat inisialisasi. file
+    # baru dibuat 0600 karena isinya jawaban yang di-cache; file wal dan shm
+    # mengikuti izin file database
+    def _connection(self):
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)")
+            # tabel lama tanpa kolom run tidak bisa dipisahkan per run
+            conn.execute("DROP TABLE IF EXISTS counters")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS worker_counters ("
+                "run TEXT NOT NULL, worker TEXT NOT NULL, name TEXT NOT NULL, value INTEGER NOT NULL, "
+                "PRIMARY KEY (run, worker, name))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str, now: float):
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at <= now:
+            self.delete(key)
+            return None
+        return value, expires_at
+
+    def set(self, key: str, value: str, expires_at: float):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            if now - self._purged_at >= self.purge_interval:
+                self._purge(conn, now)
+            conn.commit()
+
+    # hapus semua entri kedaluwarsa, mengembalikan jumlah baris yang dihapus
+    def purge(self, now: float = None) -> int:
+        with self._lock:
+            conn = self._connection()
+            deleted = self._purge(conn, time.time() if now is None else now)
+            conn.commit()
+        return deleted
+
+    # harus dipanggil dengan lock terkunci
+    def _purge(self, conn, now: float) -> int:
+        self._purged_at = now
+        deleted = conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,)).rowcount
+        self.purged += deleted
+        return deleted
+
+    def delete(self, key: str):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            conn.commit()
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM worker_counters")
+            conn.commit()
+
+    # simpan nilai penghitung milik satu worker. setiap worker hanya menulis
+    # barisnya sendiri, jadi tidak ada read-modify-write antar proses
+    def set_counters(self, worker: str, values: dict):
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO worker_counters (run, worker, name, value) VALUES (?, ?, ?, ?)",
+                [(self.run_id, worker, name, value) for name, value in values.items()],
+            )
+            conn.commit()
+
+    # total penghitung dari semua worker di run ini, termasuk worker yang sudah
+    # dijalankan ulang
+    def sum_counters(self) -> dict:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT name, SUM(value) FROM worker_counters WHERE run = ? GROUP BY name", (self.run_id,)
+            ).fetchall()
+        return dict(rows)
+
+    # hapus penghitung semua worker di run ini
+    def drop_counters(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM worker_counters WHERE run = ?", (self.run_id,))
+            conn.commit()
+
+    # run milik proses ini dan bukan worker hasil fork
+    def owns_counters(self) -> bool:
+        return self.owns_run and os.getpid() == self._owner_pid
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# cache lru dengan ttl dan batas memori, opsional dengan penyimpanan di disk.
+# dengan store, penghitung setiap worker ditulis ke store paling lama setiap
+# counter_flush_interval detik supaya stats() bisa menampilkan total semua
+# worker. dari event loop pakai aget/aset: lapisan memori tetap dibaca
+# langsung, query sqlite dijalankan di thread
+class ResponseCache:
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 16 * 1024 * 1024,
+                 ttl: float = 24 * 3600, store: SQLiteStore = None, counter_flush_interval: float = 1.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.store = store
+        self.counter_flush_interval = counter_flush_interval
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters_flushed_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        if store is not None and hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    # membuat cache dari variabel lingkungan
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        path = os.getenv("RESPONSE_CACHE_PATH")
+        store = SQLiteStore(
+            path,
+            run_id=os.getenv("RESPONSE_CACHE_RUN_ID"),
+            purge_interval=float(os.getenv("RESPONSE_CACHE_PURGE_INTERVAL", "60")),
+        ) if path else None
+        return cls(
+            max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000")),
+            max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+            ttl=float(os.getenv("RESPONSE_CACHE_TTL", str(24 * 3600))),
+            store=store,
+        )
+
+    # worker hasil fork mulai dengan penghitung sendiri, entri memori tetap dipakai
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._counters_flushed_at = 0.0
+        self.hits = self.misses = self.disk_hits = self.evictions = 0
+
+    # perkiraan ukuran satu entri di memori
+    @staticmethod
+    def _size(key: str, value: str) -> int:
+        return len(key) + len(value.encode("utf-8"))
+
+    # lapisan memori saja, None jika tidak ada atau sudah kedaluwarsa
+    def _get_memory(self, key: str, now: float):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, _ = entry
+            if expires_at <= now:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    # lapisan disk setelah memori meleset; hit disalin ke memori
+    def _get_store(self, key: str, now: float, namespace: str = None):
+        stored = self.store.get(key, now) if self.store is not None else None
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+                return None
+            value, expires_at = stored
+            self._insert(key, value, expires_at, namespace)
+            self.hits += 1
+            self.disk_hits += 1
+        return value
+
+    # namespace (tenant dan versi profil kunci) dicatat di entri memori supaya
+    # clear_memory bisa membuang satu namespace saja
+    def get(self, key: str, namespace: str = None):
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is None:
+            value = self._get_store(key, now, namespace)
+        self._flush_counters(now)
+        return value
+
+    async def aget(self, key: str, namespace: str = None):
+        if self.store is None:
+            return self.get(key, namespace)
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is None:
+            value = await asyncio.to_thread(self._get_store, key, now, namespace)
+        if self._flush_due(now):
+            await asyncio.to_thread(self._flush_counters, now)
+        return value
+
+    def set(self, key: str, value: str, namespace: str = None):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._insert(key, value, expires_at, namespace)
+        if self.store is not None:
+            self._set_store(key, value, expires_at)
+
+    async def aset(self, key: str, value: str, namespace: str = None):
+        if self.store is None:
+            return self.set(key, value, namespace)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._insert(key, value, expires_at, namespace)
+        await asyncio.to_thread(self._set_store, key, value, expires_at)
+
+    def _set_store(self, key: str, value: str, expires_at: float):
+        self.store.set(key, value, expires_at)
+        self._flush_counters(time.time())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.store is not None:
+            self.store.clear()
+
+    # kosongkan lapisan memori saja, misalnya saat versi profil berganti dan
+    # entri lama tidak mungkin dibaca lagi karena kuncinya memuat versi profil.
+    # dengan namespace hanya entri namespace itu yang dibuang. baris lama di
+    # disk tetap ada sampai kedaluwarsa lalu dibuang oleh purge
+    def clear_memory(self, namespace: str = None):
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            for key in [key for key, entry in self._entries.items() if entry[2] == namespace]:
+                self._remove(key)
+
+    # drop_counters=None: penghitung run dihapus jika run dibuat oleh store
+    # ini sendiri (lihat SQLiteStore), True untuk pembuat run_id dari luar
+    def close(self, drop_counters: bool = None):
+        if self.store is not None:
+            if drop_counters is None:
+                drop_counters = self.store.owns_counters()
+            if drop_counters:
+                self.store.drop_counters()
+            else:
+                self.flush_counters()
+            self.store.close()
+
+    def _flush_due(self, now: float) -> bool:
+        return now - self._counters_flushed_at >= self.counter_flush_interval
+
+    # tulis penghitung worker ini ke store jika sudah lewat interval (atau force)
+    def _flush_counters(self, now: float, force: bool = False):
+        if self.store is None:
+            return
+        if not force and not self._flush_due(now):
+            return
+        self._counters_flushed_at = now
+        with self._lock:
+            values = {"hits": self.hits, "misses": self.misses, "disk_hits": self.disk_hits, "evictions": self.evictions}
+        self.store.set_counters(str(os.getpid()), values)
+
+    def flush_counters(self):
+        self._flush_counters(time.time(), force=True)
+
+    # ringkasan penghitung untuk health check, "shared" berisi total semua worker
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            stats = {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+        if self.store is not None:
+            self.flush_counters()
+            shared = self.store.sum_counters()
+            shared_total = shared.get("hits", 0) + shared.get("misses", 0)
+            shared["hit_rate"] = round(shared.get("hits", 0) / shared_total, 4) if shared_total else 0.0
+            stats["shared"] = shared
+            stats["purged"] = self.store.purged
+        return stats
+
+    # harus dipanggil dengan lock terkunci
+    def _insert(self, key: str, value: str, expires_at: float, namespace: str = None):
+        size = self._size(key, value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, expires_at, namespace)
+        self._bytes += size
+
+        # buang entri yang paling lama tidak dipakai sampai batas terpenuhi
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    # harus dipanggil dengan lock terkunci
+    def _remove(self, key: str):
+        value = self._entries.pop(key)[0]
+        self._bytes -= self._size(key, value)
@@ -0,0 +1,217 @@
+import os
+import re
+import math
+from typing import NamedTuple
+
+# field yang sudah ada di profil dasar setiap prompt, tidak perlu diambil lagi
+BASE_FIELDS = frozenset(["nama", "lokasi", "pendidikan", "pekerjaan", "karakter"])
+
+# field profil yang paling relevan per kategori. passage dari field ini diberi
+# bonus skor, dan dipakai sebagai cadangan jika pertanyaan tidak cocok dengan
+# passage mana pun secara leksikal
+CATEGORY_FIELDS = {
+    "keahlian": ("keahlian", "keahlian_detail"),
+    "proyek": ("proyek", "proyek_detail"),
+    "tantangan_proyek": ("tantangan_proyek",),
+    "hobi": ("hobi", "hobi_detail"),
+    "pendidikan": ("pendidikan_sebelumnya", "kuliah"),
+    "mata_kuliah": ("kuliah",),
+    "prestasi": ("prestasi", "lomba"),
+    "lomba": ("lomba", "prestasi"),
+    "data_science": ("keahlian_detail", "belajar_coding", "proyek_detail"),
+    "tools": ("tools_favorit",),
+    "karakter": ("sifat_detail", "personality"),
+    "portofolio_tech": ("portfolio_tech",),
+    "rencana": ("rencana_masa_depan",),
+    "pekerjaan": ("pengalaman",),
+    "pengalaman": ("pengalaman",),
+    "manajemen_waktu": ("manajemen",),
+    "manajemen_stres": ("manajemen",),
+    "cerita_kuliah": ("kuliah",),
+    "organisasi": ("kuliah",),
+    "belajar_mandiri": ("belajar_coding",),
+    "belajar_kegagalan": ("belajar_coding", "tantangan_proyek"),
+    "kerja_tim": ("manajemen", "sifat_detail"),
+    "kebiasaan_ngoding": ("personality",),
+    "lagu_favorit": ("lagu_favorit",),
+    "moto_hidup": ("moto", "quotes_favorit"),
+    "general": ("keahlian", "proyek", "prestasi", "rencana_masa_depan"),
+}
+
+_WORD = re.compile(r"\w+")
+
+CONTEXT_HEADER = "\nFakta relevan:"
+
+# kata umum yang tidak membedakan passage
+STOPWORDS = frozenset("""
+    apa apakah yang dan di ke dari untuk dengan ini itu kamu aku saya dia kami kita
+    ada adalah atau juga saja sih dong ya kah pun nya tentang sama seperti pernah
+    sudah akan bisa lagi paling sangat banyak mana siapa kapan bagaimana gimana cara
+    kenapa mengapa berapa ceritakan jelaskan dong the a an of to in is
+""".split())
+
+# akhiran kepemilikan/partikel yang sering menempel di pertanyaan ("proyekmu",
+# "hobinya") dan jamak bahasa inggris ("quotes"). dipotong di pertanyaan dan di
+# passage dengan aturan yang sama, jadi potongan yang keliru tetap cocok
+_SUFFIX = re.compile(r"(?:nya|mu|ku|lah|kah|s)$")
+
+
+def tokenize_terms(text: str) -> list:
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 4:
+            word = _SUFFIX.sub("", word)
+        terms.append(word)
+    return terms
+
+
+# satu fakta profil; field adalah kunci teratas di profile.json
+class Passage(NamedTuple):
+    field: str
+    text: str
+
+
+def _line(passage: Passage) -> str:
+    return "\n- " + passage.text
+
+
+# nilai fakta tanpa label, untuk mengecek apakah fakta sudah ada di prompt
+def _value(passage: Passage) -> str:
+    return passage.text.split(": ", 1)[-1]
+
+
+def _label(key: str) -> str:
+    return key.replace("_", " ")
+
+
+# ratakan profil menjadi passage pendek: satu per item daftar dan satu per
+# pasangan kunci-nilai, dict bertingkat diberi label berjenjang
+def profile_passages(profile: dict) -> list:
+    passages = []
+
+    def walk(field: str, label: str, value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if isinstance(item, (dict, list)):
+                    walk(field, f"{label} - {_label(key)}", item)
+                else:
+                    passages.append(Passage(field, f"{label} - {_label(key)}: {item}"))
+        elif isinstance(value, list):
+            for item in value:
+                walk(field, label, item)
+        elif value not in (None, ""):
+            passages.append(Passage(field, f"{label}: {value}"))
+
+    for field, value in profile.items():
+        if field not in BASE_FIELDS:
+            walk(field, _label(field), value)
+    return passages
+
+
+# indeks bm25 di memori. bobot setiap (term, passage) tidak bergantung pada
+# pertanyaan, jadi dihitung sekali saat indeks dibangun; query cukup
+# menjumlahkan bobot dari postings term yang muncul di pertanyaan. costs
+# berisi jumlah token tiap passage di prompt, dihitung sekali oleh pemanggil
+class BM25Index:
+    def __init__(self, passages: list, k1: float = 1.5, b: float = 0.75, costs: tuple = None):
+        self.passages = tuple(passages)
+        self.costs = costs
+        self._by_field = {}
+        for doc, passage in enumerate(self.passages):
+            self._by_field.setdefault(passage.field, []).append(doc)
+
+        documents = [tokenize_terms(passage.text) for passage in self.passages]
+        average = sum(len(terms) for terms in documents) / len(documents) if documents else 0.0
+        frequencies = {}
+        for doc, terms in enumerate(documents):
+            for term in terms:
+                counts = frequencies.setdefault(term, {})
+                counts[doc] = counts.get(doc, 0) + 1
+
+        total = len(documents)
+        postings = {}
+        for term, counts in frequencies.items():
+            idf = math.log(1 + (total - len(counts) + 0.5) / (len(counts) + 0.5))
+            postings[term] = tuple(
+                (doc, idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(documents[doc]) / average)))
+                for doc, tf in counts.items()
+            )
+        self._postings = postings
+
+    def __len__(self):
+        return len(self.passages)
+
+    # (skor, indeks passage) terbaik; passage dari boost_fields mendapat bonus
+    def search(self, query: str, k: int, boost_fields: tuple = (), boost: float = 1.0) -> list:
+        scores = {}
+        for term in set(tokenize_terms(query)):
+            for doc, weight in self._postings.get(term, ()):
+                scores[doc] = scores.get(doc, 0.0) + weight
+        for field in boost_fields:
+            for doc in self._by_field.get(field, ()):
+                scores[doc] = scores.get(doc, 0.0) + boost
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, doc) for doc, score in ranked[:k]]
+
+
+# memilih fakta profil yang relevan untuk prompt: top-k passage bm25 yang
+# belum ada di prompt dan muat dalam budget token. passage dengan skor jauh
+# di bawah passage terbaik
+# (min_score_ratio) tidak diambil supaya bonus kategori saja tidak mengisi
+# prompt saat ada fakta yang cocok dengan pertanyaan. objek ini tidak
+# menyimpan profil, jadi satu retriever dipakai bersama oleh semua template
+class ProfileRetriever:
+    def __init__(self, top_k: int = 4, max_tokens: int = 160, field_boost: float = 1.5,
+                 min_score_ratio: float = 0.5, tokenizer=None):
+        self.top_k = top_k
+        self.max_tokens = max_tokens
+        self.field_boost = field_boost
+        self.min_score_ratio = min_score_ratio
+        self.tokenizer = tokenizer
+        self._header_tokens = self._count(CONTEXT_HEADER)
+
+    # membuat retriever dari variabel lingkungan
+    @classmethod
+    def from_env(cls, tokenizer=None) -> "ProfileRetriever":
+        return cls(
+            top_k=int(os.getenv("RETRIEVAL_TOP_K", "4")),
+            max_tokens=int(os.getenv("RETRIEVAL_TOKENS", "160")),
+            field_boost=float(os.getenv("RETRIEVAL_FIELD_BOOST", "1.5")),
+            min_score_ratio=float(os.getenv("RETRIEVAL_MIN_SCORE_RATIO", "0.5")),
+            tokenizer=tokenizer,
+        )
+
+    def build(self, profile: dict) -> BM25Index:
+        passages = profile_passages(profile)
+        return BM25Index(passages, costs=tuple(self._count(_line(passage)) for passage in passages))
+
+    def _count(self, text: str) -> int:
+        if self.tokenizer is not None:
+            return self.tokenizer.count(text)
+        return len(text) // 4 + 1
+
+    # blok "Fakta relevan" untuk satu pertanyaan, diurutkan menurut skor.
+    # max_tokens (termasuk header) membatasi blok lebih ketat dari
+    # self.max_tokens, fakta yang nilainya sudah ada di exclude dilewati
+    def context(self, index: BM25Index, question: str, category: str, max_tokens: int = None,
+                exclude: str = "") -> str:
+        limit = self.max_tokens if max_tokens is None else min(self.max_tokens, max_tokens - self._header_tokens)
+        # kandidat dilebihkan supaya fakta yang dilewati tidak mengurangi top-k
+        results = index.search(question, self.top_k * 2, CATEGORY_FIELDS.get(category, ()), self.field_boost)
+        lines = []
+        used = 0
+        cutoff = results[0][0] * self.min_score_ratio if results else 0.0
+        for score, doc in results:
+            if score < cutoff or len(lines) == self.top_k:
+                break
+            passage = index.passages[doc]
+            cost = index.costs[doc]
+            if used + cost > limit or (exclude and _value(passage) in exclude):
+                continue
+            lines.append(_line(passage))
+            used += cost
+        if not lines:
+            return ""
+        return CONTEXT_HEADER + "".join(lines)
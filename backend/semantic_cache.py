@@ -0,0 +1,211 @@
+import os
+import time
+import zlib
+import threading
+
+import numpy as np
+
+from response_cache import canonicalize_question
+
+
+# kata fungsi yang tidak membedakan maksud pertanyaan
+STOPWORDS = frozenset([
+    "apa", "aja", "saja", "kamu", "aku", "yang", "di", "ke", "dari", "dan",
+    "dong", "sih", "nih", "ya", "deh", "tentang", "dengan", "bagaimana",
+    "gimana", "tolong", "coba", "mana",
+])
+
+# bentuk informal yang disamakan dengan bentuk bakunya
+SLANG = {
+    "ceritain": "ceritakan",
+    "stress": "stres",
+    "tool": "tools",
+    "gak": "tidak",
+    "nggak": "tidak",
+    "enggak": "tidak",
+    "ga": "tidak",
+    "tak": "tidak",
+}
+
+# kata pengisi yang boleh ada di satu pertanyaan saja tanpa mengubah maksud.
+# kata isi lain (angka, negasi, nama, jenjang, kerabat, "terbaru" vs
+# "terbaik") harus sama persis supaya jawaban tidak tertukar
+FILLER_WORDS = frozenset(["utama", "sebenarnya", "memang", "emang", "banget"])
+
+
+# pecah kata, seragamkan slang, lepas akhiran -mu/-ku, dan buang kata fungsi
+def _content_words(question: str) -> str:
+    words = []
+    for word in canonicalize_question(question).split():
+        word = SLANG.get(word, word)
+        if len(word) > 4 and word.endswith(("mu", "ku")):
+            word = word[:-2]
+        if word not in STOPWORDS:
+            words.append(word)
+    return " ".join(words)
+
+
+# kata isi yang wajib sama antara pertanyaan baru dan pertanyaan di cache
+def _key_words(question: str) -> frozenset:
+    return frozenset(_content_words(question).split()) - FILLER_WORDS
+
+
+# vectorizer n-gram karakter yang di-hash ke dimensi tetap, tanpa model
+# dan tanpa state sehingga hasilnya sama di semua proses
+class HashedNgramVectorizer:
+    def __init__(self, dim: int = 256, ngram_range=(3, 4)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    def _features(self, text: str):
+        padded = f" {text} "
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            for i in range(len(padded) - n + 1):
+                yield padded[i:i + n]
+        # kata utuh ikut dihitung supaya kata kunci pendek tetap berbobot
+        for word in text.split():
+            yield f"w:{word}"
+
+    def transform(self, question: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(_content_words(question)):
+            h = zlib.crc32(feature.encode("utf-8"))
+            # bit teratas menentukan tanda untuk mengurangi bias tabrakan hash
+            vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+# indeks nearest-neighbour berbasis matriks numpy dengan similarity kosinus.
+# kapasitas tumbuh dua kali lipat sampai max_entries, setelah itu slot
+# tertua ditimpa seperti ring buffer. setiap slot punya waktu kedaluwarsa;
+# dengan ttl yang sama untuk semua entri slot tertua selalu kedaluwarsa lebih
+# dulu, jadi penyaringan hanya dilakukan jika slot tertua sudah lewat
+class VectorIndex:
+    def __init__(self, dim: int, max_entries: int, initial_capacity: int = 64):
+        self.dim = dim
+        self.max_entries = max_entries
+        capacity = min(initial_capacity, max_entries)
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._expires = np.full(capacity, np.inf)
+        self._values = []
+        self._next = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, vector: np.ndarray, value, expires_at: float = np.inf):
+        size = len(self._values)
+        if size < self.max_entries:
+            if size == len(self._vectors):
+                capacity = min(size * 2, self.max_entries)
+                grown = np.zeros((capacity, self.dim), dtype=np.float32)
+                grown[:size] = self._vectors
+                self._vectors = grown
+                expires = np.full(capacity, np.inf)
+                expires[:size] = self._expires
+                self._expires = expires
+            self._vectors[size] = vector
+            self._expires[size] = expires_at
+            self._values.append(value)
+            return
+
+        # indeks penuh, timpa entri tertua
+        self._vectors[self._next] = vector
+        self._expires[self._next] = expires_at
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.max_entries
+
+    # kembalikan (skor, value) tetangga terdekat yang belum kedaluwarsa, atau
+    # (0.0, None) jika tidak ada
+    def search(self, vector: np.ndarray, now: float = 0.0):
+        candidates = self.candidates(vector, now, -np.inf, limit=1)
+        return candidates[0] if candidates else (0.0, None)
+
+    # paling banyak limit pasangan (skor, value) dengan skor >= min_score,
+    # urut dari yang paling mirip, tanpa entri kedaluwarsa
+    def candidates(self, vector: np.ndarray, now: float, min_score: float, limit: int = 5) -> list:
+        size = len(self._values)
+        if size == 0:
+            return []
+        scores = self._vectors[:size] @ vector
+        if self._expires[self._next] <= now:
+            scores = np.where(self._expires[:size] > now, scores, -np.inf)
+        indexes = np.flatnonzero((scores >= min_score) & (scores > -np.inf))
+        if len(indexes) > limit:
+            indexes = indexes[np.argpartition(-scores[indexes], limit - 1)[:limit]]
+        indexes = indexes[np.argsort(-scores[indexes], kind="stable")]
+        return [(float(scores[i]), self._values[i]) for i in indexes]
+
+
+# cache semantik: pertanyaan yang mirip di kategori yang sama memakai jawaban
+# yang sama, dengan ttl yang sama seperti cache respons. kemiripan vektor
+# saja tidak cukup ("lulus sma" vs "lulus smp", "suka kopi" vs "tidak suka
+# kopi"), jadi kandidat di atas threshold juga harus punya kata isi yang sama
+class SemanticCache:
+    def __init__(self, threshold: float = 0.85, dim: int = 256, max_entries: int = 10000,
+                 ttl: float = 24 * 3600):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.vectorizer = HashedNgramVectorizer(dim=dim)
+        self._indexes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # membuat cache dari variabel lingkungan
+    @classmethod
+    def from_env(cls) -> "SemanticCache":
+        return cls(
+            threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85")),
+            dim=int(os.getenv("SEMANTIC_CACHE_DIM", "256")),
+            max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "10000")),
+            ttl=float(os.getenv("RESPONSE_CACHE_TTL", str(24 * 3600))),
+        )
+
+    # namespace memisahkan indeks per kategori dan versi profil
+    def get(self, question: str, namespace: str):
+        vector = self.vectorizer.transform(question)
+        key = _key_words(question)
+        with self._lock:
+            index = self._indexes.get(namespace)
+            candidates = index.candidates(vector, time.time(), self.threshold) if index is not None else []
+            for _, (cached_key, value) in candidates:
+                if cached_key == key:
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def set(self, question: str, namespace: str, value: str):
+        vector = self.vectorizer.transform(question)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None:
+                index = self._indexes[namespace] = VectorIndex(self.vectorizer.dim, self.max_entries)
+            index.add(vector, (_key_words(question), value), expires_at)
+
+    # tanpa prefix semua indeks dibuang, dengan prefix hanya namespace yang
+    # diawali prefix (misalnya satu tenant dan versi profil)
+    def clear(self, prefix: str = ""):
+        with self._lock:
+            if not prefix:
+                self._indexes.clear()
+                return
+            for namespace in [namespace for namespace in self._indexes if namespace.startswith(prefix)]:
+                del self._indexes[namespace]
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": sum(len(index) for index in self._indexes.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,197 @@
+# entry point multi-worker. aplikasi diimpor (profil, template prompt, katalog
+# mock, classifier) dan cache di-pre-warm sekali di proses induk, lalu induk
+# membuka socket dan mem-fork worker uvicorn yang berbagi socket itu. cache
+# respons dibagi lewat sqlite mode wal di RESPONSE_CACHE_PATH (bawaan: file
+# privat di $XDG_CACHE_HOME/ai-portfolio/, lihat default_shared_cache_path).
+#
+# state lain tetap per worker: metrik di /metrics, sesi percakapan, rate
+# limiter, gate upstream, circuit breaker, dan cache semantik. sesi yang
+# pindah worker kehilangan riwayatnya, batas RATE_LIMIT_PER_MINUTE dan
+# UPSTREAM_MAX_INFLIGHT berlaku per worker (total kira-kira N kali lipat),
+# dan /metrics hanya menampilkan worker yang kebetulan melayani scrape
+#
+#   python serve.py --workers 4 --port 8000
+#   WEB_CONCURRENCY=4 PORT=8000 python serve.py
+import os
+import sys
+import signal
+import socket
+import uuid
+import time
+import asyncio
+import hashlib
+import logging
+import argparse
+
+from structured_logging import setup_logging, shutdown_logging
+
+logger = logging.getLogger("serve")
+
+
+# worker yang mati sebelum MIN_UPTIME detik dianggap crash saat start: jeda
+# sebelum dijalankan ulang berlipat dua sampai MAX_BACKOFF, dan setelah
+# MAX_QUICK_RESTARTS crash berturut-turut induk berhenti
+MIN_UPTIME = 5.0
+RESTART_BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+MAX_QUICK_RESTARTS = 5
+
+
+# file cache bersama bawaan, di direktori cache milik user (XDG_CACHE_HOME,
+# default ~/.cache) dan bukan di /tmp yang bisa ditulis siapa saja. satu
+# direktori per lokasi aplikasi supaya dua deployment di host yang sama tidak
+# berbagi cache. direktori dibuat 0700; file sqlite dibuat 0600 oleh SQLiteStore
+def default_shared_cache_path() -> str:
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    directory = os.path.join(base, "ai-portfolio", hashlib.sha1(app_dir.encode("utf-8")).hexdigest()[:12])
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid") and os.stat(directory).st_uid != os.getuid():
+        raise RuntimeError(f"direktori cache {directory} bukan milik user ini, set RESPONSE_CACHE_PATH")
+    os.chmod(directory, 0o700)
+    return os.path.join(directory, "response-cache.sqlite3")
+
+
+# socket yang diwariskan ke semua worker
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+# jalankan satu worker uvicorn di proses anak, tidak pernah kembali
+def run_worker(app, sock: socket.socket, log_level: str):
+    import uvicorn
+
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+    server = uvicorn.Server(config)
+    try:
+        server.run(sockets=[sock])
+    finally:
+        # os._exit melewati atexit, jadi antrean log dikosongkan di sini
+        shutdown_logging()
+        os._exit(0)
+
+
+# pre-warm di proses induk supaya worker tidak mengulang panggilan yang sama;
+# hasilnya masuk ke cache sqlite yang dibaca semua worker
+def prewarm_before_fork(main):
+    if not main.prewarmer.enabled:
+        return
+
+    async def warm():
+        try:
+            await main.prewarmer.run(main.prewarm_question)
+        finally:
+            # klien http terikat ke event loop ini, worker membuka klien sendiri
+            await main.openai_client.close()
+
+    asyncio.run(warm())
+    main.response_cache.flush_counters()
+    main.prewarmer.enabled = False
+
+
+def serve(host: str, port: int, workers: int, log_level: str, drop_counters: bool = False):
+    import main
+
+    prewarm_before_fork(main)
+    sock = bind_socket(host, port)
+    logger.info("mendengarkan di %s:%s dengan %s worker (cache bersama: %s)",
+                host, port, workers, os.getenv("RESPONSE_CACHE_PATH"))
+
+    children = {}
+    stopping = False
+    crashed = False
+    quick_restarts = 0
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            run_worker(main.app, sock, log_level)
+        children[pid] = time.monotonic()
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    # tidur yang berhenti lebih awal jika induk diminta berhenti
+    def wait_backoff(seconds: float):
+        deadline = time.monotonic() + seconds
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(min(0.1, deadline - time.monotonic()))
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+
+    # worker yang mati tiba-tiba dijalankan ulang sampai induk diminta berhenti,
+    # dengan jeda yang makin panjang jika worker terus crash saat start
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = children.pop(pid, None)
+        if stopping or started is None:
+            continue
+        if time.monotonic() - started < MIN_UPTIME:
+            quick_restarts += 1
+        else:
+            quick_restarts = 0
+        if quick_restarts > MAX_QUICK_RESTARTS:
+            logger.error("worker %s crash %s kali berturut-turut saat start, server dihentikan", pid, quick_restarts)
+            crashed = True
+            stop(signal.SIGTERM, None)
+            continue
+        delay = min(RESTART_BACKOFF * 2 ** (quick_restarts - 1), MAX_BACKOFF) if quick_restarts else 0.0
+        logger.warning("worker %s berhenti (status %s), dijalankan ulang dalam %.1f s", pid, status, delay)
+        wait_backoff(delay)
+        if not stopping:
+            spawn()
+
+    sock.close()
+    main.response_cache.close(drop_counters=drop_counters)
+    if crashed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="jalankan backend dengan beberapa worker")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))))
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info"))
+    args = parser.parse_args()
+
+    setup_logging()
+
+    # tanpa file cache bersama setiap worker punya cache sendiri. run id yang
+    # sama untuk semua worker memisahkan penghitung cache dari run sebelumnya
+    if args.workers > 1:
+        if not os.getenv("RESPONSE_CACHE_PATH"):
+            os.environ["RESPONSE_CACHE_PATH"] = default_shared_cache_path()
+    # run_id dibuat di sini kecuali diberikan dari luar, dan penghitungnya
+    # dihapus lagi saat server berhenti
+    owns_run = "RESPONSE_CACHE_RUN_ID" not in os.environ
+    os.environ.setdefault("RESPONSE_CACHE_RUN_ID", uuid.uuid4().hex)
+
+    if not hasattr(os, "fork"):
+        # platform tanpa fork: worker uvicorn biasa, state dimuat per worker
+        import uvicorn
+
+        uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers, log_level=args.log_level)
+        sys.exit(0)
+
+    serve(args.host, args.port, args.workers, args.log_level, drop_counters=owns_run)
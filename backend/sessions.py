@@ -0,0 +1,172 @@
+import os
+import re
+import time
+from collections import OrderedDict
+
+# kata yang menandakan pertanyaan lanjutan yang merujuk ke jawaban sebelumnya
+FOLLOWUP_MARKERS = re.compile(
+    r"\b(itu|tadi|tersebut|barusan|sebelumnya|yang (?:pertama|kedua|ketiga|terakhir|lain)|"
+    r"lebih (?:detail|lanjut|jelas)|contohnya|kenapa|mengapa|terus|lalu|selain itu)\b"
+)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+HISTORY_HEADER = "\nRiwayat percakapan sebelumnya (yang terlama di atas):\n"
+
+
+# ringkasan jawaban untuk riwayat: kalimat pertama, dipotong ke max_chars
+def summarize_answer(answer: str, max_chars: int) -> str:
+    summary = _SENTENCE_END.split(answer.strip(), 1)[0]
+    if len(summary) > max_chars:
+        summary = summary[:max_chars - 3].rstrip() + "..."
+    return summary
+
+
+# satu giliran tanya jawab, disimpan sudah berupa baris riwayat beserta jumlah
+# tokennya supaya tidak dihitung ulang setiap pertanyaan lanjutan. __slots__
+# supaya tidak ada __dict__ per record
+class Turn:
+    __slots__ = ("line", "tokens")
+
+    def __init__(self, line: str, tokens: int):
+        self.line = line
+        self.tokens = tokens
+
+
+# ring buffer giliran dengan kapasitas tetap: list slot yang dialokasikan
+# sekali dan indeks tulis berikutnya, jauh lebih kecil dari deque per sesi
+class Session:
+    __slots__ = ("slots", "next", "count", "last_seen")
+
+    def __init__(self, capacity: int, now: float):
+        self.slots = [None] * capacity
+        self.next = 0
+        self.count = 0
+        self.last_seen = now
+
+    def append(self, turn: Turn):
+        self.slots[self.next] = turn
+        self.next = (self.next + 1) % len(self.slots)
+        self.count = min(self.count + 1, len(self.slots))
+
+    # giliran dari yang terbaru ke yang terlama
+    def recent(self):
+        capacity = len(self.slots)
+        for i in range(1, self.count + 1):
+            yield self.slots[(self.next - i) % capacity]
+
+
+# sesi percakapan di memori. sesi diurutkan menurut akses terakhir di
+# OrderedDict, jadi sesi kedaluwarsa selalu ada di depan dan bisa dibuang
+# sambil lalu setiap kali store diakses. jumlah sesi dibatasi max_sessions
+# (yang paling lama tidak aktif dibuang), jadi memori tetap rata
+class SessionStore:
+    def __init__(self, max_sessions: int = 10000, turns: int = 4, ttl: float = 1800.0,
+                 question_chars: int = 200, answer_chars: int = 240, history_tokens: int = 300,
+                 followup_only: bool = True, tokenizer=None):
+        self.max_sessions = max_sessions
+        self.turns = turns
+        self.ttl = ttl
+        self.question_chars = question_chars
+        self.answer_chars = answer_chars
+        self.history_tokens = history_tokens
+        self.followup_only = followup_only
+        self.tokenizer = tokenizer
+        self._header_tokens = self._count(HISTORY_HEADER)
+        self._sessions = OrderedDict()
+        self.expired = 0
+        self.evicted = 0
+        self.contexts = 0
+
+    # membuat store dari variabel lingkungan, SESSION_MAX=0 mematikan sesi
+    @classmethod
+    def from_env(cls, tokenizer=None) -> "SessionStore":
+        return cls(
+            max_sessions=int(os.getenv("SESSION_MAX", "10000")),
+            turns=int(os.getenv("SESSION_TURNS", "4")),
+            ttl=float(os.getenv("SESSION_TTL", "1800")),
+            history_tokens=int(os.getenv("SESSION_HISTORY_TOKENS", "300")),
+            followup_only=os.getenv("SESSION_FOLLOWUP_ONLY", "1") != "0",
+            tokenizer=tokenizer,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_sessions > 0 and self.turns > 0
+
+    def __len__(self):
+        return len(self._sessions)
+
+    # buang sesi kedaluwarsa dari depan urutan
+    def _expire(self, now: float):
+        sessions = self._sessions
+        while sessions:
+            key, session = next(iter(sessions.items()))
+            if now - session.last_seen < self.ttl:
+                break
+            del sessions[key]
+            self.expired += 1
+
+    def _get(self, key: str, now: float) -> Session:
+        self._expire(now)
+        session = self._sessions.get(key)
+        if session is not None:
+            session.last_seen = now
+            self._sessions.move_to_end(key)
+        return session
+
+    # riwayat untuk prompt dalam budget token, atau "" jika tidak perlu.
+    # tanpa followup_only riwayat selalu disertakan
+    def history(self, key: str, question: str, now: float = None) -> str:
+        if not self.enabled or key is None:
+            return ""
+        session = self._get(key, time.time() if now is None else now)
+        if session is None or not session.count:
+            return ""
+        if self.followup_only and not FOLLOWUP_MARKERS.search(question.lower()):
+            return ""
+
+        lines = []
+        used = self._header_tokens
+        for turn in session.recent():
+            if used + turn.tokens > self.history_tokens:
+                break
+            lines.append(turn.line)
+            used += turn.tokens
+        if not lines:
+            return ""
+        self.contexts += 1
+        return HISTORY_HEADER + "".join(reversed(lines))
+
+    def _count(self, text: str) -> int:
+        if self.tokenizer is not None:
+            return self.tokenizer.count(text)
+        return len(text) // 4 + 1
+
+    # catat satu giliran sebagai baris riwayat yang sudah diringkas
+    def record(self, key: str, question: str, answer: str, now: float = None):
+        if not self.enabled or key is None:
+            return
+        now = time.time() if now is None else now
+        session = self._get(key, now)
+        if session is None:
+            if len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+            session = self._sessions[key] = Session(self.turns, now)
+        question = question.strip()[:self.question_chars]
+        line = f"- Pengguna: {question}\n  Kamu: {summarize_answer(answer, self.answer_chars)}\n"
+        session.append(Turn(line, self._count(line)))
+
+    def forget(self, key: str):
+        self._sessions.pop(key, None)
+
+    def stats(self) -> dict:
+        self._expire(time.time())
+        return {
+            "enabled": self.enabled,
+            "active": len(self._sessions),
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "contexts": self.contexts,
+        }
@@ -0,0 +1,30 @@
+import asyncio
+
+
+# menggabungkan panggilan identik yang sedang berjalan: pemanggil pertama
+# menjalankan fungsi sebagai task, pemanggil lain dengan kunci yang sama
+# menunggu task yang sama. task dibungkus shield sehingga pembatalan satu
+# pemanggil (misalnya klien putus) tidak membatalkan pemanggil lain
+class SingleFlight:
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key, func):
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "inflight": len(self._inflight),
+            "calls": self.calls,
+            "shared": self.shared,
+        }
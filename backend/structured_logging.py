@@ -0,0 +1,354 @@
+import os
+import sys
+import json
+import time
+import atexit
+import random
+import itertools
+import collections
+import threading
+import logging
+import contextvars
+
+logger = logging.getLogger("request")
+
+# header untuk meneruskan id request dari proxy atau klien
+REQUEST_ID_HEADER = b"x-request-id"
+
+_TEXT_FORMAT = "%(levelname)s:%(name)s:[%(request_id)s] %(message)s"
+
+# field tambahan (extra=...) yang ikut ditulis ke log json
+_EXTRA_FIELDS = ("method", "path", "status", "duration_ms", "stages")
+
+
+# konteks satu request: id, keputusan sampling, durasi per tahap (ms), dan
+# panggilan http ke openai (ms, gagal). keputusan sampling dibuat sekali per
+# request supaya semua baris info dari request yang sama ikut atau dibuang
+# bersama
+class RequestContext:
+    __slots__ = ("request_id", "sampled", "stages", "upstream")
+
+    def __init__(self, request_id: str, sampled: bool = True):
+        self.request_id = request_id
+        self.sampled = sampled
+        self.stages = {}
+        self.upstream = None
+
+
+current_request = contextvars.ContextVar("current_request", default=None)
+
+
+# dipanggil timer tahap di metrics; tanpa request aktif tidak melakukan apa pun
+def record_stage(name: str, seconds: float):
+    context = current_request.get()
+    if context is not None:
+        context.stages[name] = context.stages.get(name, 0.0) + seconds * 1000
+
+
+# dipanggil klien openai untuk setiap request http. hanya panggilan yang
+# selesai lebih dulu yang dicatat (pemenang hedge); antrean gate, tunggu
+# single-flight, dan penolakan admission tidak pernah sampai ke sini
+def record_upstream_call(seconds: float, failed: bool):
+    context = current_request.get()
+    if context is not None and context.upstream is None:
+        context.upstream = (seconds * 1000, failed)
+
+
+# ditempel di handler buffer, jadi berjalan di thread pemanggil: isi id request
+# dari contextvar (tidak terlihat dari thread penulis) dan buang baris info
+# dari request yang tidak masuk sampel. warning ke atas selalu ditulis
+class RequestContextFilter(logging.Filter):
+    def __init__(self):
+        super().__init__()
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = current_request.get()
+        if context is None:
+            record.request_id = "-"
+            return True
+        if not context.sampled and record.levelno < logging.WARNING:
+            self.sampled_out += 1
+            return False
+        record.request_id = context.request_id
+        return True
+
+
+# handler di thread pemanggil: record dimasukkan ke deque apa adanya (tanpa
+# merender msg % args, tanpa kunci handler, tanpa membangunkan thread lain)
+# dan dirender oleh thread penulis. buffer penuh berarti baris dibuang,
+# request tidak pernah menunggu disk
+class _BufferHandler(logging.Handler):
+    def __init__(self, max_size: int):
+        super().__init__()
+        self.records = collections.deque()
+        self.max_size = max_size
+        self.dropped = 0
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if not self.filter(record):
+            return False
+        self.emit(record)
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        if len(self.records) >= self.max_size:
+            self.dropped += 1
+        else:
+            self.records.append(record)
+
+
+# satu baris json per record
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", "-")
+        if request_id != "-":
+            entry["request_id"] = request_id
+        for field in _EXTRA_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = {name: round(ms, 3) for name, ms in value.items()} if field == "stages" else value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+# thread penulis: bangun setiap interval (atau saat flush), render semua
+# record yang terkumpul, lalu tulis dan flush stream sekali per batch. record
+# tidak pernah membangunkan thread ini, jadi thread ini hanya berebut GIL
+# dengan event loop sekali per interval
+class _LogWriter(threading.Thread):
+    def __init__(self, records: collections.deque, handler: logging.StreamHandler, interval: float,
+                 batch_size: int = 512):
+        super().__init__(name="log-writer", daemon=True)
+        self.records = records
+        self.handler = handler
+        self.interval = interval
+        self.batch_size = batch_size
+        self.wake = threading.Event()
+        self.drained = threading.Event()
+        self.stopping = False
+
+    def run(self):
+        while True:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            stopping = self.stopping
+            self._drain()
+            self.drained.set()
+            if stopping:
+                return
+
+    def _drain(self):
+        records, handler = self.records, self.handler
+        while records:
+            lines = []
+            for _ in range(min(len(records), self.batch_size)):
+                record = records.popleft()
+                try:
+                    lines.append(handler.format(record) + handler.terminator)
+                except Exception:
+                    handler.handleError(record)
+            try:
+                handler.stream.write("".join(lines))
+                handler.stream.flush()
+            except Exception:
+                pass
+
+    # tunggu sampai semua record yang masuk sebelum pemanggilan ini ditulis
+    def flush(self, timeout: float = 5.0):
+        self.drained.clear()
+        self.wake.set()
+        self.drained.wait(timeout)
+
+    def stop(self):
+        self.stopping = True
+        self.wake.set()
+        self.join()
+
+
+# pipeline log: handler di root logger hanya memasukkan record ke buffer,
+# thread penulis yang merender dan menulis ke stream
+class LogPipeline:
+    def __init__(self, level: int = logging.INFO, json_format: bool = True, sample_rate: float = 1.0,
+                 queue_size: int = 10000, flush_interval: float = 0.05, stream=None):
+        self.level = level
+        self.json_format = json_format
+        self.sample_rate = sample_rate
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self.stream = stream if stream is not None else sys.stderr
+        self.filter = RequestContextFilter()
+        self.handler = _BufferHandler(queue_size)
+        self.handler.addFilter(self.filter)
+        self._writer = None
+        self._previous = None
+
+    # membuat pipeline dari variabel lingkungan
+    @classmethod
+    def from_env(cls) -> "LogPipeline":
+        return cls(
+            level=logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper()),
+            json_format=os.getenv("LOG_FORMAT", "json") != "text",
+            sample_rate=float(os.getenv("LOG_SAMPLE_RATE", "1.0")),
+            queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+            flush_interval=float(os.getenv("LOG_FLUSH_INTERVAL_MS", "50")) / 1000,
+        )
+
+    def _start_writer(self):
+        output = logging.StreamHandler(self.stream)
+        output.setFormatter(JsonFormatter() if self.json_format else logging.Formatter(_TEXT_FORMAT))
+        self._writer = _LogWriter(self.handler.records, output, self.flush_interval)
+        self._writer.start()
+
+    # pasang di root logger menggantikan handler yang ada, lalu mulai penulis.
+    # thread dan proses tidak ditulis di format mana pun, jadi tidak diisi di
+    # setiap record
+    def start(self):
+        root = logging.getLogger()
+        self._previous = (root.level, root.handlers[:], logging.logThreads, logging.logProcesses,
+                          logging.logMultiprocessing)
+        logging.logThreads = logging.logProcesses = logging.logMultiprocessing = False
+        for handler in self._previous[1]:
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(self.level)
+        self._start_writer()
+
+    # tulis semua yang masih di buffer, lalu kembalikan handler lama
+    def stop(self):
+        if self._writer is None:
+            return
+        self._writer.stop()
+        self._writer = None
+        root = logging.getLogger()
+        root.removeHandler(self.handler)
+        level, handlers, logging.logThreads, logging.logProcesses, logging.logMultiprocessing = self._previous
+        root.setLevel(level)
+        for handler in handlers:
+            root.addHandler(handler)
+
+    # tunggu sampai buffer kosong (misalnya sebelum shutdown atau di benchmark)
+    def flush(self):
+        if self._writer is not None:
+            self._writer.flush()
+
+    # thread penulis tidak ikut ter-fork, jadi proses anak memakai buffer dan
+    # penulis baru; record induk yang belum ditulis tetap milik induk
+    def _restart_in_child(self):
+        if self._writer is None:
+            return
+        self.handler.records = collections.deque()
+        self._start_writer()
+
+    def new_request(self, request_id: str) -> RequestContext:
+        sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        return RequestContext(request_id, sampled)
+
+    def stats(self) -> dict:
+        return {
+            "format": "json" if self.json_format else "text",
+            "sample_rate": self.sample_rate,
+            "queued": len(self.handler.records),
+            "dropped": self.handler.dropped,
+            "sampled_out": self.filter.sampled_out,
+        }
+
+
+_active = None
+
+
+# pasang pipeline log untuk proses ini. tanpa argumen pipeline yang sudah
+# aktif dipakai lagi (serve.py memasangnya sebelum main diimpor)
+def setup_logging(pipeline: LogPipeline = None) -> LogPipeline:
+    global _active
+    if pipeline is None and _active is not None:
+        return _active
+    if _active is not None:
+        _active.stop()
+    _active = pipeline or LogPipeline.from_env()
+    _active.start()
+    return _active
+
+
+def shutdown_logging():
+    global _active
+    if _active is not None:
+        _active.stop()
+        _active = None
+
+
+# id request dibuat dari prefix acak per proses dan penghitung. os.urandom
+# per request berarti satu syscall getrandom di setiap request
+_id_prefix = os.urandom(4).hex()
+_id_counter = itertools.count(1)
+
+
+def new_request_id() -> str:
+    return f"{_id_prefix}{next(_id_counter):08x}"
+
+
+def _after_fork_in_child():
+    global _id_prefix
+    _id_prefix = os.urandom(4).hex()
+    if _active is not None:
+        _active._restart_in_child()
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _request_id(scope) -> str:
+    for name, value in scope["headers"]:
+        if name == REQUEST_ID_HEADER:
+            value = value.decode("latin-1")
+            if 0 < len(value) <= 64 and value.isprintable():
+                return value
+            break
+    return new_request_id()
+
+
+# middleware asgi: id request (dari header X-Request-ID atau dibuat baru),
+# dikembalikan di header respons, dan satu baris ringkasan per request
+# dengan status, durasi, dan durasi per tahap
+class RequestLogMiddleware:
+    def __init__(self, app, pipeline: LogPipeline):
+        self.app = app
+        self.pipeline = pipeline
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _request_id(scope)
+        context = self.pipeline.new_request(request_id)
+        token = current_request.set(context)
+        start = time.perf_counter()
+        status = 500
+        header = (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = dict(message, headers=list(message.get("headers", ())) + [header])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            duration_ms = round((time.perf_counter() - start) * 1000, 3)
+            logger.info("%s %s %s %.1f ms", scope["method"], scope["path"], status, duration_ms, extra={
+                "method": scope["method"], "path": scope["path"], "status": status,
+                "duration_ms": duration_ms, "stages": context.stages,
+            })
+            current_request.reset(token)
@@ -0,0 +1,286 @@
+import os
+import re
+import json
+import asyncio
+import hashlib
+import logging
+
+from classifier import CATEGORY_RULES, DEFAULT_CATEGORY, KeywordClassifier, default_classifier
+from fast_path import FastPath
+from mock_catalog import MockCatalog
+from profile_store import ProfileError, ProfileStore
+from prompt_templates import PromptTemplates
+
+logger = logging.getLogger(__name__)
+
+# tenant bawaan, memakai profile.json dan konfigurasi utama aplikasi
+DEFAULT_TENANT = "default"
+
+# /t/<tenant>/ask diteruskan ke /ask milik tenant itu
+TENANT_PATH_PREFIX = "/t/"
+
+_TENANT_ID = re.compile(r"^[a-z0-9][a-z0-9_-]*$")
+
+
+# dilempar saat konfigurasi satu tenant tidak valid
+class TenantError(Exception):
+    pass
+
+
+# string yang sama di banyak profil (kunci, deskripsi yang disalin) disimpan
+# sekali. table berisi string yang sudah pernah dilihat
+def intern_strings(value, table: dict):
+    if isinstance(value, str):
+        return table.setdefault(value, value)
+    if isinstance(value, dict):
+        return {table.setdefault(key, key): intern_strings(item, table) for key, item in value.items()}
+    if isinstance(value, list):
+        return [intern_strings(item, table) for item in value]
+    return value
+
+
+# satu portofolio: profil, classifier, template prompt, katalog mock, jawaban
+# jalur cepat, dan namespace cache. classifier dan bagian statis katalog
+# dibagi antar tenant
+class Tenant:
+    def __init__(self, tenant_id: str, profile: dict, version: str, classifier: KeywordClassifier,
+                 templates: PromptTemplates, catalog: MockCatalog, hosts: tuple = (), fast_path: FastPath = None):
+        self.id = tenant_id
+        self.classifier = classifier
+        self.templates = templates
+        self.catalog = catalog
+        self.hosts = hosts
+        self.fast_path = fast_path if fast_path is not None else FastPath(profile, enabled=False)
+        self._set_version(profile, version)
+
+    def _set_version(self, profile: dict, version: str):
+        self.profile = profile
+        self.version = version
+        # tenant bawaan memakai hash profil saja supaya kunci cache lama tetap berlaku
+        self.cache_namespace = version if self.id == DEFAULT_TENANT else f"{self.id}:{version}"
+
+    def categorize(self, question: str) -> str:
+        return self.classifier.categorize(question)
+
+    # pasang versi profil baru; jika katalog gagal dirender template dikembalikan
+    def apply(self, profile: dict, version: str):
+        self.templates.rebuild(profile)
+        try:
+            self.catalog.rebuild(profile)
+        except Exception:
+            self.templates.rebuild(self.profile)
+            raise
+        self.fast_path.rebuild(profile)
+        self._set_version(profile, version)
+
+
+def _read_json(path: str, default=None):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise TenantError(f"gagal membaca {path}: {e}") from e
+
+
+# semua tenant di TENANTS_DIR, satu subdirektori per tenant:
+#   <id>/profile.json       wajib, skema sama dengan profile.json utama
+#   <id>/rules.json         opsional, [[kategori, [kata kunci, ...]], ...]
+#   <id>/mock_catalog.json  opsional, default katalog utama
+#   <id>/tenant.json        opsional, {"hosts": ["portofolio.example.com"]}
+# classifier dikompilasi sekali per set aturan dan data katalog dibaca sekali
+# per isi file, jadi tenant dengan aturan/katalog sama memakai objek yang sama
+class TenantRegistry:
+    def __init__(self, directory: str = None, compactor=None, catalog_data: dict = None,
+                 seed: int = None, reload_interval: float = 2.0, fast_path: FastPath = None, retriever=None):
+        self.directory = directory
+        self.compactor = compactor
+        self.catalog_data = catalog_data
+        # konfigurasi jalur cepat tenant bawaan, disalin per profil tenant
+        self.fast_path = fast_path
+        self.retriever = retriever
+        self.seed = seed
+        self.reload_interval = reload_interval
+        self._tenants = {}
+        self._hosts = {}
+        self._stores = []
+        self._classifiers = {}
+        self._catalogs = {}
+        self._strings = {}
+        self._listeners = []
+        self.failed = 0
+
+    # membuat registry dari variabel lingkungan, tanpa TENANTS_DIR hanya ada tenant bawaan
+    @classmethod
+    def from_env(cls, compactor=None, catalog_data: dict = None, fast_path: FastPath = None,
+                 retriever=None) -> "TenantRegistry":
+        seed = os.getenv("MOCK_SEED")
+        return cls(
+            directory=os.getenv("TENANTS_DIR") or None,
+            compactor=compactor,
+            catalog_data=catalog_data,
+            fast_path=fast_path,
+            retriever=retriever,
+            seed=int(seed) if seed else None,
+            reload_interval=float(os.getenv("PROFILE_RELOAD_INTERVAL", "2")),
+        )
+
+    def __len__(self):
+        return len(self._tenants)
+
+    # muat semua tenant; tenant yang rusak dilewati supaya tidak menjatuhkan yang lain
+    def load(self):
+        if not self.directory:
+            return
+        for tenant_id in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, tenant_id)
+            if tenant_id.startswith(".") or not os.path.isdir(path):
+                continue
+            try:
+                self.add(self._load_tenant(tenant_id, path))
+            except (TenantError, ProfileError, KeyError, IndexError, TypeError) as e:
+                self.failed += 1
+                logger.error("tenant %s dilewati: %s", tenant_id, e)
+        logger.info("%s tenant dimuat dari %s", len(self._tenants), self.directory)
+
+    # dipanggil dengan tenant dan namespace cache lamanya setelah profil
+    # tenant itu berganti
+    def on_change(self, callback):
+        self._listeners.append(callback)
+
+    def _changed(self, tenant: Tenant, profile: dict, version: str):
+        old_namespace = tenant.cache_namespace
+        tenant.apply(intern_strings(profile, self._strings), version)
+        for callback in self._listeners:
+            callback(tenant, old_namespace)
+
+    def add(self, tenant: Tenant):
+        self._tenants[tenant.id] = tenant
+        for host in tenant.hosts:
+            self._hosts[host.lower()] = tenant
+
+    def _load_tenant(self, tenant_id: str, path: str) -> Tenant:
+        if not _TENANT_ID.match(tenant_id) or tenant_id == DEFAULT_TENANT:
+            raise TenantError(f"id tenant tidak valid: {tenant_id}")
+        config = _read_json(os.path.join(path, "tenant.json"), default={})
+
+        store = ProfileStore(os.path.join(path, "profile.json"), reload_interval=self.reload_interval)
+        profile = store.profile = intern_strings(store.profile, self._strings)
+        classifier = self._classifier(os.path.join(path, "rules.json"))
+        catalog_data = self._catalog_data(os.path.join(path, "mock_catalog.json"))
+
+        templates = PromptTemplates(profile, categories=classifier.categories + (classifier.default,),
+                                    compactor=self.compactor, lazy=True, retriever=self.retriever)
+        catalog = MockCatalog(catalog_data, profile, seed=self.seed)
+        fast_path = self.fast_path.with_profile(profile) if self.fast_path is not None else None
+        tenant = Tenant(tenant_id, profile, store.version, classifier, templates, catalog,
+                        hosts=tuple(config.get("hosts", ())), fast_path=fast_path)
+
+        store.on_change(lambda new_profile, version: self._changed(tenant, new_profile, version))
+        self._stores.append(store)
+        return tenant
+
+    # satu classifier per set aturan; tanpa rules.json pakai classifier bawaan
+    def _classifier(self, path: str) -> KeywordClassifier:
+        rules = _read_json(path)
+        if rules is None:
+            return default_classifier
+        try:
+            rules = tuple((category, tuple(keywords)) for category, keywords in rules)
+        except (TypeError, ValueError) as e:
+            raise TenantError(f"format aturan {path} tidak valid: {e}") from e
+        if rules == CATEGORY_RULES:
+            return default_classifier
+        classifier = self._classifiers.get(rules)
+        if classifier is None:
+            classifier = self._classifiers[rules] = KeywordClassifier(rules, DEFAULT_CATEGORY)
+        return classifier
+
+    # data katalog dibaca sekali per isi file; tanpa file pakai katalog utama
+    def _catalog_data(self, path: str) -> dict:
+        if not os.path.exists(path):
+            return self.catalog_data
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError as e:
+            raise TenantError(f"gagal membaca {path}: {e}") from e
+        digest = hashlib.sha1(raw).hexdigest()
+        data = self._catalogs.get(digest)
+        if data is None:
+            try:
+                data = self._catalogs[digest] = json.loads(raw)
+            except ValueError as e:
+                raise TenantError(f"gagal membaca {path}: {e}") from e
+        return data
+
+    def get(self, tenant_id: str) -> Tenant:
+        return self._tenants.get(tenant_id)
+
+    # host tanpa port, huruf kecil
+    def for_host(self, host: str) -> Tenant:
+        if not host or not self._hosts:
+            return None
+        return self._hosts.get(host.rsplit(":", 1)[0].lower())
+
+    # cek ulang profil semua tenant, dijalankan sebagai task di lifespan
+    async def watch(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            for store in self._stores:
+                store.check()
+
+    def stats(self) -> dict:
+        return {
+            "tenants": len(self._tenants),
+            "hosts": len(self._hosts),
+            "failed": self.failed,
+            "classifiers": len(self._classifiers) + 1,
+            "catalogs": len(self._catalogs),
+        }
+
+
+# middleware asgi yang menentukan tenant dari prefix path /t/<id>/ atau dari
+# header host, lalu menyimpannya di scope["tenant"]. request tanpa tenant
+# yang cocok dilayani tenant bawaan
+class TenantMiddleware:
+    def __init__(self, app, registry: TenantRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not len(self.registry):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path.startswith(TENANT_PATH_PREFIX):
+            tenant_id, _, rest = path[len(TENANT_PATH_PREFIX):].partition("/")
+            tenant = self.registry.get(tenant_id)
+            if tenant is None:
+                await _not_found(send, tenant_id)
+                return
+            rest = "/" + rest
+            scope = dict(scope, path=rest, raw_path=rest.encode("latin-1"), tenant=tenant)
+        else:
+            host = None
+            for name, value in scope["headers"]:
+                if name == b"host":
+                    host = value.decode("latin-1")
+                    break
+            tenant = self.registry.for_host(host)
+            if tenant is not None:
+                scope = dict(scope, tenant=tenant)
+
+        await self.app(scope, receive, send)
+
+
+async def _not_found(send, tenant_id: str):
+    body = json.dumps({"detail": f"Tenant {tenant_id} tidak ditemukan"}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 404,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
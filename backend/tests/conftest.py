@@ -0,0 +1,12 @@
+# lingkungan uji untuk modul yang mengimpor main: tanpa openai sungguhan,
+# tanpa pre-warm, dan tanpa rate limit karena semua request dari satu klien.
+# log aplikasi ditulis thread sendiri ke stderr, di luar capture pytest,
+# jadi hanya warning ke atas yang ditampilkan
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+os.environ["PREWARM_ON_STARTUP"] = "0"
+os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+os.environ.pop("TRAFFIC_CAPTURE_DIR", None)
+os.environ.setdefault("LOG_LEVEL", "WARNING")
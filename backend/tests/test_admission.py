@@ -0,0 +1,153 @@
+# admission control: token bucket per klien, kunci klien dari header dan
+# X-Forwarded-For, gate upstream, dan perilaku /ask dan /ask/batch saat klien
+# melewati batas
+#
+#   python -m pytest tests/test_admission.py
+import asyncio
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+import main
+from admission import RateLimited, RateLimiter, UpstreamBusy, UpstreamGate
+
+UPSTREAM_ANSWER = "Jawaban dari upstream."
+
+
+def make_request(headers: dict = None, host: str = "10.0.0.1") -> Request:
+    raw = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "headers": raw, "client": (host, 40000)})
+
+
+def test_bucket_refills_at_rate():
+    limiter = RateLimiter(rate=1.0, burst=2)
+    limiter.acquire("a", now=0.0)
+    limiter.acquire("a", now=0.0)
+    with pytest.raises(RateLimited) as rejected:
+        limiter.acquire("a", now=0.0)
+    assert rejected.value.retry_after == pytest.approx(1.0)
+    limiter.acquire("a", now=1.0)
+    # klien lain dan kunci None (panggilan internal) tidak terpengaruh
+    limiter.acquire("b", now=0.0)
+    limiter.acquire(None, now=0.0)
+    assert (limiter.allowed, limiter.limited) == (4, 1)
+
+
+def test_key_header_only_for_allowed_keys():
+    limiter = RateLimiter(key_header="X-Api-Key", allowed_keys=("rahasia",))
+    assert limiter.client_key(make_request({"X-Api-Key": "rahasia"})) == "key:rahasia"
+    # kunci yang tidak terdaftar tidak memberi bucket baru, jatuh ke ip
+    assert limiter.client_key(make_request({"X-Api-Key": "acak-123"})) == "10.0.0.1"
+    assert RateLimiter(key_header="X-Api-Key").client_key(make_request({"X-Api-Key": "apa saja"})) == "10.0.0.1"
+
+
+@pytest.mark.parametrize("trusted, forwarded, expected", [
+    (0, "1.1.1.1", "10.0.0.1"),
+    (1, "1.1.1.1", "1.1.1.1"),
+    # entri paling kiri ditulis klien, yang dipakai entri dari proxy tepercaya
+    (1, "6.6.6.6, 2.2.2.2", "2.2.2.2"),
+    (2, "6.6.6.6, 2.2.2.2, 172.16.0.5", "2.2.2.2"),
+    # lebih sedikit hop dari jumlah proxy: header tidak bisa dipercaya
+    (2, "2.2.2.2", "10.0.0.1"),
+    (1, "", "10.0.0.1"),
+])
+def test_forwarded_for_uses_rightmost_untrusted_hop(trusted, forwarded, expected):
+    limiter = RateLimiter(trusted_proxies=trusted)
+    assert limiter.client_key(make_request({"X-Forwarded-For": forwarded} if forwarded else {})) == expected
+
+
+def test_gate_queues_then_rejects():
+    async def scenario():
+        gate = UpstreamGate(max_inflight=1, max_queue=1, queue_timeout=5)
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "selesai"
+
+        first = asyncio.ensure_future(gate.run(work))
+        second = asyncio.ensure_future(gate.run(work))
+        await asyncio.sleep(0)
+        with pytest.raises(UpstreamBusy):
+            await gate.run(work)
+        assert (gate.inflight, gate.queued) == (1, 1)
+        release.set()
+        return await asyncio.gather(first, second), gate
+
+    results, gate = asyncio.run(scenario())
+    assert results == ["selesai", "selesai"]
+    assert gate.stats()["rejected_queue_full"] == 1 and gate.inflight == 0
+
+
+def test_gate_queue_timeout_and_cancel_free_the_slot():
+    async def scenario():
+        gate = UpstreamGate(max_inflight=1, max_queue=4, queue_timeout=0.02)
+        await gate.acquire()
+        with pytest.raises(UpstreamBusy):
+            await gate.acquire()
+        waiter = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        gate.release()
+        return gate
+
+    gate = asyncio.run(scenario())
+    assert (gate.inflight, gate.queued, gate.rejected_timeout) == (0, 0, 1)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": UPSTREAM_ANSWER}}]})
+
+    monkeypatch.setattr(main.openai_client, "_client",
+                        httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test"))
+    monkeypatch.setattr(main, "rate_limiter", RateLimiter(rate=0.5, burst=10))
+    main.response_cache.clear()
+    return calls
+
+
+async def post(path: str, body: dict) -> httpx.Response:
+    transport = httpx.ASGITransport(app=main.app, client=("203.0.113.7", 40000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+        return await client.post(path, json=body)
+
+
+# batch lebih besar dari burst tetap dijawab semua dan hanya memakai satu token
+def test_batch_larger_than_burst_is_charged_once(upstream):
+    questions = [f"Apa keahlian utama kamu? batch {i}" for i in range(30)]
+    response = asyncio.run(post("/ask/batch", {"questions": questions}))
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["source"] for item in results] == ["openai"] * 30
+    assert len(upstream) == 30
+    assert (main.rate_limiter.allowed, main.rate_limiter.limited) == (1, 0)
+
+    # batch yang seluruhnya dari cache tidak memakai token
+    response = asyncio.run(post("/ask/batch", {"questions": questions}))
+    assert {item["source"] for item in response.json()["results"]} == {"cache"}
+    assert main.rate_limiter.allowed == 1
+
+
+def test_batch_over_limit_gets_429(upstream):
+    main.rate_limiter.burst = 1
+    first = asyncio.run(post("/ask/batch", {"questions": ["Apa hobi kamu? a"]}))
+    second = asyncio.run(post("/ask/batch", {"questions": ["Apa hobi kamu? b"]}))
+    assert first.status_code == 200
+    assert second.status_code == 429 and int(second.headers["Retry-After"]) >= 1
+
+
+@pytest.mark.parametrize("overflow, status", [("mock", 200), ("reject", 429)])
+def test_ask_over_limit(upstream, monkeypatch, overflow, status):
+    monkeypatch.setattr(main, "admission_overflow", overflow)
+    main.rate_limiter.burst = 2
+    responses = [asyncio.run(post("/ask", {"question": f"Apa proyek terbaik kamu? {overflow} {i}"})) for i in range(3)]
+    assert [response.status_code for response in responses] == [200, 200, status]
+    assert len(upstream) == 2
+    if status == 200:
+        assert responses[2].json()["response"] != UPSTREAM_ANSWER
@@ -0,0 +1,97 @@
+# /ask/batch: urutan hasil sama dengan urutan pertanyaan, pertanyaan dengan
+# kunci cache yang sama hanya dijawab sekali, batch berikutnya dari cache,
+# panggilan openai paralel dibatasi batch_concurrency, dan error upstream
+# terlihat per pertanyaan
+#
+#   python -m pytest tests/test_batch.py
+import json
+import asyncio
+
+import httpx
+import pytest
+
+import main
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    state = {"calls": 0, "inflight": 0, "peak": 0, "fail": ()}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["calls"] += 1
+        state["inflight"] += 1
+        state["peak"] = max(state["peak"], state["inflight"])
+        await asyncio.sleep(0.01)
+        state["inflight"] -= 1
+        prompt = json.loads(request.content)["messages"][1]["content"]
+        question = prompt.rsplit("Pertanyaan pengguna: ", 1)[1].split("\n", 1)[0]
+        if any(word in question for word in state["fail"]):
+            return httpx.Response(500, json={"error": {"message": "upstream rusak"}})
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"Jawaban untuk: {question}"}}]})
+
+    monkeypatch.setattr(main.openai_client, "_client",
+                        httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test"))
+    main.response_cache.clear()
+    yield state
+    main.response_cache.clear()
+
+
+async def post_batch(questions: list) -> httpx.Response:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test", timeout=None) as client:
+        return await client.post("/ask/batch", json={"questions": questions})
+
+
+QUESTIONS = ["Apa keahlian utama kamu?", "Ceritakan proyek terbaik kamu", "Apa hobi kamu?",
+             "Tools apa yang kamu pakai?", "Apa tujuan karier kamu?"]
+
+
+def test_results_keep_order_and_duplicates_call_upstream_once(upstream):
+    batch = [question for question in QUESTIONS for _ in range(2)]
+    response = asyncio.run(post_batch(batch))
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["question"] for item in results] == batch
+    assert all(item["error"] is None for item in results)
+    assert results[0]["response"] == results[1]["response"]
+    unique_keys = {main.make_cache_key(q, main.categorize_question(q), main.profile_hash) for q in QUESTIONS}
+    assert upstream["calls"] == len(unique_keys)
+
+
+def test_second_batch_is_served_from_cache(upstream):
+    first = asyncio.run(post_batch(QUESTIONS)).json()["results"]
+    calls = upstream["calls"]
+    second = asyncio.run(post_batch(QUESTIONS)).json()["results"]
+    assert {item["source"] for item in second} == {"cache"}
+    assert [item["response"] for item in second] == [item["response"] for item in first]
+    assert upstream["calls"] == calls
+
+
+def test_upstream_calls_are_bounded_by_concurrency(upstream, monkeypatch):
+    monkeypatch.setattr(main, "batch_concurrency", 2)
+    questions = [f"Apa keahlian utama kamu? nomor {i}" for i in range(8)]
+    results = asyncio.run(post_batch(questions)).json()["results"]
+    assert [item["source"] for item in results] == ["openai"] * 8
+    assert upstream["peak"] == 2
+
+
+# tidak ada fallback mock di batch: pertanyaan yang gagal membawa error,
+# sisanya tetap dijawab dan yang gagal tidak masuk cache
+def test_failed_question_reports_error(upstream):
+    upstream["fail"] = ("proyek",)
+    results = asyncio.run(post_batch(QUESTIONS)).json()["results"]
+    failed = [item for item in results if item["error"]]
+    assert [item["question"] for item in failed] == ["Ceritakan proyek terbaik kamu"]
+    assert failed[0]["response"] is None
+    assert all(item["source"] == "openai" for item in results if not item["error"])
+
+    upstream["fail"] = ()
+    results = asyncio.run(post_batch(QUESTIONS)).json()["results"]
+    assert results[1]["source"] == "openai" and results[1]["error"] is None
+
+
+def test_too_many_questions_is_rejected(upstream, monkeypatch):
+    monkeypatch.setattr(main, "batch_max_questions", 3)
+    response = asyncio.run(post_batch(QUESTIONS))
+    assert response.status_code == 400
+    assert upstream["calls"] == 0
@@ -0,0 +1,171 @@
+# circuit breaker dan hedge: transisi state breaker, jawaban mock lewat /ask
+# saat breaker terbuka, dan jawaban upstream yang terlambat masuk ke cache
+#
+#   python -m pytest tests/test_circuit_breaker.py
+import time
+import asyncio
+
+import httpx
+import pytest
+
+import main
+from circuit_breaker import CircuitBreaker, CircuitOpenError, DeadlineExceeded, Hedge
+
+UPSTREAM_ANSWER = "Jawaban dari upstream."
+
+
+def test_opens_after_failure_rate_and_rejects():
+    breaker = CircuitBreaker(window=10, min_calls=5, failure_rate=0.5, open_seconds=60)
+    for _ in range(4):
+        assert breaker.allow()
+        breaker.record(True, 0.01)
+    assert breaker.state == "closed"
+    breaker.record(True, 0.01)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_opens_on_slow_calls():
+    breaker = CircuitBreaker(min_calls=4, slow_call_seconds=1.0, slow_call_rate=0.5)
+    for duration in (0.1, 2.0, 0.1, 2.0):
+        breaker.record(False, duration)
+    assert breaker.state == "open"
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = CircuitBreaker(min_calls=1, open_seconds=0.01, half_open_probes=1)
+    breaker.record(True, 0.01)
+    assert breaker.state == "open"
+    time.sleep(0.02)
+
+    # hanya satu percobaan yang diloloskan, gagal berarti terbuka lagi
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()
+    breaker.record(True, 0.01)
+    assert breaker.state == "open"
+
+    time.sleep(0.02)
+    assert breaker.allow()
+    breaker.record(False, 0.01)
+    assert breaker.state == "closed"
+
+
+def test_cancelled_probe_returns_its_slot():
+    async def scenario():
+        breaker = CircuitBreaker(min_calls=1, open_seconds=0.0)
+        breaker.record(True, 0.01)
+        task = asyncio.ensure_future(breaker.call(lambda: asyncio.sleep(1)))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return breaker
+
+    breaker = asyncio.run(scenario())
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+def test_call_raises_while_open():
+    async def scenario():
+        breaker = CircuitBreaker(min_calls=1, open_seconds=60)
+        breaker.record(True, 0.01)
+        await breaker.call(lambda: asyncio.sleep(0))
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(scenario())
+
+
+def test_hedge_passes_late_result_to_callback():
+    async def scenario():
+        hedge = Hedge(deadline=0.02)
+        late = []
+        with pytest.raises(DeadlineExceeded):
+            await hedge.run(lambda: asyncio.sleep(0.1, result="terlambat"), on_late=late.append)
+        await asyncio.sleep(0.15)
+        return hedge, late
+
+    hedge, late = asyncio.run(scenario())
+    assert late == ["terlambat"]
+    assert hedge.missed == 1 and hedge.late_results == 1
+
+
+# on_late async (menyimpan ke cache lewat thread) dijalankan sampai selesai
+def test_hedge_runs_async_late_callback():
+    async def scenario():
+        hedge = Hedge(deadline=0.02)
+        late = []
+
+        async def store(text):
+            await asyncio.sleep(0.01)
+            late.append(text)
+
+        with pytest.raises(DeadlineExceeded):
+            await hedge.run(lambda: asyncio.sleep(0.1, result="terlambat"), on_late=store)
+        await asyncio.sleep(0.2)
+        return hedge, late
+
+    hedge, late = asyncio.run(scenario())
+    assert late == ["terlambat"]
+    assert not hedge._late_tasks
+
+
+class FakeUpstream:
+    def __init__(self, latency: float = 0.0, healthy: bool = True):
+        self.latency = latency
+        self.healthy = healthy
+        self.calls = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if not self.healthy:
+            return httpx.Response(503, json={"error": "service unavailable"})
+        return httpx.Response(200, json={"choices": [{"message": {"content": UPSTREAM_ANSWER}}]})
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    fake = FakeUpstream()
+    monkeypatch.setattr(main.openai_client, "_client",
+                        httpx.AsyncClient(transport=httpx.MockTransport(fake.handler), base_url="http://upstream.test"))
+    main.response_cache.clear()
+    return fake
+
+
+async def ask(questions: list) -> list:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+        answers = []
+        for question in questions:
+            response = await client.post("/ask", json={"question": question})
+            assert response.status_code == 200
+            answers.append(response.json()["response"])
+        return answers
+
+
+# selama breaker terbuka /ask tetap 200 dengan jawaban mock, tanpa memanggil upstream
+def test_ask_skips_upstream_while_open(upstream, monkeypatch):
+    upstream.healthy = False
+    monkeypatch.setattr(main, "openai_breaker", CircuitBreaker(window=10, min_calls=5, open_seconds=60))
+    answers = asyncio.run(ask([f"Apa keahlian utama kamu? gangguan {i}" for i in range(20)]))
+    assert main.openai_breaker.state == "open"
+    assert upstream.calls == 5
+    assert UPSTREAM_ANSWER not in answers
+
+
+def test_ask_hedge_answers_mock_then_caches_late_answer(upstream, monkeypatch):
+    upstream.latency = 0.2
+    monkeypatch.setattr(main, "openai_hedge", Hedge(deadline=0.02))
+    question = "Ceritakan proyek yang paling menantang"
+
+    async def scenario():
+        first = await ask([question])
+        await asyncio.sleep(0.3)
+        second = await ask([question])
+        return first[0], second[0]
+
+    first, second = asyncio.run(scenario())
+    assert first != UPSTREAM_ANSWER
+    assert second == UPSTREAM_ANSWER
+    assert upstream.calls == 1
@@ -0,0 +1,42 @@
+# classifier terkompilasi harus sama dengan rantai elif lama (di
+# benchmarks/bench_classifier.py) untuk golden set dan input acak
+#
+#   python -m pytest tests/test_classifier.py
+import os
+import json
+import random
+
+import pytest
+
+from bench_classifier import legacy_categorize_question
+from classifier import CATEGORY_RULES, categorize_question, classify_question
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "classifier_golden.json")
+
+with open(GOLDEN_PATH, encoding="utf-8") as f:
+    GOLDEN = json.load(f)
+
+
+@pytest.mark.parametrize("item", GOLDEN, ids=lambda item: item["question"][:40])
+def test_golden_set(item):
+    assert categorize_question(item["question"]) == item["category"]
+    assert classify_question(item["question"]).category == item["category"]
+    assert legacy_categorize_question(item["question"]) == item["category"]
+
+
+# input acak yang sengaja berisi banyak kata kunci, termasuk kata kunci yang
+# terpotong dan langsung disambung kata kunci lain
+def test_random_parity_with_legacy():
+    rng = random.Random(0)
+    keywords = [keyword for _, words in CATEGORY_RULES for keyword in words]
+    alphabet = "abcdeghiklmnoprstuy "
+    for _ in range(20000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        text += " " + rng.choice(keywords)[:-1] + rng.choice(keywords)
+        assert categorize_question(text) == legacy_categorize_question(text), text
+
+
+def test_first_rule_wins():
+    # "pacar" (personal) didahulukan walaupun "proyek" juga ada
+    assert categorize_question("Pacar kamu tahu proyek kamu?") == "personal_relationship"
+    assert categorize_question("halo, siapa namamu?") == "general"
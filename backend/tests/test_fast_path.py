@@ -0,0 +1,122 @@
+# jalur cepat untuk pertanyaan faktual: pertanyaan faktual dijawab dari profil
+# tanpa openai, pertanyaan yang meminta cerita, pendapat, atau bukan fakta
+# profil dieskalasi, dan porsi jalur cepat terlihat di / dan /metrics
+#
+#   python -m pytest tests/test_fast_path.py
+import asyncio
+
+import httpx
+import pytest
+
+import main
+from fast_path import FastPathCounts
+
+UPSTREAM_ANSWER = "Jawaban dari upstream."
+
+# pertanyaan faktual yang harus dijawab jalur cepat
+FACTUAL = [
+    "Kamu tinggal di mana?",
+    "Domisili kamu di kota apa?",
+    "Kamu kuliah di mana?",
+    "Jurusan kamu apa?",
+    "Lomba apa saja yang pernah kamu ikuti?",
+    "Pernah ikut hackathon apa?",
+    "Lagu apa yang sering kamu dengerin?",
+    "Apa moto hidup kamu?",
+    "Website ini dibuat dengan teknologi apa?",
+]
+
+# kategori faktual tapi meminta cerita atau pendapat, harus ke openai
+ESCALATED = [
+    "Bagaimana kehidupan di kota tempat kamu tinggal?",
+    "Kenapa kamu memilih kuliah di jurusan itu?",
+    "Ceritakan pengalaman lomba yang paling berkesan",
+    "Apa makna moto hidup kamu?",
+    "Kenapa pilih teknologi itu untuk portofolio ini?",
+]
+
+# kata kunci kategori faktual ada, tapi yang ditanyakan bukan fakta profil
+# (waktu, keinginan, topik lain), harus ke openai
+NOT_FACTUAL = [
+    "Sejak kapan kamu belajar coding?",
+    "kota mana yang pengen kamu kunjungi?",
+    "teknologi apa yang pengen kamu pelajari?",
+    "Kamu belajar data science dari mana?",
+    "Kota mana yang paling kamu suka?",
+    "Kapan kamu lulus kuliah?",
+    "Lomba apa yang mau kamu ikuti tahun depan?",
+    "Lagu apa yang cocok buat ngoding?",
+]
+
+# kategori lain, selalu ke openai
+OTHER = [
+    "Apa keahlian utama kamu?",
+    "Ceritakan tentang proyek terbaik kamu",
+    "Apa hobi yang kamu sukai?",
+    "Apa rencana karir kamu ke depan?",
+]
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": UPSTREAM_ANSWER}}]})
+
+    monkeypatch.setattr(main.openai_client, "_client",
+                        httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test"))
+    monkeypatch.setattr(main.fast_path, "enabled", True)
+    monkeypatch.setattr(main.fast_path, "counts", FastPathCounts())
+    main.response_cache.clear()
+    yield calls
+    main.response_cache.clear()
+
+
+async def ask(question: str) -> str:
+    return (await main.ask_ai(main.QuestionRequest(question=question))).response
+
+
+@pytest.mark.parametrize("question", FACTUAL)
+def test_factual_question_is_answered_locally(upstream, question):
+    assert asyncio.run(ask(question)) != UPSTREAM_ANSWER
+    assert upstream == []
+
+
+@pytest.mark.parametrize("question", ESCALATED + NOT_FACTUAL + OTHER)
+def test_other_questions_go_to_openai(upstream, question):
+    assert asyncio.run(ask(question)) == UPSTREAM_ANSWER
+    assert len(upstream) == 1
+
+
+def test_disabled_fast_path_goes_to_openai(upstream, monkeypatch):
+    monkeypatch.setattr(main.fast_path, "enabled", False)
+    assert asyncio.run(ask(FACTUAL[0])) == UPSTREAM_ANSWER
+    assert main.fast_path.stats()["requests"] == 1 and main.fast_path.stats()["served"] == 0
+
+
+def test_stream_sends_fast_answer_as_one_event(upstream):
+    async def stream(question: str) -> str:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+            return (await client.post("/ask/stream", json={"question": question})).text
+
+    for question in FACTUAL:
+        assert '"done": true' in asyncio.run(stream(question))
+    assert upstream == []
+
+
+def test_share_is_reported_in_health_and_metrics(upstream):
+    mix = FACTUAL + ESCALATED + NOT_FACTUAL + OTHER
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+            await asyncio.gather(*(client.post("/ask", json={"question": question}) for question in mix))
+            return (await client.get("/")).json()["fast_path"], (await client.get("/metrics")).text
+
+    health, exported = asyncio.run(scenario())
+    assert health["served"] == len(FACTUAL) and health["requests"] == len(mix)
+    assert health["share"] == pytest.approx(len(FACTUAL) / len(mix), abs=1e-3)
+    assert "fast_path_share" in exported
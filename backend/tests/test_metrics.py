@@ -0,0 +1,84 @@
+# metrik prometheus: histogram tahap dan request, durasi tahap tetap masuk
+# log per request walaupun metrics dimatikan, dan /ask/stream ikut
+# mencatat durasi total per sumber jawaban
+#
+#   python -m pytest tests/test_metrics.py
+import asyncio
+
+import httpx
+import pytest
+
+import main
+from metrics import Metrics
+from structured_logging import RequestContext, current_request
+
+
+def run_stage(metrics: Metrics) -> RequestContext:
+    context = RequestContext("uji")
+    token = current_request.set(context)
+    try:
+        with metrics.stage("categorize"):
+            pass
+        with metrics.stage("categorize"):
+            pass
+    finally:
+        current_request.reset(token)
+    return context
+
+
+def test_enabled_stage_feeds_histogram_and_request_log():
+    metrics = Metrics(enabled=True)
+    context = run_stage(metrics)
+    assert set(context.stages) == {"categorize"}
+    assert 'ask_stage_seconds_count{stage="categorize"} 2' in metrics.render()
+
+
+def test_disabled_stage_still_feeds_request_log():
+    metrics = Metrics(enabled=False)
+    context = run_stage(metrics)
+    assert set(context.stages) == {"categorize"} and context.stages["categorize"] >= 0
+    assert "ask_stage_seconds_count" not in metrics.render()
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = Metrics()
+    for seconds in (0.0002, 0.003, 0.003, 40.0):
+        metrics.observe_request("cache", seconds)
+    rendered = metrics.render()
+    assert 'ask_request_seconds_bucket{source="cache",le="0.0005"} 1' in rendered
+    assert 'ask_request_seconds_bucket{source="cache",le="0.005"} 3' in rendered
+    assert 'ask_request_seconds_bucket{source="cache",le="+Inf"} 4' in rendered
+    assert 'ask_request_seconds_count{source="cache"} 4' in rendered
+
+
+def request_count(metrics: Metrics, source: str) -> int:
+    series = metrics.request_seconds._series.get((source,))
+    return series[2] if series else 0
+
+
+@pytest.mark.parametrize("status, source", [(200, "openai"), (500, "mock")])
+def test_stream_observes_request_duration(monkeypatch, status, source):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if status != 200:
+            return httpx.Response(status, json={"error": {"message": "rusak"}})
+        body = 'data: {"choices": [{"delta": {"content": "Halo."}}]}\n\ndata: [DONE]\n\n'
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    monkeypatch.setattr(main.openai_client, "_client",
+                        httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test"))
+    monkeypatch.setattr(main, "metrics", Metrics())
+    main.response_cache.clear()
+
+    async def stream(question: str) -> str:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+            return (await client.post("/ask/stream", json={"question": question})).text
+
+    question = f"Ceritakan proyek terbaik kamu ({source})"
+    assert '"done": true' in asyncio.run(stream(question))
+    assert request_count(main.metrics, source) == 1
+    if source == "openai":
+        # pertanyaan yang sama berikutnya dari cache
+        asyncio.run(stream(question))
+        assert request_count(main.metrics, "cache") == 1
+    main.response_cache.clear()
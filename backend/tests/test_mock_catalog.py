@@ -0,0 +1,72 @@
+# katalog jawaban mock: dengan seed yang sama jawaban identik dengan handler
+# mock lama (di benchmarks/bench_mock_catalog.py), render ulang mengikuti
+# profil baru, dan /ask-mock menjawab dari katalog
+#
+#   python -m pytest tests/test_mock_catalog.py
+import os
+import copy
+import json
+import random
+import asyncio
+
+import httpx
+import pytest
+
+import main
+from bench_mock_catalog import legacy_mock_answer, new_mock_answer
+from mock_catalog import DEFAULT_CATALOG_PATH, MockCatalog
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "classifier_golden.json")
+
+with open(GOLDEN_PATH, encoding="utf-8") as f:
+    QUESTIONS = [item["question"] for item in json.load(f)]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return MockCatalog.from_file(DEFAULT_CATALOG_PATH, main.user_profile)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_identical_to_legacy(catalog, seed):
+    for question in QUESTIONS:
+        random.seed(seed)
+        catalog.rng.seed(seed)
+        assert new_mock_answer(catalog, question) == legacy_mock_answer(question), question
+
+
+def test_same_seed_repeats_answers():
+    first = MockCatalog.from_file(DEFAULT_CATALOG_PATH, main.user_profile, seed=7)
+    second = MockCatalog.from_file(DEFAULT_CATALOG_PATH, main.user_profile, seed=7)
+    categories = ["hobi", "tools", "keahlian", "personal_age", "tidak_dikenal"]
+    assert [first.answer(c) for c in categories * 5] == [second.answer(c) for c in categories * 5]
+
+
+def test_rebuild_uses_new_profile():
+    profile = copy.deepcopy(main.user_profile)
+    profile["hobi"] = ["Hobi Pengganti Untuk Uji"]
+    catalog = MockCatalog.from_file(DEFAULT_CATALOG_PATH, main.user_profile, seed=1)
+    catalog.rebuild(profile)
+    answers = {catalog.answer("hobi") for _ in range(50)}
+    assert all("Hobi Pengganti Untuk Uji" in answer or "hobi pengganti untuk uji" in answer for answer in answers)
+
+
+# profil tanpa kunci yang dipakai katalog gagal dirender, jawaban lama tetap dipakai
+def test_failed_rebuild_keeps_old_answers():
+    profile = copy.deepcopy(main.user_profile)
+    del profile["hobi"]
+    catalog = MockCatalog.from_file(DEFAULT_CATALOG_PATH, main.user_profile, seed=1)
+    with pytest.raises(KeyError):
+        catalog.rebuild(profile)
+    assert catalog.answer("hobi")
+
+
+def test_ask_mock_endpoint():
+    async def ask() -> httpx.Response:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+            return await client.post("/ask-mock", json={"question": "Apa hobi kamu?"})
+
+    response = asyncio.run(ask())
+    assert response.status_code == 200
+    assert response.json()["response"]
@@ -0,0 +1,44 @@
+# normalize_text harus sama dengan versi lama (di
+# benchmarks/bench_normalize_text.py) untuk input acak, dan gabungan hasil
+# StreamingNormalizer harus sama dengan normalize_text di potongan mana pun
+#
+#   python -m pytest tests/test_normalize_text.py
+import random
+
+import pytest
+
+from bench_normalize_text import legacy_normalize_text
+from text_normalizer import StreamingNormalizer, normalize_text
+
+# karakter yang sering memicu kasus tepi: berbagai whitespace unicode dan tanda baca
+ALPHABET = " \t\n\r\x0b\x0c\xa0\u3000\x1c\x85.,!?:;ab"
+
+
+def random_texts(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40)))
+        yield rng, text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Halo  ,  dunia  .", "Halo, dunia."),
+    ("Apa kabar ?  Baik !", "Apa kabar? Baik!"),
+    ("\n\n  Satu.\tDua  \n", "Satu. Dua"),
+    ("", ""),
+])
+def test_examples(text, expected):
+    assert normalize_text(text) == expected
+
+
+def test_random_parity_with_legacy():
+    for _, text in random_texts(100000):
+        assert normalize_text(text) == legacy_normalize_text(text), text
+
+
+def test_streaming_matches_whole_text():
+    for rng, text in random_texts(20000, seed=1):
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 6))))
+        normalizer = StreamingNormalizer()
+        streamed = "".join(normalizer.feed(text[a:b]) for a, b in zip([0] + cuts, cuts + [len(text)]))
+        assert streamed == normalize_text(text), text
@@ -0,0 +1,27 @@
+# ringkasan pre-warm: jawaban jalur cepat dan cache tidak dihitung sebagai warmed
+#
+#   python -m pytest tests/test_prewarm.py
+import asyncio
+
+from prewarm import Prewarmer
+
+SOURCES = {
+    "Apa keahlian utama kamu?": {"source": "openai"},
+    "Ceritakan proyek kamu": {"source": "openai"},
+    "Kamu kuliah di mana?": {"source": "fast_path"},
+    "Apa hobi kamu?": {"source": "cache"},
+    "Apa moto hidup kamu?": {"error": "upstream gagal"},
+}
+
+
+def test_summary_counts_each_source(monkeypatch):
+    prewarmer = Prewarmer(suggested_path=None)
+    monkeypatch.setattr(prewarmer, "questions", lambda: list(SOURCES))
+
+    async def answer_item(question, semaphore):
+        async with semaphore:
+            return SOURCES[question]
+
+    summary = asyncio.run(prewarmer.run(answer_item))
+    assert (summary["questions"], summary["warmed"], summary["fast_path"], summary["cached"], summary["failed"]) == (5, 2, 1, 1, 1)
+    assert prewarmer.last_run is summary
@@ -0,0 +1,115 @@
+# hot reload profil: file yang tidak berubah tidak memicu listener, versi baru
+# merender ulang template dan katalog mock, jawaban cache versi lama tidak
+# dipakai lagi, dan profil rusak atau tidak valid tidak mengubah apa pun
+#
+#   python -m pytest tests/test_profile_store.py
+import os
+import json
+import shutil
+import asyncio
+
+import pytest
+
+import main
+from profile_store import DEFAULT_PROFILE_PATH, ProfileError, ProfileStore
+
+QUESTION = "Siapa nama kamu?"
+
+
+@pytest.fixture
+def profile_path(tmp_path):
+    path = str(tmp_path / "profile.json")
+    shutil.copyfile(DEFAULT_PROFILE_PATH, path)
+    return path
+
+
+def write_profile(path: str, profile: dict):
+    # tulis ke file sementara lalu ganti secara atomik, seperti saat deploy konten
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def renamed(store: ProfileStore, name: str) -> dict:
+    profile = json.loads(json.dumps(store.profile))
+    profile["nama"] = name
+    return profile
+
+
+# store dengan listener main, versi profil main dikembalikan setelah uji
+@pytest.fixture
+def app_store(profile_path):
+    store = ProfileStore(profile_path, reload_interval=0)
+    store.on_change(main.apply_profile)
+    old_profile, old_version = main.user_profile, main.profile_hash
+    main.response_cache.clear()
+    yield store
+    main.apply_profile(old_profile, old_version)
+    main.response_cache.clear()
+
+
+def test_unchanged_file_does_not_notify(profile_path):
+    store = ProfileStore(profile_path, reload_interval=0)
+    changes = []
+    store.on_change(lambda profile, version: changes.append(version))
+    assert not store.check()
+    # hanya mtime yang berubah, isi sama
+    os.utime(profile_path, ns=(1, 1))
+    assert not store.check()
+    assert changes == [] and store.reloads == 0
+
+
+def test_new_version_notifies_listeners(profile_path):
+    store = ProfileStore(profile_path, reload_interval=0)
+    changes = []
+    store.on_change(lambda profile, version: changes.append((profile["nama"], version)))
+    old_version = store.version
+    write_profile(profile_path, renamed(store, "Nama Baru"))
+    assert store.check()
+    assert changes == [("Nama Baru", store.version)]
+    assert store.version != old_version and store.reloads == 1
+
+
+def test_missing_file_fails_at_startup(tmp_path):
+    with pytest.raises(ProfileError):
+        ProfileStore(str(tmp_path / "tidak-ada.json"))
+
+
+def test_reload_replaces_prompt_mock_and_cache_version(app_store, profile_path):
+    category = main.categorize_question(QUESTION)
+    old_version = main.profile_hash
+    old_key = main.make_cache_key(QUESTION, category, old_version)
+    main.response_cache.set(old_key, "Jawaban versi lama.", old_version)
+    assert asyncio.run(main.ask_ai(main.QuestionRequest(question=QUESTION))).response == "Jawaban versi lama."
+
+    write_profile(profile_path, renamed(app_store, "Nama Baru Untuk Uji Reload"))
+    assert app_store.check()
+
+    assert main.profile_hash == app_store.version != old_version
+    new_key = main.make_cache_key(QUESTION, category, main.profile_hash)
+    assert new_key != old_key and main.response_cache.get(new_key) is None
+    assert main.response_cache.stats()["entries"] == 0
+    assert "Nama Baru Untuk Uji Reload" in main.create_context_aware_prompt(QUESTION)
+
+
+def test_broken_or_invalid_profile_keeps_current_version(app_store, profile_path):
+    write_profile(profile_path, renamed(app_store, "Nama Baru Untuk Uji Reload"))
+    assert app_store.check()
+    version = main.profile_hash
+
+    with open(profile_path, "w", encoding="utf-8") as f:
+        f.write("{ bukan json")
+    assert not app_store.check()
+
+    # json valid tapi template tidak bisa dirender
+    profile = renamed(app_store, "Nama Lain")
+    del profile["proyek"]
+    write_profile(profile_path, profile)
+    assert not app_store.check()
+    assert app_store.failed_reloads == 1
+    # file yang sama tidak dicoba lagi
+    assert not app_store.check()
+    assert app_store.failed_reloads == 1
+
+    assert main.profile_hash == app_store.version == version
+    assert "Nama Baru Untuk Uji Reload" in main.create_context_aware_prompt(QUESTION)
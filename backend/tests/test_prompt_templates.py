@@ -0,0 +1,36 @@
+# template prompt per kategori tanpa kompaksi harus identik byte per byte
+# dengan penyusunan f-string lama (di benchmarks/bench_prompt_templates.py)
+#
+#   python -m pytest tests/test_prompt_templates.py
+import os
+import json
+import copy
+
+import pytest
+
+from bench_prompt_templates import legacy_create_context_aware_prompt
+from main import categorize_question, user_profile
+from prompt_templates import PromptTemplates
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "classifier_golden.json")
+
+with open(GOLDEN_PATH, encoding="utf-8") as f:
+    QUESTIONS = list(dict.fromkeys(item["question"] for item in json.load(f)))
+
+
+@pytest.mark.parametrize("lazy", [False, True], ids=["eager", "lazy"])
+def test_identical_to_legacy(lazy):
+    templates = PromptTemplates(user_profile, lazy=lazy)
+    for question in QUESTIONS:
+        rendered = templates.render(categorize_question(question), question)
+        assert rendered == legacy_create_context_aware_prompt(question), question
+
+
+def test_rebuild_uses_new_profile():
+    templates = PromptTemplates(user_profile)
+    profile = copy.deepcopy(user_profile)
+    profile["nama"] = "Nama Pengganti"
+    templates.rebuild(profile)
+    rendered = templates.render("keahlian", "Apa keahlian kamu?")
+    assert "Nama Pengganti" in rendered
+    assert user_profile["nama"] not in rendered
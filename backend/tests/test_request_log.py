@@ -0,0 +1,192 @@
+# log pertanyaan/jawaban biner: record yang ditulis terbaca kembali apa
+# adanya, file tumbuh per chunk dan dilanjutkan saat dibuka ulang, summary
+# streaming cocok dengan hitungan eksak, dan /ask, /ask/stream, serta
+# /ask-mock menulis record dengan jalur yang benar
+#
+#   python -m pytest tests/test_request_log.py
+import os
+import sys
+import json
+import math
+import random
+import asyncio
+import subprocess
+
+import httpx
+import pytest
+
+import main
+import request_log
+from fake_openai import FakeOpenAIConfig, create_app
+from request_log import PATHS, RequestLog, TopQuestions, iter_records, question_hash, summarize
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATEGORIES = ("keahlian", "proyek", "hobi", "pendidikan", "general")
+
+
+# trafik sintetis: pertanyaan berdistribusi zipf, latensi lognormal
+def synthetic(records: int, distinct: int, seed: int = 7):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    for rank in rng.choices(range(distinct), weights=weights, k=records):
+        category = CATEGORIES[rank % len(CATEGORIES)]
+        seconds = math.exp(rng.gauss(0, 1)) / 1000
+        yield f"Pertanyaan nomor {rank} tentang {category}?", category, PATHS[rank % len(PATHS)], seconds
+
+
+@pytest.fixture
+def log(tmp_path):
+    log = RequestLog(str(tmp_path), batch_size=1000, chunk_size=4096)
+    yield log
+    log.close()
+
+
+def test_records_round_trip(log):
+    log.record("Apa keahlian utama kamu?", "keahlian", "openai", 0.9, "prompt " * 40, "jawaban " * 10)
+    log.record("apa keahlian UTAMA kamu", "keahlian", "cache", 0.0004)
+    log.record("Kamu tinggal di mana?", "lokasi", "fast_path", 0.0001, "prompt tidak dihitung", None)
+    log.close()
+    openai, cache, fast = iter_records(log.path)
+    assert (openai.question, openai.category, openai.path) == ("Apa keahlian utama kamu?", "keahlian", "openai")
+    assert openai.latency_ms == pytest.approx(900.0)
+    assert openai.prompt_tokens > 0 and openai.answer_tokens > 0
+    # parafrase ejaan/tanda baca jatuh ke hash yang sama
+    assert cache.question_hash == openai.question_hash == question_hash("apa keahlian utama kamu?")
+    assert (cache.prompt_tokens, cache.answer_tokens) == (0, 0)
+    assert fast.path == "fast_path" and fast.answer_tokens == 0
+
+
+def test_long_question_is_truncated_on_character_boundary(tmp_path):
+    log = RequestLog(str(tmp_path), max_question_bytes=10)
+    log.record("ééééééé", "general", "mock", 0.001)
+    log.close()
+    record, = iter_records(log.path)
+    assert record.question == "ééééé"
+
+
+def test_file_grows_per_chunk_and_is_trimmed_on_close(log):
+    for i in range(300):
+        log.record(f"Pertanyaan nomor {i}?", "general", "mock", 0.001)
+        if i % 50 == 0:
+            log.flush()
+    log.close()
+    assert [record.question for record in iter_records(log.path)] == [f"Pertanyaan nomor {i}?" for i in range(300)]
+    assert os.path.getsize(log.path) == log.stats()["bytes"]
+
+
+def test_reopened_log_appends(tmp_path):
+    first = RequestLog(str(tmp_path), chunk_size=4096)
+    first.record("pertama", "general", "mock", 0.001)
+    first.close()
+    second = RequestLog(str(tmp_path), chunk_size=4096)
+    second.record("kedua", "general", "mock", 0.001)
+    second.close()
+    assert second.path == first.path
+    assert [record.question for record in iter_records(first.path)] == ["pertama", "kedua"]
+
+
+# ftruncate atau mmap gagal saat file diperbesar: batch itu dibuang, map lama
+# tidak dipakai lagi, dan flush berikutnya membuka ulang file
+@pytest.mark.parametrize("failing", ["ftruncate", "mmap"])
+def test_failed_growth_reopens_on_next_flush(log, monkeypatch, failing):
+    log.record("sebelum", "general", "mock", 0.001)
+    log.flush()
+    target = request_log.os if failing == "ftruncate" else request_log.mmap
+    original = getattr(target, failing)
+
+    def broken(*args, **kwargs):
+        raise OSError(28, "disk penuh")
+
+    monkeypatch.setattr(target, failing, broken)
+    for i in range(20):
+        log.record(f"gagal {i} " + "x" * 400, "general", "mock", 0.001)
+    log.flush()
+    assert log._map is None and log.records == 1
+
+    monkeypatch.setattr(target, failing, original)
+    log.record("sesudah", "general", "mock", 0.001)
+    log.flush()
+    log.close()
+    assert [record.question for record in iter_records(log.path)] == ["sebelum", "sesudah"]
+
+
+def test_foreign_file_drops_batch_without_raising(tmp_path):
+    with open(tmp_path / f"requests-{os.getpid()}.qalog", "wb") as f:
+        f.write(b"bukan log" * 10)
+    log = RequestLog(str(tmp_path))
+    log.record("pertanyaan", "general", "mock", 0.001)
+    log.flush()
+    assert log.records == 0 and log.stats()["pending"] == 0
+
+
+def test_summary_matches_exact_counts(tmp_path):
+    log = RequestLog(str(tmp_path), batch_size=1024, chunk_size=64 * 1024)
+    exact_questions, exact_categories, latencies = {}, {}, []
+    for question, category, path, seconds in synthetic(20000, 300):
+        log.record(question, category, path, seconds)
+        hashed = question_hash(question)
+        exact_questions[hashed] = exact_questions.get(hashed, 0) + 1
+        exact_categories[category] = exact_categories.get(category, 0) + 1
+        latencies.append(seconds * 1000)
+    log.close()
+    latencies.sort()
+
+    report = summarize([log.path], capacity=100).report(10)
+    assert report["records"] == 20000
+    assert report["categories"] == dict(sorted(exact_categories.items(), key=lambda item: -item[1]))
+    assert [item["count"] for item in report["top_questions"]] == sorted(exact_questions.values(), reverse=True)[:10]
+    assert all(item["max_overcount"] == 0 for item in report["top_questions"][:5])
+    for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        exact = latencies[min(int(q * len(latencies)), len(latencies) - 1)]
+        assert report["latency_ms"][name] == pytest.approx(exact, rel=0.03)
+
+
+def test_top_questions_overcount_is_bounded():
+    top = TopQuestions(capacity=2)
+    for hashed in [1] * 10 + [2] * 5 + [3, 4, 5, 6, 7]:
+        top.add(hashed, str(hashed))
+    (first, first_count, first_error), (second, second_count, _) = top.top(2)
+    assert (first, first_count, first_error) == ("1", 10, 0)
+    assert (second, second_count) == ("2", 5)
+    for _, count, error in top.top(10):
+        assert error <= top.floor
+
+
+def test_cli_summary(log):
+    for i in range(20):
+        log.record(f"Pertanyaan {i % 3}?", "general", "cache", 0.001)
+    log.close()
+    output = subprocess.run([sys.executable, os.path.join(BACKEND, "request_log.py"), "summary", log.directory,
+                             "--json", "--top", "3"], check=True, capture_output=True, text=True).stdout
+    report = json.loads(output)
+    assert report["records"] == 20 and [item["count"] for item in report["top_questions"]] == [7, 7, 6]
+
+
+def test_endpoints_record_their_path(tmp_path, monkeypatch):
+    upstream = create_app(FakeOpenAIConfig(latency_ms=1, jitter_ms=0, chunk_ms=0))
+    monkeypatch.setattr(main.openai_client, "_client",
+                        httpx.AsyncClient(transport=httpx.ASGITransport(app=upstream), base_url="http://upstream.test/v1"))
+    monkeypatch.setattr(main.fast_path, "enabled", True)
+    log = RequestLog(str(tmp_path))
+    monkeypatch.setattr(main, "request_log", log)
+    main.response_cache.clear()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+            await client.post("/ask", json={"question": "Kamu tinggal di mana?"})
+            await client.post("/ask", json={"question": "Apa keahlian utama kamu?"})
+            await client.post("/ask", json={"question": "Apa keahlian utama kamu?"})
+            await client.post("/ask/stream", json={"question": "Ceritakan tentang proyek terbaik kamu"})
+            await client.post("/ask-mock", json={"question": "Apa hobi kamu?"})
+            return (await client.get("/")).json()["request_log"]
+
+    health = asyncio.run(scenario())
+    log.close()
+    main.response_cache.clear()
+    assert health["records"] + health["pending"] == 5
+    records = list(iter_records(log.path))
+    assert [record.path for record in records] == ["fast_path", "openai", "cache", "openai", "mock"]
+    # token hanya dihitung untuk jawaban yang memanggil openai
+    for record in records:
+        assert (record.prompt_tokens > 0 and record.answer_tokens > 0) == (record.path == "openai")
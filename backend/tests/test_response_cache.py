@@ -0,0 +1,174 @@
+# cache respons exact-match: kunci kanonik, lru dengan ttl dan batas memori,
+# penyimpanan sqlite bersama (purge entri kedaluwarsa, akses dari event loop
+# lewat thread), dan penghitung bersama per run
+#
+#   python -m pytest tests/test_response_cache.py
+import os
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from response_cache import ResponseCache, SQLiteStore, make_cache_key
+
+
+def count_rows(path: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cache.sqlite3")
+
+
+def test_cache_key_ignores_case_punctuation_and_spacing():
+    assert make_cache_key("Apa keahlian kamu?", "keahlian", "v1") == make_cache_key("  apa KEAHLIAN kamu ", "keahlian", "v1")
+    assert make_cache_key("Apa keahlian kamu?", "keahlian", "v1") != make_cache_key("Apa keahlian kamu?", "keahlian", "v2")
+    assert make_cache_key("Apa keahlian kamu?", "keahlian", "v1") != make_cache_key("Apa keahlian kamu?", "general", "v1")
+
+
+def test_lru_evicts_oldest_and_respects_ttl(monkeypatch):
+    cache = ResponseCache(max_entries=2, ttl=10)
+    monkeypatch.setattr("response_cache.time.time", lambda: 1000.0)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+    monkeypatch.setattr("response_cache.time.time", lambda: 1011.0)
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 1
+
+
+def test_max_bytes_limits_memory():
+    cache = ResponseCache(max_entries=100, max_bytes=50)
+    cache.set("a", "x" * 30)
+    cache.set("b", "y" * 30)
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] <= 50
+
+
+def test_write_purges_expired_rows(db_path, monkeypatch):
+    store = SQLiteStore(db_path, purge_interval=60)
+    monkeypatch.setattr("response_cache.time.time", lambda: 1000.0)
+    for i in range(20):
+        store.set(f"lama-{i}", "jawaban", expires_at=1010.0)
+    assert count_rows(db_path) == 20
+
+    # sebelum interval purge lewat, baris kedaluwarsa belum dibuang
+    monkeypatch.setattr("response_cache.time.time", lambda: 1020.0)
+    store.set("baru-1", "jawaban", expires_at=2000.0)
+    assert count_rows(db_path) == 21
+
+    monkeypatch.setattr("response_cache.time.time", lambda: 1061.0)
+    store.set("baru-2", "jawaban", expires_at=2000.0)
+    assert count_rows(db_path) == 2
+    assert store.purged == 20
+    store.close()
+
+
+def test_purge_removes_only_expired_rows(db_path, monkeypatch):
+    store = SQLiteStore(db_path, purge_interval=3600)
+    monkeypatch.setattr("response_cache.time.time", lambda: 5.0)
+    store.set("lama", "jawaban", expires_at=10.0)
+    store.set("baru", "jawaban", expires_at=10_000_000_000.0)
+    assert store.purge(now=100.0) == 1
+    assert store.get("baru", 100.0) == ("jawaban", 10_000_000_000.0)
+    assert store.get("lama", 5.0) is None
+    store.close()
+
+
+def test_disk_entries_survive_a_new_cache(db_path):
+    first = ResponseCache(store=SQLiteStore(db_path))
+    first.set("kunci", "jawaban")
+    first.close()
+    second = ResponseCache(store=SQLiteStore(db_path))
+    assert second.get("kunci") == "jawaban"
+    assert second.disk_hits == 1
+    second.close()
+
+
+# dari event loop, query sqlite tidak berjalan di thread event loop
+def test_async_access_runs_sqlite_in_a_thread(db_path):
+    store = SQLiteStore(db_path)
+    cache = ResponseCache(store=store, counter_flush_interval=0.0)
+    threads = []
+    for name in ("get", "set", "set_counters"):
+        original = getattr(store, name)
+
+        def recording(*args, _original=original, **kwargs):
+            threads.append(threading.current_thread())
+            return _original(*args, **kwargs)
+
+        setattr(store, name, recording)
+
+    async def scenario():
+        assert await cache.aget("kunci") is None
+        await cache.aset("kunci", "jawaban")
+        cache.clear_memory()
+        assert await cache.aget("kunci") == "jawaban"
+        # hit memori tidak membaca sqlite
+        assert await cache.aget("kunci") == "jawaban"
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(scenario())
+    assert threads
+    assert all(thread is not loop_thread for thread in threads)
+    assert (cache.hits, cache.misses, cache.disk_hits) == (2, 1, 1)
+    cache.close()
+
+
+def test_async_without_store_matches_sync():
+    cache = ResponseCache()
+
+    async def scenario():
+        await cache.aset("kunci", "jawaban")
+        return await cache.aget("kunci"), await cache.aget("lain")
+
+    assert asyncio.run(scenario()) == ("jawaban", None)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_counters_are_summed_over_workers(db_path):
+    store = SQLiteStore(db_path, run_id="run-a")
+    store.set_counters("101", {"hits": 3, "misses": 1})
+    store.set_counters("102", {"hits": 2, "misses": 4})
+    store.set_counters("101", {"hits": 5, "misses": 1})
+    assert store.sum_counters() == {"hits": 7, "misses": 5}
+    store.close()
+
+
+# beberapa instance berbagi satu file: membuka store tidak menghapus
+# penghitung run lain, dan run hanya menghapus barisnya sendiri
+def test_runs_only_clean_up_their_own_counters(db_path):
+    other = SQLiteStore(db_path, run_id="instance-lain")
+    other.set_counters("200", {"hits": 4, "misses": 1})
+
+    mine = ResponseCache(store=SQLiteStore(db_path))
+    mine.get("tidak-ada")
+    mine.flush_counters()
+    assert other.sum_counters() == {"hits": 4, "misses": 1}
+    assert mine.stats()["shared"]["misses"] == 1
+
+    mine.close()
+    assert other.sum_counters() == {"hits": 4, "misses": 1}
+    with sqlite3.connect(db_path) as conn:
+        assert {run for run, in conn.execute("SELECT DISTINCT run FROM worker_counters")} == {"instance-lain"}
+
+    # run_id dari luar (serve.py) tidak dihapus oleh worker, hanya oleh pembuatnya
+    worker = ResponseCache(store=SQLiteStore(db_path, run_id="instance-lain"))
+    worker.close()
+    assert (other.sum_counters()["hits"], other.sum_counters()["misses"]) == (4, 1)
+    other.drop_counters()
+    assert other.sum_counters() == {}
+    other.close()
+
+
+def test_new_database_file_is_private(db_path):
+    store = SQLiteStore(db_path)
+    store.set("kunci", "jawaban", expires_at=10_000_000_000.0)
+    assert os.stat(db_path).st_mode & 0o777 == 0o600
+    store.close()
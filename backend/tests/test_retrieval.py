@@ -0,0 +1,120 @@
+# fakta profil dari indeks bm25: blok kategori tetap lengkap, fakta hanya
+# ditambahkan, dan pertanyaan, riwayat sesi, serta fakta tambahan tetap muat
+# di budget token prompt
+#
+#   python -m pytest tests/test_retrieval.py
+import pytest
+
+from bench_retrieval import FACT_CHECKS
+from main import categorize_question, user_profile
+from prompt_compaction import PromptCompactor
+from prompt_templates import PromptTemplates
+from retrieval import ProfileRetriever, profile_passages
+from sessions import HISTORY_HEADER
+
+
+@pytest.fixture(scope="module")
+def compactor():
+    return PromptCompactor()
+
+
+@pytest.fixture(scope="module")
+def templates(compactor):
+    return PromptTemplates(user_profile, compactor=compactor,
+                           retriever=ProfileRetriever(tokenizer=compactor.tokenizer))
+
+
+def long_history(turns: int) -> str:
+    return HISTORY_HEADER + "".join(
+        f"- Pengguna: pertanyaan nomor {i} tentang proyek\n  Kamu: jawaban nomor {i} yang cukup panjang.\n"
+        for i in range(turns)
+    )
+
+
+def test_index_covers_profile():
+    index = ProfileRetriever().build(user_profile)
+    assert len(index) == len(profile_passages(user_profile))
+    assert "nama" not in {passage.field for passage in index.passages}
+
+
+# instruksi proyek merujuk ke proyek_detail dan keahlian ke keahlian_detail,
+# jadi blok kategori tidak boleh diganti fakta hasil pencarian
+@pytest.mark.parametrize("category, question, detail", [
+    ("proyek", "Ceritakan proyek terbaik kamu", user_profile["proyek_detail"]["Rush Hour Puzzle Solver"]),
+    ("keahlian", "Apa keahlian kamu?", next(iter(user_profile["keahlian_detail"].values()))),
+])
+def test_category_block_is_kept(templates, category, question, detail):
+    rendered = templates.render(category, question)
+    assert detail in rendered
+    assert "Pertanyaan pengguna adalah tentang" in rendered
+
+
+def test_retrieval_only_adds_facts(compactor):
+    plain = PromptTemplates(user_profile, compactor=compactor)
+    retrieving = PromptTemplates(user_profile, compactor=compactor,
+                                 retriever=ProfileRetriever(tokenizer=compactor.tokenizer))
+    found = {"plain": 0, "retrieval": 0}
+    for question, fact in FACT_CHECKS:
+        category = categorize_question(question)
+        with_facts = retrieving.render(category, question)
+        without = plain.render(category, question)
+        # semua baris template kategori tetap ada
+        assert all(line in with_facts for line in without.split("\n")), question
+        found["plain"] += fact.lower() in without.lower()
+        found["retrieval"] += fact.lower() in with_facts.lower()
+    assert found["retrieval"] == len(FACT_CHECKS)
+    assert found["retrieval"] > found["plain"]
+
+
+@pytest.mark.parametrize("category, question", [
+    ("hobi", "Apa hobi kamu?"),
+    ("keahlian", "Apa keahlian kamu di Next.js?"),
+])
+def test_facts_already_in_template_are_not_repeated(templates, category, question):
+    rendered = templates.render(category, question)
+    template, _, facts = rendered.partition("Fakta relevan:")
+    facts = facts.split("\nPertanyaan pengguna:")[0]
+    for line in facts.strip().split("\n"):
+        if line:
+            assert line.split(": ", 1)[-1] not in template, line
+
+
+def test_personal_categories_get_no_facts(templates):
+    assert "Fakta relevan" not in templates.render("personal_age", "Berapa umur kamu?")
+
+
+# riwayat dan fakta dihitung ke budget; giliran terlama yang dibuang
+@pytest.mark.parametrize("category", ["proyek", "general", "keahlian", "hobi"])
+def test_history_and_facts_fit_the_budget(templates, compactor, category):
+    history = long_history(60)
+    rendered = templates.render(category, "terus proyek yang itu gimana?", history)
+    assert compactor.tokenizer.count(rendered) <= compactor.budget
+    assert "pertanyaan nomor 59" in rendered
+    assert "pertanyaan nomor 0 " not in rendered
+
+
+def test_short_history_is_kept_whole(templates):
+    history = long_history(2)
+    assert history in templates.render("proyek", "terus proyek yang itu gimana?", history)
+
+
+def test_long_question_still_fits(templates, compactor):
+    rendered = templates.render("proyek", "ceritakan proyek kamu " * 500, long_history(10))
+    assert compactor.tokenizer.count(rendered) <= compactor.budget
+
+
+def test_context_respects_token_limit_and_exclude():
+    retriever = ProfileRetriever(top_k=4, max_tokens=160)
+    index = retriever.build(user_profile)
+    question = "Buku apa yang kamu suka baca?"
+    full = retriever.context(index, question, "hobi")
+    assert "Ted Chiang" in full
+    assert retriever.context(index, question, "hobi", max_tokens=5) == ""
+    first_fact = full.split("\n- ")[1].split(": ", 1)[-1]
+    assert first_fact not in retriever.context(index, question, "hobi", exclude=first_fact)
+
+
+def test_search_ranks_matching_passage_first():
+    index = ProfileRetriever().build(user_profile)
+    (_, doc), = index.search("Rush Hour", k=1)
+    assert "Rush Hour" in index.passages[doc].text
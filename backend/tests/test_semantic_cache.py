@@ -0,0 +1,120 @@
+# cache semantik: parafrase di korpus tetap hit, pertanyaan yang mirip tapi
+# beda maksud (jenjang, kerabat, negasi, superlatif) tidak saling memakai
+# jawaban, dan entri kedaluwarsa tidak dipakai
+#
+#   python -m pytest tests/test_semantic_cache.py
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+
+import main
+from classifier import categorize_question
+from semantic_cache import SemanticCache
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "benchmarks", "semantic_corpus.json")
+
+# pasangan dari review: skor vektornya di atas 0.75, tapi jawabannya berbeda
+DIFFERENT_PAIRS = [
+    ("kapan kamu lulus sma?", "kapan kamu lulus smp?"),
+    ("Berapa umur kamu?", "Berapa umur adik kamu?"),
+    ("kamu suka kopi?", "kamu tidak suka kopi?"),
+    ("kamu suka kopi?", "kamu gak suka kopi?"),
+    ("proyek terbaru", "proyek terbaik"),
+]
+
+
+def cached_answer(cached: str, query: str, cache: SemanticCache = None):
+    cache = cache or SemanticCache()
+    cache.set(cached, categorize_question(cached), "jawaban")
+    return cache.get(query, categorize_question(query))
+
+
+@pytest.mark.parametrize("first, second", DIFFERENT_PAIRS)
+def test_different_questions_do_not_share_answers(first, second):
+    assert cached_answer(first, second) is None
+    assert cached_answer(second, first) is None
+    # tetap meleset walaupun threshold diturunkan jauh
+    assert cached_answer(first, second, SemanticCache(threshold=0.5)) is None
+
+
+def test_corpus_paraphrases_hit_without_false_hits():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = json.load(f)
+    hits = {True: 0, False: 0}
+    for pair in corpus:
+        if cached_answer(pair["cached"], pair["query"]) is not None:
+            hits[pair["same"]] += 1
+    assert hits[False] == 0
+    assert hits[True] >= 15
+
+
+def test_reordered_paraphrase_hits():
+    assert cached_answer("Apa keahlian utama kamu?", "Keahlian utama kamu apa aja?") == "jawaban"
+    assert cached_answer("Apa hobi yang kamu sukai?", "hobi yang kamu sukai apa?") == "jawaban"
+
+
+def test_category_is_part_of_the_namespace():
+    cache = SemanticCache()
+    cache.set("Apa skill kamu?", "keahlian", "jawaban")
+    assert cache.get("Apa skill kamu?", "keahlian") == "jawaban"
+    assert cache.get("Apa skill kamu?", "proyek") is None
+
+
+def test_closest_candidate_with_same_words_wins():
+    cache = SemanticCache()
+    cache.set("kamu tidak suka kopi?", "hobi", "tidak suka")
+    cache.set("kamu suka kopi?", "hobi", "suka")
+    assert cache.get("kamu suka kopi?", "hobi") == "suka"
+    assert cache.get("kamu gak suka kopi?", "hobi") == "tidak suka"
+
+
+def test_expired_entries_are_not_served(monkeypatch):
+    cache = SemanticCache(ttl=10)
+    monkeypatch.setattr("semantic_cache.time.time", lambda: 1000.0)
+    cache.set("Apa skill kamu?", "keahlian", "lama")
+    monkeypatch.setattr("semantic_cache.time.time", lambda: 1011.0)
+    assert cache.get("Apa skill kamu?", "keahlian") is None
+    cache.set("Apa skill kamu?", "keahlian", "baru")
+    assert cache.get("Apa skill kamu?", "keahlian") == "baru"
+
+
+def test_disabled_by_default():
+    assert os.environ["SEMANTIC_CACHE_ENABLED"] == "0"
+    assert main.semantic_cache is None
+
+
+# dengan cache semantik aktif, /ask untuk pertanyaan yang beda maksud tetap
+# memanggil openai dan tidak mengembalikan jawaban pertanyaan sebelumnya
+def test_ask_does_not_serve_answer_of_similar_question(monkeypatch):
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"Jawaban nomor {len(calls)}."}}]})
+
+    monkeypatch.setattr(main.openai_client, "_client",
+                        httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test"))
+    semantic_cache = SemanticCache()
+    monkeypatch.setattr(main, "semantic_cache", semantic_cache)
+    main.response_cache.clear()
+
+    async def ask(question: str) -> str:
+        transport = httpx.ASGITransport(app=main.app, client=("203.0.113.9", 40000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+            response = await client.post("/ask", json={"question": question})
+        assert response.status_code == 200
+        return response.json()["response"]
+
+    first = asyncio.run(ask("kamu suka kopi hitam?"))
+    second = asyncio.run(ask("kamu tidak suka kopi hitam?"))
+    assert first != second
+    assert len(calls) == 2
+    # parafrase dengan kata isi yang sama memakai jawaban dari cache semantik
+    assert asyncio.run(ask("kopi hitam kamu suka?")) == first
+    assert len(calls) == 2
+    assert semantic_cache.hits == 1
+    main.response_cache.clear()
@@ -0,0 +1,34 @@
+# entry point multi-worker: lokasi bawaan file cache bersama
+#
+#   python -m pytest tests/test_serve.py
+import os
+
+import pytest
+
+import serve
+
+
+def test_default_cache_path_is_private_and_outside_tmp(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    path = serve.default_shared_cache_path()
+    assert path.startswith(str(tmp_path / "cache" / "ai-portfolio"))
+    assert os.stat(os.path.dirname(path)).st_mode & 0o777 == 0o700
+    # lokasi stabil untuk deployment yang sama
+    assert serve.default_shared_cache_path() == path
+
+
+def test_default_cache_path_tightens_existing_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    directory = os.path.dirname(serve.default_shared_cache_path())
+    os.chmod(directory, 0o777)
+    serve.default_shared_cache_path()
+    assert os.stat(directory).st_mode & 0o777 == 0o700
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="butuh uid posix")
+def test_default_cache_path_rejects_foreign_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    serve.default_shared_cache_path()
+    monkeypatch.setattr(serve.os, "getuid", lambda: os.stat(tmp_path).st_uid + 1)
+    with pytest.raises(RuntimeError):
+        serve.default_shared_cache_path()
@@ -0,0 +1,88 @@
+# sesi percakapan: jumlah sesi dibatasi SESSION_MAX, sesi kedaluwarsa
+# dibuang, riwayat di prompt tidak melewati budget token, dan pertanyaan
+# lanjutan lewat /ask membawa konteks jawaban sebelumnya dari sesi yang sama
+#
+#   python -m pytest tests/test_sessions.py
+import json
+import asyncio
+
+import httpx
+import pytest
+
+import main
+from bench_sessions import ANSWER, fill
+from sessions import HISTORY_HEADER, SessionStore
+
+FOLLOWUP = "Jelaskan lebih detail yang pertama"
+
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    return main.prompt_compactor.tokenizer
+
+
+def test_oldest_sessions_are_evicted_at_the_limit(tokenizer):
+    store = SessionStore(max_sessions=50, tokenizer=tokenizer)
+    fill(store, 200, 3, now=1000.0)
+    assert len(store) == 50
+    assert store.evicted == 150
+    # sesi yang paling lama tidak aktif yang dibuang
+    assert store.history("default:sesi-000000", FOLLOWUP, now=1000.0) == ""
+    assert store.history("default:sesi-000199", FOLLOWUP, now=1000.0)
+
+
+def test_expired_sessions_are_dropped_on_access(tokenizer):
+    store = SessionStore(max_sessions=5000, ttl=60, tokenizer=tokenizer)
+    fill(store, 100, 2, now=910.0)
+    store.record("default:baru", "Apa proyek terbaik kamu?", ANSWER, now=970.0)
+    store.history("default:lain", "itu apa?", now=1000.0)
+    assert len(store) == 1 and store.expired == 100
+
+
+def test_history_fits_token_budget_newest_first(tokenizer):
+    store = SessionStore(max_sessions=100, turns=6, history_tokens=120, tokenizer=tokenizer)
+    fill(store, 20, 6, now=1000.0)
+    for i in range(20):
+        history = store.history(f"default:sesi-{i:06d}", FOLLOWUP, now=1000.0)
+        assert history.startswith(HISTORY_HEADER)
+        assert store._count(history) <= store.history_tokens
+        # giliran terbaru selalu ada, yang terlama dibuang lebih dulu
+        assert f"({i}/5)" in history and f"({i}/0)" not in history
+
+
+def test_standalone_question_gets_no_history(tokenizer):
+    store = SessionStore(tokenizer=tokenizer)
+    store.record("default:sesi", "Apa proyek terbaik kamu?", ANSWER, now=1000.0)
+    assert store.history("default:sesi", "Apa hobi kamu?", now=1000.0) == ""
+    assert store.history("default:sesi", "Teknologi apa yang dipakai di proyek itu?", now=1000.0)
+    assert SessionStore(followup_only=False).history("default:sesi", "Apa hobi kamu?") == ""
+
+
+def test_followup_over_api_carries_context(monkeypatch):
+    prompts = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        prompts.append(json.loads(request.content)["messages"][1]["content"])
+        return httpx.Response(200, json={"choices": [{"message": {"content": ANSWER}}]})
+
+    monkeypatch.setattr(main.openai_client, "_client",
+                        httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test"))
+    monkeypatch.setattr(main, "session_store", SessionStore(tokenizer=main.prompt_compactor.tokenizer))
+    main.response_cache.clear()
+
+    async def ask(question: str, session_id: str) -> httpx.Response:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+            return await client.post("/ask", json={"question": question, "session_id": session_id})
+
+    followup = "Teknologi apa yang dipakai di proyek itu?"
+    responses = [asyncio.run(ask("Apa proyek terbaik kamu?", "tamu-1")),
+                 asyncio.run(ask(followup, "tamu-1")),
+                 asyncio.run(ask(followup, "tamu-2"))]
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert len(prompts) == 3
+    assert "Apa proyek terbaik kamu?" in prompts[1] and "platform e-commerce" in prompts[1]
+    # sesi lain tidak melihat riwayat tamu-1
+    assert "Riwayat" not in prompts[2]
+    assert asyncio.run(ask("Halo", "bukan id/valid")).status_code == 422
+    main.response_cache.clear()
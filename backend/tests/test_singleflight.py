@@ -0,0 +1,92 @@
+# penggabungan panggilan identik: langsung lewat SingleFlight dan lewat /ask
+# dengan upstream tiruan
+#
+#   python -m pytest tests/test_singleflight.py
+import asyncio
+
+import httpx
+
+import main
+from singleflight import SingleFlight
+
+
+def test_identical_calls_share_one_task():
+    async def scenario():
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "hasil"
+
+        results = await asyncio.gather(*(flight.do("kunci", work) for _ in range(50)))
+        return results, calls, flight.stats()
+
+    results, calls, stats = asyncio.run(scenario())
+    assert results == ["hasil"] * 50
+    assert calls == 1
+    assert stats == {"inflight": 0, "calls": 1, "shared": 49}
+
+
+def test_error_reaches_every_caller_and_key_is_released():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream gagal")
+
+        results = await asyncio.gather(*(flight.do("kunci", fail) for _ in range(3)), return_exceptions=True)
+        again = await flight.do("kunci", lambda: asyncio.sleep(0, result="pulih"))
+        return results, again
+
+    results, again = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert again == "pulih"
+
+
+# klien yang putus tidak membatalkan pemanggil lain yang menunggu task yang sama
+def test_cancelled_caller_does_not_cancel_others():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "hasil"
+
+        first = asyncio.ensure_future(flight.do("kunci", work))
+        second = asyncio.ensure_future(flight.do("kunci", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return first, await second
+
+    first, result = asyncio.run(scenario())
+    assert first.cancelled()
+    assert result == "hasil"
+
+
+def test_concurrent_identical_questions_make_one_upstream_call(monkeypatch):
+    upstream_calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Jawaban bersama."}}]})
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+            responses = await asyncio.gather(*(
+                client.post("/ask", json={"question": "Apa keahlian utama kamu? uji singleflight"}) for _ in range(50)
+            ))
+        return [response.json()["response"] for response in responses]
+
+    monkeypatch.setattr(main.openai_client, "_client",
+                        httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test"))
+    main.response_cache.clear()
+    answers = asyncio.run(scenario())
+    assert upstream_calls == 1
+    assert set(answers) == {"Jawaban bersama."}
@@ -0,0 +1,120 @@
+# logging terstruktur: satu baris json ringkasan per request dengan id
+# request dan durasi per tahap, id dari header X-Request-ID dipakai ulang,
+# sampling membuang baris info tapi tidak warning, dan buffer penuh membuang
+# baris alih-alih menahan request
+#
+#   python -m pytest tests/test_structured_logging.py
+import io
+import json
+import asyncio
+import logging
+
+import httpx
+import pytest
+
+import main
+from structured_logging import LogPipeline, RequestLogMiddleware, record_stage
+
+app_logger = logging.getLogger("test_app")
+
+
+async def tiny_app(scope, receive, send):
+    record_stage("categorize", 0.002)
+    record_stage("categorize", 0.001)
+    app_logger.info("di dalam request")
+    app_logger.warning("peringatan di dalam request")
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+@pytest.fixture
+def pipeline():
+    # log klien httpx di sisi uji, bukan bagian dari request
+    client_logger = logging.getLogger("httpx")
+    client_level = client_logger.level
+    client_logger.setLevel(logging.WARNING)
+    stream = io.StringIO()
+    pipeline = LogPipeline(level=logging.INFO, stream=stream, flush_interval=0.01)
+    pipeline.start()
+    yield pipeline
+    pipeline.stop()
+    client_logger.setLevel(client_level)
+
+
+def lines(pipeline: LogPipeline) -> list:
+    pipeline.flush()
+    return [json.loads(line) for line in pipeline.stream.getvalue().splitlines()]
+
+
+async def get(app, path: str = "/", headers: dict = None) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+        return await client.get(path, headers=headers)
+
+
+def test_summary_line_has_request_id_and_stages(pipeline):
+    response = asyncio.run(get(RequestLogMiddleware(tiny_app, pipeline), "/cek"))
+    request_id = response.headers["x-request-id"]
+    entries = lines(pipeline)
+    assert {entry["request_id"] for entry in entries} == {request_id}
+    summary = entries[-1]
+    assert (summary["logger"], summary["method"], summary["path"], summary["status"]) == ("request", "GET", "/cek", 200)
+    assert summary["stages"]["categorize"] == pytest.approx(3.0)
+    assert summary["duration_ms"] >= 0
+
+
+@pytest.mark.parametrize("incoming, reused", [("id-dari-proxy", True), ("", False), ("x" * 65, False)])
+def test_request_id_header(pipeline, incoming, reused):
+    response = asyncio.run(get(RequestLogMiddleware(tiny_app, pipeline), headers={"X-Request-ID": incoming}))
+    assert (response.headers["x-request-id"] == incoming) is reused
+    assert response.headers["x-request-id"]
+
+
+def test_sampling_drops_info_but_keeps_warnings(pipeline):
+    pipeline.sample_rate = 0.0
+    asyncio.run(get(RequestLogMiddleware(tiny_app, pipeline)))
+    entries = lines(pipeline)
+    assert [entry["level"] for entry in entries] == ["WARNING"]
+    assert pipeline.stats()["sampled_out"] == 2
+
+
+def test_full_buffer_drops_records():
+    pipeline = LogPipeline(queue_size=2, stream=io.StringIO())
+    for i in range(5):
+        pipeline.handler.handle(logging.LogRecord("x", logging.INFO, __file__, 0, "baris %s", (i,), None))
+    assert len(pipeline.handler.records) == 2
+    assert pipeline.stats()["dropped"] == 3
+
+
+def test_text_format(pipeline):
+    pipeline.stop()
+    text = LogPipeline(level=logging.INFO, json_format=False, stream=io.StringIO())
+    text.start()
+    try:
+        response = asyncio.run(get(RequestLogMiddleware(tiny_app, text), headers={"X-Request-ID": "id-teks"}))
+        text.flush()
+        assert "INFO:test_app:[id-teks] di dalam request" in text.stream.getvalue()
+        assert response.status_code == 200
+    finally:
+        text.stop()
+    pipeline.start()
+
+
+# /ask lewat aplikasi lengkap: ringkasan membawa tahap dari handler
+def test_ask_summary_includes_handler_stages(pipeline):
+    question = "Apa keahlian utama kamu?"
+    key = main.make_cache_key(question, main.categorize_question(question), main.profile_hash)
+    main.response_cache.set(key, "Jawaban dari cache.", main.default_tenant.cache_namespace)
+
+    async def ask() -> httpx.Response:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+            return await client.post("/ask", json={"question": question})
+
+    response = asyncio.run(ask())
+    main.response_cache.clear()
+    assert response.json()["response"] == "Jawaban dari cache."
+    summary = [entry for entry in lines(pipeline) if entry.get("path") == "/ask"][-1]
+    assert summary["request_id"] == response.headers["x-request-id"]
+    assert summary["status"] == 200
+    assert "categorize" in summary["stages"]
@@ -0,0 +1,151 @@
+# multi-tenant: registry berbagi classifier dan katalog antar tenant, routing
+# lewat /t/<id>/ dan header host, namespace cache terpisah per tenant, dan
+# profil tenant yang berganti hanya membuang cache tenant itu
+#
+#   python -m pytest tests/test_tenants.py
+import os
+import json
+import asyncio
+
+import httpx
+import pytest
+
+import main
+from bench_tenants import write_tenants
+from semantic_cache import SemanticCache
+from tenants import TenantMiddleware, TenantRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    write_tenants(str(tmp_path), 2)
+    registry = TenantRegistry(directory=str(tmp_path), reload_interval=0)
+    registry.load()
+    return registry
+
+
+# registry seperti milik main, dipasang lewat middleware di depan aplikasi
+@pytest.fixture
+def app_registry(tmp_path):
+    write_tenants(str(tmp_path), 12)
+    registry = TenantRegistry(directory=str(tmp_path), compactor=main.prompt_compactor,
+                              catalog_data=main.mock_catalog.data, reload_interval=0)
+    registry.load()
+    return registry
+
+
+# upstream tiruan menjawab dengan nama asisten dari prompt
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        prompt = json.loads(request.content)["messages"][1]["content"]
+        name = prompt.split("asisten pribadi dari ", 1)[1].split(" yang", 1)[0]
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"Halo dari {name}."}}]})
+
+    monkeypatch.setattr(main.openai_client, "_client",
+                        httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test"))
+    main.response_cache.clear()
+    yield calls
+    main.response_cache.clear()
+
+
+async def post(registry: TenantRegistry, path: str, question: str, headers: dict = None) -> httpx.Response:
+    transport = httpx.ASGITransport(app=TenantMiddleware(main.app, registry=registry))
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+        return await client.post(path, json={"question": question}, headers=headers)
+
+
+def test_registry_shares_classifiers_and_catalogs(app_registry):
+    assert len(app_registry) == 12 and app_registry.failed == 0
+    stats = app_registry.stats()
+    # tenant0000 dan tenant0010 memakai rules.json yang sama
+    assert stats["classifiers"] == 2 and stats["catalogs"] == 1
+    assert app_registry.get("tenant0000").classifier is app_registry.get("tenant0010").classifier
+    assert app_registry.get("tenant0001").classifier is main.default_classifier
+    assert app_registry.get("tenant0001").catalog.data is main.mock_catalog.data
+    assert app_registry.get("tenant0000").categorize("apa tech stack kamu?") == "keahlian"
+    assert app_registry.for_host("TENANT0003.portfolio.test:443") is app_registry.get("tenant0003")
+
+
+def test_routing_by_path_and_host(app_registry, upstream):
+    question = "Siapa kamu dan apa keahlianmu?"
+    by_path = asyncio.run(post(app_registry, "/t/tenant0007/ask", question))
+    by_host = asyncio.run(post(app_registry, "/ask", question, {"host": "tenant0008.portfolio.test"}))
+    default = asyncio.run(post(app_registry, "/ask", question))
+    assert by_path.json()["response"] == "Halo dari Pemilik Portofolio 7."
+    assert by_host.json()["response"] == "Halo dari Pemilik Portofolio 8."
+    assert default.json()["response"] == f"Halo dari {main.user_profile['nama']}."
+    assert len(upstream) == 3
+
+    # pertanyaan yang sama di tenant yang sama dari cache tenant itu
+    assert asyncio.run(post(app_registry, "/t/tenant0007/ask", question)).json()["response"] == by_path.json()["response"]
+    assert len(upstream) == 3
+
+    missing = asyncio.run(post(app_registry, "/t/tidak-ada/ask", question))
+    assert missing.status_code == 404
+
+
+def test_mock_answers_use_tenant_profile(app_registry):
+    response = asyncio.run(post(app_registry, "/t/tenant0005/ask-mock", "Apa hobi kamu?"))
+    assert response.status_code == 200
+    answer = response.json()["response"].lower()
+    assert any(hobby.lower() in answer for hobby in app_registry.get("tenant0005").profile["hobi"])
+
+
+def change_profile(directory: str, tenant_id: str):
+    path = os.path.join(directory, tenant_id, "profile.json")
+    with open(path, encoding="utf-8") as f:
+        profile = json.load(f)
+    profile["nama"] = f"Nama Baru {tenant_id}"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False)
+
+
+def test_change_reports_old_namespace(registry, tmp_path):
+    changes = []
+    registry.on_change(lambda tenant, old_namespace: changes.append((tenant.id, old_namespace, tenant.cache_namespace)))
+    before = registry.get("tenant0000").cache_namespace
+    change_profile(str(tmp_path), "tenant0000")
+    for store in registry._stores:
+        store.check()
+    assert len(changes) == 1
+    tenant_id, old_namespace, new_namespace = changes[0]
+    assert (tenant_id, old_namespace) == ("tenant0000", before)
+    assert new_namespace != before and new_namespace.startswith("tenant0000:")
+
+
+def test_stale_caches_cleared_only_for_changed_tenant(monkeypatch):
+    semantic_cache = SemanticCache()
+    monkeypatch.setattr(main, "semantic_cache", semantic_cache)
+    main.response_cache.clear()
+    namespaces = ["tenant0000:v1", "tenant0001:v1", main.default_tenant.cache_namespace]
+    for namespace in namespaces:
+        main.response_cache.set(f"kunci-{namespace}", "jawaban", namespace)
+        semantic_cache.set("Apa skill kamu?", main.semantic_namespace(namespace, "keahlian"), namespace)
+
+    main.clear_stale_caches("tenant0000:v1")
+
+    assert main.response_cache.get("kunci-tenant0000:v1") is None
+    for namespace in namespaces[1:]:
+        assert main.response_cache.get(f"kunci-{namespace}") == "jawaban"
+        assert semantic_cache.get("Apa skill kamu?", main.semantic_namespace(namespace, "keahlian")) == namespace
+    assert semantic_cache.get("Apa skill kamu?", main.semantic_namespace("tenant0000:v1", "keahlian")) is None
+    main.response_cache.clear()
+
+
+def test_default_profile_change_keeps_tenant_caches():
+    main.response_cache.clear()
+    main.response_cache.set("kunci-tenant", "jawaban tenant", "tenant0001:v1")
+    main.response_cache.set("kunci-default", "jawaban default", main.default_tenant.cache_namespace)
+    old_profile, old_version = main.user_profile, main.profile_hash
+    profile = dict(old_profile, nama="Nama Pengganti")
+    try:
+        main.apply_profile(profile, "versi-uji")
+        assert main.response_cache.get("kunci-default") is None
+        assert main.response_cache.get("kunci-tenant") == "jawaban tenant"
+    finally:
+        main.apply_profile(old_profile, old_version)
+        main.response_cache.clear()
@@ -0,0 +1,160 @@
+# capture trafik dan putar ulang: data pribadi disanitasi, session_id
+# di-hash, hanya endpoint yang dipilih yang direkam, panggilan http ke openai
+# (bukan antrean gate atau penolakan) yang tercatat sebagai latensi upstream,
+# dan replay.py mengirim ulang rekaman sesuai jadwal terhadap upstream tiruan
+# yang memutar ulang latensi rekaman
+#
+#   python -m pytest tests/test_traffic_capture.py
+import json
+import asyncio
+
+import httpx
+import pytest
+
+import main
+from admission import UpstreamGate
+from circuit_breaker import CircuitBreaker
+from fake_openai import FakeOpenAIConfig, RecordedLatencies, create_app
+from replay import replay
+from structured_logging import RequestContext, RequestLogMiddleware, current_request, record_upstream_call
+from traffic_capture import TrafficCapture, TrafficCaptureMiddleware, load_capture, sanitize_question
+
+PRIVATE = [
+    ("Email aku budi.santoso+kerja@contoh.co.id, bisa kontak?", "budi.santoso"),
+    ("Nomor WA aku +62 812-3456-7890 ya", "3456"),
+    ("Cek portofolio di https://contoh.dev/budi?ref=abc dong", "contoh.dev"),
+    ("NIK 3174012345678901 dipakai buat apa?", "3174"),
+]
+
+
+@pytest.mark.parametrize("question, secret", PRIVATE)
+def test_private_data_is_removed(question, secret):
+    assert secret not in sanitize_question(question)
+
+
+def test_sanitize_collapses_whitespace_and_truncates():
+    assert sanitize_question("Apa  keahlian\nutama kamu?") == "Apa keahlian utama kamu?"
+    assert sanitize_question("a" * 600, max_chars=500) == "a" * 500
+
+
+# aplikasi kecil yang mencatat satu panggilan upstream seperti klien openai
+async def tiny_app(scope, receive, send):
+    while (await receive()).get("more_body"):
+        pass
+    if scope["path"].endswith("/ask"):
+        record_upstream_call(0.25, scope["path"].startswith("/t/"))
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+@pytest.fixture
+def capture(tmp_path):
+    capture = TrafficCapture(str(tmp_path), salt=b"garam-uji")
+    yield capture
+    capture.close()
+
+
+async def post_all(capture: TrafficCapture, requests: list):
+    # capture di dalam log request, seperti urutan middleware di main
+    app = RequestLogMiddleware(TrafficCaptureMiddleware(tiny_app, capture), pipeline=main.log_pipeline)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://backend.test") as client:
+        for path, body in requests:
+            await client.post(path, content=body if isinstance(body, bytes) else json.dumps(body))
+
+
+def test_middleware_records_sanitized_requests(capture):
+    asyncio.run(post_all(capture, [
+        ("/ask", {"question": PRIVATE[0][0], "session_id": "sesi-rahasia"}),
+        ("/t/tenant0001/ask", {"question": "Apa hobi kamu?"}),
+        ("/ask-mock", {"question": "Apa  hobi\nkamu?"}),
+        ("/ask/batch", {"questions": ["tidak direkam"]}),
+        ("/ask", b"bukan json"),
+    ]))
+    capture.close()
+    entries = load_capture([capture.directory])
+    assert [entry["endpoint"] for entry in entries] == ["/ask", "/t/tenant0001/ask", "/ask-mock"]
+    assert capture.skipped == 1
+
+    first, tenant, mock = entries
+    assert "budi.santoso" not in first["question"]
+    assert first["session"] == capture.session_hash("sesi-rahasia") != "sesi-rahasia"
+    assert (first["status"], first["upstream_ms"], first["upstream_failed"]) == (200, 250.0, False)
+    assert tenant["upstream_failed"] is True
+    assert (mock["question"], mock["session"], mock["upstream_ms"]) == ("Apa hobi kamu?", None, None)
+
+
+def test_sampling_and_endpoint_selection(tmp_path):
+    capture = TrafficCapture(str(tmp_path), sample_rate=0.0)
+    assert not capture.matches("/ask")
+    capture = TrafficCapture(str(tmp_path), endpoints=("/ask-mock",))
+    assert capture.matches("/t/x/ask-mock") and not capture.matches("/ask")
+
+
+def test_load_capture_merges_workers_and_skips_truncated_line(tmp_path):
+    (tmp_path / "capture-1.jsonl").write_text('{"ts": 2.0, "question": "b"}\n{"ts": 4.0, "quest', encoding="utf-8")
+    (tmp_path / "capture-2.jsonl").write_text('{"ts": 1.0, "question": "a"}\n{"ts": 3.0, "question": "c"}\n',
+                                              encoding="utf-8")
+    assert [entry["question"] for entry in load_capture([str(tmp_path)])] == ["a", "b", "c"]
+
+
+# antrean gate dan penolakan admission tidak pernah sampai ke klien http,
+# jadi tidak tercatat sebagai latensi atau kegagalan upstream
+@pytest.mark.parametrize("status, recorded", [(200, (False,)), (500, (True,)), (None, None)])
+def test_only_http_calls_are_recorded_as_upstream(monkeypatch, status, recorded):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status, json={"choices": [{"message": {"content": "Jawaban."}}]})
+
+    monkeypatch.setattr(main.openai_client, "_client",
+                        httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream.test"))
+    gate = UpstreamGate(max_inflight=1, max_queue=0, queue_timeout=0.01)
+    monkeypatch.setattr(main, "upstream_gate", gate)
+    monkeypatch.setattr(main, "openai_breaker", CircuitBreaker())
+    main.response_cache.clear()
+
+    async def scenario():
+        if status is None:
+            await gate.acquire()
+        context = RequestContext("uji")
+        token = current_request.set(context)
+        try:
+            await main.ask_ai(main.QuestionRequest(question=f"Apa keahlian utama kamu? {status}"))
+        finally:
+            current_request.reset(token)
+        return context.upstream
+
+    upstream = asyncio.run(scenario())
+    main.response_cache.clear()
+    if recorded is None:
+        assert upstream is None
+    else:
+        assert upstream[1:] == recorded and upstream[0] >= 0
+
+
+def test_replay_follows_schedule_and_recorded_latencies(monkeypatch):
+    questions = ["Apa keahlian utama kamu?", "Ceritakan proyek terbaik kamu", "Apa hobi kamu?"]
+    entries = [
+        {"ts": 1000.0 + i * 0.2, "endpoint": "/ask" if i % 2 else "/ask-mock", "question": questions[i % 3],
+         "session": "abc123" if i < 3 else None, "status": 200, "latency_ms": 30.0,
+         "upstream_ms": 20.0 if i % 2 else None, "upstream_failed": False}
+        for i in range(10)
+    ]
+    latencies = RecordedLatencies(entries, seed=0)
+    upstream = create_app(FakeOpenAIConfig(chunk_ms=0, latencies=latencies))
+    monkeypatch.setattr(main.openai_client, "_client",
+                        httpx.AsyncClient(transport=httpx.ASGITransport(app=upstream), base_url="http://upstream.test/v1"))
+    main.response_cache.clear()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend.test", timeout=30) as client:
+            return await replay(client, entries, speedup=10.0, concurrency=4)
+
+    result = asyncio.run(scenario())
+    main.response_cache.clear()
+    report = result.report(entries[-1]["ts"] - entries[0]["ts"], 10.0)
+    assert report["requests"] == 10
+    assert all(row["errors"] == 0 for row in report["endpoints"].values())
+    assert set(report["endpoints"]) == {"/ask", "/ask-mock"}
+    # rekaman 1.8 detik diputar 10x lebih cepat
+    assert 0.18 <= report["elapsed_s"] < 1.5
+    assert latencies.stats()["unmatched"] == 0 and latencies.stats()["matched"] >= 1
@@ -0,0 +1,52 @@
+import re
+
+
+# pola dikompilasi sekali saat impor.
+# _WHITESPACE_RUN hanya cocok dengan spasi yang memang perlu diganti (run lebih
+# dari satu karakter atau whitespace selain spasi biasa), jadi teks yang sudah
+# rapi tidak disalin sama sekali
+_WHITESPACE_RUN = re.compile(r'[^\S ]\s*| \s+')
+_SPACE_BEFORE_PUNCT = re.compile(r' (?=[.,!?])')
+
+
+# rapikan spasi tanpa strip di awal/akhir, dipakai juga oleh normalizer streaming:
+# setiap run whitespace jadi satu spasi, lalu spasi sebelum . , ! ? dibuang
+def _normalize_spacing(text: str) -> str:
+    return _SPACE_BEFORE_PUNCT.sub('', _WHITESPACE_RUN.sub(' ', text))
+
+
+# fungsi untuk normalisasi teks respons
+def normalize_text(text: str) -> str:
+    return _normalize_spacing(text).strip()
+
+
+# normalisasi inkremental untuk potongan teks yang datang bertahap.
+# spasi di ujung potongan ditahan dulu karena baru bisa diputuskan setelah
+# karakter berikutnya datang (misalnya spasi sebelum tanda titik harus dibuang),
+# sehingga gabungan semua hasil feed() sama dengan normalize_text(teks utuh)
+class StreamingNormalizer:
+    def __init__(self):
+        self._pending_space = False
+        self._started = False
+
+    # proses satu potongan dan kembalikan bagian yang sudah pasti
+    def feed(self, chunk: str) -> str:
+        stripped = chunk.rstrip()
+        trailing_space = len(stripped) < len(chunk)
+
+        if not stripped:
+            # potongan hanya berisi spasi, tahan sampai ada teks berikutnya
+            if chunk and self._started:
+                self._pending_space = True
+            return ""
+
+        if self._pending_space:
+            stripped = " " + stripped
+        cleaned = _normalize_spacing(stripped)
+        if not self._started:
+            cleaned = cleaned.lstrip()
+            self._started = True
+
+        self._pending_space = trailing_space
+        return cleaned
+
@@ -0,0 +1,234 @@
+import os
+import re
+import glob
+import json
+import time
+import random
+import asyncio
+import hashlib
+import logging
+
+from structured_logging import current_request
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENDPOINTS = ("/ask", "/ask/stream", "/ask-mock")
+MAX_BODY_BYTES = 64 * 1024
+
+# data pribadi yang sering ikut terketik di pertanyaan
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_URL = re.compile(r"\b(?:https?://|www\.)\S+", re.IGNORECASE)
+_NUMBER = re.compile(r"\+?\d[\d\s().-]{5,}\d")
+_WHITESPACE = re.compile(r"\s+")
+
+
+# pertanyaan tanpa email, url, dan nomor panjang (telepon, rekening, nik)
+def sanitize_question(question: str, max_chars: int = 500) -> str:
+    text = _EMAIL.sub("<email>", question)
+    text = _URL.sub("<url>", text)
+    text = _NUMBER.sub("<angka>", text)
+    return _WHITESPACE.sub(" ", text).strip()[:max_chars]
+
+
+# rekam request /ask, /ask/stream, dan /ask-mock (pertanyaan yang sudah disanitasi, waktu,
+# status, latensi, serta durasi dan hasil panggilan http ke openai, tanpa
+# antrean gate atau tunggu single-flight) untuk diputar ulang dengan
+# benchmarks/replay.py. setiap proses menulis capture-<pid>.jsonl sendiri.
+# session_id diganti hash dengan salt yang sama untuk semua worker, jadi
+# pertanyaan lanjutan tetap satu sesi saat diputar ulang
+class TrafficCapture:
+    def __init__(self, directory: str, sample_rate: float = 1.0, endpoints: tuple = DEFAULT_ENDPOINTS,
+                 max_question_chars: int = 500, batch_size: int = 64, flush_interval: float = 1.0, salt: bytes = None):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.endpoints = tuple(endpoints)
+        self.max_question_chars = max_question_chars
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.salt = salt or os.urandom(16)
+        self.captured = 0
+        self.skipped = 0
+        self.path = None
+        self._pending = []
+        self._file = None
+        self._questions = {}
+        self._sessions = {}
+        self._endpoints = {}
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    # membuat capture dari variabel lingkungan
+    @classmethod
+    def from_env(cls) -> "TrafficCapture":
+        endpoints = os.getenv("TRAFFIC_CAPTURE_ENDPOINTS")
+        salt = os.getenv("TRAFFIC_CAPTURE_SALT")
+        return cls(
+            directory=os.getenv("TRAFFIC_CAPTURE_DIR", "captures"),
+            sample_rate=float(os.getenv("TRAFFIC_CAPTURE_SAMPLE_RATE", "1.0")),
+            endpoints=tuple(path.strip() for path in endpoints.split(",")) if endpoints else DEFAULT_ENDPOINTS,
+            salt=salt.encode("utf-8") if salt else None,
+        )
+
+    # file induk tetap milik induk, proses anak membuka filenya sendiri
+    def _after_fork(self):
+        self._pending = []
+        self._file = None
+        self.path = None
+
+    # path dengan prefix tenant (/t/<id>/ask) ikut direkam
+    def matches(self, path: str) -> bool:
+        return path.endswith(self.endpoints) and (self.sample_rate >= 1.0 or random.random() < self.sample_rate)
+
+    def session_hash(self, session_id: str) -> str:
+        return hashlib.blake2b(session_id.encode("utf-8"), key=self.salt, digest_size=8).hexdigest()
+
+    # dipanggil middleware setelah respons selesai; body mentah baru diurai,
+    # disanitasi, dan ditulis saat flush
+    def record(self, path: str, body: bytes, started: float, status: int, seconds: float, upstream: tuple = None):
+        self._pending.append((path, body, started, status, seconds, upstream))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    # pertanyaan dan sesi yang sama berulang terus di trafik nyata, jadi hasil
+    # sanitasi dan hash-nya (sudah dalam bentuk json) disimpan di cache kecil
+    def _encoded(self, cache: dict, value: str, encode) -> str:
+        encoded = cache.get(value)
+        if encoded is None:
+            if len(cache) >= 4096:
+                cache.clear()
+            encoded = cache[value] = encode(value)
+        return encoded
+
+    def _line(self, entry: tuple):
+        path, body, started, status, seconds, upstream = entry
+        try:
+            payload = json.loads(body)
+            question = payload["question"]
+        except (ValueError, KeyError, TypeError):
+            return None
+        if not isinstance(question, str):
+            return None
+        session_id = payload.get("session_id")
+        upstream_ms, failed = upstream if upstream is not None else (None, False)
+        question = self._encoded(self._questions, question, lambda text: json.dumps(
+            sanitize_question(text, self.max_question_chars), ensure_ascii=False))
+        session = self._encoded(self._sessions, session_id, lambda text: f'"{self.session_hash(text)}"') \
+            if isinstance(session_id, str) and session_id else "null"
+        endpoint = self._encoded(self._endpoints, path, json.dumps)
+        return (f'{{"ts": {started:.3f}, "endpoint": {endpoint}, "question": {question}, "session": {session}, '
+                f'"status": {status}, "latency_ms": {seconds * 1000:.3f}, '
+                f'"upstream_ms": {"null" if upstream_ms is None else f"{upstream_ms:.3f}"}, "upstream_failed": {"true" if failed else "false"}}}\n')
+
+    def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        lines = []
+        for entry in pending:
+            line = self._line(entry)
+            if line is None:
+                self.skipped += 1
+            else:
+                lines.append(line)
+        try:
+            if self._file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self.path = os.path.join(self.directory, f"capture-{os.getpid()}.jsonl")
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write("".join(lines))
+            self._file.flush()
+        except OSError as e:
+            logger.warning("capture trafik tidak bisa ditulis, %s request dibuang: %s", len(lines), e)
+            return
+        self.captured += len(lines)
+
+    # flush berkala supaya capture bisa dibaca saat server masih berjalan
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "sample_rate": self.sample_rate,
+            "captured": self.captured,
+            "pending": len(self._pending),
+            "skipped": self.skipped,
+        }
+
+
+# middleware asgi: salin body request yang cocok sambil diteruskan ke
+# aplikasi, lalu rekam status dan durasinya. dipasang di dalam
+# RequestLogMiddleware supaya panggilan openai yang dicatat di konteks
+# request terbaca
+class TrafficCaptureMiddleware:
+    def __init__(self, app, capture: TrafficCapture):
+        self.app = app
+        self.capture = capture
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not self.capture.matches(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        size = 0
+        status = 500
+
+        # body yang sangat besar tidak disalin, request tetap diteruskan
+        async def receive_copy():
+            nonlocal size
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                size += len(body)
+                if size <= MAX_BODY_BYTES:
+                    chunks.append(body)
+            return message
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.time()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive_copy, send_status)
+        finally:
+            context = current_request.get()
+            self.capture.record(scope["path"], b"".join(chunks) if size <= MAX_BODY_BYTES else b"", started, status,
+                                time.perf_counter() - start, context.upstream if context is not None else None)
+
+
+def capture_files(paths: list) -> list:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.jsonl"))))
+        elif os.path.isfile(path):
+            files.append(path)
+    return files
+
+
+# semua request dari beberapa file capture (beberapa worker), urut waktu.
+# baris terakhir yang terpotong karena server berhenti di tengah tulis dilewati
+def load_capture(paths: list) -> list:
+    entries = []
+    for path in capture_files(paths):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    entries.sort(key=lambda entry: entry["ts"])
+    return entries
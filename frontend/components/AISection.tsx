@@ -15,6 +15,12 @@ const AISection = () => {
   const [previousQuestions, setPreviousQuestions] = useState([]);
   const { toast } = useToast();
   const textareaRef = useRef(null);
+  // id sesi per kunjungan supaya backend bisa menjawab pertanyaan lanjutan
+  const sessionIdRef = useRef(
+    typeof crypto !== "undefined" && crypto.randomUUID
+      ? crypto.randomUUID()
+      : Math.random().toString(36).slice(2)
+  );
 
   // preset pertanyaan yang relevan dengan profile
   const presetQuestions = [
@@ -82,7 +88,7 @@ const AISection = () => {
         headers: {
           "Content-Type": "application/json",
         },
-        body: JSON.stringify({ question }),
+        body: JSON.stringify({ question, session_id: sessionIdRef.current }),
       });
 
       if (!response.ok) {